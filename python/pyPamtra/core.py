@@ -15,10 +15,13 @@ from matplotlib import mlab
 import multiprocessing
 import logging
 import glob
+import gzip
+import json
 import warnings
 
 try:
-    from .libWrapper import PamtraFortranWrapper, parallelPamtraFortranWrapper
+    from .libWrapper import PamtraFortranWrapper, parallelPamtraFortranWrapper, releaseFortranDatabases, \
+      parallelPamtraSharedMemoryWrapper, toSharedMemory, releaseSharedMemory, unlinkSharedMemory, closeUnusedSharedMemory, shareResourceTracker, shareJobConstants, sharedArray, resultSlice, joinTiming
 except ImportError:
     print('PAMTRA FORTRAN LIBRARY NOT AVAILABLE!')
 try:
@@ -43,7 +46,7 @@ except KeyError:
         """
     raise RuntimeError(data_message)
 from .descriptorFile import pamDescriptorFile
-from .tools import sftp2Cluster, formatExceptionInfo
+from .tools import sftp2Cluster, formatExceptionInfo, interpColumns
 from .meteoSI import detect_liq_cloud, mod_ad, moist_rho_rh,rh2q
 from .fortranNamelist import Namelist
 
@@ -76,6 +79,7 @@ class pyPamtra(object):
     self.nmlSet["data_path"]= '$PAMTRA_DATADIR'
     self.nmlSet["save_psd"]= False #also saves the PSDs used for radiative transfer
     self.nmlSet["save_ssp"]= False #also saves the single scattering properties used for radiative transfer
+    self.nmlSet["output_products"]= "all" #comma separated list of the optional outputs to compute, see _outputSelected
     #self.nmlSet["noutlevels"]= 2 # output levels are given from top to bottom in meters
     self.nmlSet["add_obs_height_to_layer"] = False # add observation levels to atmospheric levels by interpolation
     self.nmlSet["conserve_mass_rescale_dsd"] = True #In case the mass mixing ratio for an hydrometeor calculated integrating the drop-size-distribution (DSD) doesn't correspond to the input value, rescale the DSD to account for the mass loss.
@@ -88,7 +92,9 @@ class pyPamtra(object):
     self.nmlSet["randomseed"] = 0 #0 is real noise, other value gives always the same random numbers
     self.nmlSet["emissivity"]= 0.6
     self.nmlSet["lgas_extinction"]= True
-    self.nmlSet["gas_mod"]= 'R98'
+    self.nmlSet["gas_mod"]= 'R98' #"L93"|"R98"|"L93_LUT"|"R98_LUT"
+    self.nmlSet["gas_lut_path"]= '' #directory to cache gas absorption tables, empty: no cache
+    self.nmlSet["gas_lut_tolerance"]= 1e-3 #max. relative error of gas absorption tables
     self.nmlSet["lhyd_absorption"]= True
     self.nmlSet["lhyd_scattering"]= True
     self.nmlSet["lhyd_emission"]= True
@@ -98,6 +104,11 @@ class pyPamtra(object):
     self.nmlSet["hydro_limit_density_area"] = True
     self.nmlSet["hydro_softsphere_min_density"] = 10.
     self.nmlSet["hydro_adaptive_grid"] = True
+    self.nmlSet["hydro_scat_cache"] = False # reuse the scattering properties of similar layers
+    self.nmlSet["hydro_scat_cache_size"] = 1000 # max. number of cached scattering properties
+    self.nmlSet["hydro_scat_cache_temp_res"] = 0.1 # temperature resolution of the cache [K]
+    self.nmlSet["hydro_scat_cache_conc_res"] = 0.01 # relative resolution of q, n and reff of the cache
+    self.nmlSet["loop_columns_first"] = False # loop over frequencies inside the loop over columns, reuses the psd
     self.nmlSet["tmatrix_db"] = "none"
     self.nmlSet["tmatrix_db_path"] = "database/"
     #: number of FFT points in the Doppler spectrum [typically 256 or 512]
@@ -148,6 +159,7 @@ class pyPamtra(object):
     self.set["freqs"] = []
     #self.set["nfreqs"] = 0
     self.set["namelist_file"] = "TMPFILE"
+    self.set["resultDtype"] = "float64" # or "float32" to halve the memory of the results
 
     self._nmlDefaultSet = deepcopy(self.nmlSet)
 
@@ -254,6 +266,10 @@ class pyPamtra(object):
     self.p["ngridy"] = 0
     self.p["max_nlyrs"] = 0
 
+    self._workerPool = None
+    self._workerConstants = None
+    self._resultHandles = list() #shared memory of the results, see _prepareResults
+
     return
 
 
@@ -323,25 +339,37 @@ class pyPamtra(object):
     """
     read lay or lev pamtra profile from file. Descriptot file must be defined before
 
+    The whole file is read at once, the fixed header lines of all columns are
+    parsed in one go and the layer blocks are tokenized as a single array, so
+    the reading time does not grow with the number of python operations per
+    layer. Files ending with .gz are decompressed transparently.
+
     Parameter
     ---------
     inputFile: str
-        filename with path
+        filename with path, optionally with additional .gz extension
     """
     #make sure that a descriptor file was defined
     assert self.df.nhydro > 0
 
-    f = open(inputFile,"r")
-    g = csv.reader(f,delimiter=" ",skipinitialspace=True)
-    levLay = inputFile.split(".")[-1]
+    if inputFile.endswith(".gz"):
+      levLay = inputFile[:-3].split(".")[-1]
+    else:
+      levLay = inputFile.split(".")[-1]
 
     # check whether it is the new style. otherwise read the old style
     if levLay not in ["lay","lev"]:
-      f.close()
       self.readClassicPamtraProfile(inputFile)
       return
 
-    self.p["ngridx"], self.p["ngridy"], self.p["max_nlyrs"], self.p["noutlevels"] = [int(el) for el in next(g)[:4]]
+    if inputFile.endswith(".gz"):
+      f = gzip.open(inputFile,"rt")
+    else:
+      f = open(inputFile,"r")
+    lines = [line for line in f.read().splitlines() if line.strip()]
+    f.close()
+
+    self.p["ngridx"], self.p["ngridy"], self.p["max_nlyrs"], self.p["noutlevels"] = [int(el) for el in lines[0].split()[:4]]
 
     self._shape2D = (self.p["ngridx"],self.p["ngridy"],)
     self._shape3D = (self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],)
@@ -387,87 +415,91 @@ class pyPamtra(object):
     self.p["press_lev"] = np.ones(self._shape3Dplus) * np.nan
     self.p["relhum_lev"] = np.ones(self._shape3Dplus) * np.nan
 
+    #columns of a layer line after hgt, press, temp, relhum. For hydrometeors it's always layers
+    hydroCols = list()
+    for hh in range(self.df.nhydro):
+      if self.df.data["moment_in"][hh] == 0:
+        pass #nothing to read...
+      elif self.df.data["moment_in"][hh] == 1:
+        hydroCols += [("hydro_n",hh)]
+      elif self.df.data["moment_in"][hh] == 2:
+        hydroCols += [("hydro_reff",hh)]
+      elif self.df.data["moment_in"][hh] == 3:
+        hydroCols += [("hydro_q",hh)]
+      elif self.df.data["moment_in"][hh] == 12:
+        hydroCols += [("hydro_n",hh),("hydro_reff",hh)]
+      elif self.df.data["moment_in"][hh] == 13:
+        hydroCols += [("hydro_n",hh),("hydro_q",hh)]
+      elif self.df.data["moment_in"][hh] == 23:
+        hydroCols += [("hydro_reff",hh),("hydro_q",hh)]
+      else:
+        raise IOError ('Did not understand df.data["moment_in"]')
+    #turbulence is provided in the last column
+    nValues = 4 + len(hydroCols) + ("airturb" in list(self.p.keys()))
+
+    #if levels are provided we have one line more per column
+    nHeader = 4 + (levLay == "lev")
+    nColumns = self.p["ngridx"]*self.p["ngridy"]
+
+    #only the number of layers is needed to locate all columns in the file
+    colStart = np.zeros(nColumns,dtype=int)
+    colLyrs = np.zeros(nColumns,dtype=int)
+    ll = 1
+    for cc in range(nColumns):
+      colStart[cc] = ll
+      colLyrs[cc] = int(lines[ll].split()[4])
+      #in the file its actually nlevels, so:
+      if levLay == "lev": colLyrs[cc] -= 1
+      ll += nHeader + colLyrs[cc]
+    if ll != len(lines):
+      raise IOError("Number of lines in "+inputFile+" does not match the column headers")
+
+    def headerLines(offset,nEl):
+      return np.array([lines[ll].split()[:nEl] for ll in colStart+offset],dtype=float).reshape(self._shape2D+(nEl,))
+
+    #first all the stuff without heigth dimension
+    timeLine = headerLines(0,7).astype(int)
+    year,month,day,hhmm = timeLine[...,0],timeLine[...,1],timeLine[...,2],timeLine[...,3]
+    self.p["unixtime"][:] = ((year-1970).astype("datetime64[Y]").astype("datetime64[M]") + (month-1)).astype("datetime64[D]").astype(int) *86400 + (day-1)*86400 + (hhmm//100)*3600 + (hhmm%100)*60
+    self.p["nlyrs"][:] = colLyrs.reshape(self._shape2D)
+    self.p["model_i"][:] = timeLine[...,5]
+    self.p["model_j"][:] = timeLine[...,6]
+    self.p["obs_height"][:] = headerLines(1,self.p["noutlevels"])
+    groundLine = headerLines(2,7)
+    self.p["lat"][:], self.p["lon"][:], lfrac,self.p["wind10u"][:],self.p["wind10v"][:],self.p["groundtemp"][:],self.p["hgt_lev"][...,0] = np.moveaxis(groundLine,-1,0)
+
+    self.p["sfc_type"][:] = np.around(lfrac) # lfrac is deprecated
+    water = self.p["sfc_type"] == 0
+    self.p["sfc_refl"][:] = np.where(water,'F','S')
+    self.p["sfc_salinity"][water] = 33.0
+
+    self.p["iwv"][:] = headerLines(3,1)[...,0]
+
+    if levLay == "lev":
+      self.p["hgt_lev"][...,0],self.p["press_lev"][...,0],self.p["temp_lev"][...,0],self.p["relhum_lev"][...,0] = np.moveaxis(headerLines(4,4),-1,0)
+
+    #all layer lines of all columns are tokenized at once
+    nRows = np.sum(colLyrs)
+    rowCol = np.repeat(np.arange(nColumns),colLyrs)
+    zz = np.arange(nRows) - np.repeat(np.cumsum(colLyrs)-colLyrs,colLyrs)
+    rowLines = colStart[rowCol] + nHeader + zz
+    data = np.array(" ".join([lines[ll] for ll in rowLines]).split(),dtype=float)
+    #make sure we used all the data!
+    if data.size != nRows*nValues:
+      raise IOError("Expected "+str(nValues)+" values per layer line in "+inputFile)
+    data = data.reshape(nRows,nValues)
+    xx, yy = np.unravel_index(rowCol,self._shape2D)
+
+    #do we have layer or levels
+    if levLay == "lay":
+      self.p["hgt"][xx,yy,zz],self.p["press"][xx,yy,zz],self.p["temp"][xx,yy,zz],self.p["relhum"][xx,yy,zz] = data[:,:4].T
+    else:
+      self.p["hgt_lev"][xx,yy,zz+1],self.p["press_lev"][xx,yy,zz+1],self.p["temp_lev"][xx,yy,zz+1],self.p["relhum_lev"][xx,yy,zz+1] = data[:,:4].T
+    for ii, (key,hh) in enumerate(hydroCols):
+      self.p[key][xx,yy,zz,hh] = data[:,4+ii]
+    if "airturb" in list(self.p.keys()):
+      self.p["airturb"][xx,yy,zz] = data[:,-1]
 
-    for xx in range(self._shape2D[0]):
-      for yy in range(self._shape2D[1]):
-
-        #first all the stuff without heigth dimension
-        year,month,day,time, self.p["nlyrs"][xx,yy], self.p["model_i"][xx,yy], self.p["model_j"][xx,yy] = next(g)[:7]
-        self.p["unixtime"][xx,yy] = calendar.timegm(datetime.datetime(year = int(year), month = int(month), day = int(day), hour = int(time[0:2]), minute = int(time[2:4]), second = 0).timetuple())
-        self.p["obs_height"][xx,yy,:] = np.array(np.array(next(g)[:int(self.p["noutlevels"])]),dtype=float)
-        self.p["lat"][xx,yy], self.p["lon"][xx,yy], lfrac,self.p["wind10u"][xx,yy],self.p["wind10v"][xx,yy],self.p["groundtemp"][xx,yy],self.p["hgt_lev"][xx,yy,0]  = np.array(np.array(next(g)[:7]),dtype=float)
-
-        self.p["sfc_type"][xx,yy] = np.around(lfrac) # lfrac is deprecated
-        if self.p["sfc_type"][xx,yy] == 0:
-            self.p["sfc_refl"][xx,yy] = 'F'
-            self.p["sfc_salinity"][xx,yy] = 33.0
-        else:
-            self.p["sfc_refl"][xx,yy] = 'S'
-
-        self.p["iwv"][xx,yy] = np.array(np.array(next(g)[0]),dtype=float)
-
-        #if levels are provided we have one line more:
-        if levLay == "lev":
-          dataLine = next(g)
-          #in case we have spaces after the last value...
-          try: dataLine = dataLine.remove("")
-          except: pass
-          dataLine = np.array(np.array(dataLine),dtype=float)
-          self.p["hgt_lev"][xx,yy,0],self.p["press_lev"][xx,yy,0],self.p["temp_lev"][xx,yy,0],self.p["relhum_lev"][xx,yy,0] = dataLine
-
-          #in the file its actually nlevels, so:
-          self.p["nlyrs"][xx,yy] = self.p["nlyrs"][xx,yy] - 1
-        #import pdb;pdb.set_trace()
-
-        for zz in range(self.p["nlyrs"][xx,yy]):
-          dataLine =next(g)
-          dataLineCOPY = deepcopy(dataLine)
-          try: dataLine = dataLine.remove("")
-          except: pass
-          dataLine = list(map(float,dataLine))
-          #do we have layer or levels
-          hgt,press,temp,relhum = dataLine[:4]
-          if levLay == "lay":
-            self.p["hgt"][xx,yy,zz] = dataLine.pop(0)
-            self.p["press"][xx,yy,zz] = dataLine.pop(0)
-            self.p["temp"][xx,yy,zz] = dataLine.pop(0)
-            self.p["relhum"][xx,yy,zz] = dataLine.pop(0)
-          elif levLay == "lev":
-            self.p["hgt_lev"][xx,yy,zz+1] = dataLine.pop(0)
-            self.p["press_lev"][xx,yy,zz+1] = dataLine.pop(0)
-            self.p["temp_lev"][xx,yy,zz+1] = dataLine.pop(0)
-            self.p["relhum_lev"][xx,yy,zz+1] = dataLine.pop(0)
-          else:
-            raise IOError("Did not understand lay/lev: "+layLev)
-
-          #for hydrometeors it's always layers:
-          for hh in range(self.df.nhydro):
-            if self.df.data["moment_in"][hh] == 0:
-              pass #nothing to read...
-            elif self.df.data["moment_in"][hh] == 1:
-              self.p["hydro_n"][xx,yy,zz,hh] = dataLine.pop(0)
-            elif self.df.data["moment_in"][hh] == 2:
-              self.p["hydro_reff"][xx,yy,zz,hh] = dataLine.pop(0)
-            elif self.df.data["moment_in"][hh] == 3:
-              self.p["hydro_q"][xx,yy,zz,hh] = dataLine.pop(0)
-            elif self.df.data["moment_in"][hh] == 12:
-              self.p["hydro_n"][xx,yy,zz,hh] = dataLine.pop(0)
-              self.p["hydro_reff"][xx,yy,zz,hh] = dataLine.pop(0)
-            elif self.df.data["moment_in"][hh] == 13:
-              self.p["hydro_n"][xx,yy,zz,hh] = dataLine.pop(0)
-              self.p["hydro_q"][xx,yy,zz,hh] = dataLine.pop(0)
-            elif self.df.data["moment_in"][hh] == 23:
-              self.p["hydro_reff"][xx,yy,zz,hh] = dataLine.pop(0)
-              self.p["hydro_q"][xx,yy,zz,hh] = dataLine.pop(0)
-            else:
-              raise IOError ('Did not understand df.data["moment_in"]')
-            if "airturb" in list(self.p.keys()):
-              self.p["airturb"][xx,yy,zz] = dataLine.pop(0)
-
-          #make sure we used all the data!
-          assert len(dataLine)  == 0
-
-    f.close()
     # if layer input is used, include hgt_lev. This is required when inserting observation heights in runPamtra orr runParallelPamtra
     if levLay == "lay":
       self.p["hgt_lev"][...,1:-1] = 0.5 * (self.p["hgt"][...,:-1] + self.p["hgt"][...,1:])
@@ -618,13 +650,21 @@ class pyPamtra(object):
     """
     write lay or lev (depending on file extension) pamtra profile to file.
 
+    The layer lines of all columns are formatted from one stacked array and the
+    file is written at once. Files ending with .gz are gzip compressed.
+
     Parameter
     ---------
     profileFile: str
-        filename with path
+        filename with path, optionally with additional .gz extension
     """
 
-    levLay = profileFile.split(".")[-1]
+    if profileFile.endswith(".gz"):
+      levLay = profileFile[:-3].split(".")[-1]
+    else:
+      levLay = profileFile.split(".")[-1]
+    if levLay not in ["lay","lev"]:
+      raise IOError("Did not understand lay/lev: "+levLay)
 
     firstTime = datetime.datetime.utcfromtimestamp(self.p["unixtime"][0,0])
     year=str(firstTime.year)
@@ -638,52 +678,172 @@ class pyPamtra(object):
       self.p['hydro_tn'] = np.ones((self._shape2D[0],self._shape2D[1],self.df.nhydro))*-9999.
       #self.addIntegratedValues()
 
+    #in the column headers its nlevels for lev files
     nHeights = self._shape3D[2]
-    if levLay == 'lev': nHeights+1
-
-    s = str(self._shape2D[0])+" "+str(self._shape2D[1])+" "+str(nHeights)+" "+str(self._shape3Dout[2])+"\n"
-
-    for xx in range(self._shape2D[0]):
-      for yy in range(self._shape2D[1]):
-        s += year+" "+mon+" "+day+" "+hhmm+" "+str(nHeights)+" "+str(xx+1)+" "+str(yy+1)+"\n"
-        s += ' '.join(['%9e'%height for height in self.p['obs_height'][xx,yy,:]])+"\n"
-        s += '%3.2f'%self.p["lat"][xx,yy]+" "+'%3.2f'%self.p["lon"][xx,yy]+" "+str(self.p["sfc_type"][xx,yy])+" "+str(self.p["wind10u"][xx,yy])+" "+str(self.p["wind10v"][xx,yy])+" "+str(self.p['groundtemp'][xx,yy])+" "+str(self.p['hgt_lev'][xx,yy,0])+"\n"
-        s += str(self.p["iwv"][xx,yy])
-        for ihyd in range(self.df.nhydro):
-          if self.df.data['moment_in'][ihyd] == 1:
-            s +=" "+'%9e'%self.p["hydro_wp"][xx,yy,ihyd]
-          if self.df.data['moment_in'][ihyd] == 13:
-            s +=" "+'%9e'%self.p["hydro_wp"][xx,yy,ihyd]+" "+'%9e'%self.p["hydro_tn"][xx,yy,ihyd]
-        s += "\n"
-        if levLay == 'lev':
-          s += '%6.1f'%self.p["hgt_lev"][xx,yy,0]+" "+'%6.1f'%self.p["press_lev"][xx,yy,0]+" "+'%3.2f'%self.p["temp_lev"][xx,yy,0]+" "+'%1.4f'%(self.p["relhum_lev"][xx,yy,0])+"\n"
-          for zz in range(1,self._shape3D[2]+1):
-            s += '%6.1f'%self.p["hgt_lev"][xx,yy,zz]+" "+'%6.1f'%self.p["press_lev"][xx,yy,zz]+" "+'%3.2f'%self.p["temp_lev"][xx,yy,zz]+" "+'%1.4f'%(self.p["relhum_lev"][xx,yy,zz])+" "
-            for ihyd in range(self.df.nhydro):
-              if self.df.data['moment_in'][ihyd] == 1:
-                s +=str('%9e'%self.p["hydro_q"][xx,yy,zz,ihyd])+" "
-              if self.df.data['moment_in'][ihyd] == 13:
-                s +=str('%9e'%self.p["hydro_n"][xx,yy,zz,ihyd])+" "+str('%9e'%self.p["hydro_q"][xx,yy,zz,ihyd])+" "
-            s += "\n"
-        elif levLay == 'lay':
-          for zz in range(0,self._shape3D[2]):
-            s += '%6.1f'%self.p["hgt"][xx,yy,zz]+" "+'%6.1f'%self.p["press"][xx,yy,zz]+" "+'%3.2f'%self.p["temp"][xx,yy,zz]+" "+'%1.4f'%(self.p["relhum"][xx,yy,zz])+" "
-            for ihyd in range(self.df.nhydro):
-              if self.df.data['moment_in'][ihyd] == 1:
-                s +=str('%9e'%self.p["hydro_q"][xx,yy,zz,ihyd])+" "
-              if self.df.data['moment_in'][ihyd] == 13:
-                s +=str('%9e'%self.p["hydro_n"][xx,yy,zz,ihyd])+" "+str('%9e'%self.p["hydro_q"][xx,yy,zz,ihyd])+" "
-            s += "\n"
-        else:
-          raise IOError("Did not understand lay/lev: "+layLev)
+    if levLay == 'lev': nHeights += 1
 
+    #columns of the layer lines
+    if levLay == 'lev':
+      rows = [self.p["hgt_lev"][...,1:],self.p["press_lev"][...,1:],self.p["temp_lev"][...,1:],self.p["relhum_lev"][...,1:]]
+    else:
+      rows = [self.p["hgt"],self.p["press"],self.p["temp"],self.p["relhum"]]
+    #same order as in readPamtraProfile, the integrated line needs one value per moment
+    columnKeys = {"n":("hydro_n","hydro_tn"),"reff":("hydro_reff",None),"q":("hydro_q","hydro_wp")}
+    momentKeys = {0:[],1:["n"],2:["reff"],3:["q"],12:["n","reff"],13:["n","q"],23:["reff","q"]}
+    wpCols = list()
+    for ihyd in range(self.df.nhydro):
+      for moment in momentKeys[self.df.data['moment_in'][ihyd]]:
+        key, wpKey = columnKeys[moment]
+        rows += [self.p[key][...,ihyd]]
+        if wpKey in list(self.p.keys()):
+          wpCols += [self.p[wpKey][...,ihyd]]
+        else:
+          wpCols += [np.ones(self._shape2D)*missingNumber]
+    if "airturb" in list(self.p.keys()) and (self.nmlSet["active"] and (self.nmlSet["radar_mode"] in ["moments","spectrum"])):
+      rows += [self.p["airturb"]]
+    rowFormat = '%6.1f %6.1f %3.2f %1.4f ' + '%9e '*(len(rows)-4)
+    rows = np.stack(rows,axis=-1).reshape(-1,len(rows))
+    rowLines = [rowFormat%tuple(row) for row in rows.tolist()]
+
+    nz = self._shape3D[2]
+    lines = [str(self._shape2D[0])+" "+str(self._shape2D[1])+" "+str(nz)+" "+str(self._shape3Dout[2])]
+    for cc, (xx,yy) in enumerate(np.ndindex(self._shape2D)):
+      lines.append(year+" "+mon+" "+day+" "+hhmm+" "+str(nHeights)+" "+str(xx+1)+" "+str(yy+1))
+      lines.append(' '.join(['%9e'%height for height in self.p['obs_height'][xx,yy,:]]))
+      lines.append('%3.2f'%self.p["lat"][xx,yy]+" "+'%3.2f'%self.p["lon"][xx,yy]+" "+str(self.p["sfc_type"][xx,yy])+" "+str(self.p["wind10u"][xx,yy])+" "+str(self.p["wind10v"][xx,yy])+" "+str(self.p['groundtemp'][xx,yy])+" "+str(self.p['hgt_lev'][xx,yy,0]))
+      lines.append(' '.join([str(self.p["iwv"][xx,yy])]+['%9e'%wp[xx,yy] for wp in wpCols]))
+      if levLay == 'lev':
+        lines.append('%6.1f'%self.p["hgt_lev"][xx,yy,0]+" "+'%6.1f'%self.p["press_lev"][xx,yy,0]+" "+'%3.2f'%self.p["temp_lev"][xx,yy,0]+" "+'%1.4f'%(self.p["relhum_lev"][xx,yy,0]))
+      lines.extend(rowLines[cc*nz:(cc+1)*nz])
+    lines.append("")
 
     # write stuff to file
-    f = open(profileFile, 'w')
-    f.write(s)
+    if profileFile.endswith(".gz"):
+      f = gzip.open(profileFile, 'wt')
+    else:
+      f = open(profileFile, 'w')
+    f.write("\n".join(lines))
     f.close()
     return
 
+  def writeProfileStore(self,dirname):
+    """
+    write the profile (p), the descriptor file (df.data) and the 4D and full spectrum data of
+    the descriptor file (df.data4D, df.dataFullSpec) to a binary profile store. The store is a
+    directory with one .npy file per variable, named like in writeResultsToNumpy (e.g.
+    p%temp%.npy), and a manifest.json with the descriptor file and the shapes and types of all
+    variables. Floats are saved as little endian float64, integers as int64 and strings as one
+    byte strings, all in C order so that the columns are the leading dimensions.
+    The manifest is written last, an incomplete store is not recognized.
+
+    The store is read by readProfileStore, optionally only a range of columns. The standalone
+    pamtra reads it if the store directory is given as profile (-p), the descriptor file is still
+    taken from -d then.
+
+    Parameter
+    ---------
+    dirname: str
+        directory of the store, created if it does not exist
+    """
+    manifestFile = os.path.join(dirname,"manifest.json")
+    if os.path.isfile(manifestFile):
+      #remove the old store so that no stale variables are left
+      with open(manifestFile,"r") as f:
+        oldVariables = json.load(f)["variables"]
+      os.remove(manifestFile)
+      for name in oldVariables:
+        if os.path.isfile(os.path.join(dirname,name+"%.npy")):
+          os.remove(os.path.join(dirname,name+"%.npy"))
+    elif not os.path.isdir(dirname):
+      os.makedirs(dirname)
+
+    manifest = dict()
+    manifest["version"] = 1
+    manifest["descriptorFile"] = {"dtype":[list(field) for field in self.df.data.dtype.descr],"data":self.df.data.tolist()}
+    manifest["variables"] = dict()
+    for group, data in [("p",self.p),("df.data4D",self.df.data4D),("df.dataFullSpec",self.df.dataFullSpec)]:
+      for key in list(data.keys()):
+        value = data[key]
+        if type(value) == np.ma.core.MaskedArray:
+          value = value.filled(missingNumber)
+        value = np.asarray(value)
+        if value.dtype.kind == "f":
+          value = value.astype("<f8")
+        elif value.dtype.kind in ["i","u","b"]:
+          value = value.astype("<i8")
+        elif value.dtype.kind == "U":
+          value = value.astype("S")
+        elif value.dtype.kind != "S":
+          raise TypeError("cannot store "+group+"%"+key+" of type "+str(value.dtype))
+        name = group+"%"+key
+        if self.set["pyVerbose"]>1: print("saving: "+dirname+"/"+name+"%.npy")
+        np.save(os.path.join(dirname,name+"%.npy"),np.require(value,requirements="C"))
+        manifest["variables"][name] = {"shape":list(value.shape),"dtype":value.dtype.str}
+
+    with open(manifestFile,"w") as f:
+      json.dump(manifest,f,indent=1)
+    return
+
+  def readProfileStore(self,dirname,subGrid=None):
+    """
+    read a profile store written by writeProfileStore. The variables are memory mapped (copy on
+    write, the store is never changed), so only the columns which are used are read from disk.
+    A range of columns in x direction is a contiguous block of every file.
+
+    Parameter
+    ---------
+    dirname: str
+        directory of the store
+    subGrid: list of int, optional
+        read only the columns [x_start,x_end,y_start,y_end] (default: all columns)
+    """
+    with open(os.path.join(dirname,"manifest.json"),"r") as f:
+      manifest = json.load(f)
+    if manifest["version"] != 1:
+      raise IOError("Unknown profile store version: "+str(manifest["version"]))
+
+    if subGrid is None:
+      columns = (slice(None),slice(None))
+    else:
+      columns = (slice(subGrid[0],subGrid[1]),slice(subGrid[2],subGrid[3]))
+
+    self.df = pamDescriptorFile(self)
+    dtype = [tuple(field) for field in manifest["descriptorFile"]["dtype"]]
+    self.df.data = np.array([tuple(row) for row in manifest["descriptorFile"]["data"]],dtype=dtype).view(np.recarray)
+    self.df.nhydro = len(self.df.data)
+
+    self.p = dict()
+    groups = {"p":self.p,"df.data4D":self.df.data4D,"df.dataFullSpec":self.df.dataFullSpec}
+    for name, info in list(manifest["variables"].items()):
+      group, key = name.split("%")
+      #scalars and empty arrays are not mapped
+      if len(info["shape"]) == 0:
+        value = np.load(os.path.join(dirname,name+"%.npy")).item()
+      elif np.prod(info["shape"]) == 0:
+        value = np.load(os.path.join(dirname,name+"%.npy"))[columns]
+      else:
+        value = np.load(os.path.join(dirname,name+"%.npy"),mmap_mode="c")[columns]
+        #plain views on the mapped file
+        if value.dtype.kind == "S":
+          value = value.view(np.chararray)
+        else:
+          value = value.view(np.ndarray)
+      groups[group][key] = value
+
+    self.p["ngridx"] = len(range(*columns[0].indices(self.p["ngridx"])))
+    self.p["ngridy"] = len(range(*columns[1].indices(self.p["ngridy"])))
+
+    try: self.df.fs_nbin = self.df.dataFullSpec["d_ds"].shape[-1]
+    except KeyError: self.df.fs_nbin = 0
+    self._shape2D = (self.p["ngridx"],self.p["ngridy"],)
+    self._shape3D = (self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],)
+    self._shape3Dplus = (self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"]+1,)
+    self._shape3Dout = (self.p["ngridx"],self.p["ngridy"],self.p["noutlevels"],)
+    self._shape4D = (self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro)
+    self._shape5Dplus = (self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,self.df.fs_nbin+1)
+    self._shape5D = (self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,self.df.fs_nbin)
+    return
+
   def createProfile(self,**kwargs):
     '''
     Function to create Pamtra Profiles.
@@ -1088,7 +1248,7 @@ class pyPamtra(object):
     self._shape5D = (self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,self.df.fs_nbin)
 
 
-  def rescaleHeights(self,new_hgt_lev, new_hgt=[]):
+  def rescaleHeights(self,new_hgt_lev, new_hgt=[], nThreads=1):
     """
     Rescale Pamtra profile to new height grid
 
@@ -1098,6 +1258,8 @@ class pyPamtra(object):
         Array to replace hgt_lev
     new_hgt: Array, optional
         array to replace hgt_lev (default [], i.e. interpoated from new_hgt_lev)
+    nThreads: int, optional
+        number of threads interpolating chunks of columns (default 1)
     """
 
     # sort height vectors
@@ -1117,105 +1279,44 @@ class pyPamtra(object):
     self._shape5D = (self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,self.df.fs_nbin)
     assert len(list(self.df.dataFullSpec.keys())) == 0
 
-    def extrap(x, xp, yp):
-      """np.interp function with linear extrapolation"""
-      y = np.interp(x, xp, yp)
-      y[x < xp[0]] = yp[0] + (x[x<xp[0]]-xp[0]) * (yp[0]-yp[1]) / (xp[0]-xp[1])
-      y[x > xp[-1]]= yp[-1] + (x[x>xp[-1]]-xp[-1])*(yp[-1]-yp[-2])/(xp[-1]-xp[-2])
-      return y
-
-    for key in ["hydro_q","hydro_n","hydro_reff",]:
-      if key in list(self.p.keys()):
-        #make new array
-        newP = np.ones(self._shape4D) * missingNumber
-        for x in range(self._shape2D[0]):
-          for y in range(self._shape2D[1]):
-            for h in range(self.df.nhydro):
-            #interpolate!
-              newP[x,y,:,h] = extrap(new_hgt[x,y,:],old_hgt[x,y,:],self.p[key][x,y,:,h])
-        #save new array
-        self.p[key] = newP
-        #and mark all entries below -1 as missing Number!
-        self.p[key][self.p[key]<-1.e-6] = missingNumber
-
-    for key in self.df.data4D:
-      #make new array
-      newP = np.ones(self._shape4D) * missingNumber
-      for x in range(self._shape2D[0]):
-        for y in range(self._shape2D[1]):
-          for h in range(self.df.nhydro):
-          #interpolate!
-            newP[x,y,:,h] = extrap(new_hgt[x,y,:],old_hgt[x,y,:],self.df.data4D[key][x,y,:,h])
-      #save new array
-      self.df.data4D[key] = newP
-
-
-    for key in ["hgt_lev","temp_lev", "relhum_lev"]:
-      if key in list(self.p.keys()):
-        newP = np.ones(self._shape3Dplus) * missingNumber
-        for x in range(self._shape2D[0]):
-          for y in range(self._shape2D[1]):
-#            newP[x,y] = np.interp(new_hgt_lev,old_hgt_lev[x,y],self.p[key][x,y])
-#            newP[x,y] = np.interp(new_hgt_lev[x,y],old_hgt_lev[x,y],self.p[key][x,y])
-            newP[x,y] = extrap(new_hgt_lev[x,y],old_hgt_lev[x,y],self.p[key][x,y])
-        self.p[key] = newP
-        if key != "hgt_lev": self.p[key][self.p[key]<-1.e-6] = missingNumber
-
-#     for key in ["relhum_lev"]:
-#       if key in self.p.keys():
-#         newP = np.ones(self._shape3Dplus) * missingNumber
-#         for x in xrange(self._shape2D[0]):
-#           for y in xrange(self._shape2D[1]):
-# #            newP[x,y] = np.interp(new_hgt_lev,old_hgt_lev[x,y],self.p[key][x,y])
-# #            newP[x,y] = np.interp(new_hgt_lev[x,y],old_hgt_lev[x,y],self.p[key][x,y])
-#             newP[x,y] = extrap(new_hgt_lev[x,y],old_hgt_lev[x,y],self.p[key][x,y])
-#         self.p[key] = newP
-#         if key != "hgt_lev" and self.p[key][self.p[key]<0]: print "Somethings wrong. Rel. humidity below 0!"
-
-    # for key in ["relhum"]:
-    #   if key in self.p.keys():
-    #     newP = np.ones(self._shape3D) * missingNumber
-    #     for x in xrange(self._shape2D[0]):
-    #       for y in xrange(self._shape2D[1]):
-    #         newP[x,y] = np.interp(new_hgt[x,y],old_hgt[x,y],self.p[key][x,y])
-    #     self.p[key] = newP
-    #     if key != "hgt" and self.p[key][self.p[key]<0]: print "Somethings wrong. Rel. humidity below 0!"
-
-    for key in ["airturb","hgt","temp","relhum","wind_uv","turb_edr"]:
-      if key in list(self.p.keys()):
-        newP = np.ones(self._shape3D) * missingNumber
-        for x in range(self._shape2D[0]):
-          for y in range(self._shape2D[1]):
-#            newP[x,y] = np.interp(new_hgt,old_hgt[x,y],self.p[key][x,y])
-#            newP[x,y] = np.interp(new_hgt[x,y],old_hgt[x,y],self.p[key][x,y])
-            newP[x,y] = extrap(new_hgt[x,y],old_hgt[x,y],self.p[key][x,y])
-        self.p[key] = newP
-        if key != "hgt": self.p[key][self.p[key]<-1.e-6] = missingNumber
-
-
-    for key in ["press_lev"]:
-      if key in list(self.p.keys()):
-        newP = np.ones(self._shape3Dplus) * missingNumber
-        for x in range(self._shape2D[0]):
-          for y in range(self._shape2D[1]):
-#            newP[x,y] = np.exp(np.interp(new_hgt_lev,old_hgt_lev[x,y],np.log(self.p[key][x,y])))
-#            newP[x,y] = np.exp(np.interp(new_hgt_lev[x,y],old_hgt_lev[x,y],np.log(self.p[key][x,y])))
-            newP[x,y] = np.exp(extrap(new_hgt_lev[x,y],old_hgt_lev[x,y],np.log(self.p[key][x,y])))
-        self.p[key] = newP
-        self.p[key][self.p[key]<-1.e-6] = missingNumber
-
-    for key in ["press"]:
-      if key in list(self.p.keys()):
-        newP = np.ones(self._shape3D) * missingNumber
-        for x in range(self._shape2D[0]):
-          for y in range(self._shape2D[1]):
-#            newP[x,y] = np.exp(np.interp(new_hgt,old_hgt[x,y],np.log(self.p[key][x,y])))
-#            newP[x,y] = np.exp(np.interp(new_hgt[x,y],old_hgt[x,y],np.log(self.p[key][x,y])))
-            newP[x,y] = np.exp(extrap(new_hgt[x,y],old_hgt[x,y],np.log(self.p[key][x,y])))
-        self.p[key] = newP
-        self.p[key][self.p[key]<-1.e-6] = missingNumber
-
-
+    #all columns and all variables on the same grid are interpolated at once (np.interp with
+    #linear extrapolation), pressure is interpolated logarithmically.
+    hydroKeys = [key for key in ["hydro_q","hydro_n","hydro_reff",] if key in list(self.p.keys())]
+    data4DKeys = list(self.df.data4D.keys())
+    layKeys = [key for key in ["airturb","hgt","temp","relhum","wind_uv","turb_edr"] if key in list(self.p.keys())]
+    levKeys = [key for key in ["hgt_lev","temp_lev", "relhum_lev"] if key in list(self.p.keys())]
+    logLayKeys = [key for key in ["press"] if key in list(self.p.keys())]
+    logLevKeys = [key for key in ["press_lev"] if key in list(self.p.keys())]
+
+    newLay = interpColumns(new_hgt,old_hgt,
+      [self.p[key] for key in hydroKeys] + [self.df.data4D[key] for key in data4DKeys] +
+      [self.p[key] for key in layKeys] + [np.log(self.p[key]) for key in logLayKeys],nThreads=nThreads)
+    newLev = interpColumns(new_hgt_lev,old_hgt_lev,
+      [self.p[key] for key in levKeys] + [np.log(self.p[key]) for key in logLevKeys],nThreads=nThreads)
+
+    for key in hydroKeys:
+      self.p[key] = newLay.pop(0)
+      #and mark all entries below -1 as missing Number!
+      self.p[key][self.p[key]<-1.e-6] = missingNumber
+
+    for key in data4DKeys:
+      self.df.data4D[key] = newLay.pop(0)
+
+    for key in layKeys:
+      self.p[key] = newLay.pop(0)
+      if key != "hgt": self.p[key][self.p[key]<-1.e-6] = missingNumber
+
+    for key in logLayKeys:
+      self.p[key] = np.exp(newLay.pop(0))
+      self.p[key][self.p[key]<-1.e-6] = missingNumber
+
+    for key in levKeys:
+      self.p[key] = newLev.pop(0)
+      if key != "hgt_lev": self.p[key][self.p[key]<-1.e-6] = missingNumber
+
+    for key in logLevKeys:
+      self.p[key] = np.exp(newLev.pop(0))
+      self.p[key][self.p[key]<-1.e-6] = missingNumber
 
     self.p["nlyrs"] = np.sum(self.p["hgt_lev"] != missingNumber,axis=-1) -1
 
@@ -1439,7 +1540,7 @@ class pyPamtra(object):
     return
 
 
-  def runPamtra(self, freqs, checkData=True, failOnError=True):
+  def runPamtra(self, freqs, checkData=True, failOnError=True, uniqueColumns=False):
     '''
     run Pamtra from python. Populates result dictionary 'r'.
 
@@ -1451,6 +1552,10 @@ class pyPamtra(object):
         Check input data for consitency (default True)
     failOnError : 
         raise Python Error in case of Fortran Error
+    uniqueColumns : bool, optional
+        Compute bit-identical columns (profile, descriptor file and full spectrum data, e.g.
+        from tileProfiles) only once and copy their results to all of them. Note that
+        identical columns get identical radar noise then. (default False)
     '''
     tttt = time.time()
 
@@ -1476,14 +1581,23 @@ class pyPamtra(object):
 
     if self.nmlSet["add_obs_height_to_layer"]: self._addObservationLevels()
 
+    columnState = None
+    if uniqueColumns:
+      index, inverse = self._uniqueColumns()
+      if self.set["pyVerbose"] > 0: print("unique columns:", len(index), "of", len(inverse))
+      if len(index) < len(inverse): columnState = self._reduceColumns(index)
 
-    fortResults, self.fortError, fortObject = PamtraFortranWrapper(self.set,self.nmlSet,self.df.data,self.df.data4D,self.df.dataFullSpec,self.p)
+    try:
+      fortResults, self.fortError, fortObject = PamtraFortranWrapper(self.set,self.nmlSet,self.df.data,self.df.data4D,self.df.dataFullSpec,self.p)
+    finally:
+      if columnState is not None: self._restoreColumns(columnState)
     
     if failOnError and (self.fortError != 0):
         raise RuntimeError('Fortran code failed')
 
     self.r = fortResults
     self.fortObject = fortObject
+    if columnState is not None: self._expandColumns(inverse)
 
 
     self.r["nmlSettings"] = self.nmlSet
@@ -1491,7 +1605,71 @@ class pyPamtra(object):
     if self.set["pyVerbose"] > 0: print("pyPamtra runtime:", time.time() - tttt)
     return
 
-  def runParallelPamtra(self,freqs,pp_local_workers="auto",pp_deltaF=1,pp_deltaX=0,pp_deltaY = 0,checkData=True,timeout=None):
+  def releaseDatabases(self):
+    '''
+    Free the databases (TELSEM2 emissivity atlas, Hong DDA database) which are kept in
+    memory by the Fortran library between calls of runPamtra. Only the current
+    process is affected, the workers of runParallelPamtra hold their own copies.
+    '''
+    releaseFortranDatabases(self.set["verbose"])
+    return
+
+  def startWorkerPool(self,pp_local_workers="auto"):
+    '''
+    Start worker processes which are reused by all following calls of runParallelPamtra
+    until stopWorkerPool is called. The workers are not replaced after a number of jobs, so
+    they keep the databases of the Fortran library (TELSEM2, Hong DDA database, gas
+    absorption lookup table) loaded between the runs. The namelist settings and the
+    descriptor file are passed to the workers again only if they changed. Returns self, so
+    it can be used as context manager, e.g. with pam.startWorkerPool(8): ...
+
+    Parameters
+    ----------
+    pp_local_workers : int or 'auto', optional
+        number of worker processes (default 'auto' correpons to number of cpus.)
+    '''
+    self.stopWorkerPool()
+    if pp_local_workers == "auto": pp_local_workers = multiprocessing.cpu_count()
+    shareResourceTracker()
+    self._workerPool = (multiprocessing.Pool(processes=pp_local_workers), pp_local_workers)
+    return self
+
+  def stopWorkerPool(self):
+    '''
+    Terminate the worker processes started by startWorkerPool.
+    '''
+    if self._workerPool is not None:
+      self._workerPool[0].terminate()
+      self._workerPool[0].join()
+      self._workerPool = None
+    if self._workerConstants is not None:
+      releaseSharedMemory(self._workerConstants[1])
+      self._workerConstants = None
+    return
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.stopWorkerPool()
+    return False
+
+  def _jobConstants(self):
+    '''
+    Shared memory description (see shareJobConstants) of the namelist settings and the
+    descriptor file for the workers of startWorkerPool. It is created again only if they
+    changed since the last run, otherwise the workers use the copy they already have.
+    '''
+    data = pickle.dumps((self.nmlSet, self.df.data), protocol=pickle.HIGHEST_PROTOCOL)
+    if (self._workerConstants is None) or (self._workerConstants[0] != data):
+      if self._workerConstants is not None: releaseSharedMemory(self._workerConstants[1])
+      handles = list()
+      shared = shareJobConstants((self.nmlSet, self.df.data), handles)
+      self._workerConstants = (data, handles, shared)
+    return self._workerConstants[2]
+
+  def runParallelPamtra(self,freqs,pp_local_workers="auto",pp_deltaF=1,pp_deltaX=0,pp_deltaY = 0,checkData=True,timeout=None,pp_sharedMemory=False,pp_schedule="fixed",pp_costs=None,pp_maxInflight=None,
+    pp_ncSink=None,pp_ncResume=False,pp_keepResults=True,uniqueColumns=False):
     '''
     run Pamtra parallel from python. Populates result dictionary 'r'.
 
@@ -1502,7 +1680,8 @@ class pyPamtra(object):
     checkData : bool, optional
         Check input data for consitency (default True)
     pp_local_workers : int or 'auto', optional
-        number of parallel threads (default 'auto' correpons to number of cpus.)
+        number of parallel threads (default 'auto' correpons to number of cpus.) Ignored if
+        the workers of startWorkerPool are used.
     pp_deltaF : int , optional
         Size of each thread in frequency domain. 0 means infinity. (default 1)
     pp_deltaX : int , optional
@@ -1511,6 +1690,38 @@ class pyPamtra(object):
         Size of each thread in Y domain. 0 means infinity. (default 0)
     timeout : int or None, optional
         Timeout for each thread in seconds (default None)
+    pp_sharedMemory : bool, optional
+        Place the profile, 4D descriptor file and full spectrum arrays once in shared memory
+        instead of pickling a slice of them for every job. Workers receive only the indices
+        of their part and write their results directly into the result arrays, which are
+        allocated in shared memory as well. The shared memory of the results is released
+        when the results are replaced by the next run. Requires Python >= 3.8. (default False)
+    pp_schedule : {'fixed', 'cost'}, optional
+        'fixed' uses boxes of pp_deltaX x pp_deltaY. 'cost' ignores pp_deltaX and pp_deltaY and
+        builds jobs of similar estimated cost which are submitted largest first. Idle workers
+        pick the next job, the small jobs fill the end of the run. (default 'fixed')
+    pp_costs : array_like, optional
+        cost per column for pp_schedule='cost', e.g. pp_columnCost of an earlier run. By default
+        the costs measured in the last run are reused or estimated from the profile.
+    pp_maxInflight : int, 'auto' or None, optional
+        Maximum number of submitted but not yet joined jobs. New jobs are submitted only when
+        finished ones have been joined, which limits the memory held by the queues of the pool.
+        'auto' derives the number from the available memory, None submits all jobs at once.
+        The peak of the estimated queued bytes is stored in pp_peakQueuedBytes. (default None)
+    pp_ncSink : str or None, optional
+        NetCDF4 file to which the results of every job are written as soon as it is joined.
+        See _openResultSink for the layout. (default None)
+    pp_ncResume : bool, optional
+        Continue an existing pp_ncSink file, jobs whose results are already in the file are
+        skipped. (default False)
+    pp_keepResults : bool, optional
+        Keep the results in r. If False (requires pp_ncSink), the result arrays are not
+        allocated and only the file contains them, so results larger than the memory can be
+        computed. (default True)
+    uniqueColumns : bool, optional
+        Compute bit-identical columns only once, see runPamtra. The jobs are cut from the
+        unique columns, pp_costs and pp_columnCost refer to the full grid. Cannot be combined
+        with pp_ncSink. (default False)
 
     '''
 
@@ -1534,8 +1745,13 @@ class pyPamtra(object):
     if hasattr(self, "fortObject"): del self.fortObject
     self.fortError = 0
 
-    if pp_local_workers == "auto": pp_local_workers = multiprocessing.cpu_count()
-    pool = multiprocessing.Pool(processes=pp_local_workers,maxtasksperchild=100)
+    persistentPool = self._workerPool is not None
+    if persistentPool:
+      pool, pp_local_workers = self._workerPool
+    else:
+      if pp_local_workers == "auto": pp_local_workers = multiprocessing.cpu_count()
+      shareResourceTracker()
+      pool = multiprocessing.Pool(processes=pp_local_workers,maxtasksperchild=100)
     tttt = time.time()
 
     assert self.set["nfreqs"] > 0
@@ -1545,61 +1761,130 @@ class pyPamtra(object):
 
     if self.nmlSet["add_obs_height_to_layer"]: self._addObservationLevels()
 
+    assert pp_keepResults or (pp_ncSink is not None), "pp_keepResults=False requires pp_ncSink"
+    assert not (uniqueColumns and (pp_ncSink is not None)), "uniqueColumns cannot be combined with pp_ncSink"
+
+    columnState = None
+    if uniqueColumns:
+      index, inverse = self._uniqueColumns()
+      if self.set["pyVerbose"] > 0: print("unique columns:", len(index), "of", len(inverse))
+      if len(index) < len(inverse):
+        if (pp_costs is None) and (getattr(self, "pp_columnCost", None) is not None) and \
+          (self.pp_columnCost.shape == self._shape2D) and (np.sum(self.pp_columnCost) > 0):
+          pp_costs = self.pp_columnCost
+        if pp_costs is not None:
+          pp_costs = np.asarray(pp_costs,dtype=float).reshape(-1)[index].reshape(len(index),1)
+        columnState = self._reduceColumns(index)
+
     jobs = list()
     self.pp_resultData = list()
     pp_i = 0
-    self._prepareResults()
-    try:
-      for pp_startF in np.arange(0,self.set["nfreqs"],pp_deltaF):
-        pp_endF = pp_startF + pp_deltaF
-        if pp_endF > self.set["nfreqs"]: pp_endF = self.set["nfreqs"]
-        for pp_startX in np.arange(0,self.p["ngridx"],pp_deltaX):
-          pp_endX = pp_startX + pp_deltaX
-          if pp_endX > self.p["ngridx"]: pp_endX = self.p["ngridx"]
-          pp_ngridx = pp_endX - pp_startX
-          for pp_startY in np.arange(0,self.p["ngridy"],pp_deltaY):
-            pp_endY = pp_startY + pp_deltaY
-            if pp_endY > self.p["ngridy"]: pp_endY = self.p["ngridy"]
-            pp_ngridy = pp_endY - pp_startY
-
-            if self.set["pyVerbose"] > 0: print("submitting job ", pp_i, pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY)
+    shmResults = self._prepareResults(allocate=pp_keepResults,shared=pp_sharedMemory and pp_keepResults)
+    shmHandles = list()
+    if pp_sharedMemory:
+      shmProfile = toSharedMemory(self.p, shmHandles)
+      shmData4D = toSharedMemory(self.df.data4D, shmHandles)
+      shmDataFS = toSharedMemory(self.df.dataFullSpec, shmHandles)
+    if pp_ncSink is not None:
+      self._openResultSink(pp_ncSink,resume=pp_ncResume)
+    #the workers of startWorkerPool get the namelist and descriptor file only when they changed
+    constants = self._jobConstants() if persistentPool else None
+    nmlSet, dfData = (None, None) if persistentPool else (self.nmlSet, self.df.data)
+
+    self.pp_peakQueuedBytes = 0
+    queuedBytes = [0]
+    poolBroken = [False]
+    def collectJob(jj, job, jobBytes):
+      try: self._joinResults(job.get(timeout=timeout))
+      except multiprocessing.TimeoutError:
+        print("KILLED pool due to timeout of job", jj+1)
+        poolBroken[0] = True
+      queuedBytes[0] -= jobBytes
+      if self.set["pyVerbose"] > 0: print("got job", jj+1)
 
-            indices = [pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY]
-            profilePart, dfPart,dfPart4D,dfPartFS, settings = self._sliceProfile(*indices)
-            jobs.append(pool.apply_async(parallelPamtraFortranWrapper,(
-            indices,
-            settings,self.nmlSet,dfPart,dfPart4D,dfPartFS,profilePart),{"returnModule":False}))#),callback=self.pp_resultData.append)
+    try:
+      for indices in self._jobIndices(pp_deltaF,pp_deltaX,pp_deltaY,pp_schedule,pp_local_workers,pp_costs):
+        pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY = indices
 
+        if pp_ncResume and (pp_ncSink is not None) and self._resultSinkDone(indices):
+          if self.set["pyVerbose"] > 0: print("skipping finished job ", pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY)
+          if pp_keepResults: self._readResultSink(indices)
+          continue
 
-            pp_i += 1
-            if self.set["pyVerbose"] > 0: print("submitted job: ", pp_i)
+        if self.set["pyVerbose"] > 0: print("submitting job ", pp_i, pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY)
 
+        if pp_sharedMemory:
+          #the job's share of the shared arrays, which the worker copies for the Fortran library
+          sliceXY = (slice(pp_startX,pp_endX),slice(pp_startY,pp_endY))
+          jobBytes = self._jobBytes(indices,*[dict((key,value[sliceXY]) for key,value in data.items()
+            if isinstance(value,np.ndarray) and (value.ndim >= 2)) for data in [self.p,self.df.data4D,self.df.dataFullSpec]])
+          job = pool.apply_async(parallelPamtraSharedMemoryWrapper,(
+          indices,
+          self.set,nmlSet,dfData,shmProfile,shmData4D,shmDataFS,shmResults),{"returnModule":False,"constants":constants})
+        else:
+          profilePart, dfPart,dfPart4D,dfPartFS, settings = self._sliceProfile(*indices)
+          jobBytes = self._jobBytes(indices,profilePart,dfPart4D,dfPartFS)
+          job = pool.apply_async(parallelPamtraFortranWrapper,(
+          indices,
+          settings,nmlSet,dfData,dfPart4D,dfPartFS,profilePart),{"returnModule":False,"constants":constants})#),callback=self.pp_resultData.append)
+          del profilePart, dfPart,dfPart4D,dfPartFS
+
+        jobs.append((pp_i,job,jobBytes))
+        queuedBytes[0] += jobBytes
+        self.pp_peakQueuedBytes = max(self.pp_peakQueuedBytes, queuedBytes[0])
+
+        pp_i += 1
+        if self.set["pyVerbose"] > 0: print("submitted job: ", pp_i)
+
+        if pp_maxInflight == "auto":
+          pp_maxInflight = self._autoMaxInflight(jobBytes, pp_local_workers)
+          if self.set["pyVerbose"] > 0: print("max. number of jobs in flight:", pp_maxInflight)
+        #join the finished jobs, wait for the oldest one if the window is full
+        while (pp_maxInflight is not None) and (len(jobs) >= pp_maxInflight):
+          finished = [job for job in jobs if job[1].ready()]
+          if len(finished) == 0: finished = jobs[:1]
+          for job in finished:
+            jobs.remove(job)
+            collectJob(*job)
 
       #pool.close()
       #pool.join()
     except KeyboardInterrupt:
       pool.terminate()
       pool.join()
+      poolBroken[0] = True
       print("TERMINATED: KeyboardInterrupt")
 
     if self.set["pyVerbose"] > 0: print("waiting for all jobs to finish")
-    for jj,job in enumerate(jobs):
-      #import pdb;pdb.set_trace()
-      try: self._joinResults(job.get(timeout=timeout))
-      except multiprocessing.TimeoutError:
-        print("KILLED pool due to timeout of job", jj+1)
-      if self.set["pyVerbose"] > 0: print("got job", jj+1)
-
+    try:
+      for job in jobs:
+        #import pdb;pdb.set_trace()
+        collectJob(*job)
+    finally:
+      if not persistentPool: pool.terminate()
+      elif poolBroken[0]: self.stopWorkerPool()
+      #the result arrays stay valid, see _releaseResults
+      unlinkSharedMemory(self._resultHandles)
+      releaseSharedMemory(shmHandles)
+      if pp_ncSink is not None: self._closeResultSink()
+      if columnState is not None: self._restoreColumns(columnState)
+
+    if columnState is not None: self._expandColumns(inverse)
+    if not pp_keepResults:
+      for key in self._slicedResultKeys():
+        del self.r[key]
     self.r["nmlSettings"] = self.nmlSet
 
-    pool.terminate()
+    if self.set["pyVerbose"] > 0: print("peak queued bytes:", self.pp_peakQueuedBytes)
     if self.set["pyVerbose"] > 0: print("pyPamtra runtime:", time.time() - tttt)
     del pool, jobs
     return
 
-  def runPicklePamtra(self,freqs,picklePath="pyPamJobs",pp_deltaF=1,pp_deltaX=0,pp_deltaY = 0,checkData=True,timeout=None,maxWait =3600):
+  def runPicklePamtra(self,freqs,picklePath="pyPamJobs",pp_deltaF=1,pp_deltaX=0,pp_deltaY = 0,checkData=True,timeout=None,maxWait =3600,pp_schedule="fixed",pp_workers=1,pp_costs=None):
     '''
     Special variant of runParallelPamtra writing Pickles to picklePath which are processed by another job.
+    pp_schedule, pp_workers (number of processes working on picklePath) and pp_costs
+    are explained in _jobIndices.
     '''
     import hashlib
 
@@ -1640,32 +1925,22 @@ class pyPamtra(object):
     pp_i = 0
     self._prepareResults()
     try:
-      for pp_startF in np.arange(0,self.set["nfreqs"],pp_deltaF):
-        pp_endF = pp_startF + pp_deltaF
-        if pp_endF > self.set["nfreqs"]: pp_endF = self.set["nfreqs"]
-        for pp_startX in np.arange(0,self.p["ngridx"],pp_deltaX):
-          pp_endX = pp_startX + pp_deltaX
-          if pp_endX > self.p["ngridx"]: pp_endX = self.p["ngridx"]
-          pp_ngridx = pp_endX - pp_startX
-          for pp_startY in np.arange(0,self.p["ngridy"],pp_deltaY):
-            pp_endY = pp_startY + pp_deltaY
-            if pp_endY > self.p["ngridy"]: pp_endY = self.p["ngridy"]
-            pp_ngridy = pp_endY - pp_startY
-
-            if self.set["pyVerbose"] > 0: print("submitting job ", pp_i, pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY)
-
-            indices = [pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY]
-            profilePart, dfPart,dfPart4D,dfPartFS, settings = self._sliceProfile(*indices)
-            #import pdb;pdb.set_trace()
-            inputPickle = pickle.dumps((indices,settings,self.nmlSet,dfPart,dfPart4D,dfPartFS,profilePart))
-            md5 = hashlib.md5(inputPickle).hexdigest()
-            fname = "%s/%d_%04d_%s"%(picklePath, time.time(), pp_i, md5)
-            jobs.append(fname)
-            with open(fname+".job.tmp", 'w') as f:
-              f.write(inputPickle)
-            os.rename(fname+".job.tmp",fname+".job")
-            pp_i += 1
-            if self.set["pyVerbose"] > 0: print("wrote job: ", pp_i)
+      for indices in self._jobIndices(pp_deltaF,pp_deltaX,pp_deltaY,pp_schedule,pp_workers,pp_costs):
+        pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY = indices
+
+        if self.set["pyVerbose"] > 0: print("submitting job ", pp_i, pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY)
+
+        profilePart, dfPart,dfPart4D,dfPartFS, settings = self._sliceProfile(*indices)
+        #import pdb;pdb.set_trace()
+        inputPickle = pickle.dumps((indices,settings,self.nmlSet,dfPart,dfPart4D,dfPartFS,profilePart))
+        md5 = hashlib.md5(inputPickle).hexdigest()
+        fname = "%s/%d_%04d_%s"%(picklePath, time.time(), pp_i, md5)
+        jobs.append(fname)
+        with open(fname+".job.tmp", 'wb') as f:
+          f.write(inputPickle)
+        os.rename(fname+".job.tmp",fname+".job")
+        pp_i += 1
+        if self.set["pyVerbose"] > 0: print("wrote job: ", pp_i)
 
       startTime = time.time()
 
@@ -1676,7 +1951,7 @@ class pyPamtra(object):
             print(("\rWaiting too long for job %d: %s"%(mm,fname)))
             break
           try:
-            with open(fname, 'r') as f:
+            with open(fname, 'rb') as f:
               resultPickle = pickle.load(f)
             os.remove(fname)
             if resultPickle[0] is not None:
@@ -1754,31 +2029,21 @@ class pyPamtra(object):
     pp_i = 0
     self._prepareResults()
     try:
-      for pp_startF in np.arange(0,self.set["nfreqs"],pp_deltaF):
-        pp_endF = pp_startF + pp_deltaF
-        if pp_endF > self.set["nfreqs"]: pp_endF = self.set["nfreqs"]
-        for pp_startX in np.arange(0,self.p["ngridx"],pp_deltaX):
-          pp_endX = pp_startX + pp_deltaX
-          if pp_endX > self.p["ngridx"]: pp_endX = self.p["ngridx"]
-          pp_ngridx = pp_endX - pp_startX
-          for pp_startY in np.arange(0,self.p["ngridy"],pp_deltaY):
-            pp_endY = pp_startY + pp_deltaY
-            if pp_endY > self.p["ngridy"]: pp_endY = self.p["ngridy"]
-            pp_ngridy = pp_endY - pp_startY
+      for indices in self._jobIndices(pp_deltaF,pp_deltaX,pp_deltaY):
+        pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY = indices
 
-            if self.set["pyVerbose"] > 0: print("submitting job ", pp_i, pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY)
+        if self.set["pyVerbose"] > 0: print("submitting job ", pp_i, pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY)
 
-            indices = [pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY]
-            profilePart, dfPart,dfPart4D,dfPartFS, settings = self._sliceProfile(*indices)
-            #import pdb;pdb.set_trace()
-            inputPickle = pickle.dumps((indices,settings,self.nmlSet,dfPart,dfPart4D,dfPartFS,profilePart))
-            md5 = hashlib.md5(inputPickle).hexdigest()
-            fname = "%d_%04d_%s"%(time.time(), pp_i, md5)
-            jobs.append(fname)
-            cluster.put(remotePicklePath+"/"+fname+".job.tmp",inputPickle)
-            cluster.mv(remotePicklePath+"/"+fname+".job.tmp",remotePicklePath+"/"+fname+".job")
-            pp_i += 1
-            if self.set["pyVerbose"] > 0: print("wrote job: ", pp_i)
+        profilePart, dfPart,dfPart4D,dfPartFS, settings = self._sliceProfile(*indices)
+        #import pdb;pdb.set_trace()
+        inputPickle = pickle.dumps((indices,settings,self.nmlSet,dfPart,dfPart4D,dfPartFS,profilePart))
+        md5 = hashlib.md5(inputPickle).hexdigest()
+        fname = "%d_%04d_%s"%(time.time(), pp_i, md5)
+        jobs.append(fname)
+        cluster.put(remotePicklePath+"/"+fname+".job.tmp",inputPickle)
+        cluster.mv(remotePicklePath+"/"+fname+".job.tmp",remotePicklePath+"/"+fname+".job")
+        pp_i += 1
+        if self.set["pyVerbose"] > 0: print("wrote job: ", pp_i)
 
 
       del cluster
@@ -1792,7 +2057,7 @@ class pyPamtra(object):
             print(("\rWaiting too long for job %d: %s"%(mm,fname)))
             break
           try:
-            with open(fname, 'r') as f:
+            with open(fname, 'rb') as f:
               resultPickle = pickle.load(f)
             os.remove(fname)
             if resultPickle[0] is not None:
@@ -1829,6 +2094,165 @@ class pyPamtra(object):
 
     return
 
+  def _columnCost(self):
+    '''
+    Estimate the relative computational cost of every column from the number of layers,
+    the number of layers with hydrometeors above hydro_threshold, the number of bins and
+    the scattering model of each hydrometeor and the radar mode.
+
+    Returns
+    -------
+    cost : ndarray
+      relative cost with shape (ngridx, ngridy)
+    '''
+    # relative costs of the scattering models per bin by prefix of scat_name (see
+    # scatProperties.f90), the first match counts, unknown models count 1
+    scatWeights = [("disabled",0.), ("tmatrix",20.), ("mie-sphere",2.), ("ss-rayleigh-gans",0.5),
+      ("ssrga",0.5), ("ssrg-rt3",0.5), ("rayleigh-gans",0.3), ("rayleigh",0.2), ("liudb",1.), ("hongdb",1.)]
+
+    def scatWeight(name):
+      name = name.strip()
+      for prefix, weight in scatWeights:
+        if name.startswith(prefix): return weight
+      return 1.
+
+    nlyrs = self.p["nlyrs"].astype(float)
+    cost = nlyrs.copy()
+    if self.df.nhydro == 0:
+      return cost
+
+    if "hydro_q" in self.p:
+      active = self.p["hydro_q"] > self.nmlSet["hydro_threshold"]
+    else:
+      active = self.p["hydro_n"] > 0
+    #layers above nlyrs are not computed
+    active = active & (np.arange(self.p["max_nlyrs"])[None,None,:,None] < self.p["nlyrs"][:,:,None,None])
+
+    if "nbin" in self.df.data4D:
+      nbin = self.df.data4D["nbin"].astype(float)
+    elif self.nmlSet["hydro_fullspec"]:
+      nbin = float(self.df.dataFullSpec["d_ds"].shape[-1])
+    else:
+      nbin = self.df.data["nbin"].astype(float)
+    weights = np.array([scatWeight(name) for name in self.df.data["scat_name"]])
+
+    hydroCost = np.sum(active * (nbin+1) * weights, axis=(2,3))
+    if self.nmlSet["radar_mode"] == "spectrum":
+      hydroCost = hydroCost * (1. + self.nmlSet["radar_nfft"]/256.)
+    cost += hydroCost
+    return cost
+
+  def _jobBytes(self,indices,profilePart,dfPart4D,dfPartFS):
+    '''
+    Estimate the bytes a job of runParallelPamtra keeps in the queues of the pool: the input
+    slices plus the returned parts of the result arrays.
+    '''
+    nBytes = 0
+    for part in [profilePart,dfPart4D,dfPartFS]:
+      for key in list(part.keys()):
+        if isinstance(part[key], np.ndarray): nBytes += part[key].nbytes
+    for key in self._slicedResultKeys():
+      nBytes += self.r[key][resultSlice(key,*indices)].nbytes
+    return nBytes
+
+  def _autoMaxInflight(self,jobBytes,nWorkers):
+    '''
+    Number of jobs which can be in flight using half of the available memory, at least 2 per worker.
+    Returns None (unbounded) if the available memory cannot be determined.
+    '''
+    try:
+      available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+      return None
+    return max(2*nWorkers, int(0.5*available/max(jobBytes,1)))
+
+  def _jobIndices(self,pp_deltaF,pp_deltaX,pp_deltaY,pp_schedule="fixed",pp_workers=1,pp_costs=None):
+    '''
+    Split the domain into the jobs of a parallel run.
+
+    Parameters
+    ----------
+    pp_deltaF, pp_deltaX, pp_deltaY : int
+        Size of each job in frequency, X and Y domain. For pp_schedule="cost" only pp_deltaF is used.
+    pp_schedule : {'fixed', 'cost'}, optional
+        'fixed' cuts the domain in boxes of pp_deltaX x pp_deltaY. 'cost' bisects the domain
+        into boxes of similar cost (about 4 per worker for each frequency chunk) which are
+        returned largest first, so that the cheap jobs fill the idle workers at the end.
+    pp_workers : int, optional
+        number of workers, used for pp_schedule='cost'
+    pp_costs : array_like, optional
+        cost of each column (ngridx, ngridy) for pp_schedule='cost'. If not given, the costs
+        measured in the last parallel run (pp_columnCost) are used if available, otherwise
+        they are estimated by _columnCost.
+
+    The measured runtime of each job is distributed to its columns by _joinResults according
+    to the costs (evenly for pp_schedule='fixed') and stored in pp_columnCost (seconds per
+    column) for later runs.
+
+    Returns
+    -------
+    jobs : list
+      list of [pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY]
+    '''
+    if pp_schedule not in ["fixed","cost"]:
+      raise ValueError("pp_schedule must be 'fixed' or 'cost', got %s"%pp_schedule)
+
+    if pp_schedule == "fixed":
+      #nothing to estimate, the measured runtime of a job is shared evenly by its columns
+      cost = np.ones(self._shape2D)
+    else:
+      if pp_costs is None:
+        if getattr(self, "pp_columnCost", None) is not None and self.pp_columnCost.shape == self._shape2D and np.sum(self.pp_columnCost) > 0:
+          pp_costs = self.pp_columnCost
+        else:
+          pp_costs = self._columnCost()
+      cost = np.asarray(pp_costs,dtype=float)
+      assert cost.shape == self._shape2D
+
+    #the measured costs are collected by _joinResults
+    self._ppCost = cost
+    self.pp_columnCost = np.zeros(self._shape2D)
+
+    freqChunks = list()
+    for pp_startF in np.arange(0,self.set["nfreqs"],pp_deltaF):
+      freqChunks.append((pp_startF, min(pp_startF + pp_deltaF, self.set["nfreqs"])))
+
+    if pp_schedule == "fixed":
+      jobs = list()
+      for pp_startF, pp_endF in freqChunks:
+        for pp_startX in np.arange(0,self.p["ngridx"],pp_deltaX):
+          pp_endX = min(pp_startX + pp_deltaX, self.p["ngridx"])
+          for pp_startY in np.arange(0,self.p["ngridy"],pp_deltaY):
+            pp_endY = min(pp_startY + pp_deltaY, self.p["ngridy"])
+            jobs.append([pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY])
+      return jobs
+
+    #bisect along the longer side at the cost median until the boxes are small enough
+    target = np.sum(cost) / (4. * max(pp_workers,1))
+    boxes = list()
+    stack = [(0,self.p["ngridx"],0,self.p["ngridy"])]
+    while len(stack) > 0:
+      x0,x1,y0,y1 = stack.pop()
+      boxCost = np.sum(cost[x0:x1,y0:y1])
+      if (boxCost <= target) or ((x1-x0)*(y1-y0) == 1):
+        boxes.append((boxCost,x0,x1,y0,y1))
+        continue
+      axis = 1 if (x1-x0) >= (y1-y0) else 0
+      cum = np.cumsum(np.sum(cost[x0:x1,y0:y1],axis=axis))
+      n = len(cum)
+      split = int(np.clip(np.searchsorted(cum,cum[-1]/2.)+1,1,n-1))
+      if axis == 1:
+        stack += [(x0,x0+split,y0,y1),(x0+split,x1,y0,y1)]
+      else:
+        stack += [(x0,x1,y0,y0+split),(x0,x1,y0+split,y1)]
+
+    jobs = list()
+    for pp_startF, pp_endF in freqChunks:
+      for boxCost,x0,x1,y0,y1 in boxes:
+        jobs.append((boxCost*(pp_endF-pp_startF),[pp_startF,pp_endF,x0,x1,y0,y1]))
+    jobs.sort(key=lambda job: -job[0])
+    return [job[1] for job in jobs]
+
   def _addObservationLevels(self):
     """Adds observation levels to the height grid of each profile.
     Observation heights are 3-dimensional arrays (nx,ny,nout) and can be provided by either the
@@ -1902,7 +2326,121 @@ class pyPamtra(object):
 
     return profilePart, dfData, dfData4D, dfDataFS, settings
 
-  def _prepareResults(self):
+  def _uniqueColumns(self):
+    '''
+    Find the bit-identical columns. All arrays of the profile, the 4D descriptor file
+    and the full spectrum data with the grid dimensions are compared.
+
+    Returns
+    -------
+    index : ndarray
+      flat index of the first occurrence of every unique column, in grid order
+    inverse : ndarray
+      for every column (flat index) the position of its unique column in index
+    '''
+    nColumns = self._shape2D[0]*self._shape2D[1]
+    rows = list()
+    for data in [self.p, self.df.data4D, self.df.dataFullSpec]:
+      for key in sorted(data.keys()):
+        value = data[key]
+        if isinstance(value, np.ndarray) and (not value.dtype.hasobject) and (value.shape[:2] == self._shape2D):
+          rows.append(np.ascontiguousarray(value).reshape(nColumns,-1).view(np.uint8))
+    rows = np.ascontiguousarray(np.concatenate(rows,axis=1))
+    columnKeys = rows.view(np.dtype((np.void,rows.shape[1]))).ravel()
+    _, index, inverse = np.unique(columnKeys, return_index=True, return_inverse=True)
+    #keep the grid order of the columns
+    order = np.argsort(index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return index[order], rank[inverse.ravel()]
+
+  def _reduceColumns(self,index):
+    '''
+    Replace the grid by the columns index (flat indices) on a grid of shape (len(index),1).
+
+    Returns
+    -------
+    state : tuple
+      the original profile, descriptor data and shapes, see _restoreColumns
+    '''
+    shape2D = self._shape2D
+    shapes = dict((key, value) for key, value in self.__dict__.items() if key.startswith("_shape"))
+    state = (self.p, self.df.data4D, self.df.dataFullSpec, shapes)
+
+    def reduce(data):
+      reduced = dict()
+      for key, value in data.items():
+        if isinstance(value, np.ndarray) and (value.shape[:2] == shape2D):
+          value = value.reshape((-1,)+value.shape[2:])[index].reshape((len(index),1)+value.shape[2:])
+        reduced[key] = value
+      return reduced
+
+    self.p = reduce(self.p)
+    self.df.data4D = reduce(self.df.data4D)
+    self.df.dataFullSpec = reduce(self.df.dataFullSpec)
+    self.p["ngridx"] = len(index)
+    self.p["ngridy"] = 1
+    for key, shape in shapes.items():
+      setattr(self, key, (len(index),1)+tuple(shape[2:]))
+    return state
+
+  def _restoreColumns(self,state):
+    '''
+    Undo _reduceColumns.
+    '''
+    self.p, self.df.data4D, self.df.dataFullSpec, shapes = state
+    for key, shape in shapes.items():
+      setattr(self, key, shape)
+    return
+
+  def _expandColumns(self,inverse):
+    '''
+    Scatter the results of the unique columns computed on the grid of _reduceColumns to all
+    columns of the grid. Also the results without frequency dimension (radar_hgt, psd_*).
+    '''
+    nUnique = np.max(inverse) + 1
+    for key in self._slicedResultKeys():
+      value = self.r[key]
+      if (key == "radar_vel") or (value.ndim < 2) or (value.shape[:2] != (nUnique,1)): continue
+      self.r[key] = value.reshape((nUnique,)+value.shape[2:])[inverse].reshape(self._shape2D+value.shape[2:])
+    if getattr(self, "pp_columnCost", None) is not None and self.pp_columnCost.shape == (nUnique,1):
+      self.pp_columnCost = self.pp_columnCost.reshape(nUnique)[inverse].reshape(self._shape2D)
+    return
+
+  def _prepareResults(self,allocate=True,shared=False):
+    '''
+    Prepare the result dictionary r of a parallel run.
+
+    Parameters
+    ----------
+    allocate : bool, optional
+      If False, the result arrays are read-only placeholders of the correct shape
+      which do not use memory (for results which are written to a sink only). (default True)
+    shared : bool, optional
+      Allocate the result arrays in shared memory, so that parallel workers can write their
+      part in place. The SharedMemory objects are kept in _resultHandles. (default False)
+
+    Returns
+    -------
+    resultsShared : dict or None
+      description of the shared result arrays for the workers if shared is True
+    '''
+
+    self._releaseResults()
+    computed = self._slicedResultKeys()
+    resultDtype = np.dtype(self.set.get("resultDtype","float64"))
+    resultsShared = dict() if shared else None
+
+    def full(key,shape,dtype=resultDtype):
+      if key not in computed: #save memory
+        return np.array([missingNumber])
+      if shared:
+        arr, resultsShared[key] = sharedArray(shape,dtype,missingNumber,self._resultHandles)
+        return arr
+      if allocate:
+        return np.full(shape,missingNumber,dtype=dtype)
+      else:
+        return np.broadcast_to(np.full((),missingNumber,dtype=dtype),shape)
 
     try: maxNBin = np.max(self.df.data["nbin"])
     except:
@@ -1914,49 +2452,83 @@ class pyPamtra(object):
 
 
     self.r = dict()
-    self.r["Ze"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],))*missingNumber
-    self.r["Att_hydro"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["att_npol"],))*missingNumber
-    self.r["Att_atmo"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],))*missingNumber
-    self.r["radar_hgt"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],))*missingNumber
-    if self.nmlSet["radar_mode"]=="spectrum":
-      self.r["radar_spectra"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],radar_spectrum_length,))*missingNumber
-    else:
-      self.r["radar_spectra"] = np.array([missingNumber])
-    self.r["radar_snr"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],))*missingNumber
-    self.r["radar_moments"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],4,))*missingNumber
-    self.r["radar_slopes"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],2,))*missingNumber
-    self.r["radar_edges"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],2,))*missingNumber
-    self.r["radar_quality"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],),dtype=int)*missingNumber
-    self.r["radar_vel"] = np.ones((self.set["nfreqs"],radar_spectrum_length))*missingNumber
-    self.r["tb"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["noutlevels"],self._nangles*2,self.set["nfreqs"],self._nstokes))*missingNumber
-    self.r["emissivity"] = np.ones((self.p["ngridx"],self.p["ngridy"],self._nstokes,self.set["nfreqs"],self._nangles))*missingNumber
-    if self.nmlSet["save_psd"]:
-      self.r["psd_area"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))*missingNumber
-      self.r["psd_n"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))*missingNumber
-      self.r["psd_d"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))*missingNumber
-      self.r["psd_mass"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))*missingNumber
-      self.r["psd_bscat"] = np.ones((self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))*missingNumber
-    else: #save memory
-      self.r["psd_area"] = np.array([missingNumber])
-      self.r["psd_n"] = np.array([missingNumber])
-      self.r["psd_d"] = np.array([missingNumber])
-      self.r["psd_mass"] =np.array([missingNumber])
-      self.r["psd_bscat"] =np.array([missingNumber])
+    self.r["Ze"] = full("Ze",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],))
+    self.r["Att_hydro"] = full("Att_hydro",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["att_npol"],))
+    self.r["Att_atmo"] = full("Att_atmo",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],))
+    self.r["radar_hgt"] = full("radar_hgt",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],))
+    self.r["radar_spectra"] = full("radar_spectra",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],radar_spectrum_length,))
+    self.r["radar_snr"] = full("radar_snr",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],))
+    self.r["radar_moments"] = full("radar_moments",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],4,))
+    self.r["radar_slopes"] = full("radar_slopes",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],2,))
+    self.r["radar_edges"] = full("radar_edges",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],2,))
+    self.r["radar_quality"] = full("radar_quality",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.set["nfreqs"],self.set["radar_npol"],self.nmlSet["radar_npeaks"],),dtype=int)
+    self.r["radar_vel"] = full("radar_vel",(self.set["nfreqs"],radar_spectrum_length))
+    self.r["tb"] = full("tb",(self.p["ngridx"],self.p["ngridy"],self.p["noutlevels"],self._nangles*2,self.set["nfreqs"],self._nstokes))
+    self.r["emissivity"] = full("emissivity",(self.p["ngridx"],self.p["ngridy"],self._nstokes,self.set["nfreqs"],self._nangles))
+    self.r["psd_area"] = full("psd_area",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))
+    self.r["psd_n"] = full("psd_n",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))
+    self.r["psd_d"] = full("psd_d",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))
+    self.r["psd_mass"] = full("psd_mass",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))
+    self.r["psd_bscat"] = full("psd_bscat",(self.p["ngridx"],self.p["ngridy"],self.p["max_nlyrs"],self.df.nhydro,maxNBin))
     if self.nmlSet["save_ssp"]:
-      self.r["kextatmo"] = np.ones((self.p["max_nlyrs"]))*missingNumber
-      self.r["scatter_matrix"] = np.ones((self.p["max_nlyrs"],self._nstokes,self._nangles,self._nstokes,self._nangles,4))*missingNumber
-      self.r["extinct_matrix"] = np.ones((self.p["max_nlyrs"],self._nstokes,self._nstokes,self._nangles,2))*missingNumber
-      self.r["emission_vector"] = np.ones((self.p["max_nlyrs"],self._nstokes,self._nangles,2))*missingNumber
+      #taken from the last job, not in _slicedResultKeys
+      self.r["kextatmo"] = np.full((self.p["max_nlyrs"]),missingNumber)
+      self.r["scatter_matrix"] = np.full((self.p["max_nlyrs"],self._nstokes,self._nangles,self._nstokes,self._nangles,4),missingNumber)
+      self.r["extinct_matrix"] = np.full((self.p["max_nlyrs"],self._nstokes,self._nstokes,self._nangles,2),missingNumber)
+      self.r["emission_vector"] = np.full((self.p["max_nlyrs"],self._nstokes,self._nangles,2),missingNumber)
     else: #save memory
       self.r["kextatmo"] = np.array([missingNumber])
       self.r["scatter_matrix"] = np.array([missingNumber])
       self.r["extinct_matrix"] = np.array([missingNumber])
       self.r["emission_vector"] = np.array([missingNumber])
 
+    self.r["scat_cache_hits"] = 0
+    self.r["scat_cache_misses"] = 0
+    self.r["timing"] = dict()
+
     self.r["radar_pol"] = self.set["radar_pol"]
     self.r["att_pol"] = self.set["att_pol"]
+    return resultsShared
+
+  def _releaseResults(self):
+    '''
+    Drop the results and close the shared memory of the results of earlier parallel runs
+    (see _prepareResults). Blocks which are still used by arrays referenced elsewhere are
+    kept open until the next call.
+    '''
+    self.r = dict()
+    closeUnusedSharedMemory(self._resultHandles)
     return
 
+  def _slicedResultKeys(self):
+    '''
+    keys of the result dictionary which are assembled from the parts computed by the jobs of a parallel run
+    '''
+    keys = list()
+    if self.nmlSet["active"]:
+      keys += ["Ze","Att_hydro","Att_atmo","radar_hgt"]
+      if self.nmlSet["radar_mode"] in ["spectrum","moments"]:
+        keys += [key for key in ["radar_spectra","radar_snr","radar_moments","radar_slopes","radar_edges","radar_quality"] if self._outputSelected(key)]
+        keys.append("radar_vel")
+    if self.nmlSet["passive"]:
+      keys.append("tb")
+      if self._outputSelected("emissivity"): keys.append("emissivity")
+    if self.nmlSet["save_psd"]:
+      keys += ["psd_d","psd_n","psd_mass","psd_area","psd_bscat"]
+    return keys
+
+  def _outputSelected(self,product,nmlSet=None):
+    '''
+    True if the optional output product (radar_spectra, radar_snr, radar_moments, radar_slopes,
+    radar_edges, radar_quality or emissivity) is selected by nmlSet["output_products"], same as
+    output_selected in settings.f90. radar_spectra is part of "all" only for radar_mode "spectrum".
+    '''
+    if nmlSet is None: nmlSet = self.nmlSet
+    products = nmlSet.get("output_products","all")
+    if products == "all":
+      return (product != "radar_spectra") or (nmlSet["radar_mode"] == "spectrum")
+    return product in products.split(",")
+
   def _joinResults(self,resultList):
     '''
     Collect the data of parallel pyPamtra
@@ -1969,28 +2541,152 @@ class pyPamtra(object):
 
     self.r["pamtraVersion"] = results["pamtraVersion"]
     self.r["pamtraHash"] = results["pamtraVersion"]
-    self.r["Ze"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF] = results["Ze"]
-    self.r["Att_hydro"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF] = results["Att_hydro"]
-    self.r["Att_atmo"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF] = results["Att_atmo"]
-    self.r["radar_hgt"][pp_startX:pp_endX,pp_startY:pp_endY,:]= results["radar_hgt"]
-    self.r["tb"][pp_startX:pp_endX,pp_startY:pp_endY,:,:,pp_startF:pp_endF,:]= results["tb"]
-    self.r["emissivity"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF,:]= results["emissivity"]
-    if self.nmlSet["radar_mode"]=="spectrum":
-      self.r["radar_spectra"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF]= results["radar_spectra"]
-    self.r["radar_snr"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF]= results["radar_snr"]
-    self.r["radar_moments"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF]= results["radar_moments"]
-    self.r["radar_slopes"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF]= results["radar_slopes"]
-    self.r["radar_edges"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF]= results["radar_edges"]
-    self.r["radar_quality"][pp_startX:pp_endX,pp_startY:pp_endY,:,pp_startF:pp_endF]= results["radar_quality"]
-    self.r["radar_vel"][pp_startF:pp_endF]= results["radar_vel"]
+    inPlace = results.get("inPlace",[])
+    for key in self._slicedResultKeys():
+      #results which are not kept (see _prepareResults) are read-only
+      if (key in inPlace) or (not self.r[key].flags.writeable): continue
+      self.r[key][resultSlice(key,pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY)] = results[key]
     self.r["angles_deg"]= results["angles_deg"]
-    if self.nmlSet["save_psd"]:
-      for key in ["psd_d","psd_n","psd_mass","psd_area","psd_bscat"]:
-        self.r[key][pp_startX:pp_endX,pp_startY:pp_endY] = results[key]
+    if getattr(self, "_ncSink", None) is not None:
+      self._writeResultSink([pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY],results)
     if self.nmlSet["save_ssp"]:
       for key in ["kextatmo","scatter_matrix","extinct_matrix","emission_vector"]:
         self.r[key] = results[key]
+    self.r["scat_cache_hits"] += results["scat_cache_hits"]
+    self.r["scat_cache_misses"] += results["scat_cache_misses"]
+    if "timing" in results:
+      joinTiming(self.r["timing"],results["timing"],pp_startF,pp_endF,self.set["nfreqs"])
+
+    #distribute the measured runtime of the job to the columns according to the cost estimate
+    if (getattr(self, "_ppCost", None) is not None) and ("runtime" in results):
+      estimate = self._ppCost[pp_startX:pp_endX,pp_startY:pp_endY]
+      if np.sum(estimate) > 0:
+        share = estimate / np.sum(estimate)
+      else:
+        share = np.ones(estimate.shape) / estimate.size
+      self.pp_columnCost[pp_startX:pp_endX,pp_startY:pp_endY] += results["runtime"] * share
+
+    return
 
+  def _resultSinkDims(self,key):
+    '''
+    dimension names of result key in the result sink
+    '''
+    dims = ["%s_%d"%(key,ii) for ii in range(self.r[key].ndim)]
+    names = {"x":"grid_x","y":"grid_y","f":"frequency"}
+    for ii, sl in enumerate(resultSlice(key,"f","f","x","x","y","y")):
+      if sl.start is not None: dims[ii] = names[sl.start]
+    return dims
+
+  def _openResultSink(self,fname,resume=False,ncCompression=False,gridShape=None):
+    '''
+    Open a NetCDF4 file to which _joinResults writes the part of every finished job of a
+    parallel run. It contains the arrays of r listed by _slicedResultKeys with the
+    dimensions grid_x, grid_y and frequency, chunked by column and frequency. The columns
+    and frequencies of a job are marked in job_done after its data has been written.
+
+    Parameters
+    ----------
+    fname : str
+      filename with path
+    resume : bool, optional
+      continue an existing file of the same setup instead of overwriting it (default False)
+    ncCompression : bool, optional
+      use netCDF4 compression (default False)
+    gridShape : tuple of int, optional
+      number of columns in x and y direction of the file, if it is larger than the grid of this
+      object, e.g. for the tiles of importer.readTiles (default ngridx, ngridy)
+    '''
+    import netCDF4 as nc
+
+    if gridShape is None: gridShape = (self.p["ngridx"],self.p["ngridy"])
+    gridSize = {"grid_x":int(gridShape[0]),"grid_y":int(gridShape[1])}
+    keys = self._slicedResultKeys()
+    if resume and os.path.exists(fname):
+      cdfFile = nc.Dataset(fname,"a")
+      for key in keys:
+        shape = tuple(gridSize.get(dim,size) for dim, size in zip(self._resultSinkDims(key),self.r[key].shape))
+        if (key not in cdfFile.variables) or (cdfFile.variables[key].shape != shape):
+          cdfFile.close()
+          raise IOError("%s does not match the setup of this run, cannot resume"%fname)
+      if not np.allclose(cdfFile.variables["frequency"][:],self.set["freqs"]):
+        cdfFile.close()
+        raise IOError("%s was written for other frequencies, cannot resume"%fname)
+      if self.set["pyVerbose"] > 0: print("resuming", fname, "with", np.sum(cdfFile.variables["job_done"][:]), "columns done")
+    else:
+      cdfFile = nc.Dataset(fname,"w",format="NETCDF4")
+      cdfFile.history = "Created with pyPamtra by "+self.nmlSet["creator"]+" (University of Cologne, IGMK) at " + datetime.datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+      cdfFile.properties = str(self.nmlSet)
+
+      cdfFile.createDimension('grid_x',gridSize["grid_x"])
+      cdfFile.createDimension('grid_y',gridSize["grid_y"])
+      cdfFile.createDimension('frequency',int(self.set["nfreqs"]))
+      nc_frequency = cdfFile.createVariable('frequency','f',('frequency',))
+      nc_frequency.units = 'GHz'
+      nc_frequency[:] = self.set["freqs"]
+
+      for key in keys:
+        dims = self._resultSinkDims(key)
+        for dim, size in zip(dims,self.r[key].shape):
+          if dim not in cdfFile.dimensions: cdfFile.createDimension(dim,size)
+        chunks = [1 if dim in ["grid_x","grid_y","frequency"] else size for dim, size in zip(dims,self.r[key].shape)]
+        cdfFile.createVariable(key,self.r[key].dtype,dims,fill_value=np.array(missingNumber).astype(self.r[key].dtype),
+          chunksizes=chunks,zlib=ncCompression)
+
+      nc_done = cdfFile.createVariable('job_done','i1',("frequency","grid_x","grid_y"),fill_value=0)
+      nc_done.description = "1 if the results of this frequency and column have been written completely"
+
+    self._ncSink = cdfFile
+    return
+
+  def _resultSinkDone(self,indices):
+    '''
+    True if the results of the job indices are already in the result sink
+    '''
+    pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY = indices
+    return bool(np.all(self._ncSink.variables["job_done"][pp_startF:pp_endF,pp_startX:pp_endX,pp_startY:pp_endY] == 1))
+
+  def _readResultSink(self,indices):
+    '''
+    copy the results of the job indices from the result sink to r
+    '''
+    for key in self._slicedResultKeys():
+      if not self.r[key].flags.writeable: continue
+      sl = resultSlice(key,*indices)
+      self.r[key][sl] = self._ncSink.variables[key][sl]
+    return
+
+  def _writeResultSink(self,indices,results):
+    '''
+    write the results of the job indices to the result sink and mark them as done
+    '''
+    pp_startF,pp_endF,pp_startX,pp_endX,pp_startY,pp_endY = indices
+    for key in self._slicedResultKeys():
+      sl = resultSlice(key,*indices)
+      if key in results:
+        self._ncSink.variables[key][sl] = results[key]
+      else: #written in place to shared memory
+        self._ncSink.variables[key][sl] = self.r[key][sl]
+    self._ncSink.variables["job_done"][pp_startF:pp_endF,pp_startX:pp_endX,pp_startY:pp_endY] = 1
+    self._ncSink.sync()
+    return
+
+  def _closeResultSink(self):
+    '''
+    write the remaining meta data and close the result sink
+    '''
+    cdfFile = self._ncSink
+    if ("angles_deg" in self.r) and ("angles_deg" not in cdfFile.variables):
+      angles = np.atleast_1d(np.array(self.r["angles_deg"],dtype="f"))
+      cdfFile.createDimension('angles',len(angles))
+      nc_angle = cdfFile.createVariable('angles_deg','f',('angles',))
+      nc_angle.units = 'deg'
+      nc_angle[:] = angles
+    if "pamtraVersion" in self.r:
+      cdfFile.pamtraVersion = self.r["pamtraVersion"]
+      cdfFile.pamtraHash = self.r["pamtraHash"]
+    cdfFile.close()
+    self._ncSink = None
     return
 
   def writeResultsToNumpy(self,fname,seperateFiles=False):
@@ -2010,7 +2706,7 @@ class pyPamtra(object):
       '''
       write the complete state of the session (profile,results,settings to a file
       '''
-      f = open(fname, "w")
+      f = open(fname, "wb")
       pickle.dump([self.r,self.p,self.nmlSet,self.set,self.df.data,self.df.data4D,self.df.dataFullSpec], f)
       f.close()
     else:
@@ -2060,7 +2756,7 @@ class pyPamtra(object):
         raise IOError ("Could not read data from dir")
     else:
       try:
-        f = open(fname, "r")
+        f = open(fname, "rb")
         [self.r,self.p,self.nmlSet,self.set,self.df.data,self.df.data4D,self.df.dataFullSpec] = pickle.load(f)
         f.close()
       except:
@@ -2334,56 +3030,61 @@ class pyPamtra(object):
 
 
       if ((self.r["nmlSettings"]["radar_mode"] == "spectrum") or (self.r["nmlSettings"]["radar_mode"] == "moments")):
-        nc_snr=cdfFile.createVariable('Radar_SNR', 'f',dim6d_rad,**fillVDict)
-        nc_snr.units="dB"
-        nc_snr[:] = np.array(self.r["radar_snr"],dtype='f')
-        if not pyNc: nc_snr._fillValue =missingNumber
-
-        nc_fvel=cdfFile.createVariable('Radar_MeanDopplerVel', 'f',dim6d_rad,**fillVDict)
-        nc_fvel.units="m/s"
-        nc_fvel[:] = np.array(self.r["radar_moments"][...,0],dtype='f')
-        if not pyNc: nc_fvel._fillValue =missingNumber
-
-        nc_specw=cdfFile.createVariable('Radar_SpectrumWidth', 'f',dim6d_rad,**fillVDict)
-        nc_specw.units="m/s"
-        nc_specw[:] = np.array(self.r["radar_moments"][...,1],dtype='f')
-        if not pyNc: nc_specw._fillValue =missingNumber
-
-        nc_skew=cdfFile.createVariable('Radar_Skewness', 'f',dim6d_rad,**fillVDict)
-        nc_skew.units="-"
-        nc_skew[:] = np.array(self.r["radar_moments"][...,2],dtype='f')
-        if not pyNc: nc_skew._fillValue =missingNumber
-
-        nc_kurt=cdfFile.createVariable('Radar_Kurtosis', 'f',dim6d_rad,**fillVDict)
-        nc_kurt.units="-"
-        nc_kurt[:] = np.array(self.r["radar_moments"][...,3],dtype='f')
-        if not pyNc: nc_kurt._fillValue =missingNumber
-
-        nc_lslop=cdfFile.createVariable('Radar_LeftSlope', 'f',dim6d_rad,**fillVDict)
-        nc_lslop.units="dB/(m/s)"
-        nc_lslop[:] = np.array(self.r["radar_slopes"][...,0],dtype='f')
-        if not pyNc: nc_lslop._fillValue =missingNumber
-
-        nc_rslop=cdfFile.createVariable('Radar_RightSlope', 'f',dim6d_rad,**fillVDict)
-        nc_rslop.units="dB/(m/s)"
-        nc_rslop[:] = np.array(self.r["radar_slopes"][...,1],dtype='f')
-        if not pyNc: nc_rslop._fillValue =missingNumber
-
-        nc_lslop=cdfFile.createVariable('Radar_LeftEdge', 'f',dim6d_rad,**fillVDict)
-        nc_lslop.units="m/s"
-        nc_lslop[:] = np.array(self.r["radar_edges"][...,0],dtype='f')
-        if not pyNc: nc_lslop._fillValue =missingNumber
-
-        nc_rslop=cdfFile.createVariable('Radar_RightEdge', 'f',dim6d_rad,**fillVDict)
-        nc_rslop.units="m/s"
-        nc_rslop[:] = np.array(self.r["radar_edges"][...,1],dtype='f')
-        if not pyNc: nc_rslop._fillValue =missingNumber
-
-        nc_qual=cdfFile.createVariable('Radar_Quality', 'i',dim6d_rad,**fillVDict)
-        nc_qual.units="bytes"
-        nc_qual.description="1st byte: aliasing; 2nd byte: 2nd peak present; 7th: no peak found"
-        nc_qual[:] = np.array(self.r["radar_quality"],dtype='i')
-        if not pyNc: nc_qual._fillValue =missingNumber
+        if self._outputSelected("radar_snr",self.r["nmlSettings"]):
+          nc_snr=cdfFile.createVariable('Radar_SNR', 'f',dim6d_rad,**fillVDict)
+          nc_snr.units="dB"
+          nc_snr[:] = np.array(self.r["radar_snr"],dtype='f')
+          if not pyNc: nc_snr._fillValue =missingNumber
+
+        if self._outputSelected("radar_moments",self.r["nmlSettings"]):
+          nc_fvel=cdfFile.createVariable('Radar_MeanDopplerVel', 'f',dim6d_rad,**fillVDict)
+          nc_fvel.units="m/s"
+          nc_fvel[:] = np.array(self.r["radar_moments"][...,0],dtype='f')
+          if not pyNc: nc_fvel._fillValue =missingNumber
+
+          nc_specw=cdfFile.createVariable('Radar_SpectrumWidth', 'f',dim6d_rad,**fillVDict)
+          nc_specw.units="m/s"
+          nc_specw[:] = np.array(self.r["radar_moments"][...,1],dtype='f')
+          if not pyNc: nc_specw._fillValue =missingNumber
+
+          nc_skew=cdfFile.createVariable('Radar_Skewness', 'f',dim6d_rad,**fillVDict)
+          nc_skew.units="-"
+          nc_skew[:] = np.array(self.r["radar_moments"][...,2],dtype='f')
+          if not pyNc: nc_skew._fillValue =missingNumber
+
+          nc_kurt=cdfFile.createVariable('Radar_Kurtosis', 'f',dim6d_rad,**fillVDict)
+          nc_kurt.units="-"
+          nc_kurt[:] = np.array(self.r["radar_moments"][...,3],dtype='f')
+          if not pyNc: nc_kurt._fillValue =missingNumber
+
+        if self._outputSelected("radar_slopes",self.r["nmlSettings"]):
+          nc_lslop=cdfFile.createVariable('Radar_LeftSlope', 'f',dim6d_rad,**fillVDict)
+          nc_lslop.units="dB/(m/s)"
+          nc_lslop[:] = np.array(self.r["radar_slopes"][...,0],dtype='f')
+          if not pyNc: nc_lslop._fillValue =missingNumber
+
+          nc_rslop=cdfFile.createVariable('Radar_RightSlope', 'f',dim6d_rad,**fillVDict)
+          nc_rslop.units="dB/(m/s)"
+          nc_rslop[:] = np.array(self.r["radar_slopes"][...,1],dtype='f')
+          if not pyNc: nc_rslop._fillValue =missingNumber
+
+        if self._outputSelected("radar_edges",self.r["nmlSettings"]):
+          nc_lslop=cdfFile.createVariable('Radar_LeftEdge', 'f',dim6d_rad,**fillVDict)
+          nc_lslop.units="m/s"
+          nc_lslop[:] = np.array(self.r["radar_edges"][...,0],dtype='f')
+          if not pyNc: nc_lslop._fillValue =missingNumber
+
+          nc_rslop=cdfFile.createVariable('Radar_RightEdge', 'f',dim6d_rad,**fillVDict)
+          nc_rslop.units="m/s"
+          nc_rslop[:] = np.array(self.r["radar_edges"][...,1],dtype='f')
+          if not pyNc: nc_rslop._fillValue =missingNumber
+
+        if self._outputSelected("radar_quality",self.r["nmlSettings"]):
+          nc_qual=cdfFile.createVariable('Radar_Quality', 'i',dim6d_rad,**fillVDict)
+          nc_qual.units="bytes"
+          nc_qual.description="1st byte: aliasing; 2nd byte: 2nd peak present; 7th: no peak found"
+          nc_qual[:] = np.array(self.r["radar_quality"],dtype='i')
+          if not pyNc: nc_qual._fillValue =missingNumber
 
         #nc_qual=cdfFile.createVariable('Radar_Polarisation', 'i',dim6d_rad,**fillVDict)
         #nc_qual.units="bytes"
@@ -2399,10 +3100,11 @@ class pyPamtra(object):
           nc_vel[:] = np.array(self.r["radar_vel"],dtype='f')
           if not pyNc: nc_vel._fillValue =missingNumber
 
-          nc_spec=cdfFile.createVariable('Radar_Spectrum', 'f',dim6d_rad_spec,**fillVDict)
-          nc_spec.units="dBz"
-          nc_spec[:] = np.array(self.r["radar_spectra"],dtype='f')
-          if not pyNc: nc_spec._fillValue =missingNumber
+          if self._outputSelected("radar_spectra",self.r["nmlSettings"]):
+            nc_spec=cdfFile.createVariable('Radar_Spectrum', 'f',dim6d_rad_spec,**fillVDict)
+            nc_spec.units="dBz"
+            nc_spec[:] = np.array(self.r["radar_spectra"],dtype='f')
+            if not pyNc: nc_spec._fillValue =missingNumber
 
     if (self.r["nmlSettings"]["passive"]):
       nc_tb = cdfFile.createVariable('tb', 'f',dim6d_pas,**fillVDict)
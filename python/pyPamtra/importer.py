@@ -18,6 +18,7 @@ import string
 import glob
 import warnings
 import pdb
+import threading
 
 try:
   import numexpr as ne
@@ -35,6 +36,312 @@ from copy import deepcopy
 
 missingNumber =-9999.
 
+#netCDF and HDF5 are not thread safe. readTiles reads the next tile with prefetch=True
+#while holding this lock, tileResultWriter takes it as well.
+ncLock = threading.Lock()
+
+def _readCompressedFile(fname,fnameInTar=""):
+  """
+  decompress a gzip file or the gzip compressed members of a tar file in memory
+
+  Parameters
+  ----------
+  fname : {str}
+    gzip file or tar file
+  fnameInTar : {str}, optional
+    members of the tar file to be used, wildcards allowed like in tar --wildcards. All files if empty. (the default is "")
+
+  Returns
+  -------
+  data : bytes
+    uncompressed content, the members of a tar file are concatenated
+
+  Raises
+  ------
+  IOError
+    if no member of the tar file matches fnameInTar
+  """
+  import tarfile
+  import gzip
+  import fnmatch
+
+  if fname.split(".")[-1]!="tar":
+    with gzip.open(fname,"rb") as gzFile:
+      return gzFile.read()
+
+  parts = list()
+  with tarfile.open(fname,"r") as tarFile:
+    for member in tarFile:
+      if member.isfile() and ((fnameInTar == "") or fnmatch.fnmatch(member.name,fnameInTar)):
+        with gzip.GzipFile(fileobj=tarFile.extractfile(member),mode="rb") as gzFile:
+          parts.append(gzFile.read())
+  if len(parts) == 0: raise IOError("fnameInTar not found in "+fname)
+  if len(parts) == 1: return parts[0]
+  return b"".join(parts)
+
+def _decompressFiles(fnames,fnameInTar="",nThreads=1):
+  """
+  generator returning (fname, future) for all fnames in their order. For compressed files
+  (i.e. not .nc) future.result() is their uncompressed content (see _readCompressedFile), for
+  .nc files None. The following files are decompressed in the background by nThreads threads
+  (zlib releases the GIL), thus up to nThreads files are kept in memory in addition to the
+  current one. Exceptions are raised by future.result().
+  """
+  from concurrent.futures import ThreadPoolExecutor
+  import itertools
+
+  def decompress(fname):
+    if fname.split(".")[-1]=="nc": return None
+    return _readCompressedFile(fname,fnameInTar)
+
+  nThreads = max(nThreads,1)
+  fnames = iter(fnames)
+  pool = ThreadPoolExecutor(max_workers=nThreads)
+  pending = list()
+  try:
+    for fname in itertools.islice(fnames,nThreads):
+      pending.append((fname, pool.submit(decompress,fname)))
+    while len(pending) > 0:
+      fname, future = pending.pop(0)
+      for nextFname in itertools.islice(fnames,1):
+        pending.append((nextFname, pool.submit(decompress,nextFname)))
+      yield fname, future
+  finally:
+    for nextFname, future in pending: future.cancel()
+    pool.shutdown(wait=False)
+
+def _openNcFile(fname,memory=None):
+  """
+  open netcdf file fname for reading, from memory (uncompressed content, see _decompressFiles) if given
+  """
+  import netCDF4
+  if memory is None:
+    return netCDF4.Dataset(fname,"r")
+  return netCDF4.Dataset(fname,"r",memory=memory)
+
+def _readCosmoFiles(readFile,files,args,fnameInTar="",concatenateAxis=1,nThreads=1,nProcesses=1,verbosity=0,debug=False):
+  """
+  read all files with readFile and join the results along concatenateAxis. The arrays are
+  allocated once from the shapes of the first file which was read and every file is written to
+  its own slot, so all files have to yield arrays of the same shape. Files which cannot be read
+  or have other shapes are skipped.
+
+  Parameters
+  ----------
+  readFile : {function}
+    readFile(ncFiles,*args) returns a dict of arrays for a list of opened netCDF4 datasets.
+    Has to be defined on module level for nProcesses > 1.
+  files : {list of tuples of str}
+    file names (e.g. atmospheric and number density file) passed together to readFile
+  args : {tuple}
+    further arguments of readFile
+  fnameInTar : {str}, optional
+    see _readCompressedFile (the default is "")
+  concatenateAxis : {int}, optional
+    concatenation along which axis (the default is 1)
+  nThreads : {int}, optional
+    number of threads decompressing the next files in advance if nProcesses is 1 (the default is 1)
+  nProcesses : {int}, optional
+    number of processes decompressing and reading the files in parallel. Only the arrays
+    returned by readFile are sent back. 1 reads all files in this process. (the default is 1)
+  verbosity : {int}, optional
+    verbosity of the module (the default is 0)
+  debug : {bool}, optional
+    stop and load debugger on exception (the default is False)
+
+  Returns
+  -------
+  data : dict
+    joined arrays (masked arrays)
+
+  Raises
+  ------
+  RuntimeError
+    if no file could be read
+  """
+  from concurrent.futures import ProcessPoolExecutor, as_completed
+
+  def results():
+    #yields index, file names and a function returning the result of readFile
+    if nProcesses > 1:
+      with ProcessPoolExecutor(max_workers=nProcesses) as pool:
+        futures = dict()
+        for ff, fnames in enumerate(files):
+          futures[pool.submit(_readCosmoFileJob,readFile,fnames,fnameInTar,args)] = ff
+        for future in as_completed(futures):
+          yield futures[future], files[futures[future]], future.result
+    else:
+      decompressed = zip(*[_decompressFiles(column,fnameInTar,nThreads) for column in zip(*files)])
+      for ff, fnamesMemories in enumerate(decompressed):
+        memories = [memory for fname, memory in fnamesMemories]
+        yield ff, files[ff], lambda: _readCosmoFile(readFile,files[ff],[memory.result() for memory in memories],args)
+
+  data = None
+  fileLength = dict() #length of every key along concatenateAxis per file
+  filesOK = list()
+  for ff, fnames, result in results():
+    if verbosity>0: print(*fnames)
+    try:
+      dataSingle = result()
+      if data is None:
+        data = dict()
+        for key in list(dataSingle.keys()):
+          shape = list(np.shape(dataSingle[key]))
+          fileLength[key] = shape[concatenateAxis]
+          shape[concatenateAxis] *= len(files)
+          data[key] = np.ma.masked_all(shape,dtype=np.asarray(dataSingle[key]).dtype)
+      for key in list(data.keys()):
+        expected = list(data[key].shape)
+        expected[concatenateAxis] = fileLength[key]
+        if list(np.shape(dataSingle[key])) != expected:
+          raise ValueError("shape of "+key+" differs from first file: "+str(np.shape(dataSingle[key])))
+      for key in list(data.keys()):
+        slot = [slice(None)] * data[key].ndim
+        slot[concatenateAxis] = slice(ff*fileLength[key],(ff+1)*fileLength[key])
+        data[key][tuple(slot)] = dataSingle[key]
+      filesOK.append(ff)
+      del dataSingle
+
+    #except IOError:
+    except Exception as inst:
+      print("ERROR:", fnames[0])
+      print(type(inst))     # the exception instance
+      print(inst.args)      # arguments stored in .args
+      print(inst)
+      if debug: import pdb;pdb.set_trace()
+
+  if data is None: raise RuntimeError("no file could be read")
+  #remove the slots of the skipped files
+  if len(filesOK) < len(files):
+    filesOK.sort()
+    for key in list(data.keys()):
+      index = np.concatenate([np.arange(ff*fileLength[key],(ff+1)*fileLength[key]) for ff in filesOK])
+      data[key] = data[key].take(index,axis=concatenateAxis)
+  return data
+
+def _readCosmoFile(readFile,fnames,memories,args):
+  #open the files, from memory if decompressed, and read them with readFile
+  ncFiles = list()
+  try:
+    for fname, memory in zip(fnames,memories):
+      ncFiles.append(_openNcFile(fname,memory))
+    return readFile(ncFiles,*args)
+  finally:
+    for ncFile in ncFiles: ncFile.close()
+
+def _readCosmoFileJob(readFile,fnames,fnameInTar,args):
+  #decompress and read the files in a worker process of _readCosmoFiles
+  memories = [None if fname.split(".")[-1]=="nc" else _readCompressedFile(fname,fnameInTar) for fname in fnames]
+  return _readCosmoFile(readFile,fnames,memories,args)
+
+def _readCosmoDe1MomColumnFile(ncFiles,colIndex,forecastIndex,maxLevel):
+  """
+  read columns colIndex of a COSMO-DE gop_collumn file, see readCosmoDe1MomDataset
+  """
+  variables1Dx = ["time1h"]
+  variables1Dy = ["fr_land","latitude","longitude",]
+  variables3D = ["u_10m","v_10m","t_2m","surface_air_pressure","t_s"]
+  variables4D = ["temperature","p","qv","qc","qi","qi","qr","qs","qg"]
+
+  ncFile = ncFiles[0]
+  if maxLevel  == 0: maxLevel = ncFile.variables["hfl"].shape[1]
+
+  dataSingle = dict()
+  for var in variables1Dx:
+    dataSingle[var] = ncFile.variables[var][:]
+  for var in variables1Dy:
+    dataSingle[var] = ncFile.variables[var][[colIndex]]
+  for var in [ "hfl"]:
+    dataSingle[var] = ncFile.variables[var][[colIndex],::-1][...,:maxLevel] #reverse height order and cut heights
+  for var in [ "hhl"]:
+    dataSingle[var] = ncFile.variables[var][[colIndex],::-1][...,:maxLevel+1] #reverse height order and cut heights
+  for var in variables3D:
+    dataSingle[var] = ncFile.variables[var][[colIndex],forecastIndex,:]
+  for var in variables4D:
+    dataSingle[var] = np.swapaxes(ncFile.variables[var][[colIndex],:,forecastIndex,:],1,2)[...,::-1][...,:maxLevel]#reverse height order
+
+  shape2D = (np.shape(dataSingle["latitude"])[0],np.shape(dataSingle["time1h"])[0],)
+  shape3Dplus = (np.shape(dataSingle["latitude"])[0],np.shape(dataSingle["time1h"])[0],np.shape(dataSingle["temperature"])[2]+1)
+  shape3D = (np.shape(dataSingle["latitude"])[0],np.shape(dataSingle["time1h"])[0],np.shape(dataSingle["temperature"])[2])
+
+  time1h = np.zeros(shape2D)
+  time1h[:] = dataSingle["time1h"]
+  latitude = np.zeros(shape2D)
+  latitude.T[:] = dataSingle["latitude"]
+  longitude = np.zeros(shape2D)
+  longitude.T[:] = dataSingle["longitude"]
+  fr_land =  np.zeros(shape2D)
+  fr_land.T[:] = dataSingle["fr_land"]
+  hfl =  np.zeros(shape3D)
+  hhl =  np.zeros(shape3Dplus)
+  for t in range(shape2D[1]):
+    hfl[:,t,:] = dataSingle["hfl"]
+    hhl[:,t,:] = dataSingle["hhl"]
+
+  dataSingle["time1h"] = time1h
+  dataSingle["latitude"] = latitude
+  dataSingle["longitude"] = longitude
+  dataSingle["fr_land"] = fr_land
+  dataSingle["hhl"] = hhl
+  dataSingle["hfl"] = hfl
+
+  return dataSingle
+
+def _cosmoDeConstants(conFields,forecastIndex,maxLevel,subGrid):
+  """
+  fields of the COSMO-DE constant file in the order of the profile, see _readCosmoDeFieldsFile
+  """
+  constants = dict()
+  for key in ["lon","lat"]:
+    constants[key] = np.swapaxes(conFields[key],0,1)
+  for key in ["FR_LAND","HSURF"]:
+    constants[key] = np.swapaxes(conFields[key][forecastIndex],0,1)
+  for key in ["HHL"]:
+    constants[key] = np.swapaxes(conFields[key][forecastIndex],0,2)[...,::-1][...,:maxLevel+1]
+  if subGrid is not None:
+    for key in list(constants.keys()):
+      constants[key] = constants[key][subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
+  return constants
+
+def _readCosmoDeFieldsFile(ncFiles,variables3D,variables3Dplus1,variables4D,variables4DN,forecastIndex,maxLevel,subGrid,constants):
+  """
+  read a COSMO-DE field file (gop_fields_SynSatMic or 2-moment), see readCosmoDe1MomDataset and
+  readCosmoDe2MomDataset. variables4DN are read from the second file (number densities), the
+  fields of the constant file (see _cosmoDeConstants) are added.
+  """
+  #only the subGrid hyperslab is read, the files are ordered (..., y, x)
+  if subGrid is None:
+    x, y = slice(None), slice(None)
+  else:
+    x, y = slice(subGrid[0],subGrid[1]), slice(subGrid[2],subGrid[3])
+
+  ncFileA = ncFiles[0]
+  dataSingle = dict()
+  for var in variables3D:
+    dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex,y,x],0,1)
+  for var in variables3Dplus1:
+    dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex,0,y,x],0,1)
+  for var in variables4D:
+    dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex,:,y,x],0,2)[...,::-1][...,:maxLevel]#reverse height order
+  for var in variables4DN:
+    dataSingle[var] = np.swapaxes(ncFiles[1].variables[var][forecastIndex,:,y,x],0,2)[...,::-1][...,:maxLevel]#reverse height order
+  timestamp = ncFileA.variables["time"][:]
+
+  shape3Dplus = tuple(np.array(dataSingle["T"].shape) + np.array([0,0,1]))
+  shape2D = dataSingle["T"].shape[:2]
+
+  dataSingle["timestamp"] = np.zeros(shape2D)
+  dataSingle["timestamp"][:] = timestamp
+
+  for key in ["lon","lat","FR_LAND","HSURF"]:
+    dataSingle[key] = np.zeros(shape2D)
+    dataSingle[key][:] = constants[key]
+  for key in ["HHL"]:
+    dataSingle[key] = np.zeros(shape3Dplus)
+    dataSingle[key][:] = constants[key]
+
+  return dataSingle
+
 def readWrfDataset(fname,kind):
   """
   
@@ -115,7 +422,7 @@ def readWrfDataset(fname,kind):
   return pam
 
 
-def readCosmoDe1MomDataset(fnames,kind,descriptorFile,forecastIndex = 1,colIndex=0,tmpDir="/tmp/",fnameInTar="",concatenateAxis=1,debug=False,verbosity=0,df_kind="default",constantFields=None,maxLevel=0,subGrid=None):
+def readCosmoDe1MomDataset(fnames,kind,descriptorFile,forecastIndex = 1,colIndex=0,tmpDir="/tmp/",fnameInTar="",concatenateAxis=1,debug=False,verbosity=0,df_kind="default",constantFields=None,maxLevel=0,subGrid=None,nThreads=1,nProcesses=1):
   """
   read COMSO one moment data set
 
@@ -132,9 +439,9 @@ def readCosmoDe1MomDataset(fnames,kind,descriptorFile,forecastIndex = 1,colIndex
   colIndex : {int or list of int}, optional
     which collum should be taken? list allowed! (the default is 0)
   tmpDir : {str}, optional
-    [description] (the default is "/tmp/")
+    not used anymore, compressed files are decompressed in memory (the default is "/tmp/")
   fnameInTar : {str}, optional
-    [description] (the default is "")
+    name of the gzip compressed netcdf file within the tar files, wildcards allowed (the default is "")
   concatenateAxis : {int}, optional
     concatenation along which axis (the default is 1)
   debug : {bool}, optional
@@ -149,6 +456,10 @@ def readCosmoDe1MomDataset(fnames,kind,descriptorFile,forecastIndex = 1,colIndex
     Number of maximum levels to consider. (the default is 0)
   subGrid : {[int,int,int,int]}, optional
     array with indices [lon_start,lon_end,lat_start,lat_end] ((1,1) in model corresponds to (0,0) in python!) (the default is None)
+  nThreads : {int}, optional
+    number of threads decompressing the next files while the current one is read (the default is 1)
+  nProcesses : {int}, optional
+    number of processes reading the files in parallel, see _readCosmoFiles. 1 reads them in this process (the default is 1)
  
   Returns
   -------
@@ -164,115 +475,14 @@ def readCosmoDe1MomDataset(fnames,kind,descriptorFile,forecastIndex = 1,colIndex
 
   if kind == "gop_collumn":
 
-    variables1Dx = ["time1h"]
-    variables1Dy = ["fr_land","latitude","longitude",]
-    variables2D = [ "hfl","hhl"]
-    variables3D = ["u_10m","v_10m","t_2m","surface_air_pressure","t_s"]
-    variables4D = ["temperature","p","qv","qc","qi","qi","qr","qs","qg"]
-
     nHydro = 5
 
-    data = dict()
-
     files = np.sort(glob.glob(fnames))
     if len(files) == 0: raise RuntimeError( "no files found")
     files.sort()
 
-    ffOK = 0 #successfull runs
-
-    for ff, fname in enumerate(files):
-      if verbosity>0: print(fname)
-      try:
-        if fname.split(".")[-1]!="nc":
-          tmpFile = tmpDir+"/pyPamtraImport_netcdf_"+''.join(random.choice(string.ascii_uppercase + string.digits) for x in range(5))+".nc"
-          if fname.split(".")[-1]=="tar":
-            if verbosity>3:print("tar -O --wildcards -x "+fnameInTar+" -f "+fname+">"+tmpFile+".gz")
-            os.system("tar -O --wildcards -x "+fnameInTar+" -f "+fname+">"+tmpFile+".gz")
-            gzFile = tmpFile+".gz"
-            if os.stat(gzFile).st_size == 0:
-              os.system("rm -f "+tmpFile+"*")
-              raise IOError("fnameInTar not found in "+fname)
-            if verbosity>2:print("created ", gzFile)
-          else:
-            gzFile = fname
-          os.system("zcat "+gzFile+">"+tmpFile)
-          if verbosity>1:print("created ", tmpFile)
-          ncFile = netCDF4.Dataset(tmpFile,"r")
-          if verbosity>1:print("opend ", tmpFile)
-        else:
-          ncFile = netCDF4.Dataset(fname,"r")
-          if verbosity>1:print("opend ", fname)
-
-        if maxLevel  == 0: maxLevel = ncFile.variables["hfl"].shape[1]
-
-        #import pdb;pdb.set_trace()
-        dataSingle = dict()
-        for var in variables1Dx:
-          dataSingle[var] = ncFile.variables[var][:]
-        for var in variables1Dy:
-          dataSingle[var] = ncFile.variables[var][[colIndex]]
-        for var in [ "hfl"]:
-          dataSingle[var] = ncFile.variables[var][[colIndex],::-1][...,:maxLevel] #reverse height order and cut heights
-        for var in [ "hhl"]:
-          dataSingle[var] = ncFile.variables[var][[colIndex],::-1][...,:maxLevel+1] #reverse height order and cut heights
-        for var in variables3D:
-          dataSingle[var] = ncFile.variables[var][[colIndex],forecastIndex,:]
-        for var in variables4D:
-          dataSingle[var] = np.swapaxes(ncFile.variables[var][[colIndex],:,forecastIndex,:],1,2)[...,::-1][...,:maxLevel]#reverse height order
-
-        ncFile.close()
-        if verbosity>1:print("closed nc")
-        if fname.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        shape2D = (np.shape(dataSingle["latitude"])[0],np.shape(dataSingle["time1h"])[0],)
-        shape3Dplus = (np.shape(dataSingle["latitude"])[0],np.shape(dataSingle["time1h"])[0],np.shape(dataSingle["temperature"])[2]+1)
-        shape3D = (np.shape(dataSingle["latitude"])[0],np.shape(dataSingle["time1h"])[0],np.shape(dataSingle["temperature"])[2])
-
-        time1h = np.zeros(shape2D)
-        time1h[:] = dataSingle["time1h"]
-        latitude = np.zeros(shape2D)
-        latitude.T[:] = dataSingle["latitude"]
-        longitude = np.zeros(shape2D)
-        longitude.T[:] = dataSingle["longitude"]
-        fr_land =  np.zeros(shape2D)
-        fr_land.T[:] = dataSingle["fr_land"]
-        hfl =  np.zeros(shape3D)
-        hhl =  np.zeros(shape3Dplus)
-        for t in range(shape2D[1]):
-          hfl[:,t,:] = dataSingle["hfl"]
-          hhl[:,t,:] = dataSingle["hhl"]
-
-        dataSingle["time1h"] = time1h
-        dataSingle["latitude"] = latitude
-        dataSingle["longitude"] = longitude
-        dataSingle["fr_land"] = fr_land
-        dataSingle["hhl"] = hhl
-        dataSingle["hfl"] = hfl
-
-        del time1h, longitude, latitude, fr_land, hhl, hfl
-
-
-        if ffOK == 0: #if the first file is broken, checking for ff==0 would fail!
-          data = deepcopy(dataSingle)
-        else:
-          for key in list(data.keys()):
-            data[key] = np.ma.concatenate((data[key],dataSingle[key],),axis=concatenateAxis)
-
-        ffOK += 1
-
-      #except IOError:
-      except Exception as inst:
-        if fname.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        print("ERROR:", fname)
-        print(type(inst))     # the exception instance
-        print(inst.args)      # arguments stored in .args
-        print(inst)
-        if debug: import pdb;pdb.set_trace()
-
-
+    data = _readCosmoFiles(_readCosmoDe1MomColumnFile,[(fname,) for fname in files],(colIndex,forecastIndex,maxLevel),
+      fnameInTar,concatenateAxis,nThreads,nProcesses,verbosity,debug)
 
     #shapes have changed!
     shape2D = np.shape(data["t_2m"])
@@ -306,101 +516,14 @@ def readCosmoDe1MomDataset(fnames,kind,descriptorFile,forecastIndex = 1,colIndex
     nHydro = 5
 
     conFields = ncToDict(constantFields)
-    data = dict()
     if maxLevel  == 0: maxLevel = conFields["HHL"].shape[1] - 1
     files = np.sort(glob.glob(fnames))
     if len(files) == 0: raise RuntimeError( "no files found")
     files.sort()
 
-    ffOK = 0 #successfull runs
-
-    for ff, fname in enumerate(files):
-      if verbosity>0: print(fname)
-      try:
-        if fname.split(".")[-1]!="nc":
-          tmpFile = tmpDir+"/pyPamtraImport_netcdf_"+''.join(random.choice(string.ascii_uppercase + string.digits) for x in range(5))+".nc"
-          if fname.split(".")[-1]=="tar":
-            if verbosity>3:print("tar -O --wildcards -x "+fnameInTar+" -f "+fname+">"+tmpFile+".gz")
-            os.system("tar -O --wildcards -x "+fnameInTar+" -f "+fname+">"+tmpFile+".gz")
-            gzFile = tmpFile+".gz"
-            if os.stat(gzFile).st_size == 0:
-              os.system("rm -f "+tmpFile+"*")
-              raise IOError("fnameInTar not found in "+fname)
-            if verbosity>2:print("created ", gzFile)
-          else:
-            gzFile = fname
-          os.system("zcat "+gzFile+">"+tmpFile)
-          if verbosity>1:print("created ", tmpFile)
-          ncFile = netCDF4.Dataset(tmpFile,"r")
-          if verbosity>1:print("opend ", tmpFile)
-        else:
-          ncFile = netCDF4.Dataset(fname,"r")
-          if verbosity>1:print("opend ", fname)
-
-        #import pdb;pdb.set_trace()
-        dataSingle = dict()
-        for var in variables3D:
-          if subGrid == None:
-            dataSingle[var] = np.swapaxes(ncFile.variables[var][forecastIndex],0,1)
-          else:
-            dataSingle[var] = np.swapaxes(ncFile.variables[var][forecastIndex],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for var in variables4D:
-          if subGrid == None:
-            dataSingle[var] = np.swapaxes(ncFile.variables[var][forecastIndex],0,2)[...,::-1][...,:maxLevel]#reverse height order
-          else:
-            dataSingle[var] = np.swapaxes(ncFile.variables[var][forecastIndex],0,2)[...,::-1][...,:maxLevel][subGrid[0]:subGrid[1],subGrid[2]:subGrid[3],:]
-        timestamp =   ncFile.variables["time"][:]
-        ncFile.close()
-        if verbosity>1:print("closed nc")
-        if fname.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        shape3Dplus = tuple(np.array(dataSingle["T"].shape) + np.array([0,0,1]))
-        shape3D = dataSingle["T"].shape
-        shape2D = shape3D[:2]
-
-
-        dataSingle["timestamp"] = np.zeros(shape2D)
-        dataSingle["timestamp"][:] = timestamp
-
-        for key in ["lon","lat"]:
-          dataSingle[key]  = np.zeros(shape2D)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key],0,1)
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for key in ["FR_LAND","HSURF"]:
-          dataSingle[key]  = np.zeros(shape2D)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,1)
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for key in ["HHL"]:
-          dataSingle[key]  = np.zeros(shape3Dplus)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,2)[...,::-1][...,:maxLevel+1]
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,2)[...,::-1][...,:maxLevel+1][subGrid[0]:subGrid[1],subGrid[2]:subGrid[3],:]
-
-        if ffOK == 0: #if the first file is broken, checking for ff==0 would fail!
-          data = deepcopy(dataSingle)
-        else:
-          for key in list(data.keys()):
-            data[key] = np.ma.concatenate((data[key],dataSingle[key],),axis=concatenateAxis)
-
-        ffOK += 1
-
-
-      #except IOError:
-      except Exception as inst:
-        if fname.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        print("ERROR:", fname)
-        print(type(inst))     # the exception instance
-        print(inst.args)      # arguments stored in .args
-        print(inst)
-        if debug: import pdb;pdb.set_trace()
+    constants = _cosmoDeConstants(conFields,forecastIndex,maxLevel,subGrid)
+    data = _readCosmoFiles(_readCosmoDeFieldsFile,[(fname,) for fname in files],(variables3D,[],variables4D,[],forecastIndex,maxLevel,subGrid,constants),
+      fnameInTar,concatenateAxis,nThreads,nProcesses,verbosity,debug)
 
     #shapes may have changed!
     shape3Dplus = tuple(np.array(data["T"].shape) + np.array([0,0,1]))
@@ -449,7 +572,7 @@ def readCosmoDe1MomDataset(fnames,kind,descriptorFile,forecastIndex = 1,colIndex
 
   return pam
 
-def readCosmoDe2MomDataset(fnamesA,descriptorFile,fnamesN=None,kind='new',forecastIndex = 1,tmpDir="/tmp/",fnameInTar="",debug=False,verbosity=0,df_kind="default",constantFields=None,maxLevel=0,subGrid=None):
+def readCosmoDe2MomDataset(fnamesA,descriptorFile,fnamesN=None,kind='new',forecastIndex = 1,tmpDir="/tmp/",fnameInTar="",debug=False,verbosity=0,df_kind="default",constantFields=None,maxLevel=0,subGrid=None,nThreads=1,nProcesses=1,concatenateAxis=1):
   """
   import COSMO 2-moment dataset
   
@@ -466,9 +589,9 @@ def readCosmoDe2MomDataset(fnamesA,descriptorFile,fnamesN=None,kind='new',foreca
   forecastIndex : {int}, optional
     index of forecast to be read (the default is 1)
   tmpDir : {str}, optional
-    [description] (the default is "/tmp/")
+    not used anymore, compressed files are decompressed in memory (the default is "/tmp/")
   fnameInTar : {str}, optional
-    [description] (the default is "")
+    name of the gzip compressed netcdf file within the tar files, wildcards allowed (the default is "")
   debug : {bool}, optional
     stop and load debugger on exception (the default is False) (the default is False)
   verbosity : {int}, optional
@@ -481,6 +604,12 @@ def readCosmoDe2MomDataset(fnamesA,descriptorFile,fnamesN=None,kind='new',foreca
     Number of maximum levels to consider. (the default is 0)
   subGrid : {[int,int,int,int]}, optional
     array with indices [lon_start,lon_end,lat_start,lat_end] ((1,1) in model corresponds to (0,0) in python!) (the default is None)
+  nThreads : {int}, optional
+    number of threads decompressing the next files while the current one is read (the default is 1)
+  nProcesses : {int}, optional
+    number of processes reading the files in parallel, see _readCosmoFiles. 1 reads them in this process (the default is 1)
+  concatenateAxis : {int}, optional
+    concatenation along which axis (the default is 1)
   
   Returns
   -------
@@ -498,107 +627,20 @@ def readCosmoDe2MomDataset(fnamesA,descriptorFile,fnamesN=None,kind='new',foreca
   assert constantFields
   forecastIndex = 0
   nHydro = 6
-  ffOK = 0 #successfull runs
 
   conFields = ncToDict(constantFields)
-  data = dict()
   if maxLevel  == 0: maxLevel = conFields["HHL"].shape[1] - 1
   filesA = np.sort(glob.glob(fnamesA))
   if len(filesA) == 0: raise RuntimeError( "no files found")
   filesA.sort()
+  constants = _cosmoDeConstants(conFields,forecastIndex,maxLevel,subGrid)
 
   if kind == 'new':
     variables3D = ["T_G","PS","U_10M","V_10M"]
     variables4D = ["T","P","QV","QC","QI","QR","QS","QG","QH","QNCLOUD","QNICE","QNRAIN","QNSNOW","QNGRAUPEL","QNHAIL"]
 
-
-    for ff, fnameA in enumerate(filesA):
-      if verbosity>0: print(fnameA)
-      try:
-        if fnameA.split(".")[-1]!="nc":
-          tmpFile = tmpDir+"/pyPamtraImport_netcdf_"+''.join(random.choice(string.ascii_uppercase + string.digits) for x in range(5))+".nc"
-          if fnameA.split(".")[-1]=="tar":
-            if verbosity>3:print("tar -O --wildcards -x "+fnameInTar+" -f "+fnameA+">"+tmpFile+".gz")
-            os.system("tar -O --wildcards -x "+fnameInTar+" -f "+fnameA+">"+tmpFile+".gz")
-            gzFile = tmpFile+".gz"
-            if os.stat(gzFile).st_size == 0:
-              os.system("rm -f "+tmpFile+"*")
-              raise IOError("fnameInTar not found in "+fnameA)
-            if verbosity>2:print("created ", gzFile)
-          else:
-            gzFile = fnameA
-          os.system("zcat "+gzFile+">"+tmpFile)
-          if verbosity>1:print("created ", tmpFile)
-          ncFileA = netCDF4.Dataset(tmpFile,"r")
-          if verbosity>1:print("opend ", tmpFile)
-        else:
-          ncFileA = netCDF4.Dataset(fnameA,"r")
-          if verbosity>1:print("opend ", fnameA)
-
-        #import pdb;pdb.set_trace()
-        dataSingle = dict()
-        for var in variables3D:
-          if subGrid == None:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex],0,1)
-          else:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for var in variables4D:
-          if subGrid == None:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex],0,2)[...,::-1][...,:maxLevel]#reverse height order
-          else:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex],0,2)[...,::-1][...,:maxLevel][subGrid[0]:subGrid[1],subGrid[2]:subGrid[3],:]
-        timestamp = ncFileA.variables["time"][:]
-        ncFileA.close()
-        if verbosity>1:print("closed nc")
-        if fnameA.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        shape3Dplus = tuple(np.array(dataSingle["T"].shape) + np.array([0,0,1]))
-        shape3D = dataSingle["T"].shape
-        shape2D = shape3D[:2]
-
-
-        dataSingle["timestamp"] = np.zeros(shape2D)
-        dataSingle["timestamp"][:] = timestamp
-
-        for key in ["lon","lat"]:
-          dataSingle[key]  = np.zeros(shape2D)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key],0,1)
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for key in ["FR_LAND","HSURF"]:
-          dataSingle[key]  = np.zeros(shape2D)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,1)
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for key in ["HHL"]:
-          dataSingle[key]  = np.zeros(shape3Dplus)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,2)[...,::-1][...,:maxLevel+1]
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,2)[...,::-1][...,:maxLevel+1][subGrid[0]:subGrid[1],subGrid[2]:subGrid[3],:]
-
-        if ffOK == 0: #if the first file is broken, checking for ff==0 would fail!
-          data = deepcopy(dataSingle)
-        else:
-          for key in list(data.keys()):
-            data[key] = np.ma.concatenate((data[key],dataSingle[key],),axis=concatenateAxis)
-
-        ffOK += 1
-
-
-      #except IOError:
-      except Exception as inst:
-        if fnameA.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        print("ERROR:", fnameA)
-        print(type(inst))     # the exception instance
-        print(inst.args)      # arguments stored in .args
-        print(inst)
-        if debug: import pdb;pdb.set_trace()
+    data = _readCosmoFiles(_readCosmoDeFieldsFile,[(fnameA,) for fnameA in filesA],(variables3D,[],variables4D,[],forecastIndex,maxLevel,subGrid,constants),
+      fnameInTar,concatenateAxis,nThreads,nProcesses,verbosity,debug)
 
     data["hydro_n"] = np.zeros(data["QNCLOUD"].shape + (nHydro,)) + np.nan
     data["hydro_n"][...,0] = data["QNCLOUD"]
@@ -621,131 +663,8 @@ def readCosmoDe2MomDataset(fnamesA,descriptorFile,fnamesN=None,kind='new',foreca
     variables4D = ["T","P","QV","QC","QI","QR","QS","QG","QH"]
     variables4DN = ['QNC','QNI','QNR','QNS','QNG','QNH']
 
-
-    for ff, fnameA in enumerate(filesA):
-      fnameN = filesN[ff]
-      if verbosity>0: print(fnameA, fnameN)
-      try:
-        if fnameA.split(".")[-1]!="nc":
-          tmpFile = tmpDir+"/pyPamtraImport_netcdf_"+''.join(random.choice(string.ascii_uppercase + string.digits) for x in range(5))+".nc"
-          if fnameA.split(".")[-1]=="tar":
-            if verbosity>3:print("tar -O --wildcards -x "+fnameInTar+" -f "+fnameA+">"+tmpFile+".gz")
-            os.system("tar -O --wildcards -x "+fnameInTar+" -f "+fnameA+">"+tmpFile+".gz")
-            gzFile = tmpFile+".gz"
-            if os.stat(gzFile).st_size == 0:
-              os.system("rm -f "+tmpFile+"*")
-              raise IOError("fnameInTar not found in "+fnameA)
-            if verbosity>2:print("created ", gzFile)
-          else:
-            gzFile = fnameA
-          os.system("zcat "+gzFile+">"+tmpFile)
-          if verbosity>1:print("created ", tmpFile)
-          ncFileA = netCDF4.Dataset(tmpFile,"r")
-          if verbosity>1:print("opend ", tmpFile)
-        else:
-          ncFileA = netCDF4.Dataset(fnameA,"r")
-          if verbosity>1:print("opend ", fnameA)
-
-        # number density files
-        if fnameN.split(".")[-1]!="nc":
-          tmpFile = tmpDir+"/pyPamtraImport_netcdf_"+''.join(random.choice(string.ascii_uppercase + string.digits) for x in range(5))+".nc"
-          if fnameN.split(".")[-1]=="tar":
-            if verbosity>3:print("tar -O --wildcards -x "+fnameInTar+" -f "+fnameN+">"+tmpFile+".gz")
-            os.system("tar -O --wildcards -x "+fnameInTar+" -f "+fnameN+">"+tmpFile+".gz")
-            gzFile = tmpFile+".gz"
-            if os.stat(gzFile).st_size == 0:
-              os.system("rm -f "+tmpFile+"*")
-              raise IOError("fnameInTar not found in "+fnameN)
-            if verbosity>2:print("created ", gzFile)
-          else:
-            gzFile = fnameN
-          os.system("zcat "+gzFile+">"+tmpFile)
-          if verbosity>1:print("created ", tmpFile)
-          ncFileN = netCDF4.Dataset(tmpFile,"r")
-          if verbosity>1:print("opend ", tmpFile)
-        else:
-          ncFileN = netCDF4.Dataset(fnameN,"r")
-          if verbosity>1:print("opend ", fnameN)
-
-        #import pdb;pdb.set_trace()
-        dataSingle = dict()
-        for var in variables3D:
-          if subGrid == None:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex],0,1)
-          else:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for var in variables3Dplus1:
-          if subGrid == None:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex,0],0,1)
-          else:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex,0],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for var in variables4D:
-          if subGrid == None:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex],0,2)[...,::-1][...,:maxLevel]#reverse height order
-          else:
-            dataSingle[var] = np.swapaxes(ncFileA.variables[var][forecastIndex],0,2)[...,::-1][...,:maxLevel][subGrid[0]:subGrid[1],subGrid[2]:subGrid[3],:]
-        timestamp = ncFileA.variables["time"][:]
-        ncFileA.close()
-        if verbosity>1:print("closed nc")
-        if fnameA.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        for var in variables4DN:
-          if subGrid == None:
-            dataSingle[var] = np.swapaxes(ncFileN.variables[var][forecastIndex],0,2)[...,::-1][...,:maxLevel]#reverse height order
-          else:
-            dataSingle[var] = np.swapaxes(ncFileN.variables[var][forecastIndex],0,2)[...,::-1][...,:maxLevel][subGrid[0]:subGrid[1],subGrid[2]:subGrid[3],:]
-        ncFileN.close()
-        if verbosity>1:print("closed nc")
-        if fnameN.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        shape3Dplus = tuple(np.array(dataSingle["T"].shape) + np.array([0,0,1]))
-        shape3D = dataSingle["T"].shape
-        shape2D = shape3D[:2]
-
-
-        dataSingle["timestamp"] = np.zeros(shape2D)
-        dataSingle["timestamp"][:] = timestamp
-
-        for key in ["lon","lat"]:
-          dataSingle[key]  = np.zeros(shape2D)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key],0,1)
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for key in ["FR_LAND","HSURF"]:
-          dataSingle[key]  = np.zeros(shape2D)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,1)
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,1)[subGrid[0]:subGrid[1],subGrid[2]:subGrid[3]]
-        for key in ["HHL"]:
-          dataSingle[key]  = np.zeros(shape3Dplus)
-          if subGrid == None:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,2)[...,::-1][...,:maxLevel+1]
-          else:
-            dataSingle[key][:] = np.swapaxes(conFields[key][forecastIndex],0,2)[...,::-1][...,:maxLevel+1][subGrid[0]:subGrid[1],subGrid[2]:subGrid[3],:]
-
-        if ffOK == 0: #if the first file is broken, checking for ff==0 would fail!
-          data = deepcopy(dataSingle)
-        else:
-          for key in list(data.keys()):
-            data[key] = np.ma.concatenate((data[key],dataSingle[key],),axis=concatenateAxis)
-
-        ffOK += 1
-
-
-      #except IOError:
-      except Exception as inst:
-        if fnameA.split(".")[-1]!="nc":
-          if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-          os.system("rm -f "+tmpFile+"*")
-        print("ERROR:", fnameA)
-        print(type(inst))     # the exception instance
-        print(inst.args)      # arguments stored in .args
-        print(inst)
-        if debug: import pdb;pdb.set_trace()
+    data = _readCosmoFiles(_readCosmoDeFieldsFile,list(zip(filesA,filesN)),(variables3D,variables3Dplus1,variables4D,variables4DN,forecastIndex,maxLevel,subGrid,constants),
+      fnameInTar,concatenateAxis,nThreads,nProcesses,verbosity,debug)
 
     data["hydro_n"] = np.zeros(data["QNC"].shape + (nHydro,)) + np.nan
     data["hydro_n"][...,0] = data["QNC"]
@@ -810,7 +729,7 @@ def readCosmoDe2MomDatasetOnFlightTrack(fnameA,descriptorFile,tmpDir="/tmp/",deb
   descriptorFile : {str}
     path and name of descriptor file
   tmpDir : {str}, optional
-    directory to unpack temporary files (the default is "/tmp/")
+    directory to unpack temporary files, passed to ncToDict (the default is "/tmp/")
   debug : {bool}, optional
     stop and load debugger on exception (the default is False)
   verbosity : {int}, optional
@@ -832,27 +751,13 @@ def readCosmoDe2MomDatasetOnFlightTrack(fnameA,descriptorFile,tmpDir="/tmp/",deb
 
   if verbosity>0: print(fnameA)
   try:
-    if fnameA.split(".")[-1]!="nc":
-      tmpFile = tmpDir+"/pyPamtraImport_netcdf_"+''.join(random.choice(string.ascii_uppercase + string.digits) for x in range(5))+".nc"
-      gzFile = fnameA
-      os.system("zcat "+gzFile+">"+tmpFile)
-      if verbosity>1:print("created ", tmpFile)
-      data = ncToDict(tmpFile)
-      if verbosity>1:print("read ", tmpFile)
-    else:
-      data = ncToDict(fnameA)
-      if verbosity>1:print("read ", fnameA)
+    data = ncToDict(fnameA,tmpDir=tmpDir)
+    if verbosity>1:print("read ", fnameA)
 
     if debug: import pdb;pdb.set_trace()
     if verbosity>1:print("closed nc")
-    if fnameA.split(".")[-1]!="nc":
-      if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-      os.system("rm -f "+tmpFile+"*")
 
   except Exception as inst:
-    if fnameA.split(".")[-1]!="nc":
-      if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-      os.system("rm -f "+tmpFile+"*")
     print("ERROR:", fnameA)
     print(type(inst))     # the exception instance
     print(inst.args)      # arguments stored in .args
@@ -933,7 +838,7 @@ def readCosmoReAn2km(constantFields,fname,descriptorFile,forecastIndex = 1,tmpDi
   forecastIndex : {int}, optional
     index of forecast to be read (the default is 1)
   tmpDir : {str}, optional
-    temporary directory to unpack data (the default is "/tmp/", which [default_description])
+    not used, the grib files are read directly (the default is "/tmp/")
   fnameInTar : {str}, optional
     file name within tar file (the default is "")
   debug : {bool}, optional
@@ -1020,9 +925,6 @@ def readCosmoReAn2km(constantFields,fname,descriptorFile,forecastIndex = 1,tmpDi
 
     grbs.close()
   except Exception as inst:
-    if fname.split(".")[-1]!="nc":
-      if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-      os.system("rm -f "+tmpFile+"*")
     print("ERROR:", fname)
     print(type(inst))     # the exception instance
     print(inst.args)      # arguments stored in .args
@@ -1273,7 +1175,7 @@ Apply weights:
     cdo remapnn,test_grid,test_grid_weights.nc -setgrid,narval_nestTropAtl_R1250m extpar_narval_nestTropAtl_R1250m.nc extpar_narval_nestTropAtl_R1250m_test_grid.nc
 """
 
-def readIconLem1MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,constantFields=None,maxLevel=0):
+def readIconLem1MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,constantFields=None,maxLevel=0,subGrid=None):
   """
   import ICON LEM 1-moment dataset
 
@@ -1293,6 +1195,8 @@ def readIconLem1MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
     path and name of file with constant fields (the default is None)
   maxLevel : {int}, optional
     Number of maximum levels to consider. (the default is 0)
+  subGrid : {[int,int,int,int]}, optional
+    array with indices [lon_start,lon_end,lat_start,lat_end], only this part of the fields is read (the default is None)
   
   Returns
   -------
@@ -1304,6 +1208,11 @@ def readIconLem1MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
   """
   import netCDF4
 
+  if subGrid is None:
+    lon, lat = slice(None), slice(None)
+  else:
+    lon, lat = slice(subGrid[0],subGrid[1]), slice(subGrid[2],subGrid[3])
+
   assert constantFields
   forecastIndex = 0 # time step in forecast
   nHydro = 5
@@ -1331,7 +1240,7 @@ def readIconLem1MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
     for var in variables2D_const:
       # nc dimensions: lat, lon; target dimensions: lon, lat
       assert ncFile_const.variables[var].dimensions == ('lat', 'lon')
-      dataSingle[var] = np.swapaxes(ncFile_const.variables[var],0,1)
+      dataSingle[var] = np.swapaxes(ncFile_const.variables[var][lat,lon],0,1)
 
     ncFile_const.close()
     if verbosity > 1: print("closed const nc")
@@ -1351,23 +1260,23 @@ def readIconLem1MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
     for var in variables3D:
       # nc dimensions: time, lat, lon; target dimensions: lon, lat
       assert ncFile_fg.variables[var].dimensions == ('time', 'lat', 'lon')
-      dataSingle[var] = np.swapaxes(ncFile_fg.variables[var][forecastIndex],0,1)
+      dataSingle[var] = np.swapaxes(ncFile_fg.variables[var][forecastIndex,lat,lon],0,1)
 
     for var in variables4D_10m:
       # nc dimensions: time, lat, height_5 lon; target dimensions: lon, lat
       assert ncFile_fg.variables[var].dimensions == ('time', 'lat', 'height_5', 'lon')
       assert ncFile_fg.dimensions['height_5'].size == 1
-      dataSingle[var] = np.swapaxes(ncFile_fg.variables[var][forecastIndex, :, 0, :],0,1)
+      dataSingle[var] = np.swapaxes(ncFile_fg.variables[var][forecastIndex, lat, 0, lon],0,1)
 
     for var in variables4D:
       # nc dimensions: time, lat, height, lon; target dimensions: lon, lat, level
       assert ncFile_fg.variables[var].dimensions == ('time', 'lat', 'height', 'lon')
-      dataSingle[var] = np.transpose(ncFile_fg.variables[var][forecastIndex], (2, 0, 1))[...,::-1][...,:maxLevel]#reverse height order
+      dataSingle[var] = np.transpose(ncFile_fg.variables[var][forecastIndex, lat, :, lon], (2, 0, 1))[...,::-1][...,:maxLevel]#reverse height order
 
     for var in variables4D_cloud:
       # nc dimensions: time, lat, height, lon; target dimensions: lon, lat, level
       assert ncFile_cloud.variables[var].dimensions == ('time', 'lat', 'height', 'lon')
-      dataSingle[var] = np.transpose(ncFile_cloud.variables[var][forecastIndex], (2, 0, 1))[...,::-1][...,:maxLevel]#reverse height order
+      dataSingle[var] = np.transpose(ncFile_cloud.variables[var][forecastIndex, lat, :, lon], (2, 0, 1))[...,::-1][...,:maxLevel]#reverse height order
 
     shape3D = dataSingle["temp"].shape
     shape3Dplus = (shape3D[0], shape3D[1], shape3D[2] + 1)
@@ -1388,7 +1297,7 @@ def readIconLem1MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
     for key in ["z_ifc"]:
       # nc dimensions: lat, height, lon; target dimensions: lon, lat, level
       assert ncFile_fg.variables[key].dimensions == ('lat', 'height_3', 'lon')
-      dataSingle[key] = np.transpose(ncFile_fg[key],(2, 0, 1))[...,::-1][...,:maxLevel+1]#reverse height order
+      dataSingle[key] = np.transpose(ncFile_fg[key][lat, :, lon],(2, 0, 1))[...,::-1][...,:maxLevel+1]#reverse height order
       assert dataSingle[key].shape == shape3Dplus
 
     ncFile_fg.close()
@@ -1459,7 +1368,7 @@ def readIconLem1MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
 readIconLem1MomDataset.__doc__ += __ICDN_regridding_remarks
 
 
-def readIconLem2MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,constantFields=None,maxLevel=0):
+def readIconLem2MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,constantFields=None,maxLevel=0,subGrid=None):
   """
   import ICON LEM 2-moment dataset
 
@@ -1479,6 +1388,8 @@ def readIconLem2MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
     path and name of file with constant fields (the default is None)
   maxLevel : {int}, optional
     Number of maximum levels to consider. (the default is 0)
+  subGrid : {[int,int,int,int]}, optional
+    array with indices [lon_start,lon_end,lat_start,lat_end], only this part of the fields is read (the default is None)
   
   Returns
   -------
@@ -1490,6 +1401,11 @@ def readIconLem2MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
   """
   import netCDF4
 
+  if subGrid is None:
+    lon, lat = slice(None), slice(None)
+  else:
+    lon, lat = slice(subGrid[0],subGrid[1]), slice(subGrid[2],subGrid[3])
+
   assert constantFields
   forecastIndex = 0 # time step in forecast
   nHydro = 6
@@ -1516,7 +1432,7 @@ def readIconLem2MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
     for var in variables2D_const:
       # nc dimensions: lat, lon; target dimensions: lon, lat
       assert ncFile_const.variables[var].dimensions == ('lat', 'lon')
-      dataSingle[var] = np.swapaxes(ncFile_const.variables[var],0,1)
+      dataSingle[var] = np.swapaxes(ncFile_const.variables[var][lat,lon],0,1)
 
     ncFile_const.close()
     if verbosity > 1: print("closed const nc")
@@ -1533,18 +1449,18 @@ def readIconLem2MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
     for var in variables3D:
       # nc dimensions: time, lat, lon; target dimensions: lon, lat
       assert ncFile_fg.variables[var].dimensions == ('time', 'lat', 'lon')
-      dataSingle[var] = np.swapaxes(ncFile_fg.variables[var][forecastIndex],0,1)
+      dataSingle[var] = np.swapaxes(ncFile_fg.variables[var][forecastIndex,lat,lon],0,1)
 
     for var in variables4D_10m:
       # nc dimensions: time, lat, height_5 lon; target dimensions: lon, lat
       assert ncFile_fg.variables[var].dimensions == ('time', 'lat', 'height_5', 'lon')
       assert ncFile_fg.dimensions['height_5'].size == 1
-      dataSingle[var] = np.swapaxes(ncFile_fg.variables[var][forecastIndex, :, 0, :],0,1)
+      dataSingle[var] = np.swapaxes(ncFile_fg.variables[var][forecastIndex, lat, 0, lon],0,1)
 
     for var in variables4D:
       # nc dimensions: time, lat, height, lon; target dimensions: lon, lat, level
       assert ncFile_fg.variables[var].dimensions == ('time', 'lat', 'height', 'lon')
-      dataSingle[var] = np.transpose(ncFile_fg.variables[var][forecastIndex], (2, 0, 1))[...,::-1][...,:maxLevel]#reverse height order
+      dataSingle[var] = np.transpose(ncFile_fg.variables[var][forecastIndex, lat, :, lon], (2, 0, 1))[...,::-1][...,:maxLevel]#reverse height order
 
     shape3D = dataSingle["temp"].shape
     shape3Dplus = (shape3D[0], shape3D[1], shape3D[2] + 1)
@@ -1565,7 +1481,7 @@ def readIconLem2MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
     for key in ["z_ifc"]:
       # nc dimensions: lat, height, lon; target dimensions: lon, lat, level
       assert ncFile_fg.variables[key].dimensions == ('lat', 'height_3', 'lon')
-      dataSingle[key] = np.transpose(ncFile_fg[key],(2, 0, 1))[...,::-1][...,:maxLevel+1]#reverse height order
+      dataSingle[key] = np.transpose(ncFile_fg[key][lat, :, lon],(2, 0, 1))[...,::-1][...,:maxLevel+1]#reverse height order
       assert dataSingle[key].shape == shape3Dplus
 
     ncFile_fg.close()
@@ -1602,13 +1518,13 @@ def readIconLem2MomDataset(fname_fg,descriptorFile,debug=False,verbosity=0,const
   data["hydro_q"][...,4] = data["qg"]
   data["hydro_q"][...,5] = data["qh"]
 
-  pamData["hydro_n"] = np.zeros(data["qnc"].shape + (nHydro,)) + np.nan
-  pamData["hydro_n"][...,0] = data["qnc"]
-  pamData["hydro_n"][...,1] = data["qni"]
-  pamData["hydro_n"][...,2] = data["qnr"]
-  pamData["hydro_n"][...,3] = data["qns"]
-  pamData["hydro_n"][...,4] = data["qng"]
-  pamData["hydro_n"][...,5] = data["qnh"]
+  data["hydro_n"] = np.zeros(data["qnc"].shape + (nHydro,)) + np.nan
+  data["hydro_n"][...,0] = data["qnc"]
+  data["hydro_n"][...,1] = data["qni"]
+  data["hydro_n"][...,2] = data["qnr"]
+  data["hydro_n"][...,3] = data["qns"]
+  data["hydro_n"][...,4] = data["qng"]
+  data["hydro_n"][...,5] = data["qnh"]
 
   varPairs = [["timestamp","timestamp"],["lat_2","lat"],["lon_2","lon"],
     ["u_10m","wind10u"],["v_10m","wind10v"],
@@ -2056,9 +1972,6 @@ def readMesoNH(fnameBase,fnameExt,dataDir=".",debug=False,verbosity=0,dimX=160,d
     del data_mesonh
 
   except Exception as inst:
-    if fname.split(".")[-1]!="nc":
-      if verbosity>1:print("removing ", glob.glob(tmpFile+"*"))
-      os.system("rm -f "+tmpFile+"*")
     print("ERROR:", fname)
     print(type(inst))     # the exception instance
     print(inst.args)      # arguments stored in .args
@@ -2415,6 +2328,129 @@ def readIcon2momOnFlightTrack(fname, descriptorFile, debug=False, verbosity=0):
   
   
 
+def readProfileStore(dirname,subGrid=None):
+  """
+  import a profile store written by pyPamtra.writeProfileStore. The variables are memory
+  mapped, only the columns of subGrid are read from disk.
+
+  Parameters
+  ----------
+  dirname : {str}
+    directory of the store
+  subGrid : {[int,int,int,int]}, optional
+    indices [x_start,x_end,y_start,y_end] of the columns to read (the default is None, i.e. all columns)
+
+  Returns
+  -------
+  pam : pyPamtra Object
+  """
+  pam = pyPamtra()
+  pam.readProfileStore(dirname,subGrid=subGrid)
+  return pam
+
+def readTiles(readFunction,gridShape,tileShape,args=(),kwargs={},prefetch=False):
+  """
+  generator importing a domain tile by tile, so that domains larger than the memory can be
+  processed. For every tile readFunction is called with the subGrid argument of the tile.
+  Importers which read only the subGrid hyperslab from the files are readCosmoDe1MomDataset
+  (gop_fields_SynSatMic), readCosmoDe2MomDataset, readIconLem1MomDataset,
+  readIconLem2MomDataset and readProfileStore. Use tileResultWriter to join the results of the tiles.
+
+  Parameters
+  ----------
+  readFunction : {function}
+    importer with argument subGrid=[x_start,x_end,y_start,y_end]
+  gridShape : {(int,int)}
+    number of columns of the whole domain in x and y direction
+  tileShape : {(int,int)}
+    number of columns of a tile in x and y direction
+  args : {tuple}, optional
+    positional arguments of readFunction (the default is ())
+  kwargs : {dict}, optional
+    keyword arguments of readFunction (the default is {})
+  prefetch : {bool}, optional
+    read the next tile on a background thread while the current one is processed. Both tiles
+    are in memory then. Hold ncLock if netCDF files are used in the meantime. (the default is False)
+
+  Yields
+  ------
+  subGrid : {[int,int,int,int]}
+    indices of the tile in the domain
+  pam : pyPamtra Object
+    tile
+  """
+  tiles = list()
+  for xStart in range(0,gridShape[0],tileShape[0]):
+    for yStart in range(0,gridShape[1],tileShape[1]):
+      tiles.append([xStart,min(xStart+tileShape[0],gridShape[0]),yStart,min(yStart+tileShape[1],gridShape[1])])
+
+  def read(subGrid):
+    with ncLock:
+      return readFunction(*args,subGrid=subGrid,**kwargs)
+
+  if not prefetch:
+    for subGrid in tiles:
+      yield subGrid, read(subGrid)
+    return
+
+  from concurrent.futures import ThreadPoolExecutor
+  pool = ThreadPoolExecutor(max_workers=1)
+  try:
+    future = pool.submit(read,tiles[0])
+    for tt, subGrid in enumerate(tiles):
+      pam = future.result()
+      if tt+1 < len(tiles): future = pool.submit(read,tiles[tt+1])
+      yield subGrid, pam
+      del pam
+  finally:
+    pool.shutdown(wait=True)
+
+class tileResultWriter(object):
+  """
+  writes the results of the tiles of readTiles to a single NetCDF4 file with the layout of
+  the result sink of runParallelPamtra (see pyPamtra._openResultSink). The file is created with
+  the first tile, all tiles must be run with the same settings and frequencies.
+
+  Example
+  -------
+  writer = tileResultWriter("results.nc",(nx,ny))
+  for subGrid, pam in readTiles(readIconLem2MomDataset,(nx,ny),(100,100),args,kwargs,prefetch=True):
+    pam.runParallelPamtra(freqs)
+    writer.write(subGrid,pam)
+  writer.close()
+  """
+
+  def __init__(self,fname,gridShape,ncCompression=False):
+    self.fname = fname
+    self.gridShape = gridShape
+    self.ncCompression = ncCompression
+    self._sink = None
+
+  def write(self,subGrid,pam):
+    """
+    write the results of tile pam with subGrid [x_start,x_end,y_start,y_end]
+    """
+    indices = (0,pam.set["nfreqs"],subGrid[0],subGrid[1],subGrid[2],subGrid[3])
+    results = dict((key, pam.r[key]) for key in pam._slicedResultKeys())
+    with ncLock:
+      if self._sink is None:
+        #the sink keeps the settings and meta data of the first tile, but not its results
+        self._sink = pyPamtra()
+        self._sink.set = deepcopy(pam.set)
+        self._sink.nmlSet = deepcopy(pam.nmlSet)
+        self._sink.r = pam.r
+        self._sink._openResultSink(self.fname,ncCompression=self.ncCompression,gridShape=self.gridShape)
+        self._sink.r = dict((key, pam.r[key]) for key in ["angles_deg","pamtraVersion","pamtraHash"] if key in pam.r)
+      self._sink._writeResultSink(indices,results)
+    return
+
+  def close(self):
+    if self._sink is not None:
+      with ncLock:
+        self._sink._closeResultSink()
+      self._sink = None
+    return
+
 def createUsStandardProfile(pam=pyPamtra(),**kwargs):
   '''
   Function to create clear sky US Standard Atmosphere.
@@ -2475,12 +2511,26 @@ def _createUsStandardProfile(**kwargs):
   return pamData
 
 #helper function
-def ncToDict(ncFilePath,keys='all',joinDimension='time',offsetKeys={},ncLib='netCDF4',tmpDir="/tmp/",skipFiles=[]):
+def ncToDict(ncFilePath,keys='all',joinDimension='time',offsetKeys={},ncLib='netCDF4',tmpDir="/tmp/",skipFiles=[],slices={},lazy=False):
   '''
   Load keys of netcdf file into dictionary that is returned.
   By using wildcards in ncFilePath, multiple files are possible. They are joint using joinDimension. 
   Offsets of e.g.,, time vector can be corrected by offsetKeys with value to be corrected as key as correction key in value.
-  gzip compressed netcdf with extension .gz are possible.
+  gzip compressed netcdf with extension .gz are possible, they are decompressed in memory (with netCDF4) or to tmpDir.
+
+  The sizes of joinDimension are determined first, so every joined variable is allocated only
+  once. Files without any selected part of joinDimension are not read at all. Compressed files
+  are decompressed once, they stay open (in memory or in tmpDir) from the scan until they are
+  read. With lazy=True, they are decompressed again whenever the variables are indexed.
+
+  Parameters
+  ----------
+  slices : {dict}, optional
+    slice or sorted list of indices per dimension name, only this part of the variables is read.
+    For joinDimension the indices refer to the joined dimension. (the default is {})
+  lazy : {bool}, optional
+    return ncLazyVariable objects for the variables with joinDimension, which read the data only
+    when they are indexed. (the default is False)
   '''
   if ncLib == 'netCDF4':
     import netCDF4 as nc
@@ -2493,8 +2543,6 @@ def ncToDict(ncFilePath,keys='all',joinDimension='time',offsetKeys={},ncLib='net
     openNc = nc.NetCDFFile
   else:
     raise ImportError('ncLib must be netCDF4, netCDF3 or Scientific.IO.NetCDF')
-  joinDimensionNumber = dict()
-  joinedData = dict()
   if type(ncFilePath) == list:
     ncFiles = ncFilePath
   else:
@@ -2509,49 +2557,270 @@ def ncToDict(ncFilePath,keys='all',joinDimension='time',offsetKeys={},ncLib='net
       ncFiles.remove(ncFile)
       print("skipping:", ncFile)
 
-  for nn, ncFile in enumerate(ncFiles):
-    tmpFile=False
-    if ncFile.split(".")[-1]=="gz":
-      tmpFile = True
-      gzFile = deepcopy(ncFile)
-      ncFile = tmpDir+"/maxLibs_netcdf_"+''.join(randomLib.choice(string.ascii_uppercase + string.digits) for x in range(5))+".tmp.nc"
-      print('uncompressing', nn+1,'of',len(ncFiles), gzFile, ncFile)
-      returnValue = os.system("zcat "+gzFile+">"+ncFile)
-      assert returnValue == 0
+  reader = _ncJoinReader(ncFiles,openNc,ncLib == 'netCDF4',tmpDir,joinDimension,offsetKeys,slices)
+
+  try:
+    #scan the files: variables, dimensions and size of joinDimension
+    for nn in range(len(ncFiles)):
+      ncData, tmpFile = reader.open(nn,verbose=True)
+      try:
+        if nn == 0:
+          if keys == 'all':
+            keys = list(ncData.variables.keys())
+          #make sure the join dimension is actually present!
+          if noFiles > 1: assert joinDimension in list(ncData.dimensions.keys())
+          reader.scanVariables(ncData,keys)
+        reader.scanJoinLength(ncData)
+      except:
+        reader.close(ncData,tmpFile)
+        raise
+      #keep compressed files open to read them without decompressing them again
+      if reader.compressed(nn) and ((nn == 0) or not lazy):
+        reader.keep(nn,ncData,tmpFile)
+      else:
+        reader.close(ncData,tmpFile)
+
+    rows = reader.selectedRows()
+    reader.release(keep=reader.selectedFiles(rows))
+
+    joinedKeys = [key for key in keys if reader.joinAxis[key] is not None]
+    joinedData = dict()
+    #variables without joinDimension are taken from the first file
+    otherKeys = [key for key in keys if reader.joinAxis[key] is None]
+    if len(otherKeys) > 0:
+      ncData, tmpFile = reader.open(0)
+      try:
+        for key in otherKeys:
+          joinedData[key] = reader.readVariable(ncData,key,tuple(reader.index[key]))
+      finally:
+        reader.close(ncData,tmpFile)
+
+    if lazy and (np.ndim(rows) == 1):
+      reader.release()
+      for key in joinedKeys:
+        joinedData[key] = ncLazyVariable(reader,key,rows)
     else:
-      print('opening', nn+1,'of',len(ncFiles), ncFile)
-    try: ncData = openNc(ncFile,'r')
+      joinedData.update(reader.read(joinedKeys,rows))
+  finally:
+    reader.release()
+  return joinedData
+
+class _ncJoinReader(object):
+  """
+  reads variables of several netcdf files joined along joinDimension, see ncToDict
+  """
+
+  def __init__(self,ncFiles,openNc,inMemory,tmpDir,joinDimension,offsetKeys,slices):
+    self.ncFiles = ncFiles
+    self.openNc = openNc
+    self.inMemory = inMemory
+    self.tmpDir = tmpDir
+    self.joinDimension = joinDimension
+    self.offsetKeys = offsetKeys
+    self.slices = slices
+    self.joinLength = list()
+    self.joinAxis = dict() #position of joinDimension in the variable, None if missing
+    self.outAxis = dict() #position of joinDimension in the result
+    self.index = dict() #index of the variable, the entry of joinDimension is replaced per file
+    self.shape = dict() #shape of the result without joinDimension
+    self.dtype = dict()
+    self.kept = dict() #(dataset, temporary file) of the files kept open by keep
+
+  def compressed(self,nn):
+    return self.ncFiles[nn].split(".")[-1]=="gz"
+
+  def open(self,nn,verbose=False):
+    """
+    open file nn, returns the dataset and the name of a temporary file to be removed by close
+    """
+    if nn in self.kept:
+      return self.kept[nn]
+    ncFile = self.ncFiles[nn]
+    tmpFile = None
+    if self.compressed(nn):
+      if verbose: print('uncompressing', nn+1,'of',len(self.ncFiles), ncFile)
+      if self.inMemory:
+        return self.openNc(ncFile,'r',memory=_readCompressedFile(ncFile)), None
+      import gzip
+      import shutil
+      import tempfile
+      fd, tmpFile = tempfile.mkstemp(suffix=".tmp.nc",prefix="maxLibs_netcdf_",dir=self.tmpDir)
+      with os.fdopen(fd,"wb") as outFile, gzip.open(ncFile,"rb") as gzFile:
+        shutil.copyfileobj(gzFile,outFile)
+      ncFile = tmpFile
+    elif verbose:
+      print('opening', nn+1,'of',len(self.ncFiles), ncFile)
+    try: return self.openNc(ncFile,'r'), tmpFile
     except: raise RuntimeError("Could not open file: '" + ncFile+"'")
-    if nn == 0:
-      if keys == 'all':
-        keys = list(ncData.variables.keys())
-      #make sure the join dimension is actually present!
-      if noFiles > 1: assert joinDimension in list(ncData.dimensions.keys())
-      #get the axis to join the arrays
-      for key in keys:
-        joinDimensionNumber[key] = -9999
-        for dd, dim in enumerate(ncData.variables[key].dimensions):
-          if dim == joinDimension:
-            joinDimensionNumber[key] = dd
-    #get and join the data
+
+  def close(self,ncData,tmpFile):
+    #files kept open are closed by release
+    if any(ncData is kept for kept, _ in self.kept.values()):
+      return
+    ncData.close()
+    if tmpFile is not None:
+      os.remove(tmpFile)
+
+  def keep(self,nn,ncData,tmpFile):
+    """
+    keep file nn open, open returns it again until it is released
+    """
+    self.kept[nn] = (ncData,tmpFile)
+
+  def release(self,keep=()):
+    """
+    close the files kept open, except for the file numbers in keep
+    """
+    for nn in list(self.kept.keys()):
+      if nn not in keep:
+        ncData, tmpFile = self.kept.pop(nn)
+        self.close(ncData,tmpFile)
+
+  def scanVariables(self,ncData,keys):
     for key in keys:
-      #special sausage for nc files with time offset
-      if key in list(offsetKeys.keys()):
-        data = ncData.variables[key][:] + ncData.variables[offsetKeys[key]].getValue()
-      else:
-        if ncData.variables[key].shape == ():
-          data = ncData.variables[key].getValue()
+      var = ncData.variables[key]
+      dims = list(var.dimensions)
+      self.joinAxis[key] = dims.index(self.joinDimension) if self.joinDimension in dims else None
+      self.index[key] = [self.slices.get(dim,slice(None)) for dim in dims]
+      self.shape[key] = list()
+      self.outAxis[key] = 0
+      for dd, dim in enumerate(dims):
+        if dd == self.joinAxis[key]:
+          self.outAxis[key] = len(self.shape[key])
         else:
-          data = ncData.variables[key][:]
-      if nn == 0:
-        joinedData[key] = data
-      elif joinDimensionNumber[key] != -9999:
-        joinedData[key] = np.ma.concatenate((joinedData[key],data),axis=joinDimensionNumber[key])
-      else:
-        #skip since data is already in joinedData
-        continue
-    ncData.close()
-    if (tmpFile and ncFile.split(".")[-2] == "tmp"):
-      #os.system("rm -f "+ncFile)
-      os.remove(ncFile)
-  return joinedData
+          self.shape[key] += list(np.arange(var.shape[dd])[self.index[key][dd]].shape)
+      dtype = np.dtype(object) if var.dtype == str else np.dtype(var.dtype)
+      if key in list(self.offsetKeys.keys()):
+        dtype = np.result_type(dtype,ncData.variables[self.offsetKeys[key]].dtype)
+      self.dtype[key] = dtype
+
+  def scanJoinLength(self,ncData):
+    if self.joinDimension in list(ncData.dimensions.keys()):
+      dim = ncData.dimensions[self.joinDimension]
+      self.joinLength.append(len(dim) if hasattr(dim,"__len__") else ncData.variables[self.joinDimension].shape[0])
+    else:
+      self.joinLength.append(1)
+
+  def selectedRows(self):
+    """
+    indices of the joined dimension selected by slices (int, if it is dropped)
+    """
+    return np.arange(sum(self.joinLength))[self.slices.get(self.joinDimension,slice(None))]
+
+  def selectedFiles(self,rows):
+    """
+    numbers of the files holding the rows of the joined dimension and of the first file
+    """
+    offsets = np.cumsum(self.joinLength)
+    return set([0]) | set(np.searchsorted(offsets,np.atleast_1d(rows),side="right").tolist())
+
+  def readVariable(self,ncData,key,index):
+    var = ncData.variables[key]
+    if var.shape == ():
+      data = var.getValue()
+    else:
+      data = var[index]
+    #special sausage for nc files with time offset
+    if key in list(self.offsetKeys.keys()):
+      data = data + ncData.variables[self.offsetKeys[key]].getValue()
+    return data
+
+  def read(self,keys,rows):
+    """
+    read keys for the rows (int or array of indices) of the joined dimension. Every file is
+    opened once, the results are allocated once.
+    """
+    scalar = (np.ndim(rows) == 0)
+    rows = np.atleast_1d(rows)
+    unique, position = np.unique(rows,return_inverse=True)
+    offsets = np.cumsum([0] + self.joinLength)
+
+    #part of every file: local indices and their slot in the result
+    parts = list()
+    for nn in range(len(self.ncFiles)):
+      first, last = np.searchsorted(unique,[offsets[nn],offsets[nn+1]])
+      if last > first:
+        parts.append((nn, _compactIndex(unique[first:last] - offsets[nn]), slice(first,last)))
+
+    data = dict()
+    direct = (len(parts) == 1) and (not scalar) and np.array_equal(unique,rows)
+    if not direct:
+      for key in keys:
+        shape = list(self.shape[key])
+        shape.insert(self.outAxis[key],len(unique))
+        data[key] = np.ma.masked_all(shape,dtype=self.dtype[key])
+
+    for nn, localIndex, slot in parts:
+      ncData, tmpFile = self.open(nn)
+      try:
+        for key in keys:
+          index = list(self.index[key])
+          index[self.joinAxis[key]] = localIndex
+          if direct:
+            data[key] = self.readVariable(ncData,key,tuple(index))
+          else:
+            data[key][(slice(None),)*self.outAxis[key] + (slot,)] = self.readVariable(ncData,key,tuple(index))
+      finally:
+        self.close(ncData,tmpFile)
+
+    if not direct:
+      for key in keys:
+        if scalar:
+          data[key] = data[key][(slice(None),)*self.outAxis[key] + (0,)]
+        elif not np.array_equal(unique,rows):
+          data[key] = data[key].take(position.reshape(-1),axis=self.outAxis[key])
+    return data
+
+def _compactIndex(indices):
+  #slice for evenly spaced indices, netCDF libraries read them as hyperslab
+  if len(indices) == 1:
+    return slice(indices[0],indices[0]+1)
+  step = indices[1] - indices[0]
+  if np.all(np.diff(indices) == step):
+    return slice(indices[0],indices[-1]+1,step)
+  return list(indices)
+
+class ncLazyVariable(object):
+  """
+  variable returned by ncToDict with lazy=True. The data is read when the variable is indexed,
+  only the files holding the requested part of the joined dimension are opened. np.asarray
+  reads everything.
+  """
+
+  def __init__(self,reader,key,rows):
+    self._reader = reader
+    self._key = key
+    self._rows = rows
+    self.dtype = reader.dtype[key]
+    shape = list(reader.shape[key])
+    shape.insert(reader.outAxis[key],len(rows))
+    self.shape = tuple(shape)
+    self.ndim = len(self.shape)
+
+  def __len__(self):
+    return self.shape[0]
+
+  def __repr__(self):
+    return "ncLazyVariable(%s, shape=%s, dtype=%s)" % (self._key,self.shape,self.dtype)
+
+  def __getitem__(self,item):
+    if not isinstance(item,tuple): item = (item,)
+    axis = self._reader.outAxis[self._key]
+    simple = all(isinstance(ii,(slice,int,np.integer)) for ii in item[:axis]) and \
+      all(isinstance(ii,(slice,int,np.integer)) or (ii is Ellipsis) for ii in item[axis+1:])
+    if (not simple) or (len(item) <= axis) or (item[axis] is Ellipsis) or (item[axis] is None):
+      #select the joined dimension afterwards
+      return self._reader.read([self._key],self._rows)[self._key][item]
+    rows = self._rows[item[axis]]
+    data = self._reader.read([self._key],rows)[self._key]
+    if np.ndim(rows) == 0:
+      rest = item[:axis] + item[axis+1:]
+    else:
+      rest = item[:axis] + (slice(None),) + item[axis+1:]
+    if all(isinstance(ii,slice) and ii == slice(None) for ii in rest):
+      return data
+    return data[rest]
+
+  def __array__(self,dtype=None,copy=None):
+    data = self._reader.read([self._key],self._rows)[self._key]
+    return np.asarray(data,dtype=dtype)
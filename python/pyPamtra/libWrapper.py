@@ -9,6 +9,9 @@ import numpy# as np
 #import string
 import copy
 import sys
+import time
+import collections
+import pickle
 
 try:
     from .pyPamtraLib import *
@@ -16,6 +19,11 @@ except ImportError:
     print('PAMTRA FORTRAN LIBRARY NOT AVAILABLE!')
 
 
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    shared_memory = None
+
 
 is3 = sys.version_info[0] == 3
 
@@ -30,6 +38,10 @@ def PamtraFortranWrapper(
   profile,
   returnModule=True
   ):
+  '''
+  run the Fortran library. The results are copied from the Fortran output arrays, which are
+  deallocated one by one right after copying.
+  '''
   from . import pyPamtraLib
 
   report_module.verbose = sets["verbose"]
@@ -96,8 +108,8 @@ def PamtraFortranWrapper(
   for name in descriptorFile.dtype.names:
     #1D data
     if name in ["moment_in","liq_ice"]:#,
-      if sets["pyVerbose"] > 3: print(("descriptor_file."+name +"_arr = descriptorFile['"+name+"'].tolist()"))
-      setattr(descriptor_file, name +"_arr", descriptorFile[name].tolist())
+      if sets["pyVerbose"] > 3: print(("descriptor_file."+name +"_arr = descriptorFile['"+name+"']"))
+      setattr(descriptor_file, name +"_arr", descriptorFile[name])
     #1d Strings, these are ugly...
     elif name in ["hydro_name","dist_name","scat_name","vel_size_mod"]:
       if sets["pyVerbose"] > 3: print("setattr("+"descriptor_file"+","+ name+"_str"+", ','.join(descriptorFile[name])))")
@@ -107,13 +119,13 @@ def PamtraFortranWrapper(
       setattr(descriptor_file, name+"_str", thisStr.ljust(maxLen))
     #potential 4D data
     else:
-      if sets["pyVerbose"] > 3: print(("descriptor_file."+name +"_arr = [[[descriptorFile['"+name+"'].tolist()]]]"))
-      setattr(descriptor_file, name +"_arr", [[[descriptorFile[name].tolist()]]])
+      if sets["pyVerbose"] > 3: print(("descriptor_file."+name +"_arr = descriptorFile['"+name+"'].reshape(1,1,1,-1)"))
+      setattr(descriptor_file, name +"_arr", descriptorFile[name].reshape(1,1,1,-1))
   for name4d in list(descriptorFile4D.keys()):
     assert descriptorFile4D[name4d].shape[0] == profile["lat"].shape[0]
     assert descriptorFile4D[name4d].shape[1] == profile["lat"].shape[1]
-    if sets["pyVerbose"] > 3: print(("descriptor_file."+name4d +"_arr = descriptorFile4D['"+name4d+"'].tolist()"))
-    setattr(descriptor_file, name4d +"_arr", descriptorFile4D[name4d].tolist())
+    if sets["pyVerbose"] > 3: print(("descriptor_file."+name4d +"_arr = descriptorFile4D['"+name4d+"']"))
+    setattr(descriptor_file, name4d +"_arr", fortranArray(descriptorFile4D[name4d]))
 
 
   descriptor_file.process_descriptor_file()
@@ -160,11 +172,11 @@ def PamtraFortranWrapper(
       if sets["pyVerbose"] > 3: print(("vars_atmosphere."+key +" = profile['"+key+"'])"))
       setattr(vars_atmosphere, key, profile[key])
     elif type(profile[key]) in [int, float, str]:
-      if sets["pyVerbose"] > 3: print(("vars_atmosphere.atmo_"+key +" = profile['"+key+"'].tolist()"))
+      if sets["pyVerbose"] > 3: print(("vars_atmosphere.atmo_"+key +" = profile['"+key+"']"))
       setattr(vars_atmosphere, "atmo_"+key, profile[key])
     elif type(profile[key]) == numpy.ndarray:
-      if sets["pyVerbose"] > 3: print(("vars_atmosphere.atmo_"+key +" = profile['"+key+"'].tolist()"))
-      setattr(vars_atmosphere, "atmo_"+key, profile[key].tolist())
+      if sets["pyVerbose"] > 3: print(("vars_atmosphere.atmo_"+key +" = profile['"+key+"']"))
+      setattr(vars_atmosphere, "atmo_"+key, fortranArray(profile[key]))
     else:
       raise TypeError("do not understand type of "+ key+": " + str(type(profile[key])))
     #vars_atmosphere.atmo_max_nlyr
@@ -198,8 +210,8 @@ def PamtraFortranWrapper(
     for key in list(descriptorFileFS.keys()):
       assert descriptorFileFS[key].shape[0] == profile["lat"].shape[0]
       assert descriptorFileFS[key].shape[1] == profile["lat"].shape[1]
-      if sets["pyVerbose"] > 3: print(("vars_hydrofullspec.hydrofs_"+key +" = descriptorFileFS['"+key+"'].tolist()"))
-      setattr(vars_hydrofullspec, "hydrofs_"+key, descriptorFileFS[key].tolist())
+      if sets["pyVerbose"] > 3: print(("vars_hydrofullspec.hydrofs_"+key +" = descriptorFileFS['"+key+"']"))
+      setattr(vars_hydrofullspec, "hydrofs_"+key, fortranArray(descriptorFileFS[key]))
 
     if sets["pyVerbose"] > 3:
       print("Fortran view on hydro_fullspec variables")
@@ -211,18 +223,29 @@ def PamtraFortranWrapper(
 
   ##process the results!
   results = dict()
+  resultDtype = numpy.dtype(sets.get("resultDtype","float64"))
   for key in ["tb","Ze","emissivity","Att_hydro","Att_atmo","radar_hgt","radar_moments","radar_edges","radar_slopes","radar_quality","radar_snr", "radar_spectra","radar_vel","psd_d","psd_deltad","psd_n","psd_mass","psd_area","psd_bscat","kextatmo","scatter_matrix","extinct_matrix","emis_vector","angles_deg"]:
     if sets["pyVerbose"] > 3: print(("allocTest = vars_output.out_"+key.lower()+" is None"))
     allocTest = getattr(vars_output, "out_"+key.lower()) is None
     if not allocTest:
-      if sets["pyVerbose"] > 3: print(("results['"+key+"'] = copy.deepcopy(vars_output.out_"+key.lower()+")"))
-      results[key] = copy.deepcopy(getattr(vars_output, "out_"+key.lower()))
+      if sets["pyVerbose"] > 3: print(("results['"+key+"'] = vars_output.out_"+key.lower()))
+      value = getattr(vars_output, "out_"+key.lower())
+      if value.dtype.kind == "f":
+        results[key] = value.astype(resultDtype)
+      else:
+        results[key] = numpy.array(value)
+      #free the Fortran array right away, so the results are never kept twice in memory
+      releaseFortranArray(vars_output, "out_"+key.lower())
     else:
       if sets["pyVerbose"] > 3: print("filling key", key)
       if key in ["radar_quality"]: results[key] = -9999
       else: results[key] = -9999.
 
 
+  results["scat_cache_hits"] = int(vars_output.out_scat_cache_hits)
+  results["scat_cache_misses"] = int(vars_output.out_scat_cache_misses)
+  results["timing"] = fortranTiming(vars_output, descriptorFile["scat_name"])
+
   results["pamtraVersion"] = str(pypamtralib.gitversion.astype('U40')).strip()
   results["pamtraHash"] = str(pypamtralib.githash.astype('U40')).strip()  
 
@@ -235,6 +258,24 @@ def PamtraFortranWrapper(
     return results,pamError
 
 
+def releaseFortranArray(module, name):
+  '''
+  deallocate the allocatable array name of the f2py module. f2py deallocates an array when
+  an array of size zero is assigned to it.
+  '''
+  value = getattr(module, name)
+  setattr(module, name, numpy.zeros((0,)*value.ndim, dtype=value.dtype, order="F"))
+
+def fortranArray(arr):
+  '''
+  Return arr as Fortran ordered, contiguous array (float64 for floating point data) which
+  f2py copies into the allocatable arrays of the Fortran modules as it is. Nothing is
+  copied if arr has this layout already, e.g. if it was created with order='F'.
+  '''
+  if numpy.issubdtype(arr.dtype, numpy.floating):
+    return numpy.asfortranarray(arr, dtype=numpy.float64)
+  return numpy.asfortranarray(arr)
+
 def lenFortStrAr(arr):
   '''
   get string length of a fortran string array
@@ -246,6 +287,51 @@ def lenFortStrAr(arr):
   except TypeError:
     return arr.dtype.itemsize
 
+# stages of run_rt which are timed by the Fortran library, in the order of vars_output.timing_*
+timingStages = ["get_gasabs", "set_sfc_optics", "run_drop_size_dist", "calc_scatProperties", "scatcnv", "rt4", "radar_simulator"]
+timingHydroStages = ["run_drop_size_dist", "calc_scatProperties"]
+
+def fortranTiming(vars_output, scatNames):
+  '''
+  Collect the wall-clock time [s] and number of calls of the stages of run_rt.
+
+  Returns a dict with the groups "time" and "calls" (per stage, array of shape nfreqs),
+  "hydro_time" and "hydro_calls" (run_drop_size_dist and calc_scatProperties, shape
+  nhydro x nfreqs) and "scat_name_time" and "scat_name_calls" (calc_scatProperties summed
+  per scattering model, shape nfreqs).
+  '''
+  stageTime = numpy.array(vars_output.out_timing)
+  stageCalls = numpy.array(vars_output.out_timing_calls)
+  hydroTime = numpy.array(vars_output.out_timing_hydro)
+  hydroCalls = numpy.array(vars_output.out_timing_hydro_calls)
+
+  timing = dict()
+  timing["time"] = dict((stage, stageTime[ss]) for ss, stage in enumerate(timingStages))
+  timing["calls"] = dict((stage, stageCalls[ss]) for ss, stage in enumerate(timingStages))
+  timing["hydro_time"] = dict((stage, hydroTime[ss]) for ss, stage in enumerate(timingHydroStages))
+  timing["hydro_calls"] = dict((stage, hydroCalls[ss]) for ss, stage in enumerate(timingHydroStages))
+  timing["scat_name_time"] = dict()
+  timing["scat_name_calls"] = dict()
+  for hh, scatName in enumerate(scatNames):
+    scatName = str(scatName).strip()
+    if scatName not in timing["scat_name_time"]:
+      timing["scat_name_time"][scatName] = numpy.zeros(stageTime.shape[-1])
+      timing["scat_name_calls"][scatName] = numpy.zeros(stageCalls.shape[-1], dtype=stageCalls.dtype)
+    timing["scat_name_time"][scatName] += hydroTime[1, hh]
+    timing["scat_name_calls"][scatName] += hydroCalls[1, hh]
+  return timing
+
+def joinTiming(total, timing, pp_startF, pp_endF, nfreqs):
+  '''
+  add the timing of a job (see fortranTiming) to total which covers all nfreqs frequencies
+  '''
+  for group in timing:
+    total.setdefault(group, dict())
+    for key, value in timing[group].items():
+      if key not in total[group]:
+        total[group][key] = numpy.zeros(value.shape[:-1] + (nfreqs,), dtype=value.dtype)
+      total[group][key][..., pp_startF:pp_endF] += value
+  return total
 
 
 
@@ -283,14 +369,318 @@ def lenFortStrAr(arr):
 #     _str_py2f(fortranList)[pp][len(pythonStr):] = " "
 #   return
 
+def releaseFortranDatabases(verbose=0):
+  """
+  Free the databases which are kept in memory by the Fortran library between runs
+  (TELSEM2 emissivity atlas, Hong DDA database). They are read again from disk when needed.
+  """
+  from . import pyPamtraLib
+
+  report_module.verbose = verbose
+  error = deallocate_everything.do_release_databases()
+  if error > 0: raise RuntimeError("Error in release databases")
+  return
+
+def telsem2Emissivity(month, lon, lat, freq, mu, dataPath='$PAMTRA_DATADIR', verbose=0):
+  """
+  Land surface emissivities from the TELSEM2 atlas for a batch of locations.
+  The monthly atlas is read once and kept in memory for following calls.
+
+  Parameters
+  ----------
+  month : int or str
+    month (1-12)
+  lon, lat : array_like
+    longitudes and latitudes in deg, same shape
+  freq : float
+    frequency in GHz
+  mu : array_like
+    cosines of the observation angles
+  dataPath : str, optional
+    PAMTRA data directory, environment variables are expanded.
+  verbose : int, optional
+    verbosity of the Fortran library
+
+  Returns
+  -------
+  emissivity : ndarray
+    emissivities with shape lon.shape + (2, len(mu)), vertical and horizontal polarization.
+  """
+  from . import pyPamtraLib
+
+  report_module.verbose = verbose
+  lon = numpy.asarray(lon, dtype=numpy.float32)
+  lat = numpy.asarray(lat, dtype=numpy.float32)
+  assert lon.shape == lat.shape
+  mu = numpy.atleast_1d(numpy.asarray(mu, dtype=numpy.float64))
+
+  dataPath = os.path.expandvars(dataPath)
+  settings.data_path = dataPath.ljust(lenFortStrAr(settings.data_path))
+
+  error, emissivity = pypamtralib.run_telsem2("%02d" % int(month), lon.ravel(), lat.ravel(), freq, mu)
+  if error > 0: raise RuntimeError("Error in run_telsem2")
+  # Fortran order is (pol, angle, pixel)
+  return numpy.moveaxis(emissivity, -1, 0).reshape(lon.shape + (2, len(mu)))
+
 def parallelPamtraFortranWrapper(indices, *args, **kwargs):
   if args[0]["pyVerbose"] > 1: print('starting', __name__, 'parent process:', os.getppid(), 'process id:', os.getpid())
-  results, pamError = PamtraFortranWrapper(*args, **kwargs)
+  tttt = time.time()
+  #namelist settings and descriptor file passed once via shareJobConstants
+  constants = kwargs.pop("constants", None)
+  if constants is not None:
+    args = args[:1] + tuple(jobConstants(constants)) + args[3:]
+  results, pamError = PamtraFortranWrapper(*args, **kwargs)[:2]
+  results["runtime"] = time.time() - tttt
   host = os.uname()[1]
   return indices, results, pamError, host
   #return indices, dict()
 
 
+#description of a numpy array living in shared memory, passed to the workers instead of the data
+_sharedArray = collections.namedtuple("_sharedArray", ["name", "shape", "dtype", "isCharArray"])
+
+def toSharedMemory(data, handles):
+  '''
+  Copy all numpy arrays of dict data to POSIX shared memory.
+
+  Parameters
+  ----------
+  data : dict
+    dictionary with numpy arrays (and other items which are kept as they are)
+  handles : list
+    the SharedMemory objects are appended to handles. The caller has to close and
+    unlink them with releaseSharedMemory once all workers are done.
+
+  Returns
+  -------
+  sharedData : dict
+    copy of data with the numpy arrays replaced by their shared memory description.
+  '''
+  if shared_memory is None:
+    raise ImportError("multiprocessing.shared_memory is not available, Python >= 3.8 required")
+  sharedData = dict()
+  for key in list(data.keys()):
+    if isinstance(data[key], numpy.ndarray) and (data[key].dtype != object):
+      arr = numpy.ascontiguousarray(data[key])
+      shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+      handles.append(shm)
+      numpy.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+      sharedData[key] = _sharedArray(shm.name, arr.shape, arr.dtype.str, isinstance(data[key], numpy.chararray))
+    else:
+      sharedData[key] = data[key]
+  return sharedData
+
+def sharedArray(shape, dtype, fill, handles):
+  '''
+  Create an array filled with fill in a new block of POSIX shared memory.
+
+  The SharedMemory object is appended to handles together with the reference count of its
+  memory map before the array was created. The block can be unlinked with unlinkSharedMemory
+  as soon as no worker needs to attach anymore, it is closed by closeUnusedSharedMemory once
+  no array uses it anymore.
+
+  Returns
+  -------
+  sharedArr : ndarray
+    array living in shared memory
+  description : _sharedArray
+    description of the block which can be passed to workers (see fromSharedMemory)
+  '''
+  if shared_memory is None:
+    raise ImportError("multiprocessing.shared_memory is not available, Python >= 3.8 required")
+  dtype = numpy.dtype(dtype)
+  shape = tuple(shape)
+  shm = shared_memory.SharedMemory(create=True, size=max(int(numpy.prod(shape))*dtype.itemsize, 1))
+  # numpy releases the buffer of shm.buf right away and references the memory map instead,
+  # thus the arrays using the block are only visible in the reference count of the map
+  handles.append((shm, sys.getrefcount(shm.buf.obj)))
+  sharedArr = numpy.ndarray(shape, dtype=dtype, buffer=shm.buf)
+  sharedArr[...] = fill
+  return sharedArr, _sharedArray(shm.name, shape, dtype.str, False)
+
+def resultSlice(key, pp_startF, pp_endF, pp_startX, pp_endX, pp_startY, pp_endY):
+  '''
+  index expression of the part of the result array key which is computed by a single job
+  '''
+  sliceF = slice(pp_startF, pp_endF)
+  sliceX = slice(pp_startX, pp_endX)
+  sliceY = slice(pp_startY, pp_endY)
+  if key in ["radar_hgt", "psd_d", "psd_n", "psd_mass", "psd_area", "psd_bscat"]:
+    return (sliceX, sliceY)
+  elif key == "tb":
+    return (sliceX, sliceY, slice(None), slice(None), sliceF)
+  elif key == "radar_vel":
+    return (sliceF,)
+  else:
+    return (sliceX, sliceY, slice(None), sliceF)
+
+def releaseSharedMemory(handles):
+  '''
+  close and unlink the SharedMemory objects created by toSharedMemory
+  '''
+  while len(handles) > 0:
+    shm = handles.pop()
+    shm.close()
+    _unlinkSharedMemory(shm)
+  return
+
+def unlinkSharedMemory(handles):
+  '''
+  unlink the SharedMemory objects created by sharedArray, but keep them open. The arrays
+  stay valid, but no worker can attach anymore.
+  '''
+  for shm, _ in handles:
+    _unlinkSharedMemory(shm)
+  return
+
+def closeUnusedSharedMemory(handles):
+  '''
+  close the SharedMemory objects created by sharedArray which are not used by any array
+  anymore. The others are kept in handles.
+  '''
+  inUse = list()
+  while len(handles) > 0:
+    shm, unusedRefs = handles.pop()
+    if sys.getrefcount(shm.buf.obj) > unusedRefs:
+      inUse.append((shm, unusedRefs))
+    else:
+      shm.close()
+  handles.extend(inUse)
+  return
+
+def shareResourceTracker():
+  '''
+  start the resource tracker of this process before workers are created, so that all workers
+  report to it instead of starting their own ones (see _attachSharedMemory). Call it before
+  creating a multiprocessing pool which uses shared memory.
+  '''
+  if shared_memory is not None and sys.version_info < (3, 13):
+    resource_tracker.ensure_running()
+  return
+
+def _unlinkSharedMemory(shm):
+  try: shm.unlink()
+  except FileNotFoundError: pass
+
+def _attachSharedMemory(name):
+  # the parent owns the shared memory, thus workers must not track it with the
+  # resource tracker. Otherwise it might be unlinked when the first worker exits.
+  if sys.version_info >= (3, 13):
+    return shared_memory.SharedMemory(name=name, track=False)
+  # older versions always register the block. The workers share the tracker of the parent
+  # (see shareResourceTracker) which tracks the block already, thus the registration is a
+  # no-op. Unregistering it here would race with the other workers.
+  return shared_memory.SharedMemory(name=name)
+
+def fromSharedMemory(sharedData, handles, pp_startX, pp_endX, pp_startY, pp_endY):
+  '''
+  Inverse of toSharedMemory for a single worker: returns views of the
+  [pp_startX:pp_endX,pp_startY:pp_endY] part of all shared arrays. No data is copied.
+  The attached SharedMemory objects are appended to handles, close them with
+  closeSharedMemory after all views have been deleted.
+  '''
+  data = dict()
+  for key in list(sharedData.keys()):
+    if isinstance(sharedData[key], _sharedArray):
+      shm = _attachSharedMemory(sharedData[key].name)
+      handles.append(shm)
+      arr = numpy.ndarray(sharedData[key].shape, dtype=numpy.dtype(sharedData[key].dtype), buffer=shm.buf)
+      if sharedData[key].isCharArray: arr = arr.view(numpy.chararray)
+      data[key] = arr[pp_startX:pp_endX, pp_startY:pp_endY]
+    else:
+      data[key] = sharedData[key]
+  return data
+
+def closeSharedMemory(handles):
+  '''
+  close (but do not unlink) SharedMemory objects attached by fromSharedMemory
+  '''
+  while len(handles) > 0:
+    handles.pop().close()
+  return
+
+#namelist settings and descriptor file kept by a worker process, see jobConstants
+_workerConstants = dict()
+
+def shareJobConstants(constants, handles):
+  '''
+  Pickle constants (the data which is the same for all jobs, i.e. the namelist settings and
+  the descriptor file) once to shared memory. The SharedMemory object is appended to handles,
+  release it with releaseSharedMemory when the workers do not need it anymore.
+
+  Returns
+  -------
+  shared : tuple
+    name and size of the shared memory, pass it to the workers instead of the constants.
+  '''
+  if shared_memory is None:
+    raise ImportError("multiprocessing.shared_memory is not available, Python >= 3.8 required")
+  data = pickle.dumps(constants, protocol=pickle.HIGHEST_PROTOCOL)
+  shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+  handles.append(shm)
+  shm.buf[:len(data)] = data
+  return shm.name, len(data)
+
+def jobConstants(shared):
+  '''
+  Inverse of shareJobConstants for a worker. The constants are unpickled only by the first
+  job of every worker process and kept until another shared memory block is passed.
+  '''
+  name, size = shared
+  if _workerConstants.get("name") != name:
+    shm = _attachSharedMemory(name)
+    try:
+      constants = pickle.loads(bytes(shm.buf[:size]))
+    finally:
+      shm.close()
+    _workerConstants.clear()
+    _workerConstants["name"] = name
+    _workerConstants["constants"] = constants
+  return _workerConstants["constants"]
+
+def parallelPamtraSharedMemoryWrapper(indices, sets, nmlSets, descriptorFile, profileShared, descriptorFile4DShared, descriptorFileFSShared, resultsShared=None, constants=None, **kwargs):
+  '''
+  like parallelPamtraFortranWrapper, but the profile, 4D descriptor file and full spectrum
+  data are taken from shared memory (see toSharedMemory). Only indices are passed per job.
+  If constants (see shareJobConstants) is given, nmlSets and descriptorFile are taken from it.
+
+  If resultsShared (dict of _sharedArray) is given, the results of these keys are written
+  directly to their part (see resultSlice) of the shared result arrays and are not returned.
+  The keys are listed in results["inPlace"].
+  '''
+  if sets["pyVerbose"] > 1: print('starting', __name__, 'parent process:', os.getppid(), 'process id:', os.getpid())
+  pp_startF, pp_endF, pp_startX, pp_endX, pp_startY, pp_endY = indices
+
+  sets = dict(sets)
+  sets["nfreqs"] = pp_endF - pp_startF
+  sets["freqs"] = sets["freqs"][pp_startF:pp_endF]
+
+  if constants is not None:
+    nmlSets, descriptorFile = jobConstants(constants)
+
+  tttt = time.time()
+  handles = list()
+  try:
+    profile = fromSharedMemory(profileShared, handles, pp_startX, pp_endX, pp_startY, pp_endY)
+    profile["ngridx"] = pp_endX - pp_startX
+    profile["ngridy"] = pp_endY - pp_startY
+    descriptorFile4D = fromSharedMemory(descriptorFile4DShared, handles, pp_startX, pp_endX, pp_startY, pp_endY)
+    descriptorFileFS = fromSharedMemory(descriptorFileFSShared, handles, pp_startX, pp_endX, pp_startY, pp_endY)
+    results, pamError = PamtraFortranWrapper(sets, nmlSets, descriptorFile, descriptorFile4D, descriptorFileFS, profile, **kwargs)[:2]
+    if resultsShared:
+      output = fromSharedMemory(resultsShared, handles, None, None, None, None)
+      for key in list(output.keys()):
+        output[key][resultSlice(key, *indices)] = results[key]
+        del results[key]
+      results["inPlace"] = list(output.keys())
+    results["runtime"] = time.time() - tttt
+  finally:
+    #views must be gone before the shared memory can be closed
+    profile = descriptorFile4D = descriptorFileFS = output = None
+    closeSharedMemory(handles)
+  host = os.uname()[1]
+  return indices, results, pamError, host
+
 #def PamtraFortranWrapper_OLD(nmlSets,nmlDefaultSettings,nmlFile,*pamtraArgs):
   #"""
   #this wrapper is needed because pp cannot work with fortran modules directly. returns results from pamtra AND name of the host (for pp statistics)
@@ -51,3 +51,101 @@ def formatExceptionInfo(maxTBlevel=5):
         excArgs = "<no args>"
     excTb = traceback.format_tb(trbk, maxTBlevel)
     return (excName, excArgs, excTb)
+
+
+def interpColumns(x, xp, yp, nThreads=1, chunkSize=4096):
+    """
+    np.interp with linear extrapolation for many columns at once.
+
+    Inside the range of xp the result equals np.interp, outside of it the first
+    (last) two points are extrapolated linearly.
+
+    Parameters
+    ----------
+    x : array_like
+        new coordinates with shape (..., m)
+    xp : array_like
+        coordinates of the data with shape (..., n), increasing in every column, n >= 2
+    yp : array_like or list of array_like
+        data with shape (..., n) or (..., n, k1, k2, ...). If a list is given, all
+        arrays are interpolated with the same indices.
+    nThreads : int, optional
+        number of threads working on chunks of columns (default 1)
+    chunkSize : int, optional
+        number of columns per chunk (default 4096)
+
+    Returns
+    -------
+    y : array or list of arrays
+        interpolated data with shape (..., m) or (..., m, k1, k2, ...)
+    """
+    isList = isinstance(yp, (list, tuple))
+    if not isList:
+        yp = [yp]
+
+    x = np.asarray(x, dtype=float)
+    xp = np.asarray(xp, dtype=float)
+    colShape = x.shape[:-1]
+    assert xp.shape[:-1] == colShape
+    nCols = int(np.prod(colShape))
+    m = x.shape[-1]
+    n = xp.shape[-1]
+    assert n >= 2
+
+    x2 = x.reshape(nCols, m)
+    xp2 = xp.reshape(nCols, n)
+    yp2 = list()
+    out = list()
+    for arr in yp:
+        arr = np.asarray(arr)
+        assert arr.shape[:len(colShape)+1] == colShape + (n,)
+        extraShape = arr.shape[len(colShape)+1:]
+        yp2.append(arr.reshape(nCols, n, -1))
+        out.append(np.empty((nCols, m, int(np.prod(extraShape))), dtype=np.result_type(arr, float)))
+
+    def interpChunk(c0):
+        c1 = min(c0 + chunkSize, nCols)
+        xc = x2[c0:c1]
+        xpc = xp2[c0:c1]
+        # index of the last xp <= x, -1 below the first point
+        j = np.sum(xpc[:, None, :] <= xc[:, :, None], axis=-1) - 1
+        jc = np.clip(j, 0, n-2)
+        jExact = np.clip(j, 0, n-1)
+        xj = np.take_along_axis(xpc, jc, axis=1)
+        xj1 = np.take_along_axis(xpc, jc+1, axis=1)
+        exact = ((j >= 0) & (xc == np.take_along_axis(xpc, jExact, axis=1)))[..., None]
+        below = (xc < xpc[:, :1])[..., None]
+        above = (xc > xpc[:, -1:])[..., None]
+        xc3 = xc[..., None]
+        xpc3 = xpc[..., None]
+        for ypc, outc in zip(yp2, out):
+            ypc = ypc[c0:c1]
+            yj = np.take_along_axis(ypc, jc[..., None], axis=1)
+            yj1 = np.take_along_axis(ypc, jc[..., None]+1, axis=1)
+            y = (yj1-yj)/(xj1-xj)[..., None] * (xc3-xj[..., None]) + yj
+            y = np.where(exact, np.take_along_axis(ypc, jExact[..., None], axis=1), y)
+            yBelow = ypc[:, :1] + (xc3-xpc3[:, :1]) * (ypc[:, :1]-ypc[:, 1:2]) / (xpc3[:, :1]-xpc3[:, 1:2])
+            yAbove = ypc[:, -1:] + (xc3-xpc3[:, -1:]) * (ypc[:, -1:]-ypc[:, -2:-1]) / (xpc3[:, -1:]-xpc3[:, -2:-1])
+            y = np.where(below, yBelow, y)
+            y = np.where(above, yAbove, y)
+            outc[c0:c1] = y
+
+    chunks = range(0, nCols, chunkSize)
+    if nThreads > 1 and len(chunks) > 1:
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(nThreads)
+        try:
+            pool.map(interpChunk, chunks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for c0 in chunks:
+            interpChunk(c0)
+
+    result = list()
+    for arr, outc in zip(yp, out):
+        result.append(outc.reshape(colShape + (m,) + np.shape(arr)[len(colShape)+1:]))
+    if isList:
+        return result
+    return result[0]
@@ -0,0 +1,37 @@
+import glob
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+# pyPamtra refuses to be imported without PAMTRA_DATADIR, the tests do not need the data
+os.environ.setdefault("PAMTRA_DATADIR", "")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+testDir = os.path.dirname(os.path.abspath(__file__))
+objDir = os.path.join(testDir, "..", "..", "src")
+
+
+@pytest.fixture
+def fortranDriver(tmp_path):
+  '''
+  Returns a function which compiles a driver program of tests/fortran against the objects
+  built by make in src/ and returns its output. The test is skipped if gfortran or the
+  objects are not available. libs are further libraries to link, e.g. ["lapack", "blas"].
+  '''
+  def run(name, libs=()):
+    objects = [obj for obj in glob.glob(os.path.join(objDir, "*.o")) if os.path.basename(obj) != "pamtra.o"]
+    if shutil.which("gfortran") is None:
+      pytest.skip("gfortran not available")
+    if len(objects) == 0:
+      pytest.skip("Fortran objects not built, run make first")
+    #the linker takes only the objects the driver needs from the archive
+    library = str(tmp_path / "libpamtra.a")
+    subprocess.run(["ar", "rcs", library] + objects, check=True)
+    driver = str(tmp_path / name)
+    subprocess.run(["gfortran", "-cpp", "-I" + objDir, "-o", driver, os.path.join(testDir, "fortran", name + ".f90"), library]
+      + ["-l" + lib for lib in libs], check=True)
+    return subprocess.run([driver], check=True, capture_output=True, text=True, cwd=str(tmp_path)).stdout
+  return run
@@ -0,0 +1,94 @@
+program gasabs_lut_driver
+
+  ! Compare get_gasabs with gas_mod R98/L93 and R98_LUT/L93_LUT, see test_gasabs_lut.py.
+  !
+  ! The column holds layers on a grid of temperature, pressure and humidity followed by
+  ! layers outside of the table (too cold, too warm, too high pressure, too humid). For
+  ! every case one line is printed: model, frequency, tolerance, number of layers taken
+  ! from the table, number of them outside of the table, max. relative error of the layers
+  ! taken from the table, max. relative difference of the other layers.
+
+  use kinds, only: dbl, long
+  use settings, only: gas_mod, gas_lut_path, gas_lut_tolerance
+  use report_module, only: verbose
+  use vars_index, only: i_x, i_y
+  use vars_atmosphere, only: atmo_nlyrs, atmo_press, atmo_temp, atmo_vapor_pressure, atmo_rho_vap
+  use vars_rt, only: rt_kextatmo
+  use constants, only: r_v
+  use gasabs_lut, only: gasabs_lut_get, gasabs_lut_release
+
+  implicit none
+
+  integer(kind=long), parameter :: ntemp = 6, npress = 7, nrelhum = 4
+  integer(kind=long), parameter :: nin = ntemp*npress*nrelhum, nout = 4, nlyrs = nin + nout
+  real(kind=dbl), dimension(nlyrs) :: k_direct, k_lut
+  real(kind=dbl) :: e_sat_gg_water, kext, max_err_found, max_diff_direct
+  integer(kind=long) :: i_t, i_p, i_r, nz, nfound, nfound_out, err
+  logical, dimension(nlyrs) :: found
+
+  verbose = -1 ! no warnings about rejected tables
+  gas_lut_path = ''
+  i_x = 1
+  i_y = 1
+  allocate(atmo_nlyrs(1,1), atmo_press(1,1,nlyrs), atmo_temp(1,1,nlyrs), &
+    atmo_vapor_pressure(1,1,nlyrs), atmo_rho_vap(1,1,nlyrs), rt_kextatmo(nlyrs))
+  atmo_nlyrs = nlyrs
+
+  nz = 0
+  do i_t = 1, ntemp
+    do i_p = 1, npress
+      do i_r = 1, nrelhum
+        nz = nz + 1
+        atmo_temp(1,1,nz) = 195._dbl + 21.7_dbl * (i_t-1)
+        atmo_press(1,1,nz) = 150._dbl * 2.9_dbl**(i_p-1)
+        atmo_vapor_pressure(1,1,nz) = (i_r-1) / 3._dbl * 100._dbl * e_sat_gg_water(atmo_temp(1,1,nz))
+      end do
+    end do
+  end do
+  atmo_temp(1,1,nin+1:) = (/140._dbl, 355._dbl, 250._dbl, 290._dbl/)
+  atmo_press(1,1,nin+1:) = (/50000._dbl, 90000._dbl, 115000._dbl, 90000._dbl/)
+  atmo_vapor_pressure(1,1,nin+1:) = 0.5_dbl * 100._dbl * e_sat_gg_water(atmo_temp(1,1,nin+1:))
+  atmo_vapor_pressure(1,1,nlyrs) = 2._dbl * 100._dbl * e_sat_gg_water(atmo_temp(1,1,nlyrs))
+  atmo_rho_vap(1,1,:) = atmo_vapor_pressure(1,1,:) / (r_v * atmo_temp(1,1,:))
+
+  call run_case('R98', 89._dbl, 1.e-3_dbl)
+  call run_case('R98', 31.4_dbl, 1.e-2_dbl)
+  call run_case('L93', 31.4_dbl, 1.e-2_dbl)
+  call run_case('L93', 150._dbl, 1.e-2_dbl)
+  ! a tolerance no table meets, everything is calculated directly
+  call run_case('R98', 89._dbl, 1.e-12_dbl)
+
+contains
+
+  subroutine run_case(model, freq, tolerance)
+
+    character(3), intent(in) :: model
+    real(kind=dbl), intent(in) :: freq, tolerance
+
+    gas_lut_tolerance = tolerance
+    call gasabs_lut_release()
+
+    gas_mod = model
+    call get_gasabs(err, freq)
+    if (err /= 0) stop 1
+    k_direct = rt_kextatmo
+
+    gas_mod = model//'_LUT'
+    call get_gasabs(err, freq)
+    if (err /= 0) stop 1
+    k_lut = rt_kextatmo
+
+    do nz = 1, nlyrs
+      call gasabs_lut_get(atmo_temp(1,1,nz), atmo_press(1,1,nz), atmo_rho_vap(1,1,nz), kext, found(nz))
+    end do
+    nfound = count(found)
+    nfound_out = count(found(nin+1:))
+    max_err_found = maxval(abs(k_lut - k_direct) / k_direct, mask=found)
+    max_diff_direct = maxval(abs(k_lut - k_direct) / k_direct, mask=.not. found)
+
+    print '(a4,f8.3,es10.2,2i5,2es12.4)', model, freq, tolerance, nfound, nfound_out, max(max_err_found, 0._dbl), &
+      max_diff_direct
+
+  end subroutine run_case
+
+end program gasabs_lut_driver
@@ -0,0 +1,26 @@
+program npy_io_driver
+
+  ! Read a.npy while the caller has a file open on unit 17, the unit npy_io used
+  ! before, see test_npy_io.py. Prints the data and then the line of the caller's file.
+
+  use kinds, only: dbl, long
+  use report_module, only: verbose
+  use npy_io, only: npy_read_dbl
+
+  implicit none
+
+  integer(kind=long) :: err
+  logical :: found
+  real(kind=dbl), allocatable, dimension(:) :: buf
+  character(len=20) :: line
+
+  verbose = 0
+  open(unit=17, file='caller.txt', status='old', action='read')
+  call npy_read_dbl(err, 'a.npy', (/2_long, 3_long/), found, buf)
+  if ((err /= 0) .or. (.not. found)) stop 1
+  print '(6f5.1)', buf
+  read(17, '(a)') line
+  print '(a)', trim(line)
+  close(17)
+
+end program npy_io_driver
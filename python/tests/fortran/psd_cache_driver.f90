@@ -0,0 +1,133 @@
+program psd_cache_driver
+
+  ! Compare the drop size distributions of hydrometeor_extinction with and without
+  ! psd_cache, see test_psd_cache.py.
+  !
+  ! For every hydrometeor, the inputs of a layer are set like in hydrometeor_extinction
+  ! and two frequencies are processed, once calculating the distribution for both and
+  ! once restoring it from the cache for the second one. One line is printed per
+  ! hydrometeor: its name, the number of inputs of the hydro_scat_cache keys and the number
+  ! of other values of the distribution which differ between both ways after the second
+  ! frequency.
+
+  use kinds, only: dbl, long
+  use settings, only: settings_fill_default, freqs
+  use report_module, only: verbose
+  use vars_index, only: i_x, i_y, i_z, i_h, i_f
+  use vars_atmosphere, only: atmo_max_nlyrs
+  use descriptor_file, only: n_hydro, nbin_arr
+  use drop_size_dist
+  use psd_cache, only: psd_cache_column, psd_cache_get, psd_cache_store, deallocate_psd_cache
+
+  implicit none
+
+  integer(kind=long), parameter :: nhydro = 6, maxbin = 50
+  ! the first nkey values are the inputs of the keys of hydro_scat_cache
+  integer(kind=long), parameter :: nkey = 19, nscalar = 32, nstate = nscalar + 9*(maxbin+1)
+
+  character(len=15), dimension(nhydro) :: names = (/'mono           ', 'mono_cosmo_ice ', &
+    'exp            ', 'exp_cosmo_snow ', 'exp            ', 'const_cosmo_ice'/)
+  integer(kind=long), dimension(nhydro) :: liq_ices = (/1, -1, 1, -1, -1, -1/)
+  integer(kind=long), dimension(nhydro) :: nbins = (/1, 1, 50, 50, 50, 2/)
+  real(kind=dbl), dimension(nhydro) :: a_mss = (/-99._dbl, 130._dbl, -99._dbl, 0.038_dbl, 169.6_dbl, 130._dbl/)
+  real(kind=dbl), dimension(nhydro) :: b_mss = (/-99._dbl, 3._dbl, -99._dbl, 2._dbl, 3.1_dbl, 3._dbl/)
+  real(kind=dbl), dimension(nhydro) :: alphas = (/-99._dbl, 0.684_dbl, -99._dbl, 0.3971_dbl, -99._dbl, 0.684_dbl/)
+  real(kind=dbl), dimension(nhydro) :: betas = (/-99._dbl, 2._dbl, -99._dbl, 1.88_dbl, -99._dbl, 2._dbl/)
+  real(kind=dbl), dimension(nhydro) :: p_3s = (/-99._dbl, -99._dbl, 8.d6, -99._dbl, 4.d6, -99._dbl/)
+  real(kind=dbl), dimension(nhydro) :: d_1s = (/2.d-5, -99._dbl, 1.2d-4, 0.51d-10, 1.d-10, -99._dbl/)
+  real(kind=dbl), dimension(nhydro) :: d_2s = (/-99._dbl, -99._dbl, 6.d-3, 1.d-2, 1.d-2, -99._dbl/)
+  real(kind=dbl), dimension(nhydro) :: q_hs = (/2.d-4, 5.d-5, 3.d-4, 2.d-4, 1.d-4, 5.d-5/)
+
+  real(kind=dbl), dimension(nstate) :: state_direct, state_cached
+  logical, dimension(nstate) :: differs
+  integer(kind=long) :: ih
+
+  call settings_fill_default()
+  verbose = 0
+  freqs(1:2) = (/35.5_dbl, 94._dbl/)
+  n_hydro = nhydro
+  atmo_max_nlyrs = 1
+  allocate(nbin_arr(1,1,1,nhydro))
+  nbin_arr(1,1,1,:) = nbins
+  i_x = 1
+  i_y = 1
+  i_z = 1
+
+  do ih = 1, nhydro
+    i_h = ih
+    call deallocate_psd_cache()
+    call psd_cache_column()
+    call run_layer(1_long, .false., state_direct)
+    call run_layer(2_long, .false., state_direct)
+    call run_layer(1_long, .true., state_cached)
+    call run_layer(2_long, .true., state_cached)
+    differs = transfer(state_direct, 1_8, nstate) /= transfer(state_cached, 1_8, nstate)
+    print '(a16,2i5)', names(ih), count(differs(:nkey)), count(differs(nkey+1:))
+  end do
+
+contains
+
+  subroutine run_layer(freq_index, use_cache, state)
+
+    integer(kind=long), intent(in) :: freq_index
+    logical, intent(in) :: use_cache
+    real(kind=dbl), dimension(nstate), intent(out) :: state
+
+    integer(kind=long) :: err
+    logical :: cached
+
+    i_f = freq_index
+    ! inputs of the layer as set by hydrometeor_extinction
+    dist_name = names(i_h)
+    liq_ice = liq_ices(i_h)
+    moment_in = 3
+    nbin = nbins(i_h)
+    if ((trim(dist_name) == 'mono') .or. (trim(dist_name) == 'mono_cosmo_ice')) nbin = 2
+    as_ratio = -99._dbl
+    rho_ms = -99._dbl
+    a_ms = a_mss(i_h)
+    b_ms = b_mss(i_h)
+    alpha_as = alphas(i_h)
+    beta_as = betas(i_h)
+    p_1 = -99._dbl
+    p_2 = -99._dbl
+    p_3 = p_3s(i_h)
+    p_4 = -99._dbl
+    d_1 = d_1s(i_h)
+    d_2 = d_2s(i_h)
+    dsd_canting = -99._dbl
+    q_h = q_hs(i_h)
+    n_tot = 0._dbl
+    r_eff = 0._dbl
+    layer_t = 260._dbl
+    pressure = 70000._dbl
+
+    call allocateVars_drop_size_dist()
+    cached = .false.
+    if (use_cache) call psd_cache_get(cached)
+    if (.not. cached) then
+      call make_psd(err)
+      if (err == 2) stop 1
+      if (use_cache) call psd_cache_store()
+    end if
+    call make_scat_particles(err)
+    if (err == 2) stop 1
+
+    state = 0._dbl
+    state(1:nscalar) = (/q_h, n_tot, r_eff, real(nbin, dbl), as_ratio, rho_ms, a_ms, b_ms, alpha_as, &
+      beta_as, p_1, p_2, p_3, p_4, d_1, d_2, dsd_canting, layer_t, pressure, n_0, lambda, gam, mu, &
+      n_t, sig, d_ln, d_mono, d_m, n_0_star, m_0, m_32, am_b/)
+    state(nscalar+1:nscalar+nbin) = d_ds
+    state(nscalar+maxbin+2:nscalar+maxbin+1+nbin) = n_ds
+    state(nscalar+2*(maxbin+1)+1:nscalar+2*(maxbin+1)+nbin) = delta_d_ds
+    state(nscalar+3*(maxbin+1)+1:nscalar+3*(maxbin+1)+nbin) = mass_ds
+    state(nscalar+4*(maxbin+1)+1:nscalar+4*(maxbin+1)+nbin) = area_ds
+    state(nscalar+5*(maxbin+1)+1:nscalar+5*(maxbin+1)+nbin+1) = d_bound_ds
+    state(nscalar+6*(maxbin+1)+1:nscalar+6*(maxbin+1)+nbin+1) = f_ds
+    state(nscalar+7*(maxbin+1)+1:nscalar+7*(maxbin+1)+nbin) = density2scat
+    state(nscalar+8*(maxbin+1)+1:nscalar+8*(maxbin+1)+nbin) = diameter2scat
+    call deallocateVars_drop_size_dist()
+
+  end subroutine run_layer
+
+end program psd_cache_driver
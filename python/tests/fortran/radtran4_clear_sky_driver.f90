@@ -0,0 +1,75 @@
+program radtran4_clear_sky_driver
+
+  ! Compare the radiances of a column without hydrometeors from nonscatter_radiance4 and
+  ! from adding the layers in radtran4, see test_radtran4.py.
+  !
+  ! radtran4 adds the layers as matrices if an output level below the surface is
+  ! requested, so the column is run once with and once without such a level. For a
+  ! Lambertian and a specular surface, the max. difference of the upwelling and the
+  ! downwelling radiances at the other levels is printed, relative to the intensity of the
+  ! same stream and level (Q is about zero for some streams).
+
+  use kinds, only: dbl, long
+  use settings, only: settings_fill_default, maxlay, nstokes, nummu, mu_values, quad_weights, &
+    noutlevels, freqs
+  use report_module, only: verbose
+  use vars_rt, only: rt_sfc_emissivity, rt_sfc_reflectivity, rt_hydros_present_reverse
+  use vars_index, only: i_f
+  use rt_utilities, only: double_gauss_quadrature
+
+  implicit none
+
+  integer, parameter :: nl = 60, nout = 3
+  real(kind=dbl), dimension(maxlay+1) :: height, temps, gas_extinct
+  real(kind=dbl), dimension(4*(maxlay+1)) :: up_flux, down_flux
+  real(kind=dbl), dimension(nstokes,nummu*(nout+1)) :: up_clear, down_clear, up_adding, down_adding
+  integer :: outlevels(nout+1), l, k, nrad, i_s
+  real(kind=dbl) :: up_diff, down_diff
+  integer(kind=long) :: err
+  character(1) :: ground_type
+
+  call settings_fill_default()
+  verbose = 0
+  freqs(1) = 89._dbl
+  i_f = 1
+  call double_gauss_quadrature(nummu, mu_values, quad_weights)
+  allocate(rt_sfc_emissivity(nstokes,nummu), rt_sfc_reflectivity(nstokes,nummu), rt_hydros_present_reverse(nl))
+  rt_hydros_present_reverse = .false.
+  rt_sfc_emissivity = 0.7_dbl
+  rt_sfc_emissivity(2,:) = 0.6_dbl
+  rt_sfc_reflectivity = 1._dbl - rt_sfc_emissivity
+
+  do l = 1, nl+1
+    height(l) = (nl+1-l) * 200._dbl
+    temps(l) = 290._dbl - 6.5e-3_dbl * height(l)
+  end do
+  do l = 1, nl
+    gas_extinct(l) = 1.e-4_dbl * exp(-height(l)/2000._dbl)
+  end do
+  outlevels = (/1, 30, nl+1, nl+2/)
+  nrad = nummu*nout
+
+  do k = 1, 2
+    ground_type = 'L'
+    if (k == 2) ground_type = 'S'
+
+    noutlevels = nout
+    call radtran4(err, 1.e-6_dbl, 290._dbl, ground_type, 0.3_dbl, 2.73_dbl, 3370._dbl, nl, height, &
+      temps, gas_extinct, outlevels, up_flux, down_flux, up_clear, down_clear)
+    if (err /= 0) stop 1
+    noutlevels = nout + 1
+    call radtran4(err, 1.e-6_dbl, 290._dbl, ground_type, 0.3_dbl, 2.73_dbl, 3370._dbl, nl, height, &
+      temps, gas_extinct, outlevels, up_flux, down_flux, up_adding, down_adding)
+    if (err /= 0) stop 1
+
+    up_diff = 0._dbl
+    down_diff = 0._dbl
+    do i_s = 1, nstokes
+      up_diff = max(up_diff, maxval(abs(up_clear(i_s,:nrad) - up_adding(i_s,:nrad)) / abs(up_adding(1,:nrad))))
+      down_diff = max(down_diff, maxval(abs(down_clear(i_s,:nrad) - down_adding(i_s,:nrad)) / &
+        max(abs(down_adding(1,:nrad)), 1.e-30_dbl)))
+    end do
+    print '(a2,2es12.4)', ground_type, up_diff, down_diff
+  end do
+
+end program radtran4_clear_sky_driver
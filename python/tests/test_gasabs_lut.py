@@ -0,0 +1,10 @@
+def test_lut_matches_model(fortranDriver):
+  cases = [line.split() for line in fortranDriver("gasabs_lut_driver").splitlines()]
+  assert len(cases) == 5
+  for model, freq, tolerance, nfound, nfoundOutside, maxErrorFound, maxDiffDirect in cases:
+    # interpolated within the tolerance, the layers outside of the table use the model
+    assert float(maxErrorFound) <= float(tolerance)
+    assert int(nfoundOutside) == 0
+    assert float(maxDiffDirect) == 0.
+  # the table is used unless it misses the tolerance
+  assert [int(case[3]) > 0 for case in cases] == [True, True, True, True, False]
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from pyPamtra.tools import interpColumns
+
+
+def reference(x, xp, yp):
+  # np.interp with linear extrapolation, column by column
+  y = np.empty(x.shape)
+  for idx in np.ndindex(x.shape[:-1]):
+    y[idx] = np.interp(x[idx], xp[idx], yp[idx])
+    for sel, i0, i1 in [(x[idx] < xp[idx][0], 0, 1), (x[idx] > xp[idx][-1], -2, -1)]:
+      slope = (yp[idx][i1] - yp[idx][i0]) / (xp[idx][i1] - xp[idx][i0])
+      y[idx][sel] = yp[idx][i0] + slope * (x[idx][sel] - xp[idx][i0])
+  return y
+
+
+@pytest.fixture
+def columns():
+  rng = np.random.default_rng(42)
+  xp = np.cumsum(rng.uniform(10., 100., size=(4, 3, 12)), axis=-1)
+  yp = rng.normal(size=(4, 3, 12))
+  x = np.sort(rng.uniform(-200., 1500., size=(4, 3, 20)), axis=-1)
+  # hit some grid points exactly
+  x[..., 5] = xp[..., 4]
+  x[..., 0] = xp[..., 0]
+  x[..., -1] = xp[..., -1]
+  return x, xp, yp
+
+
+@pytest.mark.parametrize("nThreads,chunkSize", [(1, 4096), (1, 5), (3, 2)])
+def test_matches_reference(columns, nThreads, chunkSize):
+  x, xp, yp = columns
+  y = interpColumns(x, xp, yp, nThreads=nThreads, chunkSize=chunkSize)
+  assert y.shape == x.shape
+  np.testing.assert_allclose(y, reference(x, xp, yp), rtol=1e-12, atol=1e-12)
+
+
+def test_list_and_extra_dimensions(columns):
+  x, xp, yp = columns
+  yp4D = np.stack([yp, 2*yp], axis=-1)
+  y, y4D = interpColumns(x, xp, [yp, yp4D], chunkSize=5)
+  assert y4D.shape == x.shape + (2,)
+  np.testing.assert_allclose(y4D[..., 0], y, rtol=1e-12, atol=1e-12)
+  np.testing.assert_allclose(y4D[..., 1], 2*y, rtol=1e-12, atol=1e-12)
+
+
+def test_inside_range_equals_interp(columns):
+  x, xp, yp = columns
+  x = np.clip(x, xp[..., :1], xp[..., -1:])
+  y = interpColumns(x, xp, yp)
+  for idx in np.ndindex(x.shape[:-1]):
+    np.testing.assert_array_equal(y[idx], np.interp(x[idx], xp[idx], yp[idx]))
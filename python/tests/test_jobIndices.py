@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+import pyPamtra
+
+
+def makePamtra(ngridx, ngridy, nfreqs, nlyrs=None):
+  pam = pyPamtra.pyPamtra()
+  if nlyrs is None:
+    nlyrs = np.full((ngridx, ngridy), 10)
+  pam.p["ngridx"] = ngridx
+  pam.p["ngridy"] = ngridy
+  pam.p["nlyrs"] = nlyrs
+  pam.p["max_nlyrs"] = int(np.max(nlyrs))
+  pam._shape2D = (ngridx, ngridy)
+  pam.set["nfreqs"] = nfreqs
+  return pam
+
+
+def coverage(pam, jobs):
+  count = np.zeros((pam.set["nfreqs"], pam.p["ngridx"], pam.p["ngridy"]), dtype=int)
+  for pp_startF, pp_endF, pp_startX, pp_endX, pp_startY, pp_endY in jobs:
+    count[pp_startF:pp_endF, pp_startX:pp_endX, pp_startY:pp_endY] += 1
+  return count
+
+
+@pytest.mark.parametrize("deltaF,deltaX,deltaY", [(1, 1, 1), (2, 3, 2), (5, 7, 5), (1, 4, 1)])
+def test_fixed_covers_every_column_once(deltaF, deltaX, deltaY):
+  pam = makePamtra(7, 5, 3)
+  jobs = pam._jobIndices(deltaF, deltaX, deltaY)
+  assert np.all(coverage(pam, jobs) == 1)
+
+
+@pytest.mark.parametrize("workers", [1, 3, 8])
+def test_cost_covers_every_column_once(workers):
+  nlyrs = np.arange(1, 7*5+1).reshape(7, 5)
+  pam = makePamtra(7, 5, 3, nlyrs=nlyrs)
+  jobs = pam._jobIndices(2, 0, 0, pp_schedule="cost", pp_workers=workers)
+  assert np.all(coverage(pam, jobs) == 1)
+
+
+def test_cost_largest_first():
+  costs = np.ones((6, 6))
+  costs[:2, :2] = 100.
+  pam = makePamtra(6, 6, 1)
+  jobs = pam._jobIndices(1, 0, 0, pp_schedule="cost", pp_workers=2, pp_costs=costs)
+  assert np.all(coverage(pam, jobs) == 1)
+  jobCosts = [np.sum(costs[x0:x1, y0:y1]) for _, _, x0, x1, y0, y1 in jobs]
+  assert jobCosts == sorted(jobCosts, reverse=True)
+
+
+def test_unknown_schedule():
+  pam = makePamtra(2, 2, 1)
+  with pytest.raises(ValueError):
+    pam._jobIndices(1, 1, 1, pp_schedule="random")
+
+
+def test_fixed_does_not_estimate_costs(monkeypatch):
+  pam = makePamtra(3, 2, 1)
+  def fail():
+    raise AssertionError("_columnCost called for pp_schedule='fixed'")
+  monkeypatch.setattr(pam, "_columnCost", fail)
+  pam._jobIndices(1, 2, 2)
+  assert np.all(pam._ppCost == 1.)
+
+
+def test_column_cost_scattering_models():
+  names = ["disabled", "rayleigh", "rayleigh-gans", "ss-rayleigh-gans_0.2_0.3_5.5", "ssrga", "mie-sphere", "liudb_09", "tmatrix", "unknown"]
+  pam = makePamtra(len(names), 1, 1, nlyrs=np.ones((len(names), 1), dtype=int))
+  pam.df.nhydro = len(names)
+  pam.df.data = np.zeros(len(names), dtype=[("nbin", int), ("scat_name", "U30")])
+  pam.df.data["nbin"] = 9
+  pam.df.data["scat_name"] = names
+  pam.p["hydro_q"] = np.zeros((len(names), 1, 1, len(names)))
+  for ii in range(len(names)):
+    pam.p["hydro_q"][ii, 0, 0, ii] = 1.
+  pam.nmlSet["radar_mode"] = "simple"
+  hydroCost = pam._columnCost()[:, 0] - 1.
+  assert np.allclose(hydroCost, 10 * np.array([0., 0.2, 0.3, 0.5, 0.5, 2., 1., 20., 1.]))
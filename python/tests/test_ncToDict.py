@@ -0,0 +1,129 @@
+import gzip
+import os
+
+import netCDF4
+import numpy as np
+import pytest
+
+from pyPamtra import importer
+
+
+@pytest.fixture
+def ncFiles(tmp_path):
+  '''
+  five files joined along time, every second one gzip compressed. Returns the file
+  names and the joined data.
+  '''
+  rng = np.random.default_rng(1)
+  files = list()
+  temps = list()
+  times = list()
+  for ii, nTime in enumerate([3, 1, 4, 2, 5]):
+    fname = str(tmp_path / ("m%d.nc" % ii))
+    ds = netCDF4.Dataset(fname, "w")
+    ds.createDimension("time", None)
+    ds.createDimension("z", 6)
+    ds.createDimension("x", 3)
+    ds.createVariable("time", "i4", ("time",))[:] = np.arange(nTime) + 10*ii
+    ds.createVariable("off", "f8", ())[:] = 0.5
+    temp = rng.random((3, nTime, 6)).astype("f4")
+    ds.createVariable("T", "f4", ("x", "time", "z"))[:] = temp
+    ds.createVariable("h", "f8", ("z",))[:] = np.arange(6.)
+    ds.close()
+    if ii % 2:
+      with open(fname, "rb") as f:
+        data = f.read()
+      with open(fname+".gz", "wb") as f:
+        f.write(gzip.compress(data))
+      os.remove(fname)
+      fname += ".gz"
+    files.append(fname)
+    temps.append(temp)
+    times.append(np.arange(nTime) + 10*ii + 0.5)
+  return files, np.concatenate(temps, axis=1), np.concatenate(times)
+
+
+def test_eager(ncFiles):
+  files, temp, time = ncFiles
+  data = importer.ncToDict(files, offsetKeys={"time": "off"})
+  np.testing.assert_array_equal(data["T"], temp)
+  np.testing.assert_array_equal(data["time"], time)
+  np.testing.assert_array_equal(data["h"], np.arange(6.))
+  assert data["off"] == 0.5
+
+
+def test_single_file(ncFiles):
+  files, temp, time = ncFiles
+  data = importer.ncToDict(files[0])
+  np.testing.assert_array_equal(data["T"], temp[:, :3])
+
+
+def test_glob(ncFiles, tmp_path):
+  files, temp, time = ncFiles
+  data = importer.ncToDict(str(tmp_path / "m*"), keys=["T"])
+  np.testing.assert_array_equal(data["T"], temp)
+
+
+@pytest.mark.parametrize("slices,expected", [
+  ({"time": slice(2, 12, 3), "z": [1, 4]}, lambda temp: temp[:, 2:12:3][..., [1, 4]]),
+  ({"time": [14, 0, 7], "x": 1}, lambda temp: temp[1, [14, 0, 7]]),
+  ({"time": -1}, lambda temp: temp[:, -1]),
+  ({"time": slice(4, 7)}, lambda temp: temp[:, 4:7]),
+])
+def test_slices(ncFiles, slices, expected):
+  files, temp, time = ncFiles
+  data = importer.ncToDict(files, keys=["T", "h"], slices=slices)
+  np.testing.assert_array_equal(data["T"], expected(temp))
+  np.testing.assert_array_equal(data["h"], np.arange(6.)[slices.get("z", slice(None))])
+
+
+@pytest.mark.parametrize("item", [
+  (slice(None), 3), (0, slice(2, 9), 2), (Ellipsis, 1), (slice(None), [5, 1, 9]),
+  (slice(None), slice(None, None, -2)), (1,), (slice(None), -1, slice(1, 3)),
+])
+def test_lazy(ncFiles, item):
+  files, temp, time = ncFiles
+  eager = importer.ncToDict(files, keys=["T", "time"], offsetKeys={"time": "off"})
+  lazy = importer.ncToDict(files, keys=["T", "time"], offsetKeys={"time": "off"}, lazy=True)
+  assert isinstance(lazy["T"], importer.ncLazyVariable)
+  assert lazy["T"].shape == eager["T"].shape
+  np.testing.assert_array_equal(lazy["T"][item], eager["T"][item])
+  np.testing.assert_array_equal(np.asarray(lazy["T"]), eager["T"])
+  np.testing.assert_array_equal(lazy["time"][4:6], eager["time"][4:6])
+
+
+def test_lazy_with_slices(ncFiles):
+  files, temp, time = ncFiles
+  lazy = importer.ncToDict(files, keys=["T"], lazy=True, slices={"time": slice(1, None, 2)})
+  np.testing.assert_array_equal(lazy["T"][:, 2], temp[:, 1::2][:, 2])
+
+
+def test_broken_file(ncFiles, tmp_path):
+  files, temp, time = ncFiles
+  broken = tmp_path / "m9.nc.gz"
+  broken.write_text("broken")
+  with pytest.raises(OSError):
+    importer.ncToDict(files + [str(broken)], keys=["T"])
+
+
+def test_no_files(tmp_path):
+  with pytest.raises(IOError):
+    importer.ncToDict(str(tmp_path / "missing*.nc"))
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_decompressed_once(ncFiles, monkeypatch, lazy):
+  files, temp, time = ncFiles
+  calls = list()
+  readCompressedFile = importer._readCompressedFile
+  def countingRead(fname, *args):
+    calls.append(fname)
+    return readCompressedFile(fname, *args)
+  monkeypatch.setattr(importer, "_readCompressedFile", countingRead)
+  data = importer.ncToDict(files, offsetKeys={"time": "off"}, lazy=lazy)
+  # every compressed file is decompressed by the scan only
+  assert sorted(calls) == sorted(files[1::2])
+  np.testing.assert_array_equal(data["h"], np.arange(6.))
+  # the lazy variables decompress the files again when they are indexed, here m1 only
+  np.testing.assert_array_equal(data["T"][:, 3], temp[:, 3])
+  assert calls[2:] == (files[1:2] if lazy else [])
@@ -0,0 +1,10 @@
+import numpy as np
+
+
+def test_read_keeps_other_units(fortranDriver, tmp_path):
+  np.save(str(tmp_path / "a.npy"), np.arange(6.).reshape(2, 3))
+  with open(str(tmp_path / "caller.txt"), "w") as f:
+    f.write("still open\n")
+  lines = fortranDriver("npy_io_driver").splitlines()
+  assert [float(value) for value in lines[0].split()] == list(range(6))
+  assert lines[1] == "still open"
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import pyPamtra
+
+optionalProducts = ["radar_spectra", "radar_snr", "radar_moments", "radar_slopes", "radar_edges", "radar_quality", "emissivity"]
+
+
+@pytest.mark.parametrize("radar_mode", ["simple", "moments", "spectrum"])
+def test_all_selects_everything(radar_mode):
+  pam = pyPamtra.pyPamtra()
+  assert pam.nmlSet["output_products"] == "all"
+  pam.nmlSet["radar_mode"] = radar_mode
+  for product in optionalProducts:
+    # the spectra are large, "all" includes them only if they are the requested radar output
+    expected = (product != "radar_spectra") or (radar_mode == "spectrum")
+    assert pam._outputSelected(product) == expected, product
+
+
+def test_product_list():
+  pam = pyPamtra.pyPamtra()
+  pam.nmlSet["output_products"] = "radar_moments,radar_snr"
+  selected = [product for product in optionalProducts if pam._outputSelected(product)]
+  assert selected == ["radar_snr", "radar_moments"]
+
+
+def test_nmlSet_argument():
+  pam = pyPamtra.pyPamtra()
+  nmlSet = dict(pam.nmlSet)
+  nmlSet["output_products"] = "emissivity"
+  assert pam._outputSelected("emissivity", nmlSet)
+  assert not pam._outputSelected("radar_spectra", nmlSet)
+  pam.nmlSet["radar_mode"] = "spectrum"
+  assert pam._outputSelected("radar_spectra")
+
+
+def test_sliced_result_keys():
+  pam = pyPamtra.pyPamtra()
+  pam.nmlSet["active"] = True
+  pam.nmlSet["passive"] = True
+  pam.nmlSet["radar_mode"] = "moments"
+  keys = pam._slicedResultKeys()
+  for key in optionalProducts[1:] + ["Ze", "radar_vel", "tb"]:
+    assert key in keys
+  assert "radar_spectra" not in keys
+
+  pam.nmlSet["output_products"] = "radar_spectra,radar_moments"
+  keys = pam._slicedResultKeys()
+  assert "radar_spectra" in keys
+  assert "radar_snr" not in keys
+
+  pam.nmlSet["output_products"] = "all"
+  pam.nmlSet["radar_mode"] = "spectrum"
+  assert "radar_spectra" in pam._slicedResultKeys()
+
+  pam.nmlSet["active"] = False
+  pam.nmlSet["output_products"] = "radar_spectra"
+  assert pam._slicedResultKeys() == ["tb"]
+
+
+def test_moments_spectra_placeholder():
+  pam = pyPamtra.pyPamtra()
+  pam.nmlSet["radar_mode"] = "moments"
+  pam.p.update(ngridx=2, ngridy=1, max_nlyrs=3, noutlevels=2)
+  pam._nangles = 16
+  pam._nstokes = 2
+  pam.set.update(nfreqs=1, radar_npol=1, att_npol=1, radar_pol=["NN"], att_pol=["N"])
+  pam.df.data = np.zeros(1, dtype=[("nbin", int)])
+  pam._prepareResults()
+  assert pam.r["radar_spectra"].shape == (1,)
+  assert pam.r["radar_moments"].shape == (2, 1, 3, 1, 1, pam.nmlSet["radar_npeaks"], 4)
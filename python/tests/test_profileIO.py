@@ -0,0 +1,86 @@
+import gzip
+
+import numpy as np
+import pytest
+
+import pyPamtra
+
+
+def makePamtra():
+  pam = pyPamtra.pyPamtra()
+  pam.df.addHydrometeor(("cwc_q", -99., 1, -99., -99., -99., -99., -99., 13, 1, "mono", -99., -99., -99., -99., 2e-5, -99., "mie-sphere", "khvorostyanov01_drops", -99.))
+  pam.df.addHydrometeor(("iwc_q", -99., -1, -99., 130., 3., 0.684, 2., 3, 1, "mono_cosmo_ice", -99., -99., -99., -99., -99., -99., "mie-sphere", "heymsfield10_particles", -99.))
+  pam.nmlSet["active"] = True
+  pam.nmlSet["radar_mode"] = "moments"
+  return pam
+
+
+@pytest.fixture
+def pam():
+  # values are chosen on the precision of the text format
+  nx, ny, nz, nout = 3, 2, 5, 2
+  rng = np.random.default_rng(0)
+  pam = makePamtra()
+  pam._shape2D = (nx, ny)
+  pam._shape3D = (nx, ny, nz)
+  pam._shape3Dout = (nx, ny, nout)
+  p = pam.p
+  p["unixtime"] = np.full((nx, ny), 1262304000 + 3600*14 + 60*30)
+  p["hgt_lev"] = np.cumsum(np.round(rng.uniform(100., 500., (nx, ny, nz+1)), 1), axis=-1)
+  p["press_lev"] = np.round(1e5 * np.exp(-p["hgt_lev"]/8000.), 1)
+  p["temp_lev"] = np.round(290. - 0.0065*p["hgt_lev"], 2)
+  p["relhum_lev"] = np.round(rng.uniform(0.1, 1., (nx, ny, nz+1)), 4)
+  for key in ["hgt", "press", "temp", "relhum"]:
+    p[key] = p[key+"_lev"][..., 1:]
+  p["hydro_q"] = np.round(rng.uniform(0., 1e-3, (nx, ny, nz, 2)), 9)
+  p["hydro_n"] = np.round(rng.uniform(0., 1e8, (nx, ny, nz, 2)), -2)
+  p["hydro_n"][..., 1] = np.nan
+  p["airturb"] = np.round(rng.uniform(0., 1., (nx, ny, nz)), 6)
+  p["obs_height"] = np.round(rng.uniform(0., 1e4, (nx, ny, nout)), 3)
+  p["lat"] = np.round(rng.uniform(-90., 90., (nx, ny)), 2)
+  p["lon"] = np.round(rng.uniform(-180., 180., (nx, ny)), 2)
+  p["sfc_type"] = rng.integers(0, 2, (nx, ny))
+  p["wind10u"] = rng.normal(size=(nx, ny))
+  p["wind10v"] = rng.normal(size=(nx, ny))
+  p["groundtemp"] = rng.uniform(270., 300., (nx, ny))
+  p["iwv"] = rng.uniform(0., 50., (nx, ny))
+  p["hydro_wp"] = np.zeros((nx, ny, 2))
+  p["hydro_tn"] = np.zeros((nx, ny, 2))
+  return pam
+
+
+def assertProfile(pam, other, keys):
+  for key in keys:
+    np.testing.assert_allclose(other.p[key], pam.p[key], rtol=1e-6, err_msg=key)
+
+
+@pytest.mark.parametrize("fname", ["profile.lev", "profile.lev.gz", "profile.lay", "profile.lay.gz"])
+def test_round_trip(pam, tmp_path, fname):
+  fname = str(tmp_path / fname)
+  pam.writePamtraProfile(fname)
+  other = makePamtra()
+  other.readPamtraProfile(fname)
+
+  assert (other.p["ngridx"], other.p["ngridy"], other.p["max_nlyrs"], other.p["noutlevels"]) == (3, 2, 5, 2)
+  np.testing.assert_array_equal(other.p["nlyrs"], 5)
+  np.testing.assert_array_equal(other.p["unixtime"], pam.p["unixtime"])
+  np.testing.assert_array_equal(other.p["sfc_type"], pam.p["sfc_type"])
+  np.testing.assert_array_equal(other.p["hydro_reff"], np.nan)
+  assertProfile(pam, other, ["obs_height", "lat", "lon", "wind10u", "wind10v", "groundtemp", "iwv", "hydro_q", "hydro_n", "airturb"])
+  if ".lev" in fname:
+    assertProfile(pam, other, ["hgt_lev", "press_lev", "temp_lev", "relhum_lev"])
+  else:
+    assertProfile(pam, other, ["hgt", "press", "temp", "relhum"])
+    np.testing.assert_allclose(other.p["hgt_lev"][..., 0], pam.p["hgt_lev"][..., 0])
+
+
+def test_gzip_identical(pam, tmp_path):
+  pam.writePamtraProfile(str(tmp_path / "profile.lev"))
+  pam.writePamtraProfile(str(tmp_path / "profile.lev.gz"))
+  with gzip.open(str(tmp_path / "profile.lev.gz"), "rt") as f:
+    assert f.read() == (tmp_path / "profile.lev").read_text()
+
+
+def test_wrong_extension(pam, tmp_path):
+  with pytest.raises(IOError):
+    pam.writePamtraProfile(str(tmp_path / "profile.txt"))
@@ -0,0 +1,113 @@
+import json
+import os
+
+import numpy as np
+import numpy.lib.recfunctions
+import pytest
+
+import pyPamtra
+from pyPamtra import importer
+
+
+@pytest.fixture
+def pam():
+  nx, ny, nz, nbin = 5, 4, 6, 3
+  rng = np.random.default_rng(2)
+  pam = pyPamtra.pyPamtra()
+  pam.df.addHydrometeor(("ice", -99., -1, 917., 130., 3.0, 0.684, 2., 3, 1, "mono_cosmo_ice", -99., -99., -99., -99., -99., -99., "mie-sphere", "heymsfield10_particles", -99.))
+  pam.df.addHydrometeor(("snow", 0.6, -1, -99., -99., -99., -99., -99., 3, 10, "exp", -99., -99., 8.e6, -99., 1.e-4, 1.e-2, "ss-rayleigh-gans", "heymsfield10_particles", -99.))
+  pam.df.data = numpy.lib.recfunctions.drop_fields(pam.df.data, ["rho_ms"], usemask=False, asrecarray=True)
+  pam.df.data4D["rho_ms"] = rng.uniform(100., 900., (nx, ny, nz, 2))
+  for key in ["d_ds", "n_ds", "mass_ds"]:
+    pam.df.dataFullSpec[key] = rng.random((nx, ny, nz, 2, nbin))
+  pam.df.dataFullSpec["d_bound_ds"] = rng.random((nx, ny, nz, 2, nbin+1))
+  pam.p["ngridx"] = nx
+  pam.p["ngridy"] = ny
+  pam.p["max_nlyrs"] = nz
+  pam.p["noutlevels"] = 2
+  pam.p["nlyrs"] = np.full((nx, ny), nz)
+  pam.p["unixtime"] = np.full((nx, ny), 1262304000)
+  pam.p["temp_lev"] = rng.uniform(200., 300., (nx, ny, nz+1))
+  pam.p["temp_lev"][0, 0, 3] = np.nan
+  pam.p["hydro_q"] = rng.random((nx, ny, nz, 2)) * 1e-4
+  pam.p["obs_height"] = rng.random((nx, ny, 2))
+  pam.p["sfc_refl"] = np.chararray((nx, ny))
+  pam.p["sfc_refl"][:] = "S"
+  pam.p["sfc_refl"][1, 2] = "F"
+  pam.p["hydro_reff"] = np.zeros((nx, ny, 0))
+  return pam
+
+
+def assertStore(pam, other, columns):
+  for src, dst in [(pam.p, other.p), (pam.df.data4D, other.df.data4D), (pam.df.dataFullSpec, other.df.dataFullSpec)]:
+    assert sorted(src.keys()) == sorted(dst.keys())
+    for key in src:
+      if np.ndim(src[key]) < 2: continue
+      np.testing.assert_array_equal(dst[key], src[key][columns], err_msg=key)
+
+
+def test_round_trip(pam, tmp_path):
+  store = str(tmp_path / "store")
+  pam.writeProfileStore(store)
+  other = importer.readProfileStore(store)
+
+  assertStore(pam, other, (slice(None), slice(None)))
+  assert (other.p["ngridx"], other.p["ngridy"], other.p["max_nlyrs"], other.p["noutlevels"]) == (5, 4, 6, 2)
+  assert isinstance(other.p["sfc_refl"], np.chararray)
+  assert other.p["sfc_refl"][1, 2] == b"F"
+  assert other.df.nhydro == 2
+  assert list(other.df.data["hydro_name"]) == ["ice", "snow"]
+  assert "rho_ms" not in other.df.data.dtype.names
+  assert other.df.fs_nbin == 3
+  assert other._shape4D == (5, 4, 6, 2)
+  assert other._shape5Dplus == (5, 4, 6, 2, 4)
+
+
+@pytest.mark.parametrize("subGrid", [[1, 4, 0, 4], [2, 3, 1, 3], [0, 5, 3, 4]])
+def test_subGrid(pam, tmp_path, subGrid):
+  store = str(tmp_path / "store")
+  pam.writeProfileStore(store)
+  other = importer.readProfileStore(store, subGrid=subGrid)
+
+  columns = (slice(subGrid[0], subGrid[1]), slice(subGrid[2], subGrid[3]))
+  assertStore(pam, other, columns)
+  shape2D = (subGrid[1]-subGrid[0], subGrid[3]-subGrid[2])
+  assert (other.p["ngridx"], other.p["ngridy"]) == shape2D
+  assert other._shape2D == shape2D
+  assert other._shape3Dplus == shape2D + (7,)
+  assert other.p["hydro_q"].shape == shape2D + (6, 2)
+
+
+def test_copy_on_write(pam, tmp_path):
+  store = str(tmp_path / "store")
+  pam.writeProfileStore(store)
+  other = importer.readProfileStore(store)
+  other.p["temp_lev"][:] = 0.
+  again = importer.readProfileStore(store)
+  np.testing.assert_array_equal(again.p["temp_lev"], pam.p["temp_lev"])
+
+
+def test_overwrite_removes_stale_variables(pam, tmp_path):
+  store = str(tmp_path / "store")
+  pam.writeProfileStore(store)
+  assert os.path.isfile(os.path.join(store, "p%hydro_q%.npy"))
+  del pam.p["hydro_q"]
+  pam.writeProfileStore(store)
+  assert not os.path.isfile(os.path.join(store, "p%hydro_q%.npy"))
+  other = importer.readProfileStore(store)
+  assert "hydro_q" not in other.p
+  with open(os.path.join(store, "manifest.json")) as f:
+    assert len(json.load(f)["variables"]) == len(os.listdir(store)) - 1
+
+
+def test_unknown_version(pam, tmp_path):
+  store = str(tmp_path / "store")
+  pam.writeProfileStore(store)
+  manifestFile = os.path.join(store, "manifest.json")
+  with open(manifestFile) as f:
+    manifest = json.load(f)
+  manifest["version"] = 2
+  with open(manifestFile, "w") as f:
+    json.dump(manifest, f)
+  with pytest.raises(IOError):
+    importer.readProfileStore(store)
@@ -0,0 +1,9 @@
+def test_cache_on_off(fortranDriver):
+  lines = [line.split() for line in fortranDriver("psd_cache_driver").splitlines()]
+  assert len(lines) == 6
+  for name, keysDiffer, distDiffer in lines:
+    # d_1 and d_2 of const_cosmo_ice are changed by make_dist_params
+    assert int(keysDiffer) == 0, name
+    # make_dist does not set f_ds of the const distributions, it is undefined either way
+    if name != "const_cosmo_ice":
+      assert int(distDiffer) == 0, name
@@ -0,0 +1,7 @@
+def test_clear_sky_equals_adding(fortranDriver):
+  lines = [line.split() for line in fortranDriver("radtran4_clear_sky_driver", libs=["lapack", "blas"]).splitlines()]
+  assert [line[0] for line in lines] == ["L", "S"]
+  for groundType, upDiff, downDiff in lines:
+    # relative to the intensity of the same stream and level, see nonscatter_radiance4
+    assert float(upDiff) <= 1e-14, groundType
+    assert float(downDiff) <= 1e-14, groundType
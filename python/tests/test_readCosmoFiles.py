@@ -0,0 +1,83 @@
+import gzip
+import os
+
+import netCDF4
+import numpy as np
+import pytest
+
+from pyPamtra import importer
+
+
+def readFile(ncFiles, scale):
+  # module level, so that it can be used with nProcesses > 1
+  return {"qc": ncFiles[0].variables["qc"][:] * scale, "qnc": ncFiles[1].variables["qnc"][:]}
+
+
+def writeFile(fname, key, data, compress):
+  ds = netCDF4.Dataset(fname, "w")
+  for dd, size in enumerate(data.shape):
+    ds.createDimension("d%d" % dd, size)
+  ds.createVariable(key, "f8", tuple("d%d" % dd for dd in range(data.ndim)))[:] = data
+  ds.close()
+  if not compress:
+    return fname
+  with open(fname, "rb") as f:
+    content = f.read()
+  os.remove(fname)
+  with open(fname+".gz", "wb") as f:
+    f.write(gzip.compress(content))
+  return fname+".gz"
+
+
+@pytest.fixture
+def cosmoFiles(tmp_path):
+  '''
+  four pairs of mass and number files with 2 time steps each, alternately gzip compressed
+  '''
+  rng = np.random.default_rng(3)
+  files = list()
+  qc = list()
+  qnc = list()
+  for ff in range(4):
+    qc.append(rng.random((3, 2, 5)))
+    qnc.append(rng.random((3, 2, 5)))
+    files.append((
+      writeFile(str(tmp_path / ("a%d.nc" % ff)), "qc", qc[-1], ff % 2 == 1),
+      writeFile(str(tmp_path / ("n%d.nc" % ff)), "qnc", qnc[-1], ff % 2 == 1),
+    ))
+  return files, np.concatenate(qc, axis=1), np.concatenate(qnc, axis=1)
+
+
+@pytest.mark.parametrize("nThreads,nProcesses", [(1, 1), (3, 1), (1, 2)])
+def test_join(cosmoFiles, nThreads, nProcesses):
+  files, qc, qnc = cosmoFiles
+  data = importer._readCosmoFiles(readFile, files, (2.,), nThreads=nThreads, nProcesses=nProcesses)
+  assert isinstance(data["qc"], np.ma.MaskedArray)
+  assert not np.any(np.ma.getmaskarray(data["qc"]))
+  np.testing.assert_array_equal(data["qc"], 2*qc)
+  np.testing.assert_array_equal(data["qnc"], qnc)
+
+
+def test_concatenate_axis(cosmoFiles):
+  files, qc, qnc = cosmoFiles
+  data = importer._readCosmoFiles(readFile, files, (1.,), concatenateAxis=0)
+  np.testing.assert_array_equal(data["qc"], np.concatenate(np.split(qc, 4, axis=1), axis=0))
+
+
+@pytest.mark.parametrize("nProcesses", [1, 2])
+def test_skip_broken_files(cosmoFiles, tmp_path, nProcesses):
+  files, qc, qnc = cosmoFiles
+  broken = tmp_path / "a9.nc.gz"
+  broken.write_text("broken")
+  other = (writeFile(str(tmp_path / "a8.nc"), "qc", np.zeros((3, 4, 5)), False), files[0][1])
+  files = files[:2] + [(str(broken), files[0][1]), other] + files[2:]
+  data = importer._readCosmoFiles(readFile, files, (1.,), nProcesses=nProcesses)
+  np.testing.assert_array_equal(data["qc"], qc)
+  np.testing.assert_array_equal(data["qnc"], qnc)
+
+
+def test_no_file_readable(tmp_path):
+  broken = tmp_path / "a9.nc.gz"
+  broken.write_text("broken")
+  with pytest.raises(RuntimeError):
+    importer._readCosmoFiles(readFile, [(str(broken), str(broken))], (1.,))
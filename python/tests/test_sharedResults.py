@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import pyPamtra
+from pyPamtra import libWrapper
+
+
+def makePamtra():
+  pam = pyPamtra.pyPamtra()
+  pam._slicedResultKeys = lambda: ["tb"]
+  pam.p.update(ngridx=4, ngridy=3, max_nlyrs=5, noutlevels=2)
+  pam._nangles = 16
+  pam._nstokes = 2
+  pam.set.update(nfreqs=1, radar_npol=1, att_npol=1, radar_pol=["NN"], att_pol=["N"])
+  pam.df.data = np.zeros(1, dtype=[("nbin", int)])
+  return pam
+
+
+@pytest.mark.skipif(libWrapper.shared_memory is None, reason="multiprocessing.shared_memory not available")
+def test_results_in_shared_memory():
+  pam = makePamtra()
+  shared = pam._prepareResults(shared=True)
+  assert list(shared.keys()) == ["tb"]
+  assert len(pam._resultHandles) == 1
+
+  handles = list()
+  out = libWrapper.fromSharedMemory(shared, handles, None, None, None, None)["tb"]
+  out[1, 2] = 5.
+  del out
+  libWrapper.closeSharedMemory(handles)
+  libWrapper.unlinkSharedMemory(pam._resultHandles)
+
+  assert pam.r["tb"].shape == (4, 3, 2, 32, 1, 2)
+  assert np.all(pam.r["tb"][1, 2] == 5.)
+  assert np.all(pam.r["tb"][0] == pyPamtra.core.missingNumber)
+
+  # a view of the old results keeps its block open
+  keep = pam.r["tb"][1]
+  pam._prepareResults()
+  assert len(pam._resultHandles) == 1
+  assert np.all(keep[2] == 5.)
+  del keep
+  pam._prepareResults()
+  assert pam._resultHandles == []
@@ -0,0 +1,81 @@
+import numpy as np
+
+import pyPamtra
+
+
+def makePamtra():
+  nx, ny, nz = 4, 3, 6
+  rng = np.random.default_rng(1)
+  pam = pyPamtra.pyPamtra()
+  pam._shape2D = (nx, ny)
+  pam._shape3D = (nx, ny, nz)
+  pam._shape4D = (nx, ny, nz, 2)
+  pam.p["ngridx"] = nx
+  pam.p["ngridy"] = ny
+  pam.p["max_nlyrs"] = nz
+  # three different columns, NaNs compare bit-wise
+  pattern = np.array([[0, 1, 0], [2, 0, 1], [0, 0, 2], [1, 1, 1]])
+  temp = rng.uniform(200., 300., (3, nz))
+  temp[1, 2] = np.nan
+  pam.p["temp"] = temp[pattern]
+  pam.p["hydro_q"] = np.repeat(pam.p["temp"][..., None], 2, axis=-1) * 1e-6
+  pam.p["sfc_refl"] = np.chararray((nx, ny))
+  pam.p["sfc_refl"][:] = "S"
+  pam.p["lat"] = np.zeros((nx, ny))
+  pam.df.data4D["rho_ms"] = np.full((nx, ny, nz, 2), 500.)
+  return pam, pattern
+
+
+def test_unique_columns():
+  pam, pattern = makePamtra()
+  index, inverse = pam._uniqueColumns()
+  assert len(index) == 3
+  assert inverse.shape == (12,)
+  # first occurrences in grid order
+  np.testing.assert_array_equal(index, [0, 1, 3])
+  np.testing.assert_array_equal(inverse, pattern.ravel())
+  temp = pam.p["temp"].reshape(12, -1)
+  np.testing.assert_array_equal(temp[index][inverse], temp)
+
+
+def test_differences_in_any_variable():
+  pam, pattern = makePamtra()
+  pam.p["lat"][3, 2] = 1.
+  pam.p["sfc_refl"][0, 2] = "F"
+  pam.df.data4D["rho_ms"][2, 0, 0, 1] = 600.
+  index, inverse = pam._uniqueColumns()
+  assert len(index) == 6
+
+
+def test_reduce_and_restore():
+  pam, pattern = makePamtra()
+  p, data4D = pam.p, pam.df.data4D
+  index, inverse = pam._uniqueColumns()
+  state = pam._reduceColumns(index)
+  assert (pam.p["ngridx"], pam.p["ngridy"]) == (3, 1)
+  assert pam._shape2D == (3, 1)
+  assert pam._shape4D == (3, 1, 6, 2)
+  assert pam.p["temp"].shape == (3, 1, 6)
+  assert pam.df.data4D["rho_ms"].shape == (3, 1, 6, 2)
+  np.testing.assert_array_equal(pam.p["temp"][:, 0], p["temp"].reshape(12, -1)[index])
+
+  pam._restoreColumns(state)
+  assert pam.p is p
+  assert pam.df.data4D is data4D
+  assert (pam.p["ngridx"], pam.p["ngridy"]) == (4, 3)
+  assert pam._shape2D == (4, 3)
+  assert pam._shape4D == (4, 3, 6, 2)
+
+
+def test_expand_results():
+  pam, pattern = makePamtra()
+  index, inverse = pam._uniqueColumns()
+  state = pam._reduceColumns(index)
+  pam._slicedResultKeys = lambda: ["tb", "radar_hgt", "radar_vel"]
+  pam.r = {"tb": np.arange(3*2*5).reshape(3, 1, 2, 5), "radar_hgt": np.arange(3*6).reshape(3, 1, 6), "radar_vel": np.arange(7)}
+  pam._restoreColumns(state)
+  pam._expandColumns(inverse)
+  assert pam.r["tb"].shape == (4, 3, 2, 5)
+  np.testing.assert_array_equal(pam.r["tb"], np.arange(3*2*5).reshape(3, 2, 5)[pattern])
+  np.testing.assert_array_equal(pam.r["radar_hgt"], np.arange(3*6).reshape(3, 6)[pattern])
+  np.testing.assert_array_equal(pam.r["radar_vel"], np.arange(7))
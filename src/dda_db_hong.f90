@@ -62,9 +62,9 @@ subroutine dda_db_hong(errorstatus,f,t,hong_type,mindex,nbins, &
   ! variables communicating with the database. need to be single precission !!!
 
   integer, parameter :: nang_db = 181
-  real(kind=dbl) :: dia
-  real(kind=dbl) :: abs_hong,ext_hong,bsc_hong,g
-  real(kind=dbl), dimension(nang_db) :: p_hong
+  real(kind=dbl), dimension(nbins) :: dia
+  real(kind=dbl), dimension(nbins) :: abs_hong,ext_hong,bsc_hong
+  real(kind=dbl), dimension(nang_db,nbins) :: p_hong
   real(kind=dbl), dimension(nang_db) :: ang_db
   real(kind=dbl), parameter, dimension(0:5) :: mass_eq_dia = (/514.71503,310.88101,897.64746,307.97501,344.20901,283.388/)*2.e-6
   real(kind=sgl), parameter, dimension(0:5) :: a_m = (/0.03,0.02,0.75,0.18,65.45,347.31/) ! taken from Kulie et al. 2010
@@ -139,38 +139,43 @@ subroutine dda_db_hong(errorstatus,f,t,hong_type,mindex,nbins, &
   if (verbose >= 3) print*, 'done calling quadratures'
 
 
-  !   integration loop over radius of spheres 
+  ! look up all diameters in the database at once
   if (verbose > 3) print*, 'Doing database search for diameter intervall: '
+  do ir = 1, nbins
+     dia(ir) = diameter(ir)
+     !no warnings if no particles present
+     if (ndens(ir) <= 0) CYCLE
+     if (dia(ir) < dmin) then
+        if (verbose >= 1) print*, 'WARNING dda_hong: particle with ', dia(ir) ,' smaller than d_min of hong database'
+     end if
+     if (dia(ir) > dmax) then
+        if (verbose >= 1) print*, 'WARNING dda_hong: particle with ', dia(ir) ,' larger than d_max of hong database'
+     end if
+  end do
+  dia = min(max(dia,dmin),dmax)
+  if (verbose >= 3) print*, ' with: ',f,t,hong_type,dia
+  call hongdb_vec(err,f,t,hong_type,nbins,dia,abs_hong,ext_hong,bsc_hong,p_hong)
+  if (err /= 0) then
+   msg = 'error in hongdb_vec!'
+   call report(err, msg, nameOfRoutine)
+   errorstatus = err
+   return
+  end if
+
+  !   integration loop over radius of spheres 
   do ir = 1, nbins
      !Do not process if no particles present
      if (ndens(ir) <= 0) CYCLE
 
      ndens_eff = ndens(ir)
      del_d_eff = del_d(ir)
-     dia = diameter(ir)
         
      n_tot = n_tot + ndens_eff*del_d_eff !weights are required as integration coefficient instead of del_d
-     if (dia < dmin) then
-        if (verbose >= 1) print*, 'WARNING dda_hong: particle with ', dia ,' smaller than d_min of hong database'
-        dia = dmin
-     end if
-     if (dia > dmax) then
-        if (verbose >= 1) print*, 'WARNING dda_hong: particle with ', dia ,' larger than d_max of hong database'
-        dia = dmax
-     end if
-     if (verbose >= 3) print*, ir, ' with: ',f,t,hong_type,dia
-     call hongdb(err,f,t,hong_type,dia,abs_hong,ext_hong,bsc_hong,g,p_hong)
-     if (err /= 0) then
-      msg = 'error in hongdb!'
-      call report(err, msg, nameOfRoutine)
-      errorstatus = err
-      return
-     end if
-     if (verbose >= 3) print*, f,t,hong_type,dia, abs_hong,ext_hong,bsc_hong,p_hong
+     if (verbose >= 3) print*, f,t,hong_type,dia(ir), abs_hong(ir),ext_hong(ir),bsc_hong(ir),p_hong(:,ir)
 
-     qext = ext_hong
-     qscat = ext_hong - abs_hong
-     qback = bsc_hong
+     qext = ext_hong(ir)
+     qscat = ext_hong(ir) - abs_hong(ir)
+     qback = bsc_hong(ir)
      ! sum up extinction, scattering, and backscattering as cross-sections/pi
 
      sumqe = sumqe + qext * ndens_eff * del_d_eff!weights(ir)
@@ -180,7 +185,7 @@ subroutine dda_db_hong(errorstatus,f,t,hong_type,mindex,nbins, &
 !     print*, diameter(ir), ndens_eff, del_d_eff, n_tot, sumqe, sumqs, sumqback
      if (lphase_flag) then
         ang_quad = acos(mu(nquad:1:-1))*180.d0/pi
-        call interpolation(nang_db,nquad,ang_db,p_hong,ang_quad,P1_quad)
+        call interpolation(nang_db,nquad,ang_db,p_hong(:,ir),ang_quad,P1_quad)
         fac = sum(P1_quad*wts)
         P1_quad = P1_quad*(2.d0/fac)
         do i = 1, nquad 
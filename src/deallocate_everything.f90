@@ -27,6 +27,8 @@ module deallocate_everything
         use descriptor_file, only: deallocate_descriptor_file
         use drop_size_dist, only: deallocateVars_drop_size_dist
         use scatProperties, only: deallocate_scatProperties
+        use scat_cache, only: deallocate_scat_cache
+        use psd_cache, only: deallocate_psd_cache
         use vars_output, only: deallocate_output_vars
         use vars_rt, only: deallocate_rt_vars
         use vars_atmosphere, only: deallocate_atmosphere_vars
@@ -42,6 +44,8 @@ module deallocate_everything
         call deallocate_output_vars()
         call deallocateVars_drop_size_dist()
         call deallocate_scatProperties()
+        call deallocate_scat_cache()
+        call deallocate_psd_cache()
         call deallocate_rt_vars()
         call deallocate_atmosphere_vars()
         call deallocate_hydrofs_vars()
@@ -52,4 +56,37 @@ module deallocate_everything
         return
 
     end subroutine do_deallocate_everything
+
+    subroutine do_release_databases(errorstatus)
+
+        !
+        ! Description:
+        !   Frees the databases which are kept in memory between runs (TELSEM2 atlas,
+        !   Hong DDA database, gas absorption tables). They are not touched by
+        !   do_deallocate_everything and are read again from disk when needed.
+        !
+
+        use kinds
+        use report_module
+
+        use mod_mwatlas_nt_bin, only: rttov_closemw_atlas
+        use hong_db, only: hongdb_release
+        use gasabs_lut, only: gasabs_lut_release
+
+        integer(kind=long), intent(out) :: errorstatus
+        integer(kind=long) :: err = 0
+        character(len=30) :: nameOfRoutine = 'release_databases'
+
+        if (verbose >= 2) call report(info,'Start of ', nameOfRoutine)
+
+        call rttov_closemw_atlas()
+        call hongdb_release()
+        call gasabs_lut_release()
+
+        if (verbose >= 2) call report(info,'End of ', nameOfRoutine)
+
+        errorstatus = err
+        return
+
+    end subroutine do_release_databases
 end module deallocate_everything
\ No newline at end of file
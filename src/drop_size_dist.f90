@@ -107,12 +107,29 @@ end subroutine deallocateVars_drop_size_dist
 
 subroutine run_drop_size_dist(errorstatus)
 
+! Error handling
+
+  integer(kind=long)  :: errorstatus
+
+  call make_psd(errorstatus)
+  if (errorstatus == 2) return
+
+  call make_scat_particles(errorstatus)
+
+end subroutine run_drop_size_dist
+
+subroutine make_psd(errorstatus)
+
+! The frequency independent part of run_drop_size_dist: mass-size relation, drop size
+! distribution, particle mass and area and the moments. Its results can be kept by
+! psd_cache and reused for the other frequencies.
+
 ! Error handling
 
   integer(kind=long)  :: errorstatus, ibin
   integer(kind=long)  :: err
   character(len=80)   :: msg
-  character(len=14)   :: nameOfRoutine = 'run_drop_size_dist'
+  character(len=14)   :: nameOfRoutine = 'make_psd'
 
   err = 0
 
@@ -190,6 +207,23 @@ subroutine run_drop_size_dist(errorstatus)
     return
   end if
 
+end subroutine make_psd
+
+subroutine make_scat_particles(errorstatus)
+
+! The frequency dependent part of run_drop_size_dist: the soft spheroid density of
+! some ice particles depends on the frequency.
+
+! Error handling
+
+  integer(kind=long)  :: errorstatus
+  integer(kind=long)  :: err
+  character(len=80)   :: msg
+  character(len=19)   :: nameOfRoutine = 'make_scat_particles'
+
+  err = 0
+  errorstatus = err
+
   if (liq_ice == -1) then
     call make_soft_spheroid(errorstatus)
   endif
@@ -216,6 +250,6 @@ subroutine run_drop_size_dist(errorstatus)
   end if 
 
 
-end subroutine run_drop_size_dist
+end subroutine make_scat_particles
 
 end module drop_size_dist
\ No newline at end of file
@@ -0,0 +1,460 @@
+module gasabs_lut
+
+  ! Lookup table of the gas absorption, used with gas_mod 'R98_LUT' and 'L93_LUT'.
+  !
+  ! For fixed frequency, temperature and pressure the absorption is very close to
+  ! a quadratic function of the water vapor density: the continuum is quadratic and
+  ! the lines depend on the humidity only through the pressure broadening. The table
+  ! holds the three coefficients of this polynomial on a regular grid of temperature
+  ! and log(pressure). The polynomial is fitted to the absorption at zero, half and
+  ! full lut_cap, the largest water vapor density of the grid point. For a layer,
+  ! the polynomials of the four surrounding grid points are evaluated and their
+  ! logarithms are interpolated bilinearly, which is exact for the power laws of the
+  ! continua.
+  !
+  ! A table is built for every frequency in use and kept until the model changes or
+  ! the databases are released, so frequencies can be processed in any order. Before
+  ! it is used, a table is compared to the direct calculation in the centres of the
+  ! grid cells and rejected if the relative error exceeds gas_lut_tolerance. Layers
+  ! outside of the table are always calculated directly. If gas_lut_path is set, the
+  ! tables are written there and read again by later runs.
+
+  use kinds, only: dbl, long
+  use report_module
+
+  implicit none
+  save
+
+  private
+  public :: gasabs_direct, gasabs_lut_prepare, gasabs_lut_get, gasabs_lut_release
+
+  ! grid of the table
+  integer(kind=long), parameter :: lut_ntemp = 101
+  real(kind=dbl), parameter :: lut_temp0 = 150._dbl ! K
+  real(kind=dbl), parameter :: lut_dtemp = 2._dbl ! K
+  integer(kind=long), parameter :: lut_npress = 94
+  real(kind=dbl), parameter :: lut_lnpress0 = 2.302585092994046_dbl ! ln(10 Pa), lower limit of rosen98_gasabs
+  real(kind=dbl), parameter :: lut_dlnpress = 0.1_dbl
+  ! lut_cap as vapor pressure relative to saturation and to the total pressure
+  real(kind=dbl), parameter :: lut_max_relhum = 1.5_dbl
+  real(kind=dbl), parameter :: lut_max_vapor_fraction = 0.08_dbl
+  ! absorption [Np/m] below which the error is not taken relative anymore
+  real(kind=dbl), parameter :: lut_min_kext = 1.e-9_dbl
+  integer(kind=long), parameter :: lut_file_version = 1
+
+  ! one table per frequency, lut_cur is the one of the current frequency
+  real(kind=dbl), allocatable, dimension(:,:,:,:) :: lut_coef ! (3,lut_ntemp,lut_npress,ntables)
+  real(kind=dbl), allocatable, dimension(:) :: lut_freq ! GHz
+  real(kind=dbl), allocatable, dimension(:) :: lut_max_error
+  real(kind=dbl), allocatable, dimension(:,:) :: lut_cap ! [kg/m3]
+  character(3) :: lut_model = ''
+  integer(kind=long) :: lut_ntables = 0
+  integer(kind=long) :: lut_cur = 0
+  logical :: lut_use = .false.
+
+contains
+
+  subroutine gasabs_direct(errorstatus, model, freq, temp, press, rho_vap, vapor_pressure, kext)
+
+    ! absorption [Np/m] of a single layer calculated with model L93 or R98
+
+    use constants, only: t_abs
+
+    implicit none
+
+    character(3), intent(in) :: model
+    real(kind=dbl), intent(in) :: freq ! GHz
+    real(kind=dbl), intent(in) :: temp ! K
+    real(kind=dbl), intent(in) :: press ! Pa
+    real(kind=dbl), intent(in) :: rho_vap ! kg/m3
+    real(kind=dbl), intent(in) :: vapor_pressure ! Pa
+    real(kind=dbl), intent(out) :: kext
+
+    real(kind=dbl) :: absair, abswv
+
+    integer(kind=long), intent(out) :: errorstatus
+    integer(kind=long) :: err
+    character(len=80) :: msg
+    character(len=14) :: nameOfRoutine = 'gasabs_direct'
+
+    err = 0
+    if (model .eq. 'L93') then
+      call mpm93(err,freq, press/1.d3, vapor_pressure/1.d3,temp - t_abs, 0.d0, kext)
+      if (err /= 0) then
+        msg = 'error in mpm93!'
+        call report(err, msg, nameOfRoutine)
+        errorstatus = err
+        return
+      end if
+      kext = kext/1.d3
+    else if (model .eq. 'R98') then
+      call rosen98_gasabs(err,freq,temp,rho_vap,press,absair,abswv)
+      if (err /= 0) then
+        msg = 'Error in rosen98_gasabs!'
+        call report(err, msg, nameOfRoutine)
+        errorstatus = err
+        return
+      end if
+      kext = (absair + abswv)/1.d3    ! conversion to Np/m
+    else
+      kext = 0
+      msg = 'No gas absorption model specified!'
+      err = fatal
+      call report(err, msg, nameOfRoutine)
+    end if
+
+    errorstatus = err
+    return
+
+  end subroutine gasabs_direct
+
+  subroutine gasabs_lut_prepare(errorstatus, model, freq)
+
+    ! make sure the table of model for freq is available, either from memory, from
+    ! gas_lut_path or calculated
+
+    use settings, only: gas_lut_path, gas_lut_tolerance
+
+    implicit none
+
+    character(3), intent(in) :: model
+    real(kind=dbl), intent(in) :: freq ! GHz
+
+    logical :: loaded
+    integer(kind=long) :: i_t
+
+    integer(kind=long), intent(out) :: errorstatus
+    integer(kind=long) :: err
+    character(len=80) :: msg
+    character(len=18) :: nameOfRoutine = 'gasabs_lut_prepare'
+
+    err = 0
+
+    if (lut_model /= model) call gasabs_lut_release()
+
+    lut_cur = 0
+    do i_t = 1, lut_ntables
+      if (lut_freq(i_t) == freq) lut_cur = i_t
+    end do
+
+    if (lut_cur == 0) then
+      if (verbose >= 2) call report(info,'Start of ', nameOfRoutine)
+
+      if (.not. allocated(lut_cap)) then
+        allocate(lut_cap(lut_ntemp,lut_npress))
+        call fill_lut_cap()
+      end if
+      call add_table(freq)
+
+      loaded = .false.
+      if (len_trim(gas_lut_path) > 0) call read_lut(model, freq, loaded)
+      if (.not. loaded) then
+        call build_lut(err, model, freq)
+        if (err /= 0) then
+          lut_ntables = lut_ntables - 1
+          lut_cur = 0
+          lut_use = .false.
+          msg = 'error in build_lut!'
+          call report(err, msg, nameOfRoutine)
+          errorstatus = err
+          return
+        end if
+        if (len_trim(gas_lut_path) > 0) call write_lut(model, freq)
+      end if
+      lut_model = model
+
+      if (verbose >= 2) then
+        write(msg,'(a,f10.3,a,es9.2)') 'gas absorption table ', freq, ' GHz, max. relative error ', &
+          lut_max_error(lut_cur)
+        call report(info, msg, nameOfRoutine)
+      end if
+      if (lut_max_error(lut_cur) > gas_lut_tolerance) then
+        write(msg,'(a,f10.3,a,es9.2)') 'gas absorption table not used for ', freq, ' GHz, error ', &
+          lut_max_error(lut_cur)
+        call report(warning, msg, nameOfRoutine)
+      end if
+    end if
+
+    !the tolerance can change between runs
+    lut_use = (lut_max_error(lut_cur) <= gas_lut_tolerance)
+
+    errorstatus = err
+    return
+
+  end subroutine gasabs_lut_prepare
+
+  subroutine gasabs_lut_get(temp, press, rho_vap, kext, found)
+
+    ! absorption [Np/m] of a layer from the table. found is .false. if the layer is
+    ! outside of the table or the table is not used, kext is not set then.
+
+    implicit none
+
+    real(kind=dbl), intent(in) :: temp ! K
+    real(kind=dbl), intent(in) :: press ! Pa
+    real(kind=dbl), intent(in) :: rho_vap ! kg/m3
+    real(kind=dbl), intent(out) :: kext
+    logical, intent(out) :: found
+
+    real(kind=dbl) :: x, y, wx, wy
+    real(kind=dbl), dimension(2,2) :: k_corner
+    integer(kind=long) :: it, ip
+
+    found = .false.
+    if (.not. lut_use) return
+    !written like this to catch nans as well
+    if (.not. ((press > 0._dbl) .and. (rho_vap >= 0._dbl))) return
+
+    x = (temp - lut_temp0) / lut_dtemp
+    y = (log(press) - lut_lnpress0) / lut_dlnpress
+    if (.not. ((x >= 0._dbl) .and. (x < lut_ntemp-1) .and. (y >= 0._dbl) .and. (y < lut_npress-1))) return
+    it = int(x, kind=long) + 1
+    ip = int(y, kind=long) + 1
+    !lut_cap is smallest in the lower corner of the cell
+    if (rho_vap > lut_cap(it,ip)) return
+
+    k_corner = lut_coef(1,it:it+1,ip:ip+1,lut_cur) + rho_vap * (lut_coef(2,it:it+1,ip:ip+1,lut_cur) &
+      + rho_vap * lut_coef(3,it:it+1,ip:ip+1,lut_cur))
+    if (any(k_corner <= 0._dbl)) return
+
+    wx = x - (it-1)
+    wy = y - (ip-1)
+    kext = exp((1._dbl-wx) * (1._dbl-wy) * log(k_corner(1,1)) &
+      + wx * (1._dbl-wy) * log(k_corner(2,1)) &
+      + (1._dbl-wx) * wy * log(k_corner(1,2)) &
+      + wx * wy * log(k_corner(2,2)))
+    found = .true.
+
+    return
+
+  end subroutine gasabs_lut_get
+
+  subroutine gasabs_lut_release()
+
+    ! free the tables, see do_release_databases
+
+    implicit none
+
+    if (allocated(lut_coef)) deallocate(lut_coef)
+    if (allocated(lut_freq)) deallocate(lut_freq)
+    if (allocated(lut_max_error)) deallocate(lut_max_error)
+    if (allocated(lut_cap)) deallocate(lut_cap)
+    lut_model = ''
+    lut_ntables = 0
+    lut_cur = 0
+    lut_use = .false.
+
+  end subroutine gasabs_lut_release
+
+  subroutine add_table(freq)
+
+    ! make room for the table of freq and make it the current one
+
+    implicit none
+
+    real(kind=dbl), intent(in) :: freq
+
+    real(kind=dbl), allocatable, dimension(:,:,:,:) :: coef_tmp
+    real(kind=dbl), allocatable, dimension(:) :: freq_tmp, error_tmp
+    integer(kind=long) :: n
+
+    if (.not. allocated(lut_coef)) then
+      allocate(lut_coef(3,lut_ntemp,lut_npress,4), lut_freq(4), lut_max_error(4))
+    else if (lut_ntables == size(lut_freq)) then
+      n = 2 * lut_ntables
+      allocate(coef_tmp(3,lut_ntemp,lut_npress,n), freq_tmp(n), error_tmp(n))
+      coef_tmp(:,:,:,:lut_ntables) = lut_coef(:,:,:,:lut_ntables)
+      freq_tmp(:lut_ntables) = lut_freq(:lut_ntables)
+      error_tmp(:lut_ntables) = lut_max_error(:lut_ntables)
+      call move_alloc(coef_tmp, lut_coef)
+      call move_alloc(freq_tmp, lut_freq)
+      call move_alloc(error_tmp, lut_max_error)
+    end if
+
+    lut_ntables = lut_ntables + 1
+    lut_cur = lut_ntables
+    lut_freq(lut_cur) = freq
+    lut_max_error(lut_cur) = -1._dbl
+
+  end subroutine add_table
+
+  subroutine fill_lut_cap()
+
+    use constants, only: r_v
+
+    implicit none
+
+    real(kind=dbl) :: temp, press
+    integer(kind=long) :: it, ip
+    real(kind=dbl) :: e_sat_gg_water
+
+    do ip = 1, lut_npress
+      press = exp(lut_lnpress0 + (ip-1) * lut_dlnpress)
+      do it = 1, lut_ntemp
+        temp = lut_temp0 + (it-1) * lut_dtemp
+        ! e_sat_gg_water is in hPa
+        lut_cap(it,ip) = min(lut_max_relhum * 100._dbl * e_sat_gg_water(temp), &
+          lut_max_vapor_fraction * press) / (r_v * temp)
+      end do
+    end do
+
+  end subroutine fill_lut_cap
+
+  subroutine build_lut(errorstatus, model, freq)
+
+    ! fit the coefficients of the current table and determine its lut_max_error
+
+    use constants, only: r_v
+
+    implicit none
+
+    character(3), intent(in) :: model
+    real(kind=dbl), intent(in) :: freq
+
+    real(kind=dbl) :: temp, press, rho_vap, k0, k_half, k_cap, a, b, k_lut, k_direct
+    integer(kind=long) :: it, ip, ir
+    logical :: found
+    real(kind=dbl), dimension(2), parameter :: test_fraction = (/0.3_dbl, 1._dbl/)
+
+    integer(kind=long), intent(out) :: errorstatus
+    integer(kind=long) :: err
+
+    err = 0
+
+    do ip = 1, lut_npress
+      press = exp(lut_lnpress0 + (ip-1) * lut_dlnpress)
+      do it = 1, lut_ntemp
+        temp = lut_temp0 + (it-1) * lut_dtemp
+        rho_vap = lut_cap(it,ip)
+        call gasabs_direct(err, model, freq, temp, press, 0._dbl, 0._dbl, k0)
+        if (err /= 0) exit
+        call gasabs_direct(err, model, freq, temp, press, 0.5_dbl*rho_vap, 0.5_dbl*rho_vap*r_v*temp, k_half)
+        if (err /= 0) exit
+        call gasabs_direct(err, model, freq, temp, press, rho_vap, rho_vap*r_v*temp, k_cap)
+        if (err /= 0) exit
+        a = 2._dbl * (k_cap - 2._dbl*k_half + k0)
+        b = k_cap - k0 - a
+        lut_coef(1,it,ip,lut_cur) = k0
+        lut_coef(2,it,ip,lut_cur) = b / rho_vap
+        lut_coef(3,it,ip,lut_cur) = a / rho_vap**2
+      end do
+      if (err /= 0) exit
+    end do
+    if (err /= 0) then
+      errorstatus = err
+      return
+    end if
+
+    !test the interpolation in the centre of every second cell
+    lut_use = .true.
+    lut_max_error(lut_cur) = 0._dbl
+    do ip = 1, lut_npress-1, 2
+      press = exp(lut_lnpress0 + (ip-0.5_dbl) * lut_dlnpress)
+      do it = 1, lut_ntemp-1, 2
+        temp = lut_temp0 + (it-0.5_dbl) * lut_dtemp
+        do ir = 1, 2
+          rho_vap = test_fraction(ir) * lut_cap(it,ip)
+          call gasabs_lut_get(temp, press, rho_vap, k_lut, found)
+          if (.not. found) cycle
+          call gasabs_direct(err, model, freq, temp, press, rho_vap, rho_vap*r_v*temp, k_direct)
+          if (err /= 0) then
+            errorstatus = err
+            return
+          end if
+          lut_max_error(lut_cur) = max(lut_max_error(lut_cur), &
+            abs(k_lut - k_direct) / max(abs(k_direct), lut_min_kext))
+        end do
+      end do
+    end do
+
+    errorstatus = err
+    return
+
+  end subroutine build_lut
+
+  function lut_file_name(model, freq)
+
+    use settings, only: gas_lut_path
+
+    implicit none
+
+    character(3), intent(in) :: model
+    real(kind=dbl), intent(in) :: freq
+    character(len=350) :: lut_file_name
+    character(len=16) :: freq_str
+
+    write(freq_str, '(f16.6)') freq
+    lut_file_name = trim(gas_lut_path)//'/gasabs_'//model//'_'//trim(adjustl(freq_str))//'.lut'
+
+  end function lut_file_name
+
+  subroutine read_lut(model, freq, loaded)
+
+    ! read the current table written by write_lut. Files of other grids or versions are ignored.
+
+    implicit none
+
+    character(3), intent(in) :: model
+    real(kind=dbl), intent(in) :: freq
+    logical, intent(out) :: loaded
+
+    integer :: unit, ios
+    integer(kind=long) :: version, ntemp, npress, version_end
+    character(3) :: file_model
+    real(kind=dbl) :: file_freq, temp0, dtemp, lnpress0, dlnpress, max_relhum, max_vapor_fraction, max_error
+    logical :: file_exists
+
+    loaded = .false.
+    inquire(file=trim(lut_file_name(model, freq)), exist=file_exists)
+    if (.not. file_exists) return
+
+    open(newunit=unit, file=trim(lut_file_name(model, freq)), access='stream', form='unformatted', &
+      status='old', action='read', iostat=ios)
+    if (ios /= 0) return
+    read(unit, iostat=ios) version, file_model, file_freq, ntemp, npress, temp0, dtemp, lnpress0, dlnpress, &
+      max_relhum, max_vapor_fraction, max_error
+    if ((ios == 0) .and. (version == lut_file_version) .and. (file_model == model) .and. (file_freq == freq) &
+      .and. (ntemp == lut_ntemp) .and. (npress == lut_npress) .and. (temp0 == lut_temp0) &
+      .and. (dtemp == lut_dtemp) .and. (lnpress0 == lut_lnpress0) .and. (dlnpress == lut_dlnpress) &
+      .and. (max_relhum == lut_max_relhum) .and. (max_vapor_fraction == lut_max_vapor_fraction)) then
+      !the version is repeated at the end to detect incomplete files
+      read(unit, iostat=ios) lut_coef(:,:,:,lut_cur), version_end
+      if ((ios == 0) .and. (version_end == lut_file_version)) then
+        lut_max_error(lut_cur) = max_error
+        loaded = .true.
+      end if
+    end if
+    close(unit)
+
+  end subroutine read_lut
+
+  subroutine write_lut(model, freq)
+
+    ! write the current table to gas_lut_path. Failing to write is not an error, the table is
+    ! calculated again next time.
+
+    implicit none
+
+    character(3), intent(in) :: model
+    real(kind=dbl), intent(in) :: freq
+
+    integer :: unit, ios
+    character(len=80) :: msg
+    character(len=9) :: nameOfRoutine = 'write_lut'
+
+    open(newunit=unit, file=trim(lut_file_name(model, freq)), access='stream', form='unformatted', &
+      status='replace', action='write', iostat=ios)
+    if (ios == 0) then
+      write(unit, iostat=ios) lut_file_version, model, freq, lut_ntemp, lut_npress, lut_temp0, lut_dtemp, &
+        lut_lnpress0, lut_dlnpress, lut_max_relhum, lut_max_vapor_fraction, lut_max_error(lut_cur), &
+        lut_coef(:,:,:,lut_cur), lut_file_version
+      close(unit)
+    end if
+    if (ios /= 0) then
+      msg = 'Could not write gas absorption table to gas_lut_path'
+      call report(warning, msg, nameOfRoutine)
+    end if
+
+  end subroutine write_lut
+
+end module gasabs_lut
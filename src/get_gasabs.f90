@@ -7,6 +7,8 @@ subroutine get_gasabs &
     !  is selected.
     !
     !  The absorption coefficient is converted from Np/km to Np/m in the end.
+    !  With gas_mod R98_LUT or L93_LUT, the absorption is interpolated from the
+    !  table of the gasabs_lut module where possible.
     !
     !  The result is stored in rt_kextatmo from vars_atmosphere module.
     !
@@ -25,6 +27,7 @@ subroutine get_gasabs &
     ! 0.1     21/09/2009   Include Rosenkranz gas absorption model - M. Mech
     ! 0.2     26/02/2013   Application of European Standards for Writing and
     !                      Documenting Exchangeable Fortran 90 Code - M. Mech
+    ! 0.3     18/10/2026   Lookup tables (gasabs_lut)
     !
     ! Code Description:
     !  Language: Fortran 90.
@@ -33,7 +36,8 @@ subroutine get_gasabs &
     !
     ! Parent Module: run_rt
     !
-    ! Child modules: mpm93
+    ! Child modules: gasabs_lut
+    !                mpm93
     !                rosen_gasabs98
     !
     ! Declarations:
@@ -44,8 +48,8 @@ subroutine get_gasabs &
     long   ! integer parameter specifying long integer
     use vars_atmosphere, only: atmo_nlyrs, atmo_press, atmo_temp, atmo_vapor_pressure, atmo_rho_vap
     use vars_rt, only: rt_kextatmo
-    use constants, only: t_abs
     use settings, only: gas_mod
+    use gasabs_lut, only: gasabs_direct, gasabs_lut_prepare, gasabs_lut_get
     use vars_index, only: i_x, i_y
     use report_module
 
@@ -61,8 +65,7 @@ subroutine get_gasabs &
     ! Local scalars:
     integer(kind=long) :: nz
 
-    real(kind=dbl) :: absair, abswv
-    real(kind=dbl) :: tc
+    logical :: use_lut, found
 
     ! Error handling
 
@@ -73,30 +76,27 @@ subroutine get_gasabs &
 
     if (verbose >= 2) call report(info,'Start of ', nameOfRoutine)
 
+    use_lut = (gas_mod(4:7) .eq. '_LUT')
+    if (use_lut) then
+        call gasabs_lut_prepare(err, gas_mod(1:3), freq)
+        if (err /= 0) then
+            msg = 'error in gasabs_lut_prepare!'
+            call report(err, msg, nameOfRoutine)
+            errorstatus = err
+            return
+        end if
+    end if
+
     do nz = 1, atmo_nlyrs(i_x,i_y)
-        tc = atmo_temp(i_x,i_y,nz) - t_abs
-        if (gas_mod .eq. 'L93') then
-            call mpm93(err,freq, atmo_press(i_x,i_y,nz)/1.d3, atmo_vapor_pressure(i_x,i_y,nz)/1.d3,tc, 0.d0, rt_kextatmo(nz))
-            if (err /= 0) then
-                msg = 'error in mpm93!'
-                call report(err, msg, nameOfRoutine)
-                errorstatus = err
-                return
-            end if
-            rt_kextatmo(nz) = rt_kextatmo(nz)/1.d3
-        else if (gas_mod .eq. 'R98') then
-            call rosen98_gasabs(err,freq,atmo_temp(i_x,i_y,nz),atmo_rho_vap(i_x,i_y,nz),atmo_press(i_x,i_y,nz),absair,abswv)
-            if (err /= 0) then
-                msg = 'Error in rosen98_gasabs!'
-                call report(err, msg, nameOfRoutine)
-                errorstatus = err
-                return
-            end if
-            rt_kextatmo(nz) = (absair + abswv)/1.d3    ! conversion to Np/m
-        else
-            rt_kextatmo(nz) = 0
-            msg = 'No gas absorption model specified!'
-            err = fatal
+        if (use_lut) then
+            call gasabs_lut_get(atmo_temp(i_x,i_y,nz), atmo_press(i_x,i_y,nz), atmo_rho_vap(i_x,i_y,nz), &
+                rt_kextatmo(nz), found)
+            if (found) cycle
+        end if
+        call gasabs_direct(err, gas_mod(1:3), freq, atmo_temp(i_x,i_y,nz), atmo_press(i_x,i_y,nz), &
+            atmo_rho_vap(i_x,i_y,nz), atmo_vapor_pressure(i_x,i_y,nz), rt_kextatmo(nz))
+        if (err /= 0) then
+            msg = 'error in gasabs_direct!'
             call report(err, msg, nameOfRoutine)
             errorstatus = err
             return
@@ -1,6 +1,112 @@
-subroutine hongdb(errorstatus,freq,temp,hong_type,dia,abs_hong,ext_hong,bsc_hong,g,p_hong)
+module hong_db
+!
+! Module level copy of the Hong database. Instead of opening and reading hong.dda for every
+! particle size, the records of a particle type and frequency are read once per process the first
+! time they are needed and kept in memory (indexed by diameter, temperature, frequency and type)
+! until hongdb_release is called or data_path changes.
 !
-! This routine gives access to the Hong database described in Hong et al  2009 JGR. The database contains 
+! Only the variables used by hongdb are kept: area, extinction and absorption efficiency and the
+! first element of the phase function.
+
+  use kinds
+  use report_module
+
+  implicit none
+  save
+
+  integer, parameter :: hong_nfreq = 21, hong_ntemp = 5, hong_ndia = 38, hong_ntype = 6, hong_nang = 181
+
+  real(kind=dbl), parameter, dimension(hong_nfreq) :: hong_freqs = (/90.0_dbl, 118.0_dbl, 157.0_dbl, 166.0_dbl,&
+    183.3_dbl, 190.0_dbl, 203.0_dbl, 220.0_dbl, 243.0_dbl, 325.0_dbl, 340.0_dbl,&
+    380.0_dbl, 425.0_dbl, 448.0_dbl, 463.0_dbl, 487.0_dbl, 500.0_dbl, 640.0_dbl, 664.0_dbl, 683.0_dbl, 874.0_dbl/)
+  real(kind=dbl), parameter, dimension(hong_ntemp) :: hong_temps = (/223.15_dbl,238.15_dbl,243.15_dbl,258.15_dbl,273.15_dbl/)
+  real(kind=dbl), parameter, dimension(hong_ndia) :: hong_dias = (/2.0_dbl, 4.0_dbl, 6.0_dbl, 8.0_dbl, 10.0_dbl,&
+    12.5_dbl, 15.0_dbl, 20.0_dbl, 25.0_dbl, 30.0_dbl, &
+    40.0_dbl, 50.0_dbl, 60.0_dbl, 70.0_dbl, 80.0_dbl, 90.0_dbl, 100.0_dbl, 125.0_dbl, 150.0_dbl, 175.0_dbl, &
+    200.0_dbl, 250.0_dbl, 300.0_dbl, 350.0_dbl, 400.0_dbl, 500.0_dbl, 600.0_dbl, 700.0_dbl, 800.0_dbl, 900.0_dbl,&
+    1000.0_dbl, 1100.0_dbl, 1200.0_dbl, 1300.0_dbl, 1400.0_dbl, 1600.0_dbl, 1800.0_dbl, 2000.0_dbl/)
+
+  real(kind=dbl), allocatable, dimension(:,:,:,:) :: hong_area, hong_ext, hong_abs
+  real(kind=dbl), allocatable, dimension(:,:,:,:,:) :: hong_p
+  logical, dimension(hong_nfreq,0:hong_ntype-1) :: hong_loaded = .false.
+  character(len=300) :: hong_file = ''
+
+contains
+
+  subroutine hongdb_load(errorstatus,hong_type,floc)
+  ! read all temperatures and diameters of particle type hong_type and frequency index floc
+
+    use settings, only: data_path
+
+    implicit none
+
+    integer, intent(in) :: hong_type, floc
+    integer :: tloc, dloc, pos, ios
+    real(kind=dbl) :: dum
+    real(kind=dbl), dimension(hong_nang) :: dum_ar
+
+    integer(kind=long), intent(out) :: errorstatus
+    character(len=80) :: msg
+    character(len=14) :: nameOfRoutine = 'hongdb_load'
+
+    errorstatus = 0
+
+    hong_file = trim(data_path)//'/hongdb/hong.dda'
+
+    if (.not. allocated(hong_p)) then
+      allocate(hong_area(hong_ndia,hong_ntemp,hong_nfreq,0:hong_ntype-1))
+      allocate(hong_ext(hong_ndia,hong_ntemp,hong_nfreq,0:hong_ntype-1))
+      allocate(hong_abs(hong_ndia,hong_ntemp,hong_nfreq,0:hong_ntype-1))
+      allocate(hong_p(hong_nang,hong_ndia,hong_ntemp,hong_nfreq,0:hong_ntype-1))
+    end if
+
+    if (verbose >= 2) print*, 'Loading Hong database for type and frequency ', hong_type, hong_freqs(floc)
+
+    ! The record length is i8+10*f8+(8*181)*f8 = 11672
+    open(666,file=trim(hong_file),form='unformatted',access='direct',recl=11672,status='old',iostat=ios)
+    if (ios /= 0) then
+      errorstatus = fatal
+      msg = 'cannot open '//trim(hong_file)
+      call report(errorstatus, msg, nameOfRoutine)
+      return
+    end if
+
+    do tloc = 1, hong_ntemp
+      do dloc = 1, hong_ndia
+        pos = 1 + hong_type * hong_nfreq * hong_ntemp * hong_ndia + (floc - 1) * hong_ntemp * hong_ndia &
+          + (tloc - 1) * hong_ndia + (dloc - 1)
+        read(666,rec=pos) dum, dum, dum, dum, dum, dum, hong_area(dloc,tloc,floc,hong_type), &
+          hong_ext(dloc,tloc,floc,hong_type),hong_abs(dloc,tloc,floc,hong_type),dum,dum,&
+          hong_p(:,dloc,tloc,floc,hong_type),dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
+      end do
+    end do
+    close(666)
+
+    hong_loaded(floc,hong_type) = .true.
+
+    return
+  end subroutine hongdb_load
+
+  subroutine hongdb_release()
+  ! free the memory of the database, it is read again when needed
+
+    implicit none
+
+    if (allocated(hong_area)) deallocate(hong_area)
+    if (allocated(hong_ext)) deallocate(hong_ext)
+    if (allocated(hong_abs)) deallocate(hong_abs)
+    if (allocated(hong_p)) deallocate(hong_p)
+    hong_loaded(:,:) = .false.
+    hong_file = ''
+
+    return
+  end subroutine hongdb_release
+
+end module hong_db
+
+subroutine hongdb_vec(errorstatus,freq,temp,hong_type,nbins,dia,abs_hong,ext_hong,bsc_hong,p_hong)
+!
+! This routine gives access to the Hong database described in Hong et al  2009 JGR. The database contains
 ! single scattering properties (absorption and scattering cross section and phase function elements) for six
 ! particles calculated with the DDA method.
 !
@@ -14,228 +120,206 @@ subroutine hongdb(errorstatus,freq,temp,hong_type,dia,abs_hong,ext_hong,bsc_hong
 ! this coefficient after Eriksson et al 2015 AMT has been performed.
 !
 ! Due to the limited range in diameters, a loss of mass occurs.
-! 
+!
 ! Up to now, only the first element of the phase function is used.!!!
+!
+! All nbins diameters are looked up at once, frequency and temperature are the same for all of them.
+! Temperatures and diameters outside of the database are set to the closest value of the database.
 
   use kinds
   use report_module
+  use hong_db
   use settings, only: data_path
-  
+
   implicit none
-  
-  integer :: i, sf,st,sd,floc, tloc, dloc, pos1,pos2,pos3,pos4,pos5,pos6,pos7,pos8
-  
-  integer, intent(in) :: hong_type
-  real(kind=dbl), intent(in) :: freq,temp,dia
-  real(kind=dbl), intent(out) :: abs_hong,ext_hong,bsc_hong,g
-  real(kind=dbl), dimension(181), intent(out) :: p_hong
+
+  integer :: i, ir, floc, tloc, dloc, fl
+
+  integer, intent(in) :: hong_type, nbins
+  real(kind=dbl), intent(in) :: freq,temp
+  real(kind=dbl), dimension(nbins), intent(in) :: dia
+  real(kind=dbl), dimension(nbins), intent(out) :: abs_hong,ext_hong,bsc_hong
+  real(kind=dbl), dimension(hong_nang,nbins), intent(out) :: p_hong
   real(kind=dbl) :: area, abs_eff, ext_eff
-  
-  ! the intermediate datasets
-  real(kind=dbl) :: a111,e111
-  real(kind=dbl) :: a112,e112
-  real(kind=dbl) :: a121,e121
-  real(kind=dbl) :: a122,e122
-  real(kind=dbl) :: a211,e211
-  real(kind=dbl) :: a212,e212
-  real(kind=dbl) :: a221,e221
-  real(kind=dbl) :: a222,e222
-  real(kind=dbl), dimension(181) :: p111,p112,p121,p122,p211,p212,p221,p222,dum_ar
-  
+
+  ! the intermediate datasets, (diameter, temperature, frequency)
+  real(kind=dbl), dimension(2,2,2) :: a_ftd, e_ftd
+  real(kind=dbl), dimension(hong_nang,2,2,2) :: p_ftd
+
   real(kind=dbl) :: freq_l, freq1, freq2, temp_l, temp1, temp2, dia_l, dia1, dia2
-  real(kind=dbl), dimension(38) :: dias
-  real(kind=dbl), dimension(21) :: freqs
-  real(kind=dbl), dimension(5) :: temps
-  
-  real(kind=dbl) :: dum
-!  real(kind=dbl), dimension(11) :: dummy
-  
+
   integer(kind=long) :: errorstatus
   integer(kind=long) :: err
   character(len=80) :: msg
-  character(len=14) :: nameOfRoutine = 'hongdb'
+  character(len=14) :: nameOfRoutine = 'hongdb_vec'
+
+  interface
+    subroutine intpol(dia,dia1,dia2,temp,temp1,temp2,freq,freq1,freq2,t111,t112,t121,t122,t211,t212,t221,t222,res)
+      use kinds
+      implicit none
+      real(kind=dbl) :: dia,dia1,dia2,temp,temp1,temp2,freq,freq1,freq2
+      real(kind=dbl) :: t111,t112,t121,t122,t211,t212,t221,t222,res
+    end subroutine intpol
+  end interface
 
   if (verbose >= 2) call report(info,'Start of ', nameOfRoutine)
 
   freq_l = freq
-  temp_l = temp
-  dia_l = dia*1.e6 ! diameter in database is in micron
+  temp_l = min(max(temp,hong_temps(1)),hong_temps(hong_ntemp))
   err = 0
-  abs_eff = 0._dbl
-  abs_hong = 0._dbl
-  ext_eff = 0._dbl
-  ext_hong = 0._dbl
-  bsc_hong = 0._dbl
-  g = 0._dbl
-  p_hong(:) = 0._dbl
-  
-  freqs = (/90.0_dbl, 118.0_dbl, 157.0_dbl, 166.0_dbl, 183.3_dbl, 190.0_dbl, 203.0_dbl, 220.0_dbl, 243.0_dbl, 325.0_dbl, 340.0_dbl,&
-    380.0_dbl, 425.0_dbl, 448.0_dbl, 463.0_dbl, 487.0_dbl, 500.0_dbl, 640.0_dbl, 664.0_dbl, 683.0_dbl, 874.0_dbl/)
-  temps =(/223.15_dbl,238.15_dbl,243.15_dbl,258.15_dbl,273.15_dbl/)
-  dias = (/2.0_dbl, 4.0_dbl, 6.0_dbl, 8.0_dbl, 10.0_dbl, 12.5_dbl, 15.0_dbl, 20.0_dbl, 25.0_dbl, 30.0_dbl, &
-    40.0_dbl, 50.0_dbl, 60.0_dbl, 70.0_dbl, 80.0_dbl, 90.0_dbl, 100.0_dbl, 125.0_dbl, 150.0_dbl, 175.0_dbl, &
-    200.0_dbl, 250.0_dbl, 300.0_dbl, 350.0_dbl, 400.0_dbl, 500.0_dbl, 600.0_dbl, 700.0_dbl, 800.0_dbl, 900.0_dbl,&
-    1000.0_dbl, 1100.0_dbl, 1200.0_dbl, 1300.0_dbl, 1400.0_dbl, 1600.0_dbl, 1800.0_dbl, 2000.0_dbl/)
+  abs_hong(:) = 0._dbl
+  ext_hong(:) = 0._dbl
+  bsc_hong(:) = 0._dbl
+  p_hong(:,:) = 0._dbl
 
   ! we do not do any extrapolation in frequency, temperature and diameter
-  
-  if ((freq_l < freqs(1)) .or. (freq_l > freqs(21))) then
+
+  if ((freq_l < hong_freqs(1)) .or. (freq_l > hong_freqs(hong_nfreq))) then
      errorstatus = fatal
-     msg =  'No extraplation for frequency' 
+     msg =  'No extraplation for frequency'
      call report(errorstatus, msg, nameOfRoutine)
-     return    
+     return
   end if
 
-!   if ((dia_l < dias(1)) .or. (dia_l > dias(38))) then
-!      errorstatus = fatal
-!      msg =  'No extraplation for diameter' 
-!      call report(errorstatus, msg, nameOfRoutine)
-!      return    
-!     
-!   end if
-! 
-!   if ((temp_l < temps(1)) .or. (temp_l > temps(5))) then
-!      errorstatus = fatal
-!      msg =  'No extraplation for temperature!' 
-!      call report(errorstatus, msg, nameOfRoutine)
-!      return    
-!   end if
-
-  if (abs(freq_l - freqs(1)) < 0.00001) freq_l = freq_l + 0.00001
-  if (abs(freq_l - freqs(21)) < 0.00001) freq_l = freq_l - 0.00001
-  if (abs(temp_l - temps(1)) < 0.00001) temp_l = temp_l + 0.00001
-  if (abs(temp_l - temps(5)) < 0.00001) temp_l = temp_l - 0.00001
-  if (abs(dia_l - dias(1)) < 0.00001) dia_l = dia_l + 0.00001
-  if (abs(dia_l - dias(38)) < 0.00001) dia_l = dia_l - 0.00001
+  if (abs(freq_l - hong_freqs(1)) < 0.00001) freq_l = freq_l + 0.00001
+  if (abs(freq_l - hong_freqs(hong_nfreq)) < 0.00001) freq_l = freq_l - 0.00001
+  if (abs(temp_l - hong_temps(1)) < 0.00001) temp_l = temp_l + 0.00001
+  if (abs(temp_l - hong_temps(hong_ntemp)) < 0.00001) temp_l = temp_l - 0.00001
 
   ! find the bounding frequencies
 
-  floc = minloc(abs(freqs - freq_l), 1) ! index of nearest frequency
-  if (freqs(floc) > freq_l) then
+  floc = minloc(abs(hong_freqs - freq_l), 1) ! index of nearest frequency
+  if (hong_freqs(floc) > freq_l) then
     floc = floc - 1
-    freq2 = freqs(floc + 1)
-    freq1 = freqs(floc)
-  elseif (freqs(floc) < freq_l) then
-    freq1 = freqs(floc)
-    freq2 = freqs(floc+1)
+    freq2 = hong_freqs(floc + 1)
+    freq1 = hong_freqs(floc)
+  elseif (hong_freqs(floc) < freq_l) then
+    freq1 = hong_freqs(floc)
+    freq2 = hong_freqs(floc+1)
   else
     freq1 = freq_l
     freq2 = freq1
   end if
-  
+
   ! find the bounding termperatures
 
-  tloc = minloc(abs(temps - temp_l), 1) ! index of nearest temperature
-  if (temps(tloc) > temp_l) then
+  tloc = minloc(abs(hong_temps - temp_l), 1) ! index of nearest temperature
+  if (hong_temps(tloc) > temp_l) then
     tloc = tloc - 1
-    temp2 = temps(tloc + 1)
-    temp1 = temps(tloc)
-  elseif (temps(tloc) < temp_l) then
-    temp1 = temps(tloc)
-    temp2 = temps(tloc+1)
+    temp2 = hong_temps(tloc + 1)
+    temp1 = hong_temps(tloc)
+  elseif (hong_temps(tloc) < temp_l) then
+    temp1 = hong_temps(tloc)
+    temp2 = hong_temps(tloc+1)
   else
     temp1 = temp_l
     temp2 = temp1
   end if
 
-  ! find the bounding diameters
+  ! make sure the needed part of the database is in memory, start from scratch if the location changed
+  if (trim(hong_file) /= trim(data_path)//'/hongdb/hong.dda') call hongdb_release()
+  do fl = floc, floc+1
+    if (.not. hong_loaded(fl,hong_type)) then
+      call hongdb_load(err,hong_type,fl)
+      if (err /= 0) then
+        msg = 'error in hongdb_load!'
+        call report(err, msg, nameOfRoutine)
+        errorstatus = err
+        return
+      end if
+    end if
+  end do
+
+  do ir = 1, nbins
 
-  dloc = minloc(abs(dias - dia_l), 1) ! index if nearest diameter
-  if (dias(dloc) > dia_l) then
-    dloc = dloc - 1
-    dia2 = dias(dloc + 1)
-    dia1 = dias(dloc)
-  elseif (dias(dloc) < dia_l) then
-    dia1 = dias(dloc)
-    dia2 = dias(dloc+1)
-  else
-    dia1 = dia_l
-    dia2 = dia1
-  end if
-  
-  ! calculate positions for all the datasets we need to perform the interpolation
-  ! floc, tloc, and dloc are the indices of the lower boundary
-  sf = size(freqs) ! 21
-  st = size(temps) ! 5
-  sd = size(dias)  ! 38
-  pos1 = 1 + hong_type * sf * st * sd + (floc - 1) * st * sd + (tloc - 1) * sd + (dloc - 1)
-  pos2 = 1 + hong_type * sf * st * sd + (floc - 1) * st * sd + (tloc - 1) * sd + dloc
-  pos3 = 1 + hong_type * sf * st * sd + (floc - 1) * st * sd + (tloc ) * sd + (dloc - 1)
-  pos4 = 1 + hong_type * sf * st * sd + (floc - 1) * st * sd + (tloc) * sd + dloc
-  pos5 = 1 + hong_type * sf * st * sd + (floc) * st * sd + (tloc - 1) * sd + (dloc - 1)
-  pos6 = 1 + hong_type * sf * st * sd + (floc) * st * sd + (tloc - 1) * sd + dloc
-  pos7 = 1 + hong_type * sf * st * sd + (floc) * st * sd + (tloc) * sd + (dloc - 1)
-  pos8 = 1 + hong_type * sf * st * sd + (floc) * st * sd + (tloc) * sd + dloc
-  if (verbose > 3) print*, pos1, pos2, pos3, pos4, pos5, pos6, pos7, pos8
-  ! The record length is i4+10*f4+(8*181)*f4 = 5836
-!  open(666,file='/home/mech/workspace/HongLiuDB/scripts/test.dda',form='unformatted',access='direct',recl=5836)
-  ! The record length is i8+10*f8+(8*181)*f8 = 11672
-  open(666,file=trim(data_path)//'/hongdb/hong.dda',form='unformatted',access='direct',recl=11672)
-  ! we have to get datasets for all combination
-  ! freq1,temp1,dia1
-  read(666,rec=pos1) dum, dum, dum, dum, dum, dum, area, e111,a111,dum,dum,p111,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
-  if (verbose > 3) print*,a111,e111
-  ! freq1,temp1,dia2
-  read(666,rec=pos2) dum, dum, dum, dum, dum, dum, dum, e112,a112,dum,dum,p112,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
-  if (verbose > 3) print*,a112,e112
-  ! freq1,temp2,dia1
-  read(666,rec=pos3) dum, dum, dum, dum, dum, dum, dum, e121,a121,dum,dum,p121,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
-  if (verbose > 3) print*,a121,e121
-  ! freq1,temp2,dia2
-  read(666,rec=pos4) dum, dum, dum, dum, dum, dum, dum, e122,a122,dum,dum,p122,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
-  if (verbose > 3) print*,a122,e122
-  ! freq2,temp1,dia1
-  read(666,rec=pos5) dum, dum, dum, dum, dum, dum, dum, e211,a211,dum,dum,p211,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
-  if (verbose > 3) print*,a211,e211
-  ! freq2,temp1,dia2
-  read(666,rec=pos6) dum, dum, dum, dum, dum, dum, dum, e212,a212,dum,dum,p212,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
-  if (verbose > 3) print*,a212,e212
-  ! freq2,temp2,dia1
-  read(666,rec=pos7) dum, dum, dum, dum, dum, dum, dum, e221,a221,dum,dum,p221,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
-  if (verbose > 3) print*,a221,e221
-  ! freq2,temp2,dia2
-  read(666,rec=pos8) dum, dum, dum, dum, dum, dum, dum, e222,a222,dum,dum,p222,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar,dum_ar
-  if (verbose > 3) print*,a222,e222
-  close(666)
-
-  ! interpolation
-!  print*, dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,a111,a112,a121,a122,a211,a212,a221,a222,abs_hong
-  ! absorption cross section
-  call intpol(dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,a111,a112,a121,a122,a211,a212,a221,a222,abs_eff)
-  abs_hong = abs_eff*area*1.e-12 ! rescale from 1/micron**2 to 1/m**2
-  if (verbose > 3) print*, dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,a111,a112,a121,a122,a211,a212,a221,a222,abs_hong
-  ! scattering cross section
-  call intpol(dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,e111,e112,e121,e122,e211,e212,e221,e222,ext_eff)
-  ext_hong = ext_eff * area*1.e-12 ! rescale from 1/micron**2 to 1/m**2
-  if (verbose > 3) print*, dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,e111,e112,e121,e122,e211,e212,e221,e222,ext_hong
-  ! back scattering cross section
-!   call intpol(dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,b111,b112,b121,b122,b211,b212,b221,b222,bsc_hong)
-!   print*, dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,b111,b112,b121,b122,b211,b212,b221,b222,bsc_hong
-  ! phase function
-  do i = 1,181
-    call intpol(dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,&
-      p111(i),p112(i),p121(i),p122(i),p211(i),p212(i),p221(i),p222(i),p_hong(i))
+    dia_l = min(max(dia(ir)*1.e6,hong_dias(1)),hong_dias(hong_ndia)) ! diameter in database is in micron
+    if (abs(dia_l - hong_dias(1)) < 0.00001) dia_l = dia_l + 0.00001
+    if (abs(dia_l - hong_dias(hong_ndia)) < 0.00001) dia_l = dia_l - 0.00001
+
+    ! find the bounding diameters
+
+    dloc = minloc(abs(hong_dias - dia_l), 1) ! index if nearest diameter
+    if (hong_dias(dloc) > dia_l) then
+      dloc = dloc - 1
+      dia2 = hong_dias(dloc + 1)
+      dia1 = hong_dias(dloc)
+    elseif (hong_dias(dloc) < dia_l) then
+      dia1 = hong_dias(dloc)
+      dia2 = hong_dias(dloc+1)
+    else
+      dia1 = dia_l
+      dia2 = dia1
+    end if
+
+    ! we have to get datasets for all combination
+    area = hong_area(dloc,tloc,floc,hong_type)
+    a_ftd = hong_abs(dloc:dloc+1,tloc:tloc+1,floc:floc+1,hong_type)
+    e_ftd = hong_ext(dloc:dloc+1,tloc:tloc+1,floc:floc+1,hong_type)
+    p_ftd = hong_p(:,dloc:dloc+1,tloc:tloc+1,floc:floc+1,hong_type)
+
+    ! interpolation
+    ! absorption cross section
+    call intpol(dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,a_ftd(1,1,1),a_ftd(2,1,1),&
+      a_ftd(1,2,1),a_ftd(2,2,1),a_ftd(1,1,2),a_ftd(2,1,2),a_ftd(1,2,2),a_ftd(2,2,2),abs_eff)
+    abs_hong(ir) = abs_eff*area*1.e-12 ! rescale from 1/micron**2 to 1/m**2
+    ! scattering cross section
+    call intpol(dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,e_ftd(1,1,1),e_ftd(2,1,1),&
+      e_ftd(1,2,1),e_ftd(2,2,1),e_ftd(1,1,2),e_ftd(2,1,2),e_ftd(1,2,2),e_ftd(2,2,2),ext_eff)
+    ext_hong(ir) = ext_eff * area*1.e-12 ! rescale from 1/micron**2 to 1/m**2
+    if (verbose > 3) print*, dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,abs_hong(ir),ext_hong(ir)
+    ! phase function
+    do i = 1,hong_nang
+      call intpol(dia_l,dia1,dia2,temp_l,temp1,temp2,freq_l,freq1,freq2,&
+        p_ftd(i,1,1,1),p_ftd(i,2,1,1),p_ftd(i,1,2,1),p_ftd(i,2,2,1),&
+        p_ftd(i,1,1,2),p_ftd(i,2,1,2),p_ftd(i,1,2,2),p_ftd(i,2,2,2),p_hong(i,ir))
+    end do
+
+    bsc_hong(ir) = p_hong(hong_nang,ir)*area*1.e-12 ! rescale from 1/micron**2 to 1/m**2
   end do
-  
-  bsc_hong = p_hong(181)*area*1.e-12 ! rescale from 1/micron**2 to 1/m**2
 
-  errorstatus = err    
+  errorstatus = err
   if (verbose >= 2) call report(info,'End of ', nameOfRoutine)
 
   return
-  
+
+end subroutine hongdb_vec
+
+subroutine hongdb(errorstatus,freq,temp,hong_type,dia,abs_hong,ext_hong,bsc_hong,g,p_hong)
+!
+! Single diameter version of hongdb_vec.
+
+  use kinds
+
+  implicit none
+
+  integer, intent(in) :: hong_type
+  real(kind=dbl), intent(in) :: freq,temp,dia
+  real(kind=dbl), intent(out) :: abs_hong,ext_hong,bsc_hong,g
+  real(kind=dbl), dimension(181), intent(out) :: p_hong
+  real(kind=dbl), dimension(1) :: abs_vec, ext_vec, bsc_vec
+
+  integer(kind=long) :: errorstatus
+
+  call hongdb_vec(errorstatus,freq,temp,hong_type,1,(/dia/),abs_vec,ext_vec,bsc_vec,p_hong)
+  abs_hong = abs_vec(1)
+  ext_hong = ext_vec(1)
+  bsc_hong = bsc_vec(1)
+  g = 0._dbl
+
+  return
+
 end subroutine hongdb
 
 subroutine intpol(dia,dia1,dia2,temp,temp1,temp2,freq,freq1,freq2,t111,t112,t121,t122,t211,t212,t221,t222,res)
 
   use kinds
-  
+
   implicit none
-  
+
   real(kind=dbl) :: dia,dia1,dia2,temp,temp1,temp2,freq,freq1,freq2
   real(kind=dbl) :: t111,t112,t121,t122,t211,t212,t221,t222,res
   real(kind=dbl) :: tmp1, tmp2,tmp3,tmp4,tmp5,tmp6
-  
+
   if (dia1 == dia2) then
     tmp1 = t111
     tmp2 = t121
@@ -265,7 +349,7 @@ subroutine intpol(dia,dia1,dia2,temp,temp1,temp2,freq,freq1,freq2,t111,t112,t121
 !   call interpolation(1,2,(/freq1,freq2/),(//),freq,tmp)
 !   call interpolation(1,2,(/freq1,freq2/),(//),freq,tmp)
 !   call interpolation(1,2,(//),,,res)
-  
+
   return
-  
-end subroutine intpol
\ No newline at end of file
+
+end subroutine intpol
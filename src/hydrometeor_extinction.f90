@@ -33,7 +33,8 @@ subroutine hydrometeor_extinction(errorstatus)
       hydro_includeHydroInRhoAir, &
       lhyd_scattering, &
       lhyd_emission, &
-      lhyd_absorption
+      lhyd_absorption, &
+      loop_columns_first
   use constants
   use descriptor_file
   use drop_size_dist
@@ -56,7 +57,16 @@ subroutine hydrometeor_extinction(errorstatus)
     out_psd_d, &
     out_psd_deltad, &
     out_psd_n, &
-    out_psd_mass
+    out_psd_mass, &
+    timing_clock, &
+    timing_add, &
+    timing_drop_size_dist, &
+    timing_scatproperties, &
+    timing_scatcnv, &
+    timing_radar_simulator
+  use psd_cache, only: psd_cache_column, &
+    psd_cache_get, &
+    psd_cache_store
   use vars_index, only: i_x,i_y, i_z, i_h
 
   implicit none
@@ -66,6 +76,8 @@ subroutine hydrometeor_extinction(errorstatus)
   real(kind=dbl) ::    emis_vector_scatcnv(nstokes,nummu,2)
 
   integer(kind=long) :: increment, start, stop
+  real(kind=dbl) :: t_start
+  logical :: psd_cached
 
 
   integer(kind=long), intent(out) :: errorstatus
@@ -92,6 +104,9 @@ subroutine hydrometeor_extinction(errorstatus)
 
   call allocate_scatProperties()
 
+  !the psd does not depend on frequency, keep it if all frequencies of the column follow
+  if (loop_columns_first .and. (.not. hydro_fullSpec)) call psd_cache_column()
+
   !in case we want to calczulate the attenuation top-down we have to reverse the order
   if (TRIM(radar_attenuation) == "top-down") then
     increment = -1
@@ -286,7 +301,21 @@ subroutine hydrometeor_extinction(errorstatus)
 
         call allocateVars_drop_size_dist()
 
-        call run_drop_size_dist(err)
+        t_start = timing_clock()
+        psd_cached = .false.
+        if (loop_columns_first) call psd_cache_get(psd_cached)
+        if (.not. psd_cached) then
+          call make_psd(err)
+          if (err == 2) then
+            msg = 'Error in make_psd'
+            call report(err, msg, nameOfRoutine)
+            errorstatus = err
+            return
+          end if
+          if (loop_columns_first) call psd_cache_store()
+        end if
+        call make_scat_particles(err)
+        call timing_add(timing_drop_size_dist, t_start)
         if (err == 2) then
           msg = 'Error in run_drop_size_dist'
           call report(err, msg, nameOfRoutine)
@@ -311,7 +340,9 @@ subroutine hydrometeor_extinction(errorstatus)
       end if !hydro_fullSpec
 
       if (active .or. passive) then
+        t_start = timing_clock()
         call calc_scatProperties(err)
+        call timing_add(timing_scatproperties, t_start)
         if (err == 2) then
           msg = 'Error in calc_scatProperties'
           call report(err, msg, nameOfRoutine)
@@ -327,8 +358,10 @@ subroutine hydrometeor_extinction(errorstatus)
 
     !convert rt3 to rt4 input
     if (nlegen_coef>0) then
+      t_start = timing_clock()
       call scatcnv(err,nlegen_coef,legen_coef,rt_kexttot(i_z),salbedo,&
         scatter_matrix_scatcnv,extinct_matrix_scatcnv,emis_vector_scatcnv)
+      call timing_add(timing_scatcnv, t_start)
       if (err /= 0) then
         msg = 'error in scatcnv!'
         call report(err, msg, nameOfRoutine)
@@ -346,8 +379,10 @@ subroutine hydrometeor_extinction(errorstatus)
 
 
     if (active .and. rt_hydros_present(i_z)) then
+      t_start = timing_clock()
       call radar_simulator(err,radar_spec, rt_back(i_z,:), rt_kexttot(i_z),&
         atmo_delta_hgt_lev(i_x,i_y,i_z))
+      call timing_add(timing_radar_simulator, t_start)
       if (err /= 0) then
         msg = 'error in radar_simulator!'
         call report(err, msg, nameOfRoutine)
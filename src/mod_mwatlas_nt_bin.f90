@@ -39,6 +39,10 @@ MODULE mod_mwatlas_nt_bin
     integer(kind=long), allocatable,dimension(:) :: atlas_cellnum
     ! "Correspondance" vector indicating that for the ith element, the j so that EMIS(j,...) is the emissivity of cellnumber i.
     integer(kind=long) :: atlas_correspondance(660066) 
+    ! the atlas stays in memory until rttov_closemw_atlas is called or another month/directory is requested
+    logical :: atlas_loaded = .false.
+    ! directory the atlas in memory was read from
+    character(len=300) :: atlas_dir = ''
 
 !=======================================================
 !ROUTINES ==============================================
@@ -159,19 +163,58 @@ CONTAINS
     atlas_ndat=ipos;
     CLOSE(iiin)
 
+    atlas_loaded = .true.
+    atlas_dir = dir
+
     errorstatus = err
 
     if (verbose >= 3) call report(info,'End of ', nameOfRoutine)
     
   END SUBROUTINE rttov_readmw_atlas
 
+  !------------------------------------------------------------------
+  SUBROUTINE rttov_getmw_atlas(errorstatus,dir,month)
+    !======Make sure the atlas of the requested month is in memory, read it only
+    !======if it is not loaded yet or another month/directory is in memory
+    CHARACTER(len=*), INTENT (IN)       :: dir
+    CHARACTER(len=2), intent(in) :: month
+    integer(kind=long) :: imonth
+    integer(kind=long), intent(out) :: errorstatus
+    integer(kind=long) :: err = 0
+    character(len=80) :: msg
+    character(22) :: nameOfRoutine = 'rttov_getmw_atlas'
+
+    err = 0
+    read(month,'(I2.2)') imonth
+
+    if (atlas_loaded .and. (atlas_month == imonth) .and. (trim(atlas_dir) == dir)) then
+      errorstatus = err
+      return
+    end if
+
+    call rttov_closemw_atlas()
+    call rttov_readmw_atlas(err,dir,month)
+    if (err /= 0) then
+      msg = 'error in rttov_readmw_atlas'
+      call report(err,msg, nameOfRoutine)
+      call rttov_closemw_atlas()
+      errorstatus = err
+      return
+    end if
+
+    errorstatus = err
+
+  END SUBROUTINE rttov_getmw_atlas
+
   !------------------------------------------------------------------
   SUBROUTINE rttov_closemw_atlas()
     !======free a monthly atlas
-    DEALLOCATE(atlas_emis) 
-    DEALLOCATE(atlas_class1) 
-    DEALLOCATE(atlas_class2) 
-    DEALLOCATE(atlas_cellnum) 
+    if (allocated(atlas_emis)) DEALLOCATE(atlas_emis) 
+    if (allocated(atlas_class1)) DEALLOCATE(atlas_class1) 
+    if (allocated(atlas_class2)) DEALLOCATE(atlas_class2) 
+    if (allocated(atlas_cellnum)) DEALLOCATE(atlas_cellnum) 
+    atlas_loaded = .false.
+    atlas_dir = ''
   END SUBROUTINE rttov_closemw_atlas
 ! 
 !   !------------------------------------------------------------------
@@ -0,0 +1,310 @@
+module npy_io
+  ! Description:
+  ! Reads arrays saved in the numpy .npy format (versions 1.0 to 3.0) with
+  ! stream access. Supported are little endian float64, float32, int64 and
+  ! int32 arrays, which are returned as real(dbl), and one byte strings
+  ! ('|S1'), all in C order. The data is returned as a flat buffer in C order,
+  ! reshape(buf, shp, order=(/ndim,...,1/)) gives the Fortran array with the
+  ! same indices as the numpy array.
+
+  use kinds
+  use report_module
+
+  implicit none
+  save
+
+  private
+  public :: npy_shape, npy_read_dbl, npy_read_char
+
+  ! unit of the file opened by npy_header, assigned by open(newunit=...) so it
+  ! cannot collide with the units of other modules
+  integer :: npy_unit = -1
+  integer, parameter :: npy_maxdim = 5
+  integer, parameter :: i8 = selected_int_kind(18)
+
+contains
+
+  subroutine npy_header(errorstatus, fname, descr, ndim, shp)
+    ! opens fname and reads the header. The file is left open and positioned
+    ! at the start of the data.
+
+    implicit none
+
+    integer(kind=long), intent(out) :: errorstatus
+    character(len=*), intent(in) :: fname
+    character(len=2), intent(out) :: descr
+    integer, intent(out) :: ndim
+    integer(kind=long), dimension(npy_maxdim), intent(out) :: shp
+
+    integer(kind=long) :: err
+    character(len=80) :: msg
+    character(len=14) :: nameOfRoutine = 'npy_header'
+
+    character(len=6) :: magic
+    character(len=1), dimension(2) :: version
+    character(len=1), dimension(4) :: hlen_bytes
+    character(len=1024) :: header
+    character(len=128) :: shape_str
+    integer :: hlen, nlen, ii, pos, pos1, pos2
+
+    err = 0
+    ndim = 0
+    shp = 0
+
+    open(newunit=npy_unit, file=trim(fname), access='stream', form='unformatted',&
+      status='old', action='read', iostat=err)
+    if (err /= 0) then
+      msg = "Read error: Cannot open file "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      errorstatus = fatal
+      return
+    end if
+
+    read(npy_unit, iostat=err) magic, version
+    if ((err /= 0) .or. (magic /= char(147)//'NUMPY')) then
+      msg = "Not a npy file: "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      close(npy_unit)
+      errorstatus = fatal
+      return
+    end if
+
+    ! the header length is uint16 in version 1.0, uint32 afterwards
+    nlen = 4
+    if (ichar(version(1)) == 1) nlen = 2
+    read(npy_unit, iostat=err) hlen_bytes(1:nlen)
+    hlen = 0
+    do ii = nlen, 1, -1
+      hlen = hlen*256 + ichar(hlen_bytes(ii))
+    end do
+    if ((err /= 0) .or. (hlen > len(header))) then
+      msg = "Cannot read npy header of "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      close(npy_unit)
+      errorstatus = fatal
+      return
+    end if
+    header = ""
+    read(npy_unit, iostat=err) header(1:hlen)
+
+    ! e.g. {'descr': '<f8', 'fortran_order': False, 'shape': (3, 4), }
+    ! pos1 and pos2 are the quotes around the type, e.g. '<f8'
+    pos = index(header, "'descr':")
+    pos1 = pos + 7 + index(header(pos+8:), "'")
+    pos2 = pos1 + index(header(pos1+1:), "'")
+    if ((pos == 0) .or. (pos2 - pos1 /= 4) .or. (header(pos1+1:pos1+1) == '>')) then
+      msg = "Unsupported npy data type in "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      close(npy_unit)
+      errorstatus = fatal
+      return
+    end if
+    descr = header(pos1+2:pos1+3)
+
+    pos = index(header, "'fortran_order':")
+    if ((pos == 0) .or. (index(header(pos+16:pos+24), 'False') == 0)) then
+      msg = "npy file not in C order: "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      close(npy_unit)
+      errorstatus = fatal
+      return
+    end if
+
+    pos = index(header, "'shape':")
+    pos1 = pos + index(header(pos:), "(")
+    pos2 = pos1 - 1 + index(header(pos1:), ")")
+    shape_str = header(pos1:pos2-1)
+    do while (len_trim(shape_str) > 0)
+      ii = index(shape_str, ",")
+      if (ii == 0) ii = len_trim(shape_str) + 1
+      ndim = ndim + 1
+      if (ndim > npy_maxdim) exit
+      read(shape_str(1:ii-1), *, iostat=err) shp(ndim)
+      if (err /= 0) exit
+      shape_str = adjustl(shape_str(ii+1:))
+    end do
+    if ((pos == 0) .or. (err /= 0) .or. (ndim > npy_maxdim)) then
+      msg = "Cannot read npy shape of "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      close(npy_unit)
+      errorstatus = fatal
+      return
+    end if
+
+    errorstatus = err
+    return
+  end subroutine npy_header
+
+  subroutine npy_shape(errorstatus, fname, ndim, shp)
+    ! shape of the array in fname
+
+    implicit none
+
+    integer(kind=long), intent(out) :: errorstatus
+    character(len=*), intent(in) :: fname
+    integer, intent(out) :: ndim
+    integer(kind=long), dimension(npy_maxdim), intent(out) :: shp
+
+    character(len=2) :: descr
+
+    call npy_header(errorstatus, fname, descr, ndim, shp)
+    if (errorstatus == 0) close(npy_unit)
+
+    return
+  end subroutine npy_shape
+
+  subroutine check_shape(errorstatus, fname, ndim, shp, expected)
+
+    implicit none
+
+    integer(kind=long), intent(out) :: errorstatus
+    character(len=*), intent(in) :: fname
+    integer, intent(in) :: ndim
+    integer(kind=long), dimension(npy_maxdim), intent(in) :: shp
+    integer(kind=long), dimension(:), intent(in) :: expected
+
+    character(len=80) :: msg
+    character(len=14) :: nameOfRoutine = 'check_shape'
+
+    errorstatus = 0
+    if (ndim /= size(expected)) then
+      errorstatus = fatal
+    else if (any(shp(1:ndim) /= expected)) then
+      errorstatus = fatal
+    end if
+    if (errorstatus /= 0) then
+      msg = "Unexpected shape of "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      close(npy_unit)
+    end if
+
+    return
+  end subroutine check_shape
+
+  subroutine npy_read_dbl(errorstatus, fname, expected, found, buf)
+    ! reads the numeric array fname with shape expected (numpy order) if the
+    ! file exists.
+
+    implicit none
+
+    integer(kind=long), intent(out) :: errorstatus
+    character(len=*), intent(in) :: fname
+    integer(kind=long), dimension(:), intent(in) :: expected
+    logical, intent(out) :: found
+    real(kind=dbl), allocatable, dimension(:), intent(out) :: buf
+
+    integer(kind=long) :: err
+    character(len=80) :: msg
+    character(len=14) :: nameOfRoutine = 'npy_read_dbl'
+
+    character(len=2) :: descr
+    integer :: ndim
+    integer(kind=long), dimension(npy_maxdim) :: shp
+    real(kind=sgl), allocatable, dimension(:) :: buf_f4
+    integer(kind=i8), allocatable, dimension(:) :: buf_i8
+    integer(kind=long), allocatable, dimension(:) :: buf_i4
+
+    errorstatus = 0
+    inquire(file=trim(fname), exist=found)
+    if (.not. found) return
+
+    call npy_header(err, fname, descr, ndim, shp)
+    if (err /= 0) then
+      errorstatus = err
+      return
+    end if
+    call check_shape(err, fname, ndim, shp, expected)
+    if (err /= 0) then
+      errorstatus = err
+      return
+    end if
+
+    allocate(buf(product(expected)))
+    ! the buffers assume that dbl, sgl and long are 8, 4 and 4 byte kinds
+    select case (descr)
+    case ('f8')
+      read(npy_unit, iostat=err) buf
+    case ('f4')
+      allocate(buf_f4(size(buf)))
+      read(npy_unit, iostat=err) buf_f4
+      buf = buf_f4
+    case ('i8')
+      allocate(buf_i8(size(buf)))
+      read(npy_unit, iostat=err) buf_i8
+      buf = buf_i8
+    case ('i4')
+      allocate(buf_i4(size(buf)))
+      read(npy_unit, iostat=err) buf_i4
+      buf = buf_i4
+    case default
+      msg = "Unsupported npy data type "//descr//" in "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      close(npy_unit)
+      errorstatus = fatal
+      return
+    end select
+    close(npy_unit)
+    if (err /= 0) then
+      msg = "Read error: "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+    end if
+
+    errorstatus = err
+    return
+  end subroutine npy_read_dbl
+
+  subroutine npy_read_char(errorstatus, fname, expected, found, buf)
+    ! reads the one byte string array fname with shape expected (numpy
+    ! order) if the file exists.
+
+    implicit none
+
+    integer(kind=long), intent(out) :: errorstatus
+    character(len=*), intent(in) :: fname
+    integer(kind=long), dimension(:), intent(in) :: expected
+    logical, intent(out) :: found
+    character(len=1), allocatable, dimension(:), intent(out) :: buf
+
+    integer(kind=long) :: err
+    character(len=80) :: msg
+    character(len=14) :: nameOfRoutine = 'npy_read_char'
+
+    character(len=2) :: descr
+    integer :: ndim
+    integer(kind=long), dimension(npy_maxdim) :: shp
+
+    errorstatus = 0
+    inquire(file=trim(fname), exist=found)
+    if (.not. found) return
+
+    call npy_header(err, fname, descr, ndim, shp)
+    if (err /= 0) then
+      errorstatus = err
+      return
+    end if
+    call check_shape(err, fname, ndim, shp, expected)
+    if (err /= 0) then
+      errorstatus = err
+      return
+    end if
+    if (descr /= 'S1') then
+      msg = "Unsupported npy data type "//descr//" in "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+      close(npy_unit)
+      errorstatus = fatal
+      return
+    end if
+
+    allocate(buf(product(expected)))
+    read(npy_unit, iostat=err) buf
+    close(npy_unit)
+    if (err /= 0) then
+      msg = "Read error: "//trim(fname)
+      call report(fatal, msg, nameOfRoutine)
+    end if
+
+    errorstatus = err
+    return
+  end subroutine npy_read_char
+
+end module npy_io
@@ -7,6 +7,7 @@ program pamtra
   use vars_output !output variables
   use report_module
   use descriptor_file
+  use profile_store, only: read_store_fill_variables
   use deallocate_everything, only : do_deallocate_everything
   use vars_index, only: i_x, i_y, i_f
 
@@ -27,7 +28,7 @@ program pamtra
 
 
 !!!loop variables
-  integer(kind=long) :: i
+  integer(kind=long) :: i, i_run
 
   ! Error handling
 
@@ -90,6 +91,15 @@ program pamtra
        call read_new_fill_variables(err)
   if (atmo_input_type == 'cla') &
        call read_classic_fill_variables(err)
+  if (atmo_input_type == 'npy') then
+     call read_store_fill_variables(err)
+     if (err /= 0) then
+        msg = 'Error in read_store_fill_variables!'
+        call report(fatal, msg, nameOfRoutine)
+        errorstatus = err
+        go to 666
+     end if
+  end if
 
   ! make sure that all the levels and layer variables are present
   call fillMissing_atmosphere_vars(err)
@@ -133,23 +143,36 @@ program pamtra
   msg = 'Start loop over frequencies & profiles!'
   if (verbose >= 2)  call report(info, msg, nameOfRoutine)
 
-  grid_f: do i_f =1, nfrq
-     grid_y: do i_y = 1, atmo_ngridy !i_x_in, i_x_fin
-        grid_x: do i_x = 1, atmo_ngridx !i_y_in, i_y_fin
-
-           !run the model
-           call run_rt(err)
-           if (err /= 0) then
-              !                    msg = 'Error in run_rt!'
-              write(msg,'(A30,I3,A1,I3)') 'error in run_rt!', i_x,' ',i_y
-              call report(fatal, msg, nameOfRoutine)
-              errorstatus = err
-              go to 666
-           end if
-
-        end do grid_x
-     end do grid_y
-  end do grid_f
+  ! frequency is the outer loop unless loop_columns_first is set. Then all
+  ! frequencies of a column are done one after another and share the psd.
+  grid: do i_run = 0, nfrq*atmo_ngridy*atmo_ngridx - 1
+     if (loop_columns_first) then
+        i_f = mod(i_run, nfrq) + 1
+        i_x = mod(i_run/nfrq, atmo_ngridx) + 1
+        i_y = i_run/(nfrq*atmo_ngridx) + 1
+     else
+        i_x = mod(i_run, atmo_ngridx) + 1
+        i_y = mod(i_run/atmo_ngridx, atmo_ngridy) + 1
+        i_f = i_run/(atmo_ngridx*atmo_ngridy) + 1
+     end if
+
+     !run the model
+     call run_rt(err)
+     if (err /= 0) then
+        !                    msg = 'Error in run_rt!'
+        write(msg,'(A30,I3,A1,I3)') 'error in run_rt!', i_x,' ',i_y
+        call report(fatal, msg, nameOfRoutine)
+        errorstatus = err
+        go to 666
+     end if
+
+  end do grid
+
+  if (hydro_scat_cache .and. (verbose >= 1)) then
+     write(msg,'(a,i12,a,i12)') 'scattering properties cache hits: ', out_scat_cache_hits, &
+          ', misses: ', out_scat_cache_misses
+     call report(info, msg, nameOfRoutine)
+  end if
 
 
   if (write_nc) then
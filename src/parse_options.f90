@@ -64,6 +64,7 @@ subroutine parse_options(gitVersion,gitHash)
                 print*,'Available options:'
                 print*,'   -n|--namelist     namelist file (default None)'
                 print*,'   -p|--profile      profile file  (default profile/standard.dat)'
+                print*,'                     or directory of a profile store (pyPamtra.writeProfileStore)'
                 print*,'   -o|--output       output directory  (default .)'
                 print*,'   -d|--descriptor   descriptor file  (default descriptor_file.txt)'
 !                 print*,'   -g|--grid         start_lon,end_lon,start_lat,end_lat (number of grid point)'
@@ -91,7 +92,9 @@ subroutine parse_options(gitVersion,gitHash)
     end do
     
  
-    !get filename
+    !get filename, a profile store directory may be given with a trailing slash
+    if (input_pathfile(len_trim(input_pathfile):len_trim(input_pathfile)) == "/") &
+      input_pathfile(len_trim(input_pathfile):) = " "
     pos1 = 1
     n = 0
     DO
@@ -0,0 +1,215 @@
+module profile_store
+  ! Description:
+  ! Reads a profile store written by pyPamtra.writeProfileStore, i.e. a
+  ! directory with one .npy file per variable (p%<key>%.npy,
+  ! df.data4D%<key>%.npy and df.dataFullSpec%<key>%.npy) and a manifest.json.
+  ! The dimensions are read by screen_input, the descriptor file is taken from
+  ! descriptor_file_name as for the ascii profiles. Profile variables missing
+  ! in the store are left to fillMissing_atmosphere_vars.
+
+  use kinds
+  use report_module
+  use npy_io, only: npy_shape, npy_read_dbl, npy_read_char
+
+  implicit none
+  save
+
+  private
+  public :: read_store_fill_variables
+
+contains
+
+  subroutine read_store_fill_variables(errorstatus)
+
+    use settings, only: verbose, input_pathfile, noutlevels, &
+      add_obs_height_to_layer, hydro_fullSpec
+    use vars_atmosphere
+    use descriptor_file
+    use vars_hydroFullSpec
+
+    implicit none
+
+    integer(kind=long), intent(out) :: errorstatus
+    integer(kind=long) :: err
+    character(len=80) :: msg
+    character(len=30) :: nameOfRoutine = 'read_store_fill_variables'
+
+! work variables
+    real(kind=dbl), allocatable, dimension(:) :: buf
+    character(len=1), allocatable, dimension(:) :: cbuf
+    logical :: found, found4D
+    integer :: ndim
+    integer(kind=long), dimension(5) :: shp
+    integer(kind=long) :: nx, ny, nz, nh, nb
+
+    err = 0
+
+    if (verbose >= 3) call report(info,'Start of ', nameOfRoutine)
+
+    nx = atmo_ngridx
+    ny = atmo_ngridy
+    nz = atmo_max_nlyrs - noutlevels
+    nh = n_hydro
+
+! 2D variables
+    if (read_var('p%lat', (/nx,ny/))) atmo_lat = real(reshape(buf,(/nx,ny/),order=(/2,1/)),sgl)
+    if (read_var('p%lon', (/nx,ny/))) atmo_lon = real(reshape(buf,(/nx,ny/),order=(/2,1/)),sgl)
+    if (read_var('p%wind10u', (/nx,ny/))) atmo_wind10u = real(reshape(buf,(/nx,ny/),order=(/2,1/)),sgl)
+    if (read_var('p%wind10v', (/nx,ny/))) atmo_wind10v = real(reshape(buf,(/nx,ny/),order=(/2,1/)),sgl)
+    if (read_var('p%groundtemp', (/nx,ny/))) atmo_groundtemp = reshape(buf,(/nx,ny/),order=(/2,1/))
+    if (read_var('p%iwv', (/nx,ny/))) atmo_iwv = reshape(buf,(/nx,ny/),order=(/2,1/))
+    if (read_var('p%nlyrs', (/nx,ny/))) atmo_nlyrs = nint(reshape(buf,(/nx,ny/),order=(/2,1/)),long)
+    if (read_var('p%unixtime', (/nx,ny/))) atmo_unixtime = nint(reshape(buf,(/nx,ny/),order=(/2,1/)),long)
+    if (read_var('p%model_i', (/nx,ny/))) atmo_model_i = nint(reshape(buf,(/nx,ny/),order=(/2,1/)),long)
+    if (read_var('p%model_j', (/nx,ny/))) atmo_model_j = nint(reshape(buf,(/nx,ny/),order=(/2,1/)),long)
+    if (read_var('p%sfc_type', (/nx,ny/))) sfc_type = nint(reshape(buf,(/nx,ny/),order=(/2,1/)),long)
+    if (read_var('p%sfc_model', (/nx,ny/))) sfc_model = nint(reshape(buf,(/nx,ny/),order=(/2,1/)),long)
+    if (read_var('p%sfc_salinity', (/nx,ny/))) sfc_salinity = reshape(buf,(/nx,ny/),order=(/2,1/))
+    if (read_var('p%sfc_slf', (/nx,ny/))) sfc_slf = reshape(buf,(/nx,ny/),order=(/2,1/))
+    if (read_var('p%sfc_sif', (/nx,ny/))) sfc_sif = reshape(buf,(/nx,ny/),order=(/2,1/))
+    if (err == 0) then
+      call npy_read_char(err, trim(input_pathfile)//'/p%sfc_refl%.npy', (/nx,ny/), found, cbuf)
+      if (found .and. (err == 0)) sfc_refl = reshape(cbuf,(/nx,ny/),order=(/2,1/))
+    end if
+    if (read_var('p%obs_height', (/nx,ny,noutlevels/))) &
+      atmo_obs_height = real(reshape(buf,(/nx,ny,noutlevels/),order=(/3,2,1/)),sgl)
+    if (read_var('p%radar_prop', (/nx,ny,2_long/))) &
+      atmo_radar_prop = reshape(buf,(/nx,ny,2_long/),order=(/3,2,1/))
+
+! layer and level variables, the layers above nz are kept for the output levels
+    if (read_var('p%hgt', (/nx,ny,nz/))) atmo_hgt(:,:,1:nz) = reshape(buf,(/nx,ny,nz/),order=(/3,2,1/))
+    if (read_var('p%press', (/nx,ny,nz/))) atmo_press(:,:,1:nz) = reshape(buf,(/nx,ny,nz/),order=(/3,2,1/))
+    if (read_var('p%temp', (/nx,ny,nz/))) atmo_temp(:,:,1:nz) = reshape(buf,(/nx,ny,nz/),order=(/3,2,1/))
+    if (read_var('p%relhum', (/nx,ny,nz/))) atmo_relhum(:,:,1:nz) = reshape(buf,(/nx,ny,nz/),order=(/3,2,1/))
+    if (read_var('p%airturb', (/nx,ny,nz/))) atmo_airturb(:,:,1:nz) = reshape(buf,(/nx,ny,nz/),order=(/3,2,1/))
+    if (read_var('p%wind_w', (/nx,ny,nz/))) atmo_wind_w(:,:,1:nz) = reshape(buf,(/nx,ny,nz/),order=(/3,2,1/))
+    if (read_var('p%wind_uv', (/nx,ny,nz/))) atmo_wind_uv(:,:,1:nz) = reshape(buf,(/nx,ny,nz/),order=(/3,2,1/))
+    if (read_var('p%turb_edr', (/nx,ny,nz/))) atmo_turb_edr(:,:,1:nz) = reshape(buf,(/nx,ny,nz/),order=(/3,2,1/))
+    if (read_var('p%hgt_lev', (/nx,ny,nz+1/))) &
+      atmo_hgt_lev(:,:,1:nz+1) = reshape(buf,(/nx,ny,nz+1/),order=(/3,2,1/))
+    if (read_var('p%press_lev', (/nx,ny,nz+1/))) &
+      atmo_press_lev(:,:,1:nz+1) = reshape(buf,(/nx,ny,nz+1/),order=(/3,2,1/))
+    if (read_var('p%temp_lev', (/nx,ny,nz+1/))) &
+      atmo_temp_lev(:,:,1:nz+1) = reshape(buf,(/nx,ny,nz+1/),order=(/3,2,1/))
+    if (read_var('p%relhum_lev', (/nx,ny,nz+1/))) &
+      atmo_relhum_lev(:,:,1:nz+1) = reshape(buf,(/nx,ny,nz+1/),order=(/3,2,1/))
+
+! hydrometeor moments
+    if (read_var('p%hydro_q', (/nx,ny,nz,nh/))) &
+      atmo_hydro_q(:,:,1:nz,:) = reshape(buf,(/nx,ny,nz,nh/),order=(/4,3,2,1/))
+    if (read_var('p%hydro_reff', (/nx,ny,nz,nh/))) &
+      atmo_hydro_reff(:,:,1:nz,:) = reshape(buf,(/nx,ny,nz,nh/),order=(/4,3,2,1/))
+    if (read_var('p%hydro_n', (/nx,ny,nz,nh/))) &
+      atmo_hydro_n(:,:,1:nz,:) = reshape(buf,(/nx,ny,nz,nh/),order=(/4,3,2,1/))
+
+! 4D descriptor file data replaces the values of the descriptor file
+    found4D = .false.
+    call fill_4d('as_ratio', as_ratio_arr)
+    call fill_4d('rho_ms', rho_ms_arr)
+    call fill_4d('canting', canting_arr)
+    call fill_4d('a_ms', a_ms_arr)
+    call fill_4d('b_ms', b_ms_arr)
+    call fill_4d('alpha_as', alpha_as_arr)
+    call fill_4d('beta_as', beta_as_arr)
+    call fill_4d('p_1', p_1_arr)
+    call fill_4d('p_2', p_2_arr)
+    call fill_4d('p_3', p_3_arr)
+    call fill_4d('p_4', p_4_arr)
+    call fill_4d('d_1', d_1_arr)
+    call fill_4d('d_2', d_2_arr)
+    if (read_var('df.data4D%nbin', (/nx,ny,nz,nh/))) then
+      deallocate(nbin_arr)
+      allocate(nbin_arr(nx,ny,atmo_max_nlyrs,nh))
+      nbin_arr = -9999
+      nbin_arr(:,:,1:nz,:) = nint(reshape(buf,(/nx,ny,nz,nh/),order=(/4,3,2,1/)),long)
+      found4D = .true.
+    end if
+
+! add_obs_height moves the layers of the atmosphere only
+    if (add_obs_height_to_layer .and. (found4D .or. hydro_fullSpec)) then
+      msg = 'add_obs_height_to_layer does not work with 4D or full spectra data'
+      call report(fatal, msg, nameOfRoutine)
+      errorstatus = fatal
+      return
+    end if
+
+! full spectra
+    if (hydro_fullSpec .and. (err == 0)) then
+      call npy_shape(err, trim(input_pathfile)//'/df.dataFullSpec%d_ds%.npy', ndim, shp)
+      if (err == 0) then
+        nb = shp(5)
+        call allocate_hydrofs_vars(err, int(nb))
+      end if
+      call fill_fs('rho_ds', hydrofs_rho_ds, nb)
+      call fill_fs('d_ds', hydrofs_d_ds, nb)
+      call fill_fs('d_bound_ds', hydrofs_d_bound_ds, nb+1)
+      call fill_fs('n_ds', hydrofs_n_ds, nb)
+      call fill_fs('mass_ds', hydrofs_mass_ds, nb)
+      call fill_fs('area_ds', hydrofs_area_ds, nb)
+      call fill_fs('canting', hydrofs_canting, nb)
+      call fill_fs('as_ratio', hydrofs_as_ratio, nb)
+      call fill_fs('fallvelocity', hydrofs_fallvelocity, nb)
+    end if
+
+    if (err /= 0) then
+      msg = 'Error reading profile store '//trim(input_pathfile)
+      call report(err, msg, nameOfRoutine)
+      errorstatus = err
+      return
+    end if
+
+    errorstatus = err
+    if (verbose >= 3) call report(info,'End of ', nameOfRoutine)
+    return
+
+  contains
+
+    logical function read_var(key, expected)
+      ! reads key into buf if it is in the store and no error occured before
+
+      character(len=*), intent(in) :: key
+      integer(kind=long), dimension(:), intent(in) :: expected
+
+      read_var = .false.
+      if (err /= 0) return
+      call npy_read_dbl(err, trim(input_pathfile)//'/'//key//'%.npy', expected, found, buf)
+      read_var = found .and. (err == 0)
+
+    end function read_var
+
+    subroutine fill_4d(key, arr)
+
+      character(len=*), intent(in) :: key
+      real(kind=dbl), allocatable, dimension(:,:,:,:), intent(inout) :: arr
+
+      if (.not. read_var('df.data4D%'//key, (/nx,ny,nz,nh/))) return
+      deallocate(arr)
+      allocate(arr(nx,ny,atmo_max_nlyrs,nh))
+      arr = -9999.d0
+      arr(:,:,1:nz,:) = reshape(buf,(/nx,ny,nz,nh/),order=(/4,3,2,1/))
+      found4D = .true.
+
+    end subroutine fill_4d
+
+    subroutine fill_fs(key, arr, nbins)
+
+      character(len=*), intent(in) :: key
+      real(kind=dbl), dimension(:,:,:,:,:), intent(inout) :: arr
+      integer(kind=long), intent(in) :: nbins
+
+      if (err /= 0) return
+      if (.not. read_var('df.dataFullSpec%'//key, (/nx,ny,nz,nh,nbins/))) then
+        if (err == 0) then
+          msg = 'hydro_fullSpec needs df.dataFullSpec%'//key
+          call report(fatal, msg, nameOfRoutine)
+          err = fatal
+        end if
+        return
+      end if
+      arr(:,:,1:nz,:,:) = reshape(buf,(/nx,ny,nz,nh,nbins/),order=(/5,4,3,2,1/))
+
+    end subroutine fill_fs
+
+  end subroutine read_store_fill_variables
+
+end module profile_store
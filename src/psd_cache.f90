@@ -0,0 +1,160 @@
+module psd_cache
+  ! Description:
+  ! Keeps the frequency independent part of the drop size distributions
+  ! (make_psd of drop_size_dist) of all layers and hydrometeors of the current
+  ! column. With loop_columns_first, all frequencies of a column are processed
+  ! one after another, so the distributions, particle masses and areas are
+  ! calculated only for the first frequency and restored for the others.
+  ! The cache is emptied when the column changes and by deallocate_everything.
+
+  use kinds
+  use drop_size_dist, only: nbin, &
+    d_ds, &
+    d_bound_ds, &
+    delta_d_ds, &
+    n_ds, &
+    f_ds, &
+    mass_ds, &
+    area_ds, &
+    a_ms, b_ms, &
+    n_0, lambda, gam, mu, &
+    n_t, sig, d_ln, &
+    d_mono, &
+    d_m, n_0_star, &
+    m_0, m_32, am_b, &
+    n_tot, d_1, d_2
+
+  implicit none
+  save
+
+  private
+  public :: psd_cache_column, psd_cache_get, psd_cache_store, deallocate_psd_cache
+
+  integer, parameter :: npar = 18
+
+  integer(kind=long) :: psd_i_x = 0, psd_i_y = 0
+  integer(kind=long) :: psd_maxbin = 0
+
+  logical, allocatable, dimension(:,:) :: psd_valid ! (layer, hydrometeor)
+  integer(kind=long), allocatable, dimension(:,:) :: psd_nbin
+  ! d_ds, delta_d_ds, n_ds, mass_ds, area_ds, d_bound_ds, f_ds
+  real(kind=dbl), allocatable, dimension(:,:,:,:) :: psd_bins ! (psd_maxbin+1, 7, layer, hydrometeor)
+  real(kind=dbl), allocatable, dimension(:,:,:) :: psd_par ! (npar, layer, hydrometeor)
+
+contains
+
+  subroutine psd_cache_column()
+    ! called at the start of every column and frequency. Empties the cache if
+    ! the column changed.
+
+    use vars_atmosphere, only: atmo_max_nlyrs
+    use descriptor_file, only: n_hydro, nbin_arr
+    use vars_index, only: i_x, i_y
+
+    implicit none
+
+    if (.not. allocated(psd_valid)) then
+      ! monodisperse distributions use 2 bins regardless of nbin_arr
+      psd_maxbin = max(maxval(nbin_arr), 2)
+      allocate(psd_valid(atmo_max_nlyrs,n_hydro))
+      allocate(psd_nbin(atmo_max_nlyrs,n_hydro))
+      allocate(psd_bins(psd_maxbin+1,7,atmo_max_nlyrs,n_hydro))
+      allocate(psd_par(npar,atmo_max_nlyrs,n_hydro))
+      psd_valid = .false.
+    else if ((i_x /= psd_i_x) .or. (i_y /= psd_i_y)) then
+      psd_valid = .false.
+    end if
+    psd_i_x = i_x
+    psd_i_y = i_y
+
+    return
+  end subroutine psd_cache_column
+
+  subroutine psd_cache_get(found)
+    ! restore the distribution of the current layer and hydrometeor. The
+    ! arrays of drop_size_dist have to be allocated already.
+
+    use vars_index, only: i_z, i_h
+
+    implicit none
+
+    logical, intent(out) :: found
+
+    found = psd_valid(i_z,i_h)
+    if (.not. found) return
+
+    nbin = psd_nbin(i_z,i_h)
+    d_ds = psd_bins(1:nbin,1,i_z,i_h)
+    delta_d_ds = psd_bins(1:nbin,2,i_z,i_h)
+    n_ds = psd_bins(1:nbin,3,i_z,i_h)
+    mass_ds = psd_bins(1:nbin,4,i_z,i_h)
+    area_ds = psd_bins(1:nbin,5,i_z,i_h)
+    d_bound_ds = psd_bins(1:nbin+1,6,i_z,i_h)
+    f_ds = psd_bins(1:nbin+1,7,i_z,i_h)
+
+    a_ms = psd_par(1,i_z,i_h)
+    b_ms = psd_par(2,i_z,i_h)
+    n_0 = psd_par(3,i_z,i_h)
+    lambda = psd_par(4,i_z,i_h)
+    gam = psd_par(5,i_z,i_h)
+    mu = psd_par(6,i_z,i_h)
+    n_t = psd_par(7,i_z,i_h)
+    sig = psd_par(8,i_z,i_h)
+    d_ln = psd_par(9,i_z,i_h)
+    d_mono = psd_par(10,i_z,i_h)
+    d_m = psd_par(11,i_z,i_h)
+    n_0_star = psd_par(12,i_z,i_h)
+    m_0 = psd_par(13,i_z,i_h)
+    m_32 = psd_par(14,i_z,i_h)
+    am_b = psd_par(15,i_z,i_h)
+    ! keys of hydro_scat_cache, d_1 and d_2 are changed by make_dist_params for some
+    ! distributions
+    n_tot = psd_par(16,i_z,i_h)
+    d_1 = psd_par(17,i_z,i_h)
+    d_2 = psd_par(18,i_z,i_h)
+
+    return
+  end subroutine psd_cache_get
+
+  subroutine psd_cache_store()
+    ! keep the distribution of the current layer and hydrometeor calculated by
+    ! make_psd
+
+    use vars_index, only: i_z, i_h
+
+    implicit none
+
+    if (nbin > psd_maxbin) return
+
+    psd_nbin(i_z,i_h) = nbin
+    psd_bins(1:nbin,1,i_z,i_h) = d_ds
+    psd_bins(1:nbin,2,i_z,i_h) = delta_d_ds
+    psd_bins(1:nbin,3,i_z,i_h) = n_ds
+    psd_bins(1:nbin,4,i_z,i_h) = mass_ds
+    psd_bins(1:nbin,5,i_z,i_h) = area_ds
+    psd_bins(1:nbin+1,6,i_z,i_h) = d_bound_ds
+    psd_bins(1:nbin+1,7,i_z,i_h) = f_ds
+
+    psd_par(:,i_z,i_h) = (/a_ms, b_ms, n_0, lambda, gam, mu, n_t, sig, d_ln, &
+      d_mono, d_m, n_0_star, m_0, m_32, am_b, n_tot, d_1, d_2/)
+    psd_valid(i_z,i_h) = .true.
+
+    return
+  end subroutine psd_cache_store
+
+  subroutine deallocate_psd_cache()
+
+    implicit none
+
+    if (allocated(psd_valid)) deallocate(psd_valid)
+    if (allocated(psd_nbin)) deallocate(psd_nbin)
+    if (allocated(psd_bins)) deallocate(psd_bins)
+    if (allocated(psd_par)) deallocate(psd_par)
+
+    psd_i_x = 0
+    psd_i_y = 0
+    psd_maxbin = 0
+    return
+  end subroutine deallocate_psd_cache
+
+end module psd_cache
@@ -1,6 +1,6 @@
 module pyPamtraLib
 
-  use kinds, only: long
+  use kinds, only: long, sgl, dbl
   !    use constants !physical constants live here
   use settings !all settings go here
   use vars_atmosphere !input variables 
@@ -36,7 +36,7 @@ contains
 
 
 !!!loop variables
-    integer(kind=long) ::  fi,i
+    integer(kind=long) ::  fi,i,i_run
 
     ! Error handling
 
@@ -116,21 +116,34 @@ contains
     msg = 'Start loop over frequencies & profiles!'
     if (verbose >= 2)  call report(info, msg, nameOfRoutine)
 
-    grid_f: do i_f =1, nfrq
-       grid_y: do i_y = 1, atmo_ngridy !i_x_in, i_x_fin
-          grid_x: do i_x = 1, atmo_ngridx !i_y_in, i_y_fin
-             !run the model
-             call run_rt(err)
-             if (err /= 0) then
-                msg = 'Error in run_rt!'
-                call report(fatal, msg, nameOfRoutine)
-                errorstatus = err
-                return
-             end if
-
-          end do grid_x
-       end do grid_y
-    end do grid_f
+    ! frequency is the outer loop unless loop_columns_first is set. Then all
+    ! frequencies of a column are done one after another and share the psd.
+    grid: do i_run = 0, nfrq*atmo_ngridy*atmo_ngridx - 1
+       if (loop_columns_first) then
+          i_f = mod(i_run, nfrq) + 1
+          i_x = mod(i_run/nfrq, atmo_ngridx) + 1
+          i_y = i_run/(nfrq*atmo_ngridx) + 1
+       else
+          i_x = mod(i_run, atmo_ngridx) + 1
+          i_y = mod(i_run/atmo_ngridx, atmo_ngridy) + 1
+          i_f = i_run/(atmo_ngridx*atmo_ngridy) + 1
+       end if
+       !run the model
+       call run_rt(err)
+       if (err /= 0) then
+          msg = 'Error in run_rt!'
+          call report(fatal, msg, nameOfRoutine)
+          errorstatus = err
+          return
+       end if
+
+    end do grid
+
+    if (hydro_scat_cache .and. (verbose >= 1)) then
+       write(msg,'(a,i12,a,i12)') 'scattering properties cache hits: ', out_scat_cache_hits, &
+            ', misses: ', out_scat_cache_misses
+       call report(info, msg, nameOfRoutine)
+    end if
 
     errorstatus = err
 
@@ -147,4 +160,41 @@ contains
 
   end subroutine run_pamtra
 
+  subroutine run_telsem2(errorstatus, month, npix, nang, lon, lat, freq, mu, emissivity)
+
+    ! land surface emissivity from the TELSEM2 atlas for a batch of lat/lon pairs.
+    ! The atlas stays in memory for following calls of the same month.
+
+    implicit none
+
+    integer(kind=long), intent(in) :: npix, nang
+    character(len=2), intent(in) :: month
+    real(kind=sgl), dimension(npix), intent(in) :: lon, lat
+    real(kind=dbl), intent(in) :: freq
+    real(kind=dbl), dimension(nang), intent(in) :: mu
+    real(kind=dbl), dimension(2,nang,npix), intent(out) :: emissivity
+
+    integer(kind=long), intent(out) :: errorstatus
+    integer(kind=long) :: err
+    character(len=80) :: msg
+    character(len=14) :: nameOfRoutine = 'run_telsem2'
+
+    err = 0
+
+    if (verbose >= 2) call report(info,'Start of ', nameOfRoutine)
+
+    call telsem2_batch(err, month, npix, lon, lat, freq, nang, mu, emissivity)
+    if (err /= 0) then
+       msg = 'error in telsem2_batch!'
+       call report(err, msg, nameOfRoutine)
+       errorstatus = err
+       return
+    end if
+
+    errorstatus = err
+
+    if (verbose >= 2) call report(info,'End of ', nameOfRoutine)
+
+  end subroutine run_telsem2
+
 end module pyPamtraLib
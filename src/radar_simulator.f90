@@ -508,32 +508,39 @@ subroutine radar_simulator(errorstatus,particle_spectrum,back,kexthydro,delta_h)
           end if
 
 
-          out_radar_spectra(i_x,i_y,i_z,i_f,i_p,:) = 10*log10(noise_turb_spectra)
+          if (allocated(out_radar_spectra)) &
+            out_radar_spectra(i_x,i_y,i_z,i_f,i_p,:) = 10*log10(noise_turb_spectra)
           WHERE (ISNAN(noise_turb_spectra)) noise_turb_spectra = -9999.d0
-          if (verbose >= 5 ) then
+          if ((verbose >= 5 ) .and. allocated(out_radar_spectra)) then
               print*,"final log spectrum"
               print*, "i_x,i_y,i_z,i_f,i_p,", i_x,i_y,i_z,i_f,i_p
               print*,out_radar_spectra(i_x,i_y,i_z,i_f,i_p,:)
               print*,"#####################"
           end if
           do i_n = 1  , radar_nPeaks
-            out_radar_snr(i_x,i_y,i_z,i_f,i_p,i_n) = SNR !same SNR for all values as of now...
+            !outputs not in output_products are not allocated
+            if (allocated(out_radar_snr)) &
+              out_radar_snr(i_x,i_y,i_z,i_f,i_p,i_n) = SNR !same SNR for all values as of now...
             out_radar_vel(i_f,:) = spectra_velo(:)
-            out_radar_moments(i_x,i_y,i_z,i_f,i_p,i_n,:) = moments(1:4,i_n)
-            out_radar_slopes(i_x,i_y,i_z,i_f,i_p,i_n,:) = slope(:,i_n)
-            out_radar_edges(i_x,i_y,i_z,i_f,i_p,i_n,:) = edge(:,i_n)
-            out_radar_quality(i_x,i_y,i_z,i_f,i_p,i_n) = quailty_aliasing + quality_moments !same quailty for all values as of now...
+            if (allocated(out_radar_moments)) &
+              out_radar_moments(i_x,i_y,i_z,i_f,i_p,i_n,:) = moments(1:4,i_n)
+            if (allocated(out_radar_slopes)) &
+              out_radar_slopes(i_x,i_y,i_z,i_f,i_p,i_n,:) = slope(:,i_n)
+            if (allocated(out_radar_edges)) &
+              out_radar_edges(i_x,i_y,i_z,i_f,i_p,i_n,:) = edge(:,i_n)
+            if (allocated(out_radar_quality)) &
+              out_radar_quality(i_x,i_y,i_z,i_f,i_p,i_n) = quailty_aliasing + quality_moments !same quailty for all values as of now...
 
             moments(0,i_n) = 10*log10(moments(0,i_n))
             IF (ISNAN(moments(0,i_n))) moments(0,i_n) = -9999.d0
             out_Ze(i_x,i_y,i_z,i_f,i_p,i_n) = moments(0,i_n)
             if (verbose >= 5 ) then
               print*, "i_x,i_y,i_z,i_f,i_p,i_n ",i_x,i_y,i_z,i_f,i_p,i_n
-              print*, "out_radar_snr",out_radar_snr(i_x,i_y,i_z,i_f,i_p,i_n)
-              print*, "out_radar_moments",out_radar_moments(i_x,i_y,i_z,i_f,i_p,i_n,:)
-              print*, "out_radar_slopes",out_radar_slopes(i_x,i_y,i_z,i_f,i_p,i_n,:)
-              print*, "out_radar_edges",out_radar_edges(i_x,i_y,i_z,i_f,i_p,i_n,:)
-              print*, "out_radar_quality",out_radar_quality(i_x,i_y,i_z,i_f,i_p,i_n)
+              if (allocated(out_radar_snr)) print*, "out_radar_snr",out_radar_snr(i_x,i_y,i_z,i_f,i_p,i_n)
+              if (allocated(out_radar_moments)) print*, "out_radar_moments",out_radar_moments(i_x,i_y,i_z,i_f,i_p,i_n,:)
+              if (allocated(out_radar_slopes)) print*, "out_radar_slopes",out_radar_slopes(i_x,i_y,i_z,i_f,i_p,i_n,:)
+              if (allocated(out_radar_edges)) print*, "out_radar_edges",out_radar_edges(i_x,i_y,i_z,i_f,i_p,i_n,:)
+              if (allocated(out_radar_quality)) print*, "out_radar_quality",out_radar_quality(i_x,i_y,i_z,i_f,i_p,i_n)
               print*, "out_Ze",out_Ze(i_x,i_y,i_z,i_f,i_p,i_n)
             end if
           end do
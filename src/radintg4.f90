@@ -171,6 +171,57 @@ SUBROUTINE INTERNAL_RADIANCE4(N, UPREFLECT, UPTRANS, UPSOURCE,&
   RETURN
 END SUBROUTINE INTERNAL_RADIANCE4
 
+SUBROUTINE NONSCATTER_RADIANCE4(N, NUM_LAYERS, NOUTLEVELS, OUTLEVELS,&
+     REFLECT, TRANS, SOURCE,&
+     INTOPRAD, INBOTTOMRAD,&
+     UPRAD, DOWNRAD)
+  !        NONSCATTER_RADIANCE4 calculates the internal radiance at the
+  !      output levels if all layers above the surface are purely absorbing
+  !      (see NONSCATTER_LAYER4). Their transmission matrices are diagonal
+  !      and they do not reflect, so adding the layers reduces to following
+  !      each stream through the layers. Only the surface (layer
+  !      NUM_LAYERS+1) couples the streams. The radiances are the same as
+  !      those of COMBINE_LAYERS4 and INTERNAL_RADIANCE4 apart from rounding:
+  !      the difference of every Stokes component stays below 1e-14 relative
+  !      to the intensity of the same stream and level (tested by
+  !      python/tests/test_radtran4.py). The cost is of order N per layer
+  !      instead of N**3.
+  !      The output levels must not be below the surface.
+  INTEGER   N, NUM_LAYERS, NOUTLEVELS
+  INTEGER   OUTLEVELS(NOUTLEVELS)
+  REAL*8    REFLECT(N,N,2,*), TRANS(N,N,2,*), SOURCE(N,2,*)
+  REAL*8    INTOPRAD(N), INBOTTOMRAD(N)
+  REAL*8    UPRAD(N,*), DOWNRAD(N,*)
+  REAL*8    DOWN(N,NUM_LAYERS+1), UP(N,NUM_LAYERS+1)
+  INTEGER   I, L
+
+  !               Downwelling radiance from the top to the surface
+  DOWN(:,1) = INTOPRAD
+  DO L = 1, NUM_LAYERS
+     DO I = 1, N
+        DOWN(I,L+1) = TRANS(I,I,1,L)*DOWN(I,L) + SOURCE(I,1,L)
+     ENDDO
+  ENDDO
+  !               Upwelling radiance leaving the surface
+  UP(:,NUM_LAYERS+1) = MATMUL(REFLECT(:,:,2,NUM_LAYERS+1), DOWN(:,NUM_LAYERS+1))&
+       + MATMUL(TRANS(:,:,2,NUM_LAYERS+1), INBOTTOMRAD)&
+       + SOURCE(:,2,NUM_LAYERS+1)
+  !               and from the surface to the top
+  DO L = NUM_LAYERS, 1, -1
+     DO I = 1, N
+        UP(I,L) = TRANS(I,I,2,L)*UP(I,L+1) + SOURCE(I,2,L)
+     ENDDO
+  ENDDO
+
+  DO I = 1, NOUTLEVELS
+     L = MIN(MAX(OUTLEVELS(I),1), NUM_LAYERS+1)
+     UPRAD(:,I) = UP(:,L)
+     DOWNRAD(:,I) = DOWN(:,L)
+  ENDDO
+
+  RETURN
+END SUBROUTINE NONSCATTER_RADIANCE4
+
 SUBROUTINE DOUBLING_INTEGRATION4 (N, NUM_DOUBLES,      &
      SYMMETRIC, REFLECT, TRANS, LIN_SOURCE,     &
      LINFACTOR, T_REFLECT, T_TRANS, T_SOURCE)
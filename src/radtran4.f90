@@ -160,7 +160,7 @@ subroutine radtran4(errorstatus, max_delta_tau,&
 
   integer   layer, num_doubles
   integer   i, j, k, l, n, krt, ks
-  logical   symmetric
+  logical   symmetric, clear_sky
   real*8    linfactor
   real*8    planck0, planck1
   real*8    zdiff, delta_z, f, num_sub_layers, extinct
@@ -187,11 +187,6 @@ subroutine radtran4(errorstatus, max_delta_tau,&
   character(len=80) :: msg
   character(len=14) :: nameOfRoutine = 'radtran4'
 
-  !Without setting these values to zero, PyPamtra results might when called several times!
-  source(:) = 0.d0
-  reflect(:) = 0.d0
-  trans(:) = 0.d0
-
   err = 0
   if (verbose >= 2) call report(info,'Start of ', nameOfRoutine)
 
@@ -240,6 +235,13 @@ subroutine radtran4(errorstatus, max_delta_tau,&
      return
   end if
 
+  !Without setting these values to zero, PyPamtra results might when called several times!
+  !Only the part of the layers and the surface (plus the level below) is used, the whole
+  !arrays take hundreds of MB.
+  source(1:min(2*n*(num_layers+2), size(source))) = 0.d0
+  reflect(1:min(2*n*n*(num_layers+2), size(reflect))) = 0.d0
+  trans(1:min(2*n*n*(num_layers+2), size(trans))) = 0.d0
+
   ! !           make the desired quadrature abscissas and weights
   !       if (quad_type(1:1) .eq. 'd') then
   !         call double_gauss_quadrature&
@@ -369,57 +371,72 @@ subroutine radtran4(errorstatus, max_delta_tau,&
   call thermal_radiance (nstokes, nummu,0, sky_temp, zero,  &
        wavelength,  sky_radiance)
 
-  !         for each desired output level (1 thru nl+2) add layers
-  !           above and below level and compute internal radiance.
-  !           outlevels gives the desired output levels.
-  do i = 1, noutlevels
-     layer = min( max( outlevels(i), 1), num_layers+2)
-     upreflect(:) = 0.D0
-     downreflect(:) = 0.D0
-     call midentity (n, uptrans(1))
-     call midentity (n, uptrans(1+n*n))
-     call midentity (n, downtrans(1))
-     call midentity (n, downtrans(1+n*n))
-     upsource(:) = 0.D0
-     downsource(:) = 0.D0
-
-     do l = 1, layer-1
-        krt = 1 + 2*n*n*(l-1)
-        ks = 1 + 2*n*(l-1)
-        if (l .eq. 1) then
-           call mcopy (2*n,n, reflect(krt), upreflect)
-           call mcopy (2*n,n, trans(krt), uptrans)
-           call mcopy (2*n,1, source(ks), upsource)
-        else
-           call mcopy (2*n,n, upreflect, reflect1)
-           call mcopy (2*n,n, uptrans, trans1)
-           call mcopy (2*n,1, upsource, source1)
-           call combine_layers4(n, reflect1, trans1, source1,&
-                reflect(krt), trans(krt), source(ks),&
-                upreflect, uptrans, upsource)
-        endif
-     enddo
-     do l = layer, num_layers+1
-        krt = 1 + 2*n*n*(l-1)
-        ks = 1 + 2*n*(l-1)
-        if (l .eq. layer) then
-           call mcopy (2*n,n, reflect(krt), downreflect)
-           call mcopy (2*n,n, trans(krt), downtrans)
-           call mcopy (2*n,1, source(ks), downsource)
-        else
-           call mcopy (2*n,n, downreflect, reflect1)
-           call mcopy (2*n,n, downtrans, trans1)
-           call mcopy (2*n,1, downsource, source1)
-           call combine_layers4(n, reflect1, trans1, source1,&
-                reflect(krt), trans(krt), source(ks),&
-                downreflect, downtrans, downsource)
-        endif
-     enddo
-     call internal_radiance4(n, upreflect, uptrans, upsource,&
-          downreflect, downtrans, downsource, &
+  !           without any scattering layer, the layers need not be added
+  !             as matrices, see nonscatter_radiance4. The radiances agree
+  !             with the adding below within 1e-14 relative to the intensity.
+  clear_sky = (.not. any(rt_hydros_present_reverse(1:num_layers))) .and. &
+       all(outlevels(1:noutlevels) <= num_layers+1)
+
+  if (clear_sky) then
+     if (verbose >= 3) call report(info,'no scattering layers, using nonscatter_radiance4', nameOfRoutine)
+     call nonscatter_radiance4(n, num_layers, noutlevels, outlevels,&
+          reflect, trans, source,&
           sky_radiance, gnd_radiance,&
-          up_rad(1+(i-1)*n), down_rad(1+(i-1)*n))
-  enddo
+          up_rad, down_rad)
+  else
+
+     !         for each desired output level (1 thru nl+2) add layers
+     !           above and below level and compute internal radiance.
+     !           outlevels gives the desired output levels.
+     do i = 1, noutlevels
+        layer = min( max( outlevels(i), 1), num_layers+2)
+        upreflect(:) = 0.D0
+        downreflect(:) = 0.D0
+        call midentity (n, uptrans(1))
+        call midentity (n, uptrans(1+n*n))
+        call midentity (n, downtrans(1))
+        call midentity (n, downtrans(1+n*n))
+        upsource(:) = 0.D0
+        downsource(:) = 0.D0
+
+        do l = 1, layer-1
+           krt = 1 + 2*n*n*(l-1)
+           ks = 1 + 2*n*(l-1)
+           if (l .eq. 1) then
+              call mcopy (2*n,n, reflect(krt), upreflect)
+              call mcopy (2*n,n, trans(krt), uptrans)
+              call mcopy (2*n,1, source(ks), upsource)
+           else
+              call mcopy (2*n,n, upreflect, reflect1)
+              call mcopy (2*n,n, uptrans, trans1)
+              call mcopy (2*n,1, upsource, source1)
+              call combine_layers4(n, reflect1, trans1, source1,&
+                   reflect(krt), trans(krt), source(ks),&
+                   upreflect, uptrans, upsource)
+           endif
+        enddo
+        do l = layer, num_layers+1
+           krt = 1 + 2*n*n*(l-1)
+           ks = 1 + 2*n*(l-1)
+           if (l .eq. layer) then
+              call mcopy (2*n,n, reflect(krt), downreflect)
+              call mcopy (2*n,n, trans(krt), downtrans)
+              call mcopy (2*n,1, source(ks), downsource)
+           else
+              call mcopy (2*n,n, downreflect, reflect1)
+              call mcopy (2*n,n, downtrans, trans1)
+              call mcopy (2*n,1, downsource, source1)
+              call combine_layers4(n, reflect1, trans1, source1,&
+                   reflect(krt), trans(krt), source(ks),&
+                   downreflect, downtrans, downsource)
+           endif
+        enddo
+        call internal_radiance4(n, upreflect, uptrans, upsource,&
+             downreflect, downtrans, downsource, &
+             sky_radiance, gnd_radiance,&
+             up_rad(1+(i-1)*n), down_rad(1+(i-1)*n))
+     enddo
+  end if
 
 
 
@@ -24,6 +24,7 @@ subroutine run_rt(errorstatus)
 
   real(kind=dbl) :: wavelength       ! microns
   real(kind=dbl) :: ground_albedo
+  real(kind=dbl) :: t_start
 
   character(300) :: out_file_pas, out_file_act !file names if no nc
 
@@ -89,7 +90,9 @@ subroutine run_rt(errorstatus)
   if (verbose >= 2) call report(info,nxstr//' '//nystr//'type to local variables done',nameOfRoutine)
 
   if (passive .eqv. .true.) then
+     t_start = timing_clock()
      call set_sfc_optics(err,freq)
+     call timing_add(timing_sfc_optics, t_start)
      if (err /= 0) then
         msg = 'error in set_sfc_optics'
         call report(err,msg, nameOfRoutine)
@@ -104,7 +107,9 @@ subroutine run_rt(errorstatus)
   !
   if (lgas_extinction) then
      !returns rt_kextatmo!
+     t_start = timing_clock()
      call get_gasabs(err,freq)
+     call timing_add(timing_gasabs, t_start)
      if (err /= 0) then
         msg = 'error in get_gasabs'
         call report(err,msg, nameOfRoutine)
@@ -187,9 +192,11 @@ subroutine run_rt(errorstatus)
      
      if (verbose >= 2) print*, i_x,i_y, "Entering rt4 ...."
 
+     t_start = timing_clock()
      call rt4(err, out_file_pas,&
           ground_albedo,sky_temp,&
           wavelength,outlevels)
+     call timing_add(timing_rt4, t_start)
 
      if (verbose >= 2) print*, i_x,i_y, "....rt4 finished"
      !calculate human readable angles!
@@ -73,7 +73,13 @@ contains
       hydro_fullSpec, &
       radar_pol, &
       radar_npol, &
-      save_psd
+      save_psd, &
+      hydro_scat_cache
+    use scat_cache, only: scat_cache_lookup, &
+      scat_cache_get, &
+      scat_cache_store, &
+      scat_cache_get_spec, &
+      scat_cache_store_spec
     use mie_spheres, only: calc_mie_spheres
     use tmatrix, only: calc_tmatrix
     use rayleigh_gans, only: calc_self_similar_rayleigh_gans, &
@@ -149,6 +155,7 @@ contains
     integer :: nlegen_coef_hydro
     integer :: jj
     integer(kind=long) :: liu_type, hong_type
+    logical :: use_cache, cache_hit
 
     integer(kind=long) :: errorstatus
     integer(kind=long) :: err = 0
@@ -249,8 +256,20 @@ contains
     where (isnan(canting_list)) canting_list = 0.d0
     where (as_ratio_list < 0) as_ratio_list = 0.d0
     where (isnan(as_ratio_list)) as_ratio_list = 0.d0
+    ! reuse the properties of a similar layer if possible
+    use_cache = hydro_scat_cache .and. (.not. hydro_fullSpec) .and. (.not. save_psd)
+    cache_hit = .false.
+    if (use_cache) call scat_cache_lookup(cache_hit)
+
+    if (cache_hit) then
+
+      call scat_cache_get(kext_hydro,salb_hydro,back_hydro,scatter_matrix_hydro,&
+        extinct_matrix_hydro,emis_vector_hydro,nlegen_coef_hydro,legen_coef1_hydro,&
+        legen_coef2_hydro,legen_coef3_hydro,legen_coef4_hydro)
+      nlegen_coef = max(nlegen_coef,nlegen_coef_hydro)
+
 !!!!modern RT4 routines !!!
-    if (TRIM(scat_name) == "tmatrix") then
+    else if (TRIM(scat_name) == "tmatrix") then
 
       call calc_tmatrix(err,&
         freq*1.d9,&
@@ -840,6 +859,12 @@ contains
       return
     end if
 
+    if (use_cache .and. (.not. cache_hit)) then
+      call scat_cache_store(kext_hydro,salb_hydro,back_hydro,scatter_matrix_hydro,&
+        extinct_matrix_hydro,emis_vector_hydro,nlegen_coef_hydro,legen_coef1_hydro,&
+        legen_coef2_hydro,legen_coef3_hydro,legen_coef4_hydro)
+    end if
+
     if (save_psd .eqv. .true.) then
       ! only for polrization one!
       out_psd_bscat(i_x,i_y,i_z,i_h,1:nbin) =  back_spec_dia(1,:)/num_density(:)
@@ -902,13 +927,18 @@ contains
     if ((active) .and. ((radar_mode .eq. "spectrum") .or. (radar_mode .eq. "moments"))) then
 
       do  i_p= 1, radar_npol
-        call radar_spectrum(err,nbin,d_ds, back_hydro(i_p),  back_spec_dia(i_p,:),layer_t,pressure,freq,&
-          soft_rho_eff,vel_size_mod,mass_ds,area_ds,radar_spec_hydro)
-        if (err /= 0) then
-          msg = 'error in radar_spectrum!'
-          call report(err, msg, nameOfRoutine)
-          errorstatus = err
-          return
+        if (cache_hit) then
+          call scat_cache_get_spec(i_p,radar_spec_hydro)
+        else
+          call radar_spectrum(err,nbin,d_ds, back_hydro(i_p),  back_spec_dia(i_p,:),layer_t,pressure,freq,&
+            soft_rho_eff,vel_size_mod,mass_ds,area_ds,radar_spec_hydro)
+          if (err /= 0) then
+            msg = 'error in radar_spectrum!'
+            call report(err, msg, nameOfRoutine)
+            errorstatus = err
+            return
+          end if
+          if (use_cache) call scat_cache_store_spec(i_p,radar_spec_hydro)
         end if
         radar_spec(i_p,:) = radar_spec(i_p,:)+ radar_spec_hydro(:)
       end do
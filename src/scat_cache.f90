@@ -0,0 +1,302 @@
+module scat_cache
+  ! Description:
+  ! Bounded least recently used (LRU) cache for the single scattering
+  ! properties of a single hydrometeor class in a single layer. Entries are
+  ! keyed on frequency, hydrometeor, quantized temperature and quantized
+  ! q_h, n_tot and r_eff (plus the descriptor values of the layer), so that
+  ! columns with similar layers share the expensive calc_scatProperties
+  ! calls. The cache lives as long as the other run time variables, i.e. it
+  ! is emptied by deallocate_everything.
+  !
+  ! The quantization is controlled by hydro_scat_cache_temp_res [K] and
+  ! hydro_scat_cache_conc_res (relative resolution of q_h, n_tot and r_eff,
+  ! also used for the pressure if Doppler spectra are simulated). The number
+  ! of hits and misses is counted in out_scat_cache_hits and
+  ! out_scat_cache_misses of vars_output.
+
+  use kinds
+  use settings, only: nstokes, &
+    nummu, &
+    maxnleg
+  use vars_output, only: out_scat_cache_hits, &
+    out_scat_cache_misses
+
+  implicit none
+  save
+
+  integer, parameter :: nkey = 21
+
+  integer(kind=long) :: cache_n = 0, cache_slot = 0
+  integer(kind=8) :: cache_clock = 0
+  integer(kind=8), dimension(nkey) :: current_key
+
+  integer(kind=8), allocatable, dimension(:,:) :: cache_key
+  integer(kind=8), allocatable, dimension(:) :: cache_used
+  real(kind=dbl), allocatable, dimension(:) :: cache_kext, cache_salb
+  real(kind=dbl), allocatable, dimension(:,:) :: cache_back
+  real(kind=dbl), allocatable, dimension(:,:,:,:,:,:) :: cache_scatter
+  real(kind=dbl), allocatable, dimension(:,:,:,:,:) :: cache_extinct
+  real(kind=dbl), allocatable, dimension(:,:,:,:) :: cache_emis
+  integer, allocatable, dimension(:) :: cache_nlegen
+  real(kind=dbl), allocatable, dimension(:,:,:) :: cache_legen
+  real(kind=dbl), allocatable, dimension(:,:,:) :: cache_radar_spec
+
+contains
+
+  subroutine allocate_scat_cache()
+
+    use settings, only: hydro_scat_cache_size, &
+      radar_npol, &
+      radar_nfft_aliased
+
+    implicit none
+
+    integer(kind=long) :: n
+
+    n = hydro_scat_cache_size
+
+    allocate(cache_key(nkey,n))
+    allocate(cache_used(n))
+    allocate(cache_kext(n))
+    allocate(cache_salb(n))
+    allocate(cache_back(radar_npol,n))
+    allocate(cache_scatter(nstokes,nummu,nstokes,nummu,4,n))
+    allocate(cache_extinct(nstokes,nstokes,nummu,2,n))
+    allocate(cache_emis(nstokes,nummu,2,n))
+    allocate(cache_nlegen(n))
+    allocate(cache_legen(4,maxnleg,n))
+    allocate(cache_radar_spec(radar_npol,radar_nfft_aliased,n))
+
+    cache_n = 0
+    cache_clock = 0
+    return
+  end subroutine allocate_scat_cache
+
+  subroutine deallocate_scat_cache()
+
+    implicit none
+
+    if (allocated(cache_key)) deallocate(cache_key)
+    if (allocated(cache_used)) deallocate(cache_used)
+    if (allocated(cache_kext)) deallocate(cache_kext)
+    if (allocated(cache_salb)) deallocate(cache_salb)
+    if (allocated(cache_back)) deallocate(cache_back)
+    if (allocated(cache_scatter)) deallocate(cache_scatter)
+    if (allocated(cache_extinct)) deallocate(cache_extinct)
+    if (allocated(cache_emis)) deallocate(cache_emis)
+    if (allocated(cache_nlegen)) deallocate(cache_nlegen)
+    if (allocated(cache_legen)) deallocate(cache_legen)
+    if (allocated(cache_radar_spec)) deallocate(cache_radar_spec)
+
+    cache_n = 0
+    cache_slot = 0
+    cache_clock = 0
+    out_scat_cache_hits = 0
+    out_scat_cache_misses = 0
+    return
+  end subroutine deallocate_scat_cache
+
+  function quantize_log(x) result(bin)
+    ! relative quantization of positive values, everything else gets one bin
+
+    use settings, only: hydro_scat_cache_conc_res
+
+    implicit none
+
+    real(kind=dbl), intent(in) :: x
+    integer(kind=8) :: bin
+
+    if ((x > 0.d0) .and. (.not. isnan(x))) then
+      bin = nint(log(x)/log(1.d0 + hydro_scat_cache_conc_res), kind=8)
+    else
+      bin = -huge(bin)
+    end if
+    return
+  end function quantize_log
+
+  subroutine scat_cache_lookup(found)
+    ! build the key of the current layer and hydrometeor and search it in
+    ! the cache. In case it is not found, the slot for scat_cache_store is
+    ! reserved.
+
+    use settings, only: hydro_scat_cache_temp_res, &
+      active, &
+      radar_mode
+    use vars_index, only: i_f, i_h
+    use drop_size_dist, only: layer_t, &
+      pressure, &
+      q_h, &
+      n_tot, &
+      r_eff, &
+      nbin, &
+      as_ratio, &
+      rho_ms, &
+      a_ms, &
+      b_ms, &
+      alpha_as, &
+      beta_as, &
+      p_1, p_2, p_3, p_4, &
+      d_1, d_2, &
+      dsd_canting
+
+    implicit none
+
+    logical, intent(out) :: found
+    integer(kind=long) :: ii
+
+    if (.not. allocated(cache_key)) call allocate_scat_cache()
+
+    current_key(1) = i_f
+    current_key(2) = i_h
+    current_key(3) = nint(layer_t/hydro_scat_cache_temp_res, kind=8)
+    current_key(4) = quantize_log(q_h)
+    current_key(5) = quantize_log(n_tot)
+    current_key(6) = quantize_log(r_eff)
+    ! the pressure matters only for the fall velocity of the Doppler spectrum
+    if (active .and. ((radar_mode == "spectrum") .or. (radar_mode == "moments"))) then
+      current_key(7) = quantize_log(pressure)
+    else
+      current_key(7) = 0
+    end if
+    current_key(8) = nbin
+    ! the descriptor values (potentially 4D) are compared bit by bit
+    current_key(9) = transfer(as_ratio, 1_8)
+    current_key(10) = transfer(rho_ms, 1_8)
+    current_key(11) = transfer(a_ms, 1_8)
+    current_key(12) = transfer(b_ms, 1_8)
+    current_key(13) = transfer(alpha_as, 1_8)
+    current_key(14) = transfer(beta_as, 1_8)
+    current_key(15) = transfer(p_1, 1_8)
+    current_key(16) = transfer(p_2, 1_8)
+    current_key(17) = transfer(p_3, 1_8)
+    current_key(18) = transfer(p_4, 1_8)
+    current_key(19) = transfer(d_1, 1_8)
+    current_key(20) = transfer(d_2, 1_8)
+    current_key(21) = transfer(dsd_canting, 1_8)
+
+    cache_clock = cache_clock + 1
+    found = .false.
+
+    do ii = 1, cache_n
+      if (all(cache_key(:,ii) == current_key)) then
+        found = .true.
+        cache_slot = ii
+        cache_used(ii) = cache_clock
+        out_scat_cache_hits = out_scat_cache_hits + 1
+        return
+      end if
+    end do
+
+    ! not found, take a new slot or replace the least recently used one
+    if (cache_n < size(cache_used)) then
+      cache_n = cache_n + 1
+      cache_slot = cache_n
+    else
+      cache_slot = minloc(cache_used, 1)
+    end if
+    cache_key(:,cache_slot) = current_key
+    cache_used(cache_slot) = cache_clock
+    out_scat_cache_misses = out_scat_cache_misses + 1
+
+    return
+  end subroutine scat_cache_lookup
+
+  subroutine scat_cache_get(kext_hydro, salb_hydro, back_hydro, &
+    scatter_matrix_hydro, extinct_matrix_hydro, emis_vector_hydro, &
+    nlegen_coef_hydro, legen_coef1_hydro, legen_coef2_hydro, &
+    legen_coef3_hydro, legen_coef4_hydro)
+    ! get the properties found by scat_cache_lookup
+
+    use settings, only: radar_npol
+
+    implicit none
+
+    real(kind=dbl), intent(out) :: kext_hydro, salb_hydro
+    real(kind=dbl), dimension(radar_npol), intent(out) :: back_hydro
+    real(kind=dbl), dimension(nstokes,nummu,nstokes,nummu,4), intent(out) :: scatter_matrix_hydro
+    real(kind=dbl), dimension(nstokes,nstokes,nummu,2), intent(out) :: extinct_matrix_hydro
+    real(kind=dbl), dimension(nstokes,nummu,2), intent(out) :: emis_vector_hydro
+    integer, intent(out) :: nlegen_coef_hydro
+    real(kind=dbl), dimension(maxnleg), intent(out) :: legen_coef1_hydro, legen_coef2_hydro, &
+      legen_coef3_hydro, legen_coef4_hydro
+
+    kext_hydro = cache_kext(cache_slot)
+    salb_hydro = cache_salb(cache_slot)
+    back_hydro(:) = cache_back(:,cache_slot)
+    scatter_matrix_hydro = cache_scatter(:,:,:,:,:,cache_slot)
+    extinct_matrix_hydro = cache_extinct(:,:,:,:,cache_slot)
+    emis_vector_hydro = cache_emis(:,:,:,cache_slot)
+    nlegen_coef_hydro = cache_nlegen(cache_slot)
+    legen_coef1_hydro(:) = cache_legen(1,:,cache_slot)
+    legen_coef2_hydro(:) = cache_legen(2,:,cache_slot)
+    legen_coef3_hydro(:) = cache_legen(3,:,cache_slot)
+    legen_coef4_hydro(:) = cache_legen(4,:,cache_slot)
+
+    return
+  end subroutine scat_cache_get
+
+  subroutine scat_cache_store(kext_hydro, salb_hydro, back_hydro, &
+    scatter_matrix_hydro, extinct_matrix_hydro, emis_vector_hydro, &
+    nlegen_coef_hydro, legen_coef1_hydro, legen_coef2_hydro, &
+    legen_coef3_hydro, legen_coef4_hydro)
+    ! store the properties in the slot reserved by scat_cache_lookup
+
+    use settings, only: radar_npol
+
+    implicit none
+
+    real(kind=dbl), intent(in) :: kext_hydro, salb_hydro
+    real(kind=dbl), dimension(radar_npol), intent(in) :: back_hydro
+    real(kind=dbl), dimension(nstokes,nummu,nstokes,nummu,4), intent(in) :: scatter_matrix_hydro
+    real(kind=dbl), dimension(nstokes,nstokes,nummu,2), intent(in) :: extinct_matrix_hydro
+    real(kind=dbl), dimension(nstokes,nummu,2), intent(in) :: emis_vector_hydro
+    integer, intent(in) :: nlegen_coef_hydro
+    real(kind=dbl), dimension(maxnleg), intent(in) :: legen_coef1_hydro, legen_coef2_hydro, &
+      legen_coef3_hydro, legen_coef4_hydro
+
+    cache_kext(cache_slot) = kext_hydro
+    cache_salb(cache_slot) = salb_hydro
+    cache_back(:,cache_slot) = back_hydro(:)
+    cache_scatter(:,:,:,:,:,cache_slot) = scatter_matrix_hydro
+    cache_extinct(:,:,:,:,cache_slot) = extinct_matrix_hydro
+    cache_emis(:,:,:,cache_slot) = emis_vector_hydro
+    cache_nlegen(cache_slot) = nlegen_coef_hydro
+    cache_legen(1,:,cache_slot) = legen_coef1_hydro(:)
+    cache_legen(2,:,cache_slot) = legen_coef2_hydro(:)
+    cache_legen(3,:,cache_slot) = legen_coef3_hydro(:)
+    cache_legen(4,:,cache_slot) = legen_coef4_hydro(:)
+
+    return
+  end subroutine scat_cache_store
+
+  subroutine scat_cache_get_spec(pol, radar_spec_hydro)
+    ! get the Doppler spectrum of polarisation pol found by scat_cache_lookup
+
+    use settings, only: radar_nfft_aliased
+
+    implicit none
+
+    integer(kind=long), intent(in) :: pol
+    real(kind=dbl), dimension(radar_nfft_aliased), intent(out) :: radar_spec_hydro
+
+    radar_spec_hydro(:) = cache_radar_spec(pol,:,cache_slot)
+
+    return
+  end subroutine scat_cache_get_spec
+
+  subroutine scat_cache_store_spec(pol, radar_spec_hydro)
+    ! store the Doppler spectrum of polarisation pol
+
+    use settings, only: radar_nfft_aliased
+
+    implicit none
+
+    integer(kind=long), intent(in) :: pol
+    real(kind=dbl), dimension(radar_nfft_aliased), intent(in) :: radar_spec_hydro
+
+    cache_radar_spec(pol,:,cache_slot) = radar_spec_hydro(:)
+
+    return
+  end subroutine scat_cache_store_spec
+
+end module scat_cache
@@ -30,6 +30,13 @@ module settings
 
     character(1), parameter :: units='T'
 
+    ! outputs which can be switched off with output_products. The other outputs follow
+    ! from passive, active, radar_mode, save_psd and save_ssp.
+    character(20), dimension(7), parameter :: optional_products = (/ &
+         "radar_spectra       ", "radar_snr           ", "radar_moments       ", &
+         "radar_slopes        ", "radar_edges         ", "radar_quality       ", &
+         "emissivity          "/)
+
     real(kind=dbl), parameter :: radar_kolmogorov_constant = 0.5     ! kolmogorov constant for turbulence
 
 
@@ -76,6 +83,10 @@ module settings
     real(kind=dbl) :: radar_airmotion_step_vmin
     real(kind=dbl) :: hydro_softsphere_min_density !tmatrix method numerically unstable for extremely low density
     real(kind=dbl) :: hydro_threshold
+    real(kind=dbl) :: hydro_scat_cache_temp_res ! temperature resolution of the scattering properties cache [K]
+    real(kind=dbl) :: hydro_scat_cache_conc_res ! relative resolution of q_h, n_tot and r_eff of the scattering properties cache
+    integer(kind=long) :: hydro_scat_cache_size ! max. number of entries of the scattering properties cache
+    real(kind=dbl) :: gas_lut_tolerance ! max. relative error of the gas absorption lookup table
 
   integer, parameter :: maxnleg = 200 !max legnth of legendre series
   logical, parameter :: lphase_flag = .true.
@@ -100,16 +111,20 @@ module settings
        radar_smooth_spectrum, &
        hydro_fullSpec, &
        hydro_limit_density_area, &
+       hydro_scat_cache, & ! reuse scattering properties of similar layers
+       loop_columns_first, & ! loop over frequencies inside the loop over columns and reuse the psd of the column
        hydro_adaptive_grid, & ! apply an adaptive grid to the psd. good to reduce mass overestimations for small amounts. works only for modified gamma
        conserve_mass_rescale_dsd, & ! in case the total mass calculated integrating the DSD is different from q_h (mass mixing ratio given in input) rescale the DSD
        add_obs_height_to_layer, & ! if passive=.true. and the observation height don't correspond to a layer interface, add to the profile the observation height and interpolate all variables
        radar_use_wider_peak, & ! use wider peak inlcuding the found noise/peak border
        liblapack, & ! use liblapack for matrix inversion which much faster
        radar_allow_negative_dD_dU !allow that particle velocity is decreasing with size
-  character(3) :: gas_mod
+  character(8) :: gas_mod
+  character(300) :: gas_lut_path ! directory of the cached gas absorption lookup tables
   character(3) :: liq_mod
   character(20) :: moments_file,file_desc
   character(300) :: output_path, data_path
+  character(200) :: output_products ! comma separated list of the optional outputs which are stored or "all"
   character(100) :: creator
   character(18) :: freq_str
   character(2) :: OUTPOL
@@ -157,6 +172,7 @@ contains
         data_path,&
         save_psd, &
         save_ssp, &
+        output_products, &
         obs_height, &
         outpol, &
         freq_str,&
@@ -175,6 +191,8 @@ contains
         lhyd_scattering, &
         lhyd_emission, &
         gas_mod, &
+        gas_lut_path, &
+        gas_lut_tolerance, &
         hydro_fullSpec, &
         hydro_limit_density_area,&
         hydro_softsphere_min_density, &
@@ -185,6 +203,11 @@ contains
         liq_mod, &
         hydro_includeHydroInRhoAir,&
         hydro_threshold, &
+        hydro_scat_cache, &
+        hydro_scat_cache_size, &
+        hydro_scat_cache_temp_res, &
+        hydro_scat_cache_conc_res, &
+        loop_columns_first, &
         radar_nfft, &
         radar_no_Ave, &
         radar_max_V, &
@@ -275,6 +298,9 @@ contains
     integer(kind=long) :: err = 0
     character(len=80) :: msg
     character(len=15) :: nameOfRoutine = 'test_settings'
+    integer :: pos1, pos2
+    character(len=20) :: product
+    logical :: is_store
     !test for settings go here
 
     err = 0
@@ -283,11 +309,22 @@ contains
     call assert_true(err, noutlevels > 0, 'Number of output levels has to be larger than 0')
     call assert_false(err,MOD(radar_nfft, 2) == 1,&
          "radar_nfft has to be even")
-    call assert_true(err,(gas_mod == "L93") .or. (gas_mod == "R98"),&
-         "gas_mod has to be L93 or R98")
+    call assert_true(err,(gas_mod == "L93") .or. (gas_mod == "R98") .or. &
+         (gas_mod == "L93_LUT") .or. (gas_mod == "R98_LUT"),&
+         "gas_mod has to be L93, R98, L93_LUT or R98_LUT")
+    call assert_true(err,gas_lut_tolerance > 0,&
+         "gas_lut_tolerance has to be larger than 0")
+    if (hydro_scat_cache) then
+       call assert_true(err,hydro_scat_cache_size > 0,&
+            "hydro_scat_cache_size has to be larger than 0")
+       call assert_true(err,(hydro_scat_cache_temp_res > 0) .and. (hydro_scat_cache_conc_res > 0),&
+            "hydro_scat_cache_temp_res and hydro_scat_cache_conc_res have to be larger than 0")
+    end if
     if (hydro_fullSpec) then
-       call assert_true(err,in_python,&
-            "hydro_fullSpec works only in python!")
+       ! the standalone version reads the spectra from a profile store
+       inquire(file=trim(input_pathfile)//'/manifest.json', exist=is_store)
+       call assert_true(err,in_python .or. is_store,&
+            "hydro_fullSpec works only in python or with a profile store!")
     end if
     if (.not. radar_use_hildebrand) then
        call assert_true(err,ALL(radar_noise_distance_factor(1:nfrq)>0),&
@@ -325,6 +362,26 @@ contains
        return
     end if
 
+    !test output_products
+    pos1 = 1
+    do while (trim(output_products) /= "all")
+       pos2 = INDEX(output_products(pos1:), ",")
+       if (pos2 == 0) then
+          product = output_products(pos1:)
+       else
+          product = output_products(pos1:pos1+pos2-2)
+       end if
+       call assert_true(err,ANY(product == optional_products),&
+            "unknown output in output_products: "//trim(product))
+       if (pos2 == 0) exit
+       pos1 = pos1 + pos2
+    end do
+    !the ASCII output of the active part contains the moments and slopes
+    if (active .and. (radar_mode /= "simple") .and. (.not. write_nc) .and. (.not. in_python)) then
+       call assert_true(err,output_selected("radar_moments") .and. output_selected("radar_slopes"),&
+            "ASCII output requires radar_moments and radar_slopes")
+    end if
+
     if (err /= 0) then
        msg = 'value in settings not allowed'
        call report(err, msg, nameOfRoutine)
@@ -338,6 +395,21 @@ contains
 
   end subroutine test_settings
 
+  logical function output_selected(product)
+    ! is the optional output product part of output_products? radar_spectra is saved
+    ! with output_products="all" only if radar_mode is "spectrum", for "moments"
+    ! it has to be listed explicitly.
+    implicit none
+    character(len=*), intent(in) :: product
+
+    if (trim(output_products) == "all") then
+       output_selected = (product /= "radar_spectra") .or. (radar_mode == "spectrum")
+    else
+       output_selected = INDEX(","//trim(output_products)//",", ","//trim(product)//",") > 0
+    end if
+
+  end function output_selected
+
   subroutine fillRealValues(setArray,default)
     use kinds
     implicit none
@@ -473,6 +545,7 @@ contains
         data_path='$PAMTRA_DATADIR'
         save_psd=.false.
         save_ssp=.false.
+        output_products="all" ! or e.g. "radar_moments,radar_snr", see output_selected
         noutlevels=2 ! number of output levels
         outpol='VH'
         freq_str=''
@@ -487,6 +560,8 @@ contains
         emissivity=0.6
         lgas_extinction=.true.
         gas_mod='R98'
+        gas_lut_path=''
+        gas_lut_tolerance = 1.d-3 ! relative
         lhyd_absorption=.true.
         lhyd_scattering=.true.
         lhyd_emission=.true.
@@ -495,6 +570,11 @@ contains
         hydro_limit_density_area = .true.
         hydro_softsphere_min_density = 10. !kg/m^3
         hydro_adaptive_grid = .true.
+        hydro_scat_cache = .false.
+        hydro_scat_cache_size = 1000
+        hydro_scat_cache_temp_res = 0.1d0 ! K
+        hydro_scat_cache_conc_res = 0.01d0 ! relative
+        loop_columns_first = .false.
         conserve_mass_rescale_dsd = .true.
         liq_mod = "TKC"!"Ell"
         tmatrix_db = "none" ! none or file
@@ -598,6 +678,8 @@ contains
       print*, 'tmatrix_db: ', tmatrix_db
       print*, 'lgas_extinction: ', lgas_extinction
       print*, 'gas_mod: ', gas_mod
+      print*, 'gas_lut_path: ', gas_lut_path
+      print*, 'gas_lut_tolerance: ', gas_lut_tolerance
       print*, 'liq_mod: ', liq_mod
       print*, 'moments_file: ', moments_file
       print*, 'radar_receiver_uncertainty_std: ', radar_receiver_uncertainty_std
@@ -607,6 +689,11 @@ contains
       print*, 'hydro_limit_density_area: ', hydro_limit_density_area
       print*, 'hydro_softsphere_min_density: ', hydro_softsphere_min_density
       print*, 'hydro_adaptive_grid: ', hydro_adaptive_grid
+      print*, 'hydro_scat_cache: ', hydro_scat_cache
+      print*, 'hydro_scat_cache_size: ', hydro_scat_cache_size
+      print*, 'hydro_scat_cache_temp_res: ', hydro_scat_cache_temp_res
+      print*, 'hydro_scat_cache_conc_res: ', hydro_scat_cache_conc_res
+      print*, 'loop_columns_first: ', loop_columns_first
       print*, 'conserve_mass_rescale_dsd', conserve_mass_rescale_dsd
       print*, 'radar_noise_distance_factor: ', radar_noise_distance_factor
       print*, 'radar_airmotion_step_vmin: ', radar_airmotion_step_vmin
@@ -633,6 +720,7 @@ contains
       print*, 'emissivity: ', emissivity
       print*, 'save_psd: ', save_psd
       print*, 'save_ssp: ', save_ssp
+      print*, 'output_products: ', output_products
       print*, "randomseed", randomseed
       print*, "radar_pol", radar_pol
       print*, "radar_npol", radar_npol
@@ -87,7 +87,7 @@ contains
       call report(errorstatus, msg, nameOfRoutine)
       return
     end if
-    out_emissivity(i_x,i_y,:,i_f,:) = rt_sfc_emissivity(:,:)
+    if (allocated(out_emissivity)) out_emissivity(i_x,i_y,:,i_f,:) = rt_sfc_emissivity(:,:)
 
     errorstatus = err
    
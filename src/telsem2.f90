@@ -1,86 +1,135 @@
 subroutine telsem2(errorstatus, month, lon, lat, freq, emissivity)
-  use mod_mwatlas_nt_bin!, only: rttov_readmw_atlas,&
-  !rttov_closemw_atlas, test_inputs, emis_interp_ind_sing
   use kinds
   use report_module
-  use constants, only: rad2deg
-  use settings, only: data_path, nummu, mu_values
+  use settings, only: nummu, mu_values
   
   implicit none
 
-  integer :: i
   real(kind=sgl), intent(in) :: lon, lat
   real(kind=dbl), intent(in) :: freq
   real(kind=dbl), dimension(2,nummu), intent(out) :: emissivity 
+  character(len=2), intent(in) :: month
+
+  real(kind=sgl), dimension(1) :: lon_arr, lat_arr
+  real(kind=dbl), dimension(2,nummu,1) :: emis_arr
+
+  integer(kind=long), intent(out) :: errorstatus
+  integer(kind=long) :: err = 0
+  character(len=80) :: msg    
+  character(22) :: nameOfRoutine = 'telsem2'
+
+  if (verbose >= 3) call report(info,'Start of ', nameOfRoutine)  
+
+  lon_arr(1) = lon
+  lat_arr(1) = lat
+
+  call telsem2_batch(err, month, 1_long, lon_arr, lat_arr, freq, int(nummu,kind=long), mu_values(1:nummu), emis_arr)
+  if (err /= 0) then
+     msg = 'error in telsem2_batch'
+     call report(err,msg, nameOfRoutine)
+     errorstatus = err
+     return
+  end if
+
+  emissivity(:,:) = emis_arr(:,:,1)
+
+  errorstatus = err
+
+  if (verbose >= 3) call report(info,'End of ', nameOfRoutine)
+
+end subroutine telsem2
+
+subroutine telsem2_batch(errorstatus, month, npix, lon, lat, freq, nang, mu, emissivity)
+
+! Land surface emissivities from the TELSEM2 atlas for npix lat/lon pairs and nang
+! cosines of the observation angle. The monthly atlas is read only once and kept in
+! memory (see rttov_getmw_atlas); it is freed with rttov_closemw_atlas.
+
+  use mod_mwatlas_nt_bin, only: rttov_getmw_atlas, test_inputs, emis_interp_ind_sing
+  use kinds
+  use report_module
+  use constants, only: rad2deg
+  use settings, only: data_path
+  
+  implicit none
+
+  integer(kind=long) :: i, ip
+  integer(kind=long), intent(in) :: npix, nang
+  real(kind=sgl), dimension(npix), intent(in) :: lon, lat
+  real(kind=dbl), intent(in) :: freq
+  real(kind=dbl), dimension(nang), intent(in) :: mu
+  real(kind=dbl), dimension(2,nang,npix), intent(out) :: emissivity 
   !DECLARATIONS ==============================================
 
   !INPUT PARAMETERS
   integer(kind=long) :: imonth  !(1->12)
   character(len=2), intent(in) :: month
-  character(len=80) :: dir  !directory of emis database
-  real(kind=dbl) :: theta  !(0->60)
+  character(len=300) :: dir  !directory of emis database
+  real(kind=dbl), dimension(nang) :: theta  !(0->60)
   real(kind=sgl) :: lon_tmp
 
   integer(kind=long), intent(out) :: errorstatus
   integer(kind=long) :: err = 0
   character(len=80) :: msg    
-  character(22) :: nameOfRoutine = 'telsem2'
+  character(22) :: nameOfRoutine = 'telsem2_batch'
 
   if (verbose >= 3) call report(info,'Start of ', nameOfRoutine)  
 
+  err = 0
+
   !====================================================
-  !===read the atlas
+  !===read the atlas, if it is not already in memory
   !====================================================
     
   dir=data_path(:len_trim(data_path))//'/emissivity/'
 
-  call rttov_readmw_atlas(err,trim(dir),month)
+  call rttov_getmw_atlas(err,trim(dir),month)
 
   if (err /= 0) then
-     msg = 'error in rttov_readmw_atlas'
+     msg = 'error in rttov_getmw_atlas'
      call report(err,msg, nameOfRoutine)
      errorstatus = err
      return
   end if
 
   read(month,'(I2)') imonth
-  ! the data in the database as a range in longitude from 0 to 360. therefore we need to transform 
-  ! negative longitudes to the range 180 to 359
-  if (lon < 0.) then
-    lon_tmp = lon + 360.
-  else
-    lon_tmp = lon
-  end if
-  do i = 1,nummu
-    theta = acos(mu_values(i))*rad2deg
-    !====================================================
-    !===sample on a single pixel
-    !====================================================
-    !===test the inputs
-    call test_inputs(err,imonth,lat,lon_tmp,theta,freq)
-    if (err /= 0) then
-        msg = 'error in test_inputs'
-        call report(err,msg, nameOfRoutine)
-        call rttov_closemw_atlas()
-        errorstatus = err
-        return
-    end if
-    
-    call emis_interp_ind_sing(err,lat,lon_tmp,theta,freq,emissivity(1,i),emissivity(2,i))
-    if (err /= 0) then
-        msg = 'error in emis_interp_ind_sing'
-        call report(err,msg, nameOfRoutine)
-        call rttov_closemw_atlas()
-        errorstatus = err
-        return
+  do i = 1,nang
+    theta(i) = acos(mu(i))*rad2deg
+  end do
+
+  do ip = 1, npix
+    ! the data in the database as a range in longitude from 0 to 360. therefore we need to transform 
+    ! negative longitudes to the range 180 to 359
+    if (lon(ip) < 0.) then
+      lon_tmp = lon(ip) + 360.
+    else
+      lon_tmp = lon(ip)
     end if
+    do i = 1,nang
+      !====================================================
+      !===sample on a single pixel
+      !====================================================
+      !===test the inputs
+      call test_inputs(err,imonth,lat(ip),lon_tmp,theta(i),freq)
+      if (err /= 0) then
+          msg = 'error in test_inputs'
+          call report(err,msg, nameOfRoutine)
+          errorstatus = err
+          return
+      end if
+      
+      call emis_interp_ind_sing(err,lat(ip),lon_tmp,theta(i),freq,emissivity(1,i,ip),emissivity(2,i,ip))
+      if (err /= 0) then
+          msg = 'error in emis_interp_ind_sing'
+          call report(err,msg, nameOfRoutine)
+          errorstatus = err
+          return
+      end if
+    end do
   end do
-    
-  call rttov_closemw_atlas()
 
   errorstatus = err
 
   if (verbose >= 3) call report(info,'End of ', nameOfRoutine)
 
-end subroutine telsem2
-
+end subroutine telsem2_batch
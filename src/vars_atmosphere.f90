@@ -63,6 +63,7 @@ module vars_atmosphere
     use settings, only: verbose, input_file, input_pathfile, &
       output_path, nc_out_file, file_desc, freq_str
     use descriptor_file, only: moment_in_arr, n_hydro
+    use npy_io, only: npy_read_dbl
 
     implicit none
 
@@ -73,27 +74,64 @@ module vars_atmosphere
 
 ! work variables
     real(kind=dbl), dimension(8) :: dum_8
+    real(kind=dbl), allocatable, dimension(:) :: dum_scalar
+    integer(kind=long), dimension(0) :: scalar_shape
+    logical :: is_store, found
+    integer :: ii
+    character(len=10), dimension(4) :: store_scalars = (/'ngridx    ','ngridy    ','max_nlyrs ','noutlevels'/)
 
     if (verbose >= 3) call report(info,'Start of ', nameOfRoutine)
 
+! a directory written by pyPamtra.writeProfileStore
+    inquire(file=trim(input_pathfile)//'/manifest.json', exist=is_store)
+    if (is_store) then
+      atmo_input_type = 'npy'
+    else
+      atmo_input_type = trim(input_pathfile(len_trim(input_pathfile)-2:len_trim(input_pathfile)))
+    end if
 
-    atmo_input_type = trim(input_pathfile(len_trim(input_pathfile)-2:len_trim(input_pathfile)))
-
-    if ((atmo_input_type .ne. 'cla') .and. (atmo_input_type .ne. 'lev') .and. (atmo_input_type .ne. 'lay'))  then
+    if ((atmo_input_type .ne. 'cla') .and. (atmo_input_type .ne. 'lev') .and. (atmo_input_type .ne. 'lay') &
+        .and. (atmo_input_type .ne. 'npy'))  then
         msg = "Unknown ascii input file type"//trim(atmo_input_type)
         call report(err,msg,nameOfRoutine)
         errorstatus = fatal
         return
     end if
 
+! Screen profile store, the dimensions are saved as scalars
+    if (atmo_input_type == 'npy') then
+      do ii = 1, 4
+        call npy_read_dbl(err, trim(input_pathfile)//'/p%'//trim(store_scalars(ii))//'%.npy', &
+          scalar_shape, found, dum_scalar)
+        if ((err /= 0) .or. (.not. found)) then
+          msg = "Read error: Cannot read p%"//trim(store_scalars(ii))//" of profile store"
+          call report(fatal,msg,nameOfRoutine)
+          errorstatus = fatal
+          return
+        end if
+        dum_8(ii) = dum_scalar(1)
+      end do
+      atmo_ngridx = nint(dum_8(1), long)
+      atmo_ngridy = nint(dum_8(2), long)
+      atmo_max_nlyrs = nint(dum_8(3), long)
+! the output levels of the store replace the ones of the namelist
+      noutlevels = nint(dum_8(4), long)
+      if (verbose >= 2) then
+        msg = "reading profile store "//trim(input_pathfile)
+        call report(info,msg,nameOfRoutine)
+      end if
+! add layers/levels to be able to insert the output levels as a new layers/levels
+      atmo_max_nlyrs = atmo_max_nlyrs + noutlevels
+    else
 ! OPEN input file
-    open(UNIT=14, FILE=TRIM(input_pathfile),&
-    STATUS='OLD', iostat=err)
-    if (err /= 0) then
-        msg = "Read error: Cannot open file "//TRIM(input_pathfile)
-        call report(err,msg,nameOfRoutine)
-        errorstatus = fatal
-        return
+      open(UNIT=14, FILE=TRIM(input_pathfile),&
+      STATUS='OLD', iostat=err)
+      if (err /= 0) then
+          msg = "Read error: Cannot open file "//TRIM(input_pathfile)
+          call report(err,msg,nameOfRoutine)
+          errorstatus = fatal
+          return
+      end if
     end if
 
 ! Screen NEW input file format
@@ -127,8 +165,13 @@ module vars_atmosphere
       close(14)
     endif
 
-    nc_out_file = trim(output_path)//"/"//trim(input_file(1:len_trim(input_file)-4))//&
-    trim(freq_str)//trim(file_desc)//'.nc'
+    if (atmo_input_type == 'npy') then
+      nc_out_file = trim(output_path)//"/"//trim(input_file)//&
+      trim(freq_str)//trim(file_desc)//'.nc'
+    else
+      nc_out_file = trim(output_path)//"/"//trim(input_file(1:len_trim(input_file)-4))//&
+      trim(freq_str)//trim(file_desc)//'.nc'
+    end if
 
     errorstatus = err
     if (verbose >= 3) call report(info,'End of ', nameOfRoutine)
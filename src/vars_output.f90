@@ -45,6 +45,25 @@ module vars_output
   real(kind=dbl), allocatable, dimension(:,:,:,:,:,:) :: out_scatter_matrix
   real(kind=dbl), allocatable, dimension(:,:,:,:,:) :: out_extinct_matrix
   real(kind=dbl), allocatable, dimension(:,:,:,:) :: out_emis_vector
+
+  integer(kind=long) :: out_scat_cache_hits = 0 ! reused scattering properties, see scat_cache
+  integer(kind=long) :: out_scat_cache_misses = 0 ! computed scattering properties, see scat_cache
+
+  ! wall-clock time [s] and number of calls of the stages of run_rt per frequency,
+  ! the first index is one of the timing_* stages below
+  integer(kind=long), parameter :: n_timing_stages = 7
+  integer(kind=long), parameter :: timing_gasabs = 1
+  integer(kind=long), parameter :: timing_sfc_optics = 2
+  integer(kind=long), parameter :: timing_drop_size_dist = 3
+  integer(kind=long), parameter :: timing_scatproperties = 4
+  integer(kind=long), parameter :: timing_scatcnv = 5
+  integer(kind=long), parameter :: timing_rt4 = 6
+  integer(kind=long), parameter :: timing_radar_simulator = 7
+  real(kind=dbl), allocatable, dimension(:,:) :: out_timing
+  integer(kind=long), allocatable, dimension(:,:) :: out_timing_calls
+  ! the same for run_drop_size_dist (1) and calc_scatProperties (2) per hydrometeor
+  real(kind=dbl), allocatable, dimension(:,:,:) :: out_timing_hydro
+  integer(kind=long), allocatable, dimension(:,:,:) :: out_timing_hydro_calls
   
   real(kind=dbl), dimension(300) :: out_debug_diameter
   real(kind=dbl), dimension(300) :: out_debug_back_of_d
@@ -72,7 +91,8 @@ module vars_output
       nummu,&
       noutlevels, &
       radar_nfft, &
-      radar_nPeaks
+      radar_nPeaks, &
+      output_selected
 
     use nan, only: nan_dbl
     use mod_io_strings
@@ -131,8 +151,10 @@ module vars_output
 !         hwps(:,:)= nan_dbl()
 !    end if
 
-    allocate(out_emissivity(atmo_ngridx,atmo_ngridy,nstokes,nfrq,nummu))
-    out_emissivity = nan_dbl()
+    if (passive .and. output_selected("emissivity")) then
+        allocate(out_emissivity(atmo_ngridx,atmo_ngridy,nstokes,nfrq,nummu))
+        out_emissivity = nan_dbl()
+    end if
     allocate(out_angles_deg(2*nummu))
     out_angles_deg = nan_dbl()
 !     if (write_nc .or. in_python) then
@@ -153,23 +175,35 @@ module vars_output
         out_radar_hgt= -9999._dbl
     end if
 
+    !the optional outputs which are not in output_products are not allocated
+    !set to -9999, because height of profiles can vary!
     if((active) .and. ((radar_mode .eq. "spectrum") .or. (radar_mode .eq. "moments")))  then
-        allocate(&
-        out_radar_spectra(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nfft),&
-        out_radar_snr(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks),&
-        out_radar_moments(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks,4),&
-        out_radar_slopes(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks,2),&
-        out_radar_edges(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks,2),&
-        out_radar_quality(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks),&
-        out_radar_vel(nfrq,radar_nfft))
-        !set to -9999, because height of profiles can vary!
-        out_radar_spectra = -9999.d0
-        out_radar_snr = -9999.d0
+        allocate(out_radar_vel(nfrq,radar_nfft))
         out_radar_vel = -9999.d0
-        out_radar_moments = -9999.d0
-        out_radar_slopes = -9999.d0
-        out_radar_edges = -9999.d0
-        out_radar_quality = -9999
+        if (output_selected("radar_spectra")) then
+            allocate(out_radar_spectra(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nfft))
+            out_radar_spectra = -9999.d0
+        end if
+        if (output_selected("radar_snr")) then
+            allocate(out_radar_snr(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks))
+            out_radar_snr = -9999.d0
+        end if
+        if (output_selected("radar_moments")) then
+            allocate(out_radar_moments(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks,4))
+            out_radar_moments = -9999.d0
+        end if
+        if (output_selected("radar_slopes")) then
+            allocate(out_radar_slopes(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks,2))
+            out_radar_slopes = -9999.d0
+        end if
+        if (output_selected("radar_edges")) then
+            allocate(out_radar_edges(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks,2))
+            out_radar_edges = -9999.d0
+        end if
+        if (output_selected("radar_quality")) then
+            allocate(out_radar_quality(atmo_ngridx,atmo_ngridy,no_allocated_lyrs,nfrq,radar_npol,radar_nPeaks))
+            out_radar_quality = -9999
+        end if
     end if
 
     if (save_psd) then
@@ -203,6 +237,15 @@ module vars_output
 	)
     end if
     
+    allocate(out_timing(n_timing_stages,nfrq))
+    allocate(out_timing_calls(n_timing_stages,nfrq))
+    allocate(out_timing_hydro(2,n_hydro,nfrq))
+    allocate(out_timing_hydro_calls(2,n_hydro,nfrq))
+    out_timing = 0._dbl
+    out_timing_calls = 0
+    out_timing_hydro = 0._dbl
+    out_timing_hydro_calls = 0
+
     !debuging stuff, only deallocated if necessary:
     if (allocated(out_debug_radarvel)) deallocate(out_debug_radarvel)
     if (allocated(out_debug_radarback)) deallocate(out_debug_radarback)
@@ -269,12 +312,55 @@ module vars_output
     if (allocated(out_scatter_matrix)) deallocate(out_scatter_matrix)
     if (allocated(out_extinct_matrix)) deallocate(out_extinct_matrix)
     if (allocated(out_emis_vector)) deallocate(out_emis_vector)
+    if (allocated(out_timing)) deallocate(out_timing)
+    if (allocated(out_timing_calls)) deallocate(out_timing_calls)
+    if (allocated(out_timing_hydro)) deallocate(out_timing_hydro)
+    if (allocated(out_timing_hydro_calls)) deallocate(out_timing_hydro_calls)
     
     if (verbose >= 3) call report(info,'End of ', nameOfRoutine)
 
 
   end subroutine deallocate_output_vars
 
+  function timing_clock()
+
+    ! wall-clock time [s] used as start time for timing_add
+
+    implicit none
+    real(kind=dbl) :: timing_clock
+    integer(kind=8) :: clock_count, clock_rate
+
+    call system_clock(clock_count, clock_rate)
+    timing_clock = dble(clock_count) / dble(clock_rate)
+
+  end function timing_clock
+
+  subroutine timing_add(stage, t_start)
+
+    ! add the time since t_start to stage of the current frequency. run_drop_size_dist and
+    ! calc_scatProperties are counted for the current hydrometeor as well.
+
+    use vars_index, only: i_f, i_h
+
+    implicit none
+    integer(kind=long), intent(in) :: stage
+    real(kind=dbl), intent(in) :: t_start
+    real(kind=dbl) :: t_stage
+
+    if (.not. allocated(out_timing)) return
+
+    t_stage = timing_clock() - t_start
+    out_timing(stage,i_f) = out_timing(stage,i_f) + t_stage
+    out_timing_calls(stage,i_f) = out_timing_calls(stage,i_f) + 1
+    if ((stage == timing_drop_size_dist) .or. (stage == timing_scatproperties)) then
+      out_timing_hydro(stage-timing_drop_size_dist+1,i_h,i_f) = &
+        out_timing_hydro(stage-timing_drop_size_dist+1,i_h,i_f) + t_stage
+      out_timing_hydro_calls(stage-timing_drop_size_dist+1,i_h,i_f) = &
+        out_timing_hydro_calls(stage-timing_drop_size_dist+1,i_h,i_f) + 1
+    end if
+
+  end subroutine timing_add
+
 
 end module vars_output
 
@@ -165,53 +165,59 @@ subroutine write_nc_results
      call check(nf90_put_att(ncid, ZeVarID, "missing_value", -9999))
 
      if ((radar_mode .eq. "spectrum") .or. (radar_mode .eq. "moments")) then
-        call check(nf90_def_var(ncid,'Radar_SNR', nf90_double,dim6d_rad, RadarSNRID))
-        call check(nf90_put_att(ncid, RadarSNRID, "units", "dB"))
-        call check(nf90_put_att(ncid, RadarSNRID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_MeanDopplerVel', nf90_double,dim6d_rad, velVarID))
-        call check(nf90_put_att(ncid, velVarID, "units", "m/s"))
-        call check(nf90_put_att(ncid, velVarID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_SpectrumWidth', nf90_double,dim6d_rad, swVarID))
-        call check(nf90_put_att(ncid, swVarID, "units", "m/s"))
-        call check(nf90_put_att(ncid, swVarID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_Skewness', nf90_double,dim6d_rad, skewVarID))
-        call check(nf90_put_att(ncid, skewVarID, "units", "-"))
-        call check(nf90_put_att(ncid, skewVarID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_Kurtosis', nf90_double,dim6d_rad, kurtVarID))
-        call check(nf90_put_att(ncid, kurtVarID, "units", "-"))
-        call check(nf90_put_att(ncid, kurtVarID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_LeftSlope', nf90_double,dim6d_rad, lSloVarID))
-        call check(nf90_put_att(ncid, lSloVarID, "units", "dB/(m/s)"))
-        call check(nf90_put_att(ncid, lSloVarID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_RightSlope', nf90_double,dim6d_rad, rSloVarID))
-        call check(nf90_put_att(ncid, rSloVarID, "units", "dB/(m/s)"))
-        call check(nf90_put_att(ncid, rSloVarID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_LeftEdge', nf90_double,dim6d_rad, lEdgVarID))
-        call check(nf90_put_att(ncid, lEdgVarID, "units", "m/s"))
-        call check(nf90_put_att(ncid, lEdgVarID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_RightEdge', nf90_double,dim6d_rad, rEdgVarID))
-        call check(nf90_put_att(ncid, rEdgVarID, "units", "m/s"))
-        call check(nf90_put_att(ncid, rEdgVarID, "missing_value", -9999))
-
-        call check(nf90_def_var(ncid,'Radar_Quality', nf90_int,dim6d_rad, rQualVarID))
-        call check(nf90_put_att(ncid, rQualVarID, "units", "bytes"))
-        call check(nf90_put_att(ncid, rQualVarID, "description", "1st byte: aliasing; "// &
-             "2nd byte: 2nd peak present; 7th: no peak found"))
-        call check(nf90_put_att(ncid, rQualVarID, "missing_value", -9999))
-
+        if (allocated(out_radar_snr)) then
+           call check(nf90_def_var(ncid,'Radar_SNR', nf90_double,dim6d_rad, RadarSNRID))
+           call check(nf90_put_att(ncid, RadarSNRID, "units", "dB"))
+           call check(nf90_put_att(ncid, RadarSNRID, "missing_value", -9999))
+        end if
+        if (allocated(out_radar_moments)) then
+           call check(nf90_def_var(ncid,'Radar_MeanDopplerVel', nf90_double,dim6d_rad, velVarID))
+           call check(nf90_put_att(ncid, velVarID, "units", "m/s"))
+           call check(nf90_put_att(ncid, velVarID, "missing_value", -9999))
+
+           call check(nf90_def_var(ncid,'Radar_SpectrumWidth', nf90_double,dim6d_rad, swVarID))
+           call check(nf90_put_att(ncid, swVarID, "units", "m/s"))
+           call check(nf90_put_att(ncid, swVarID, "missing_value", -9999))
+
+           call check(nf90_def_var(ncid,'Radar_Skewness', nf90_double,dim6d_rad, skewVarID))
+           call check(nf90_put_att(ncid, skewVarID, "units", "-"))
+           call check(nf90_put_att(ncid, skewVarID, "missing_value", -9999))
+
+           call check(nf90_def_var(ncid,'Radar_Kurtosis', nf90_double,dim6d_rad, kurtVarID))
+           call check(nf90_put_att(ncid, kurtVarID, "units", "-"))
+           call check(nf90_put_att(ncid, kurtVarID, "missing_value", -9999))
+        end if
+        if (allocated(out_radar_slopes)) then
+           call check(nf90_def_var(ncid,'Radar_LeftSlope', nf90_double,dim6d_rad, lSloVarID))
+           call check(nf90_put_att(ncid, lSloVarID, "units", "dB/(m/s)"))
+           call check(nf90_put_att(ncid, lSloVarID, "missing_value", -9999))
+
+           call check(nf90_def_var(ncid,'Radar_RightSlope', nf90_double,dim6d_rad, rSloVarID))
+           call check(nf90_put_att(ncid, rSloVarID, "units", "dB/(m/s)"))
+           call check(nf90_put_att(ncid, rSloVarID, "missing_value", -9999))
+        end if
+        if (allocated(out_radar_edges)) then
+           call check(nf90_def_var(ncid,'Radar_LeftEdge', nf90_double,dim6d_rad, lEdgVarID))
+           call check(nf90_put_att(ncid, lEdgVarID, "units", "m/s"))
+           call check(nf90_put_att(ncid, lEdgVarID, "missing_value", -9999))
+
+           call check(nf90_def_var(ncid,'Radar_RightEdge', nf90_double,dim6d_rad, rEdgVarID))
+           call check(nf90_put_att(ncid, rEdgVarID, "units", "m/s"))
+           call check(nf90_put_att(ncid, rEdgVarID, "missing_value", -9999))
+        end if
+        if (allocated(out_radar_quality)) then
+           call check(nf90_def_var(ncid,'Radar_Quality', nf90_int,dim6d_rad, rQualVarID))
+           call check(nf90_put_att(ncid, rQualVarID, "units", "bytes"))
+           call check(nf90_put_att(ncid, rQualVarID, "description", "1st byte: aliasing; "// &
+                "2nd byte: 2nd peak present; 7th: no peak found"))
+           call check(nf90_put_att(ncid, rQualVarID, "missing_value", -9999))
+        end if
         if (radar_mode == "spectrum") then
            call check(nf90_def_var(ncid,'Radar_Velocity', nf90_double,(/dfrqID,dnfftID/), RadarVelID))
            call check(nf90_put_att(ncid, RadarVelID, "units", "m/s"))
            call check(nf90_put_att(ncid, RadarVelID, "missing_value", -9999))
-
+        end if
+        if ((radar_mode == "spectrum") .and. allocated(out_radar_spectra)) then
            call check(nf90_def_var(ncid,'Radar_Spectrum', nf90_double, &
                 (/dnfftID,dradpolID,dfrqID,dlayerID,dlatID,dlonID/), RadarSpecID))
            call check(nf90_put_att(ncid, RadarSpecID, "units", "dBz"))
@@ -280,40 +286,50 @@ subroutine write_nc_results
      call check(nf90_put_var(ncid, AttAtmoVarID, &
           RESHAPE( out_att_atmo, (/nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/4,3,2,1/))))
      if ((radar_mode == "moments") .or.(radar_mode == "spectrum") ) then
-        call check(nf90_put_var(ncid, velVarID, &
-             RESHAPE( out_radar_moments(:,:,:,:,:,:,1), &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-        call check(nf90_put_var(ncid, swVarID, &
-             RESHAPE( out_radar_moments(:,:,:,:,:,:,2),  &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-        call check(nf90_put_var(ncid, skewVarID, &
-             RESHAPE( out_radar_moments(:,:,:,:,:,:,3), &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-        call check(nf90_put_var(ncid, kurtVarID, &
-             RESHAPE( out_radar_moments(:,:,:,:,:,:,4), &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-        call check(nf90_put_var(ncid, lSloVarID, &
-             RESHAPE( out_radar_slopes(:,:,:,:,:,:,1), &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-        call check(nf90_put_var(ncid, rSloVarID, &
-             RESHAPE( out_radar_slopes(:,:,:,:,:,:,2), &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-
-        call check(nf90_put_var(ncid, lEdgVarID, &
-             RESHAPE( out_radar_edges(:,:,:,:,:,:,1), &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-        call check(nf90_put_var(ncid, rEdgVarID, &
-             RESHAPE( out_radar_edges(:,:,:,:,:,:,2), &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-
-        call check(nf90_put_var(ncid, RadarSNRID, &
-             RESHAPE( out_radar_snr, &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
-        call check(nf90_put_var(ncid, rQualVarID, &
-             RESHAPE( out_radar_quality, &
-             (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+        if (allocated(out_radar_moments)) then
+           call check(nf90_put_var(ncid, velVarID, &
+                RESHAPE( out_radar_moments(:,:,:,:,:,:,1), &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+           call check(nf90_put_var(ncid, swVarID, &
+                RESHAPE( out_radar_moments(:,:,:,:,:,:,2), &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+           call check(nf90_put_var(ncid, skewVarID, &
+                RESHAPE( out_radar_moments(:,:,:,:,:,:,3), &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+           call check(nf90_put_var(ncid, kurtVarID, &
+                RESHAPE( out_radar_moments(:,:,:,:,:,:,4), &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+        end if
+        if (allocated(out_radar_slopes)) then
+           call check(nf90_put_var(ncid, lSloVarID, &
+                RESHAPE( out_radar_slopes(:,:,:,:,:,:,1), &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+           call check(nf90_put_var(ncid, rSloVarID, &
+                RESHAPE( out_radar_slopes(:,:,:,:,:,:,2), &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+        end if
+        if (allocated(out_radar_edges)) then
+           call check(nf90_put_var(ncid, lEdgVarID, &
+                RESHAPE( out_radar_edges(:,:,:,:,:,:,1), &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+           call check(nf90_put_var(ncid, rEdgVarID, &
+                RESHAPE( out_radar_edges(:,:,:,:,:,:,2), &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+        end if
+        if (allocated(out_radar_snr)) then
+           call check(nf90_put_var(ncid, RadarSNRID, &
+                RESHAPE( out_radar_snr, &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+        end if
+        if (allocated(out_radar_quality)) then
+           call check(nf90_put_var(ncid, rQualVarID, &
+                RESHAPE( out_radar_quality, &
+                (/ radar_nPeaks, radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), ORDER = (/6,5,4,3,2,1/))))
+        end if
         if (radar_mode == "spectrum") then
            call check(nf90_put_var(ncid, RadarVelID, RESHAPE(out_radar_vel, (/ radar_nfft,nfrq/),ORDER = (/2,1/))))
+        end if
+        if ((radar_mode == "spectrum") .and. allocated(out_radar_spectra)) then
            call check(nf90_put_var(ncid, RadarSpecID, &
                 RESHAPE( out_radar_spectra, &
                 (/ radar_nfft,radar_npol, nfrq, atmo_max_nlyrs, atmo_ngridy, atmo_ngridx/), &